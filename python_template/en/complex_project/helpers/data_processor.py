@@ -11,16 +11,77 @@ Author: Your name
 Date: {current_date}
 """
 
+import copy
+import json
+import re
+import time
+import weakref
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import logging
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+try:
+    from instrumentation import instrumented
+except ImportError:  # instrumentation.py was not copied along with this module
+    def instrumented(name=None, counter=None):
+        return lambda function: function
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# One machine-readable record per operation (see _log_metrics)
+metrics_logger = logging.getLogger(f"{__name__}.metrics")
+
+# Quantiles reported for numeric columns in the executive summary
+SUMMARY_QUANTILES = [0.25, 0.50, 0.75]
+
+# Numeric blocks are copied in column batches of at most this many bytes
+NUMERIC_BATCH_BYTES = 64 * 1024 ** 2
+
+# Memory optimization
+CATEGORY_MAX_UNIQUE_RATIO = 0.5  # Text columns with fewer distinct values per row become category
+INTEGER_DOWNCAST_TYPES = [np.int8, np.int16, np.int32]
+UNSIGNED_DOWNCAST_TYPES = [np.uint8, np.uint16, np.uint32]
+
+# Memory accounting
+MEMORY_SAMPLE_SIZE = 1000  # Values per object column sized by the sampled estimate
+_MEMORY_MEMO = {}  # (id of the frame, sample size or None if exact) -> (weak reference, version, bytes)
+
+# Column name normalization
+COLUMN_NAME_MEMO_SIZE = 4096  # Distinct names and headers remembered across calls
+COLUMN_COLLISION_MODES = ['warn', 'raise', 'suffix']
+
+# Date components that process_dates can extract
+DATE_COMPONENTS = ['year', 'month', 'day', 'day_name', 'quarter', 'is_weekend']
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+DATE_FORMAT_SAMPLE_SIZE = 1000  # Values checked against the inferred date format
 
+# Result formats of detect_outliers_iqr_frame
+OUTLIER_OUTPUTS = ['mask', 'indices', 'counts']
+
+# Accumulator sizes of the streaming summary
+SKETCH_COMPACTOR_SIZE = 1000  # Items per quantile sketch compactor
+HEAVY_HITTERS_CAPACITY = 1000  # Distinct values counted per categorical column
+DISTINCT_SKETCH_PRECISION = 12  # HyperLogLog uses 2**12 registers (~1.6% error)
+
+# Duplicate detection from 64-bit row hashes
+DUPLICATE_MODES = ['exact', 'approximate']
+DUPLICATE_SKETCH_PRECISION = 14  # 2**14 registers (~0.8% error on distinct rows)
+DUPLICATE_COMPACT_ROWS = 1_000_000  # Pending row hashes before deduplicating them
+ROW_HASH_MULTIPLIER = 0x100000001B3  # Chains column hashes so column order matters
+ROW_HASH_SECOND_SEED = 0x9E3779B97F4A7C15  # Seed of the independent hash of exact mode
+ROW_HASH_KEYS = ['0123456789123456', 'f3a9c1e07b5d2864']  # hash_array keys of text values, one per seed
+
+
+@instrumented()
 def validate_dataframe(df, dataset_name="Dataset"):
     """
     Validates a DataFrame and reports common issues.
@@ -36,53 +97,407 @@ def validate_dataframe(df, dataset_name="Dataset"):
     --------
     dict : Dictionary with validation report
     """
+    started = time.perf_counter()
     report = {
         'dataset': dataset_name,
         'rows': len(df),
         'columns': len(df.columns),
         'null_values': df.isnull().sum().sum(),
-        'duplicates': df.duplicated().sum(),
-        'memory_mb': df.memory_usage(deep=True).sum() / (1024 ** 2),
+        'duplicates': count_duplicate_rows(df),
+        'memory_mb': measure_memory(df) / (1024 ** 2),
         'columns_with_nulls': df.columns[df.isnull().any()].tolist(),
         'data_types': df.dtypes.to_dict()
     }
 
-    logger.info(f"Validation completed for {dataset_name}")
-    logger.info(f"  - Dimensions: {report['rows']} rows x {report['columns']} columns")
-    logger.info(f"  - Null values: {report['null_values']}")
-    logger.info(f"  - Duplicates: {report['duplicates']}")
+    logger.info("Validation completed for %s", dataset_name)
+    logger.info("  - Dimensions: %s rows x %s columns", report['rows'], report['columns'])
+    logger.info("  - Null values: %s", report['null_values'])
+    logger.info("  - Duplicates: %s", report['duplicates'])
+    _log_metrics('validate_dataframe', started, df, dataset=dataset_name)
 
     return report
 
 
-def clean_column_names(df):
+@instrumented()
+def optimize_memory(df, inplace=False, category_ratio=CATEGORY_MAX_UNIQUE_RATIO,
+                    downcast_floats=True, arrow_strings=True, unsigned_integers=False):
+    """
+    Reduces the memory of a DataFrame by converting each column to a smaller dtype.
+
+    - Integers go to the smallest type of the same signedness that holds their
+      range; signed columns become unsigned only with unsigned_integers=True,
+      since subtracting from an unsigned column wraps around instead of going negative.
+    - float64 goes to float32 only when every value survives the round trip.
+    - Text columns with few distinct values become category; the remaining
+      all-string columns use the Arrow-backed string dtype.
+
+    Smaller integer types can overflow in later element-wise arithmetic, so
+    this is meant for loaded data that is mostly read. The before/after
+    report is logged and stored in df.attrs['memory_optimization'].
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame to optimize
+    inplace : bool
+        If True, converts the columns of df itself
+    category_ratio : float
+        Maximum distinct values per row for a text column to become category
+    downcast_floats : bool
+        Whether to try float64 -> float32
+    arrow_strings : bool
+        Whether to convert the remaining text columns to Arrow strings (needs pyarrow)
+    unsigned_integers : bool
+        Whether signed integer columns without negative values may become unsigned
+
+    Returns:
+    --------
+    pandas.DataFrame : DataFrame with optimized dtypes
+    """
+    started = time.perf_counter()
+    memory_before = measure_memory(df)
+    df_optimized = df if inplace else df.copy(deep=False)
+    string_dtype = _arrow_string_dtype() if arrow_strings else None
+    conversions = {}
+
+    for col in df_optimized.columns:
+        series = df_optimized[col]
+        new_dtype = _optimized_dtype(series, category_ratio, downcast_floats, string_dtype, unsigned_integers)
+        if new_dtype is not None:
+            conversions[col] = f"{series.dtype} -> {new_dtype}"
+            df_optimized[col] = series.astype(new_dtype)
+
+    memory_after = measure_memory(df_optimized)
+    report = {
+        'memory_before_mb': float(memory_before / (1024 ** 2)),
+        'memory_after_mb': float(memory_after / (1024 ** 2)),
+        'reduction_percentage': float((1 - memory_after / memory_before) * 100) if memory_before else 0.0,
+        'conversions': conversions
+    }
+    df_optimized.attrs['memory_optimization'] = report
+
+    logger.info("Memory optimized: %.2f MB -> %.2f MB (%.1f%% less, %s columns converted)",
+                report['memory_before_mb'], report['memory_after_mb'], report['reduction_percentage'], len(conversions))
+    _log_metrics('optimize_memory', started, df_optimized, memory_bytes=memory_after,
+                 bytes_before=memory_before, conversions=len(conversions))
+    return df_optimized
+
+
+def _optimized_dtype(series, category_ratio, downcast_floats, string_dtype, unsigned_integers=False):
+    """Smallest safe dtype for a column, or None to keep the current one."""
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype):
+        # Extension dtypes: only the default (non-categorical) string dtype is compacted
+        if isinstance(dtype, pd.StringDtype) and _is_low_cardinality(series, category_ratio):
+            return 'category'
+        return None
+
+    if dtype.kind in 'iu':
+        if len(series) == 0:
+            return None
+        minimum, maximum = series.min(), series.max()
+        unsigned = dtype.kind == 'u' or (unsigned_integers and minimum >= 0)
+        candidates = UNSIGNED_DOWNCAST_TYPES if unsigned else INTEGER_DOWNCAST_TYPES
+        for candidate in candidates:
+            info = np.iinfo(candidate)
+            if info.min <= minimum and maximum <= info.max and np.dtype(candidate).itemsize < dtype.itemsize:
+                return np.dtype(candidate)
+        return None
+
+    if dtype == np.float64 and downcast_floats:
+        values = series.to_numpy()
+        converted = values.astype(np.float32)
+        # NaN != NaN, so nulls are compared separately
+        if np.array_equal(converted.astype(np.float64), values, equal_nan=True):
+            return np.dtype(np.float32)
+        return None
+
+    if dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+        if _is_low_cardinality(series, category_ratio):
+            return 'category'
+        return string_dtype
+
+    return None
+
+
+def _is_low_cardinality(series, category_ratio):
+    """Whether a column has few enough distinct values per row to be stored as category."""
+    return len(series) > 0 and series.nunique() <= category_ratio * len(series)
+
+
+def _arrow_string_dtype():
+    """Arrow-backed string dtype, or None (with a warning) if pyarrow is not installed."""
+    try:
+        return pd.StringDtype(storage="pyarrow")
+    except ImportError:
+        logger.warning("pyarrow is not installed, text columns keep the object dtype. "
+                       "Install it with: pip install pyarrow")
+        return None
+
+
+def measure_memory(df, exact=False, sample_size=MEMORY_SAMPLE_SIZE):
+    """
+    Measures the memory of a DataFrame in bytes, index included.
+
+    df.memory_usage(deep=True) sizes every Python object of every object
+    column. Here only object columns (and an object index) are sized deeply,
+    from a random sample of sample_size values unless exact is True; every
+    other dtype reports the exact size of its buffers.
+
+    Results are memoized per frame and reused while it keeps the same index,
+    columns and column arrays, so measuring the same frame again (e.g. when
+    loading and then validating it) is free. Values edited in place are not
+    detected; use exact=True after such edits.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame to measure
+    exact : bool
+        Whether to size every object instead of a sample
+    sample_size : int
+        Values sampled per object column
+
+    Returns:
+    --------
+    int : Memory in bytes (estimated unless exact)
+    """
+    version = _frame_version(df)
+    keys = [(id(df), None)] if exact else [(id(df), None), (id(df), sample_size)]
+    for key in keys:
+        memo = _MEMORY_MEMO.get(key)
+        if memo is not None and memo[0]() is df and memo[1] == version:
+            return memo[2]
+
+    rows = len(df)
+    sampled = not exact and rows > sample_size
+    if sampled:
+        positions = np.random.default_rng(0).integers(0, rows, sample_size)
+    total = 0
+    for values in [df.index] + [df.iloc[:, i] for i in range(df.shape[1])]:
+        if sampled and values.dtype == object:
+            sample = values[positions] if isinstance(values, pd.Index) else values.iloc[positions]
+            total += _deep_bytes(sample) * rows / sample_size
+        else:
+            total += _deep_bytes(values)
+    total = int(total)
+
+    if version is not None:
+        key = (id(df), sample_size if sampled else None)
+        _MEMORY_MEMO[key] = (weakref.ref(df, lambda _, key=key: _MEMORY_MEMO.pop(key, None)), version, total)
+    return total
+
+
+def _frame_version(df):
+    """
+    Identity of the index, the columns and every column array of a frame.
+
+    Assigning, adding or dropping columns and reindexing replace some of
+    these objects, which invalidates the memoized measurements.
+    """
+    arrays = getattr(getattr(df, '_mgr', None), 'arrays', None)
+    if arrays is None:
+        return None
+    return df.shape, id(df.index), id(df.columns), tuple(id(array) for array in arrays)
+
+
+def _deep_bytes(values):
+    """Deep memory of a Series (without its index) or of an Index."""
+    if isinstance(values, pd.Index):
+        return values.memory_usage(deep=True)
+    return values.memory_usage(deep=True, index=False)
+
+
+def _log_metrics(operation, started, df=None, shape=None, memory_bytes=None, **fields):
+    """
+    Logs one machine-readable metrics record for an operation.
+
+    The record (operation, rows, columns, bytes, seconds plus any extra
+    fields) is logged as JSON on the metrics logger and attached to the log
+    record as `metrics`. Nothing is measured unless INFO is enabled for the
+    metrics logger.
+
+    Parameters:
+    -----------
+    operation : str
+        Name of the operation
+    started : float
+        time.perf_counter() value when the operation started
+    df : pandas.DataFrame, optional
+        Resulting DataFrame, whose shape and memory are reported
+    shape : tuple, optional
+        (rows, columns) processed (defaults to the shape of df)
+    memory_bytes : int, optional
+        Bytes already measured (defaults to measure_memory(df))
+    **fields
+        Additional values for the record
+    """
+    if not metrics_logger.isEnabledFor(logging.INFO):
+        return
+
+    metrics = {'operation': operation, 'rows': None, 'columns': None, 'bytes': None,
+               'seconds': round(time.perf_counter() - started, 6)}
+    if shape is None and df is not None:
+        shape = df.shape
+    if shape is not None:
+        metrics['rows'], metrics['columns'] = int(shape[0]), int(shape[1])
+    if memory_bytes is None and df is not None:
+        memory_bytes = measure_memory(df)
+    if memory_bytes is not None:
+        metrics['bytes'] = int(memory_bytes)
+    metrics.update({key: value.item() if isinstance(value, np.generic) else value for key, value in fields.items()})
+
+    metrics_logger.info("%s", json.dumps(metrics, default=str), extra={'metrics': metrics})
+
+
+@instrumented()
+def count_duplicate_rows(df, mode="exact"):
+    """
+    Counts rows equal to a previous row, like df.duplicated().sum().
+
+    Every row is reduced to a 64-bit hash with vectorized column hashing
+    instead of building per-row tuples. In exact mode only the rows whose
+    hash repeats are compared value by value, so a hash collision never
+    inflates the count; approximate mode estimates the distinct rows with a
+    HyperLogLog sketch and compares nothing.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame to check
+    mode : str
+        'exact' or 'approximate' (~0.8% error on the number of distinct rows)
+
+    Returns:
+    --------
+    int : Number of duplicate rows
+    """
+    if mode not in DUPLICATE_MODES:
+        raise ValueError(f"Unsupported duplicate mode: {mode}. Use one of: {DUPLICATE_MODES}")
+    if len(df) == 0:
+        return 0
+
+    hashes = _row_hashes(df)[0]
+    if mode == 'approximate':
+        registers = np.zeros(2 ** DUPLICATE_SKETCH_PRECISION, dtype=np.uint8)
+        _hll_update(registers, hashes)
+        return max(len(df) - _hll_estimate(registers), 0)
+
+    # Rows with a unique hash cannot be duplicates; verify only the rest
+    candidates = pd.Series(hashes).duplicated(keep=False).to_numpy()
+    if not candidates.any():
+        return 0
+    return int(df[candidates].duplicated().sum())
+
+
+@instrumented()
+def clean_column_names(df, inplace=False, copy_data=True, on_collision="warn"):
     """
     Cleans and standardizes column names.
 
+    Names are normalized once per distinct header and remembered across
+    calls, so daily files with the same columns skip the string work.
+
     Parameters:
     -----------
     df : pandas.DataFrame
         DataFrame with columns to clean
+    inplace : bool
+        If True, renames the columns of df itself and returns it
+    copy_data : bool
+        If False, returns a shallow copy that shares the data buffers with df
+        (a copy-on-write view when pandas copy-on-write is enabled)
+    on_collision : str
+        What to do when several names clean to the same one: 'warn' (log and
+        keep the duplicates), 'raise' (ValueError) or 'suffix' (append _2, _3...)
 
     Returns:
     --------
     pandas.DataFrame : DataFrame with clean columns
     """
-    df_clean = df.copy()
+    if on_collision not in COLUMN_COLLISION_MODES:
+        raise ValueError(f"Unsupported collision mode: {on_collision}. Use one of: {COLUMN_COLLISION_MODES}")
+
+    started = time.perf_counter()
+    clean_names, collisions = _clean_header(tuple(df.columns), on_collision == 'suffix')
+    if collisions:
+        if on_collision == 'raise':
+            raise ValueError(f"Column names collide after cleaning: {collisions}")
+        if on_collision == 'warn':
+            logger.warning("Column names collide after cleaning: %s", collisions)
+        else:
+            logger.info("Colliding column names numbered: %s", collisions)
 
-    # Clean column names
-    df_clean.columns = (df_clean.columns
-                        .str.strip()  # Remove spaces
-                        .str.lower()  # Lowercase
-                        .str.replace(' ', '_')  # Spaces to underscores
-                        .str.replace('[^a-zA-Z0-9_]', '', regex=True)  # Only alphanumeric and _
-                        .str.replace('_+', '_', regex=True)  # Multiple _ to single _
-                        .str.strip('_'))  # Remove _ at start/end
+    if inplace:
+        df_clean = df
+    else:
+        df_clean = df.copy(deep=copy_data)
+    df_clean.columns = list(clean_names)
 
-    logger.info(f"Column names cleaned: {list(df_clean.columns)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Column names cleaned: %s", list(clean_names))
+    _log_metrics('clean_column_names', started, df_clean, collisions=len(collisions))
     return df_clean
 
 
+def find_column_name_collisions(columns):
+    """
+    Finds column names that clean to the same identifier.
+
+    Parameters:
+    -----------
+    columns : iterable
+        Original column names
+
+    Returns:
+    --------
+    dict : Clean name -> list of original names, only for colliding names
+    """
+    collisions = _clean_header(tuple(columns), False)[1]
+    # Copy so callers cannot modify the memoized result
+    return {clean_name: list(names) for clean_name, names in collisions.items()}
+
+
+@lru_cache(maxsize=COLUMN_NAME_MEMO_SIZE)
+def _clean_header(columns, add_suffixes):
+    """
+    Cleans a whole header, memoized by the tuple of original names.
+
+    Returns the clean names as a tuple and the collisions (clean name ->
+    original names); with add_suffixes, repeated clean names get _2, _3...
+    in order.
+    """
+    clean_names = [_clean_column_name(name) for name in columns]
+
+    originals = {}
+    for name, clean_name in zip(columns, clean_names):
+        originals.setdefault(clean_name, []).append(name)
+    collisions = {clean_name: names for clean_name, names in originals.items() if len(names) > 1}
+
+    if add_suffixes and collisions:
+        seen = {}
+        taken = set(clean_names)
+        for i, clean_name in enumerate(clean_names):
+            seen[clean_name] = seen.get(clean_name, 0) + 1
+            if seen[clean_name] > 1:
+                suffix = seen[clean_name]
+                while f"{clean_name}_{suffix}" in taken:
+                    suffix += 1
+                clean_names[i] = f"{clean_name}_{suffix}"
+                taken.add(clean_names[i])
+
+    return tuple(clean_names), collisions
+
+
+@lru_cache(maxsize=COLUMN_NAME_MEMO_SIZE)
+def _clean_column_name(name):
+    """Applies the clean_column_names rules to a single name."""
+    clean_name = str(name).strip().lower().replace(' ', '_')  # Spaces to underscores
+    clean_name = re.sub('[^a-zA-Z0-9_]', '', clean_name)  # Only alphanumeric and _
+    clean_name = re.sub('_+', '_', clean_name)  # Multiple _ to single _
+    return clean_name.strip('_')  # Remove _ at start/end
+
+
 def detect_outliers_iqr(series, multiplier=1.5):
     """
     Detects outliers using the IQR (Interquartile Range) method.
@@ -99,11 +514,10 @@ def detect_outliers_iqr(series, multiplier=1.5):
     dict : Information about detected outliers
     """
     if not pd.api.types.is_numeric_dtype(series):
-        logger.warning(f"Series {series.name} is not numeric, skipping outlier detection")
+        logger.warning("Series %s is not numeric, skipping outlier detection", series.name)
         return None
 
-    Q1 = series.quantile(0.25)
-    Q3 = series.quantile(0.75)
+    Q1, Q3 = series.quantile([0.25, 0.75])
     IQR = Q3 - Q1
 
     lower_bound = Q1 - multiplier * IQR
@@ -123,11 +537,113 @@ def detect_outliers_iqr(series, multiplier=1.5):
         'outlier_indices': outliers.index.tolist()
     }
 
-    logger.info(f"Outliers in {series.name}: {len(outliers)} ({result['outliers_percentage']:.1f}%)")
+    logger.info("Outliers in %s: %s (%.1f%%)", series.name, len(outliers), result['outliers_percentage'])
+    return result
+
+
+@instrumented()
+def detect_outliers_iqr_frame(df, numeric_columns=None, multiplier=1.5, output="mask"):
+    """
+    Detects IQR outliers in every numeric column of a DataFrame at once.
+
+    Columns are copied to float64 NumPy blocks of at most NUMERIC_BATCH_BYTES,
+    so the extra memory stays bounded however many columns there are. Q1 and
+    Q3 of each column come from a partition of a copy of that column only
+    (same values as Series.quantile), and the outliers are flagged with one
+    vectorized comparison per block. Outliers are returned as a boolean mask
+    or as arrays of row positions instead of lists of values and labels.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame to analyze
+    numeric_columns : list, optional
+        Columns to analyze (defaults to every numeric column)
+    multiplier : float
+        Multiplier for IQR range (default: 1.5)
+    output : str
+        'mask' (boolean DataFrame aligned with df), 'indices' (NumPy array of
+        row positions per column) or 'counts' (bounds and counts only)
+
+    Returns:
+    --------
+    dict : 'summary' DataFrame with bounds and counts per column, plus
+           'mask' or 'indices' depending on output
+    """
+    if output not in OUTLIER_OUTPUTS:
+        raise ValueError(f"Unsupported output: {output}. Use one of: {OUTLIER_OUTPUTS}")
+
+    started = time.perf_counter()
+    if numeric_columns is None:
+        numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    columns = []
+    for col in numeric_columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            columns.append(col)
+        else:
+            logger.warning("Series %s is not numeric, skipping outlier detection", col)
+
+    lower_bounds = np.full(len(columns), np.nan)
+    upper_bounds = np.full(len(columns), np.nan)
+    outliers = np.zeros(len(columns), dtype=np.int64)
+    mask = np.zeros((len(df), len(columns)), dtype=bool, order='F') if output == 'mask' else None
+    indices = {}
+    memory_bytes = 0
+
+    start = 0
+    for batch in _column_batches(columns, len(df), np.dtype(np.float64).itemsize):
+        # Fortran order keeps each column contiguous for the column-wise partitions and comparisons
+        block = np.asfortranarray(df[batch].to_numpy(dtype=np.float64, na_value=np.nan))
+        memory_bytes = max(memory_bytes, block.nbytes)
+        counts = (~np.isnan(block)).sum(axis=0)
+        quartiles = np.empty((2, len(batch)))
+        for i in range(len(batch)):
+            # The block keeps the row order for the comparison, so each column is partitioned in a copy
+            column = block[:, i:i + 1].copy(order='F')
+            _partition_for_quantiles(column, counts[i:i + 1], [0.25, 0.75])
+            quartiles[:, i:i + 1] = _quantiles_from_sorted(column, counts[i:i + 1], [0.25, 0.75])
+        iqr = quartiles[1] - quartiles[0]
+        lower = quartiles[0] - multiplier * iqr
+        upper = quartiles[1] + multiplier * iqr
+
+        # NaN never compares as an outlier
+        batch_mask = (block < lower) | (block > upper)
+        end = start + len(batch)
+        lower_bounds[start:end] = lower
+        upper_bounds[start:end] = upper
+        outliers[start:end] = batch_mask.sum(axis=0)
+        if output == 'mask':
+            mask[:, start:end] = batch_mask
+        elif output == 'indices':
+            indices.update({col: np.flatnonzero(batch_mask[:, i]) for i, col in enumerate(batch)})
+        start = end
+
+    total_values = len(df)
+
+    result = {
+        'summary': pd.DataFrame({
+            'total_values': total_values,
+            'outliers_detected': outliers,
+            'outliers_percentage': outliers / total_values * 100 if total_values else np.nan,
+            'lower_bound': lower_bounds,
+            'upper_bound': upper_bounds
+        }, index=pd.Index(columns, name='column'))
+    }
+    if output == 'mask':
+        result['mask'] = pd.DataFrame(mask, index=df.index, columns=columns)
+    elif output == 'indices':
+        result['indices'] = indices
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Outliers in %s columns: %s values", len(columns), outliers.sum())
+    _log_metrics('detect_outliers_iqr_frame', started, shape=(len(df), len(columns)), memory_bytes=memory_bytes,
+                 outliers=outliers.sum())
     return result
 
 
-def process_dates(df, date_column, date_format=None):
+@instrumented()
+def process_dates(df, date_column, date_format=None, components=None,
+                  inplace=False, new_columns_only=False, cache=True):
     """
     Converts a column to datetime format and extracts useful components.
 
@@ -138,44 +654,115 @@ def process_dates(df, date_column, date_format=None):
     date_column : str
         Name of the column with dates
     date_format : str, optional
-        Specific date format (e.g., '%Y-%m-%d')
+        Specific date format (e.g., '%Y-%m-%d'); inferred from a sample of
+        the column when omitted
+    components : list, optional
+        Components to extract (default: all of DATE_COMPONENTS)
+    inplace : bool
+        If True, adds the columns to df itself instead of a copy
+    new_columns_only : bool
+        If True, returns only the extracted component columns
+    cache : bool
+        If True, each distinct date string is parsed only once
 
     Returns:
     --------
     pandas.DataFrame : DataFrame with processed date columns
     """
-    df_processed = df.copy()
-
+    if components is None:
+        components = DATE_COMPONENTS
+    unknown = [component for component in components if component not in DATE_COMPONENTS]
+    if unknown:
+        raise ValueError(f"Unsupported date components: {unknown}. Use: {DATE_COMPONENTS}")
+    if inplace and new_columns_only:
+        raise ValueError("inplace and new_columns_only cannot be used together")
+
+    started = time.perf_counter()
     try:
         # Convert to datetime
-        if date_format:
-            df_processed[date_column] = pd.to_datetime(df_processed[date_column],
-                                                       format=date_format)
-        else:
-            df_processed[date_column] = pd.to_datetime(df_processed[date_column])
+        date_col = _parse_dates(df[date_column], date_format, cache)
 
-        # Extract useful components
-        date_col = df_processed[date_column]
+        # Extract the requested components
         base_name = date_column.replace('_date', '').replace('date_', '')
-
-        df_processed[f'{base_name}_year'] = date_col.dt.year
-        df_processed[f'{base_name}_month'] = date_col.dt.month
-        df_processed[f'{base_name}_day'] = date_col.dt.day
-        df_processed[f'{base_name}_day_name'] = date_col.dt.day_name()
-        df_processed[f'{base_name}_quarter'] = date_col.dt.quarter
-        df_processed[f'{base_name}_is_weekend'] = date_col.dt.weekday >= 5
-
-        logger.info(f"Column {date_column} processed successfully")
-        logger.info(f"  - Range: {date_col.min()} to {date_col.max()}")
-        logger.info(f"  - Columns created: year, month, day, day_name, quarter, is_weekend")
+        new_columns = {}
+        weekday = None
+        for component in components:
+            if component in ['day_name', 'is_weekend'] and weekday is None:
+                weekday = date_col.dt.weekday.to_numpy(dtype=np.float64, na_value=np.nan)
+            new_columns[f'{base_name}_{component}'] = _date_component(date_col, component, weekday)
+
+        if new_columns_only:
+            df_processed = pd.DataFrame(new_columns, index=df.index)
+        else:
+            # A shallow copy is enough: columns are replaced, never written into
+            df_processed = df if inplace else df.copy(deep=False)
+            df_processed[date_column] = date_col
+            for name, values in new_columns.items():
+                df_processed[name] = values
+
+        logger.info("Column %s processed successfully", date_column)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  - Range: %s to %s", date_col.min(), date_col.max())
+        logger.info("  - Columns created: %s", ', '.join(components))
+        _log_metrics('process_dates', started, df_processed, column=date_column, components=len(components))
 
     except Exception as e:
-        logger.error(f"Error processing dates in column {date_column}: {str(e)}")
+        logger.error("Error processing dates in column %s: %s", date_column, e)
         raise
 
     return df_processed
 
 
+def _parse_dates(series, date_format=None, cache=True):
+    """
+    Converts a Series to datetime.
+
+    Without a format, one is inferred from the first values and checked on a
+    sample so pandas takes its fixed-format path. With cache, the column is
+    factorized and every distinct value is parsed once, which is what makes
+    columns of repeated timestamps cheap.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+    if date_format is None:
+        date_format = _infer_date_format(series)
+    if not cache:
+        return pd.to_datetime(series, format=date_format)
+
+    codes, uniques = pd.factorize(series)
+    parsed = pd.DatetimeIndex(pd.to_datetime(uniques, format=date_format))
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT),
+                     index=series.index, name=series.name)
+
+
+def _infer_date_format(series):
+    """Guesses the strftime format of a string column, or None if no single format fits its first values."""
+    sample = series.dropna().iloc[:DATE_FORMAT_SAMPLE_SIZE]
+    if len(sample) == 0 or not isinstance(sample.iloc[0], str):
+        return None
+
+    date_format = guess_datetime_format(sample.iloc[0])
+    if date_format is None:
+        return None
+    try:
+        pd.to_datetime(sample, format=date_format)
+    except (ValueError, TypeError):
+        logger.debug("Inferred date format %s does not fit the sample, using pandas parsing", date_format)
+        return None
+    return date_format
+
+
+def _date_component(date_col, component, weekday=None):
+    """Extracts one date component; day_name is built as a categorical from weekday codes."""
+    if component == 'day_name':
+        codes = np.where(np.isnan(weekday), -1, weekday).astype(np.int8)
+        return pd.Categorical.from_codes(codes, categories=DAY_NAMES, ordered=True)
+    if component == 'is_weekend':
+        return weekday >= 5
+    return getattr(date_col.dt, component)
+
+
+@instrumented()
 def create_executive_summary(df, numeric_columns=None, categorical_columns=None):
     """
     Creates a complete executive summary of the DataFrame.
@@ -193,6 +780,8 @@ def create_executive_summary(df, numeric_columns=None, categorical_columns=None)
     --------
     dict : Dictionary with executive summary
     """
+    started = time.perf_counter()
+
     # Auto-detect columns if not specified
     if numeric_columns is None:
         numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
@@ -200,37 +789,29 @@ def create_executive_summary(df, numeric_columns=None, categorical_columns=None)
     if categorical_columns is None:
         categorical_columns = df.select_dtypes(include=['object', 'category']).columns.tolist()
 
+    # A single null mask shared by the quality and per-column sections
+    null_counts = df.isnull().sum()
+    total_nulls = null_counts.sum()
+
     summary = {
         'general_information': {
             'rows': len(df),
             'columns': len(df.columns),
-            'memory_mb': df.memory_usage(deep=True).sum() / (1024 ** 2),
+            'memory_mb': measure_memory(df) / (1024 ** 2),
             'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         },
         'data_quality': {
-            'total_null_values': df.isnull().sum().sum(),
-            'duplicate_rows': df.duplicated().sum(),
-            'completeness_percentage': ((df.size - df.isnull().sum().sum()) / df.size) * 100
+            'total_null_values': total_nulls,
+            'duplicate_rows': count_duplicate_rows(df),
+            'completeness_percentage': ((df.size - total_nulls) / df.size) * 100
         },
         'numeric_columns': {},
         'categorical_columns': {}
     }
 
     # Analysis of numeric columns
-    for col in numeric_columns:
-        if col in df.columns:
-            series = df[col].dropna()
-            summary['numeric_columns'][col] = {
-                'count': len(series),
-                'mean': series.mean(),
-                'std': series.std(),
-                'min': series.min(),
-                'max': series.max(),
-                'q25': series.quantile(0.25),
-                'q50': series.quantile(0.50),
-                'q75': series.quantile(0.75),
-                'null_values': df[col].isnull().sum()
-            }
+    numeric_columns = [col for col in numeric_columns if col in df.columns]
+    summary['numeric_columns'] = _summarize_numeric_columns(df, numeric_columns, null_counts)
 
     # Analysis of categorical columns
     for col in categorical_columns:
@@ -240,30 +821,874 @@ def create_executive_summary(df, numeric_columns=None, categorical_columns=None)
                 'unique_values': df[col].nunique(),
                 'most_frequent_value': value_counts.index[0] if len(value_counts) > 0 else None,
                 'max_frequency': value_counts.iloc[0] if len(value_counts) > 0 else 0,
-                'null_values': df[col].isnull().sum(),
+                'null_values': null_counts[col],
                 'top_5_values': value_counts.head().to_dict()
             }
 
     logger.info("Executive summary generated successfully")
+    _log_metrics('create_executive_summary', started, df)
     return summary
 
 
-def export_clean_data(df, filename, destination_folder="../data/resultados"):
+def _summarize_numeric_columns(df, columns, null_counts):
     """
-    Exports the clean DataFrame to Excel with timestamp.
+    Computes the numeric statistics of the executive summary.
+
+    Columns with a plain NumPy integer or float64 dtype are grouped by dtype
+    and summarized with vectorized reductions over NumPy blocks of at most
+    NUMERIC_BATCH_BYTES, so the extra memory stays bounded however many
+    columns there are. Each column of a block is partitioned in place at the
+    min, max and quantile positions instead of being sorted. Any other dtype
+    (nullable, float32...) uses the per-column pandas path.
 
     Parameters:
     -----------
     df : pandas.DataFrame
-        DataFrame to export
+        DataFrame to summarize
+    columns : list
+        Numeric columns present in df
+    null_counts : pandas.Series
+        Null values per column, shared with the rest of the summary
+
+    Returns:
+    --------
+    dict : Statistics per column, in the order of columns
+    """
+    stats = {}
+    groups = {}
+
+    for col in columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, np.dtype) and (dtype.kind in 'iu' or dtype == np.float64):
+            groups.setdefault(dtype, []).append(col)
+        else:
+            series = df[col].dropna()
+            stats[col] = {
+                'count': len(series),
+                'mean': series.mean(),
+                'std': series.std(),
+                'min': series.min(),
+                'max': series.max(),
+                'q25': series.quantile(0.25),
+                'q50': series.quantile(0.50),
+                'q75': series.quantile(0.75),
+                'null_values': null_counts[col]
+            }
+
+    batches = [(dtype, batch) for dtype, group_columns in groups.items()
+               for batch in _column_batches(group_columns, len(df), dtype.itemsize)]
+    for dtype, group_columns in batches:
+        # Fortran order keeps each column contiguous for the column-wise reductions and
+        # partitions; the copy is owned, so it can be partitioned in place
+        block = np.asfortranarray(df[group_columns].to_numpy(dtype=dtype, copy=True))
+        counts = len(df) - null_counts[group_columns].to_numpy()
+
+        # Mean and standard deviation share one zero-filled copy of the block
+        values = block.astype(np.float64, order='F')
+        if dtype.kind == 'f':
+            valid = ~np.isnan(block)
+            values[~valid] = 0.0
+        else:
+            valid = True
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # All-null columns produce NaN statistics, like pandas does
+            means = values.sum(axis=0) / counts
+            np.subtract(values, means, out=values, where=valid)
+            np.multiply(values, values, out=values)
+            stds = np.sqrt(values.sum(axis=0) / (counts - 1))
+        stds[counts < 2] = np.nan
+
+        # Partitioning puts min, max and the quantile neighbours in their sorted positions (NaN goes last)
+        del values
+        _partition_for_quantiles(block, counts, SUMMARY_QUANTILES)
+        quantiles = _quantiles_from_sorted(block, counts, SUMMARY_QUANTILES)
+        has_values = counts > 0
+        last = np.maximum(counts - 1, 0)
+        columns_index = np.arange(len(group_columns))
+        mins = block[0, :] if len(block) else np.full(len(group_columns), np.nan)
+        maxs = block[last, columns_index] if len(block) else np.full(len(group_columns), np.nan)
+        if dtype.kind == 'f':
+            mins = np.where(has_values, mins, np.nan)
+            maxs = np.where(has_values, maxs, np.nan)
+
+        for i, col in enumerate(group_columns):
+            stats[col] = {
+                'count': int(counts[i]),
+                'mean': means[i],
+                'std': stds[i],
+                'min': mins[i],
+                'max': maxs[i],
+                'q25': quantiles[0, i],
+                'q50': quantiles[1, i],
+                'q75': quantiles[2, i],
+                'null_values': null_counts[col]
+            }
+
+    return {col: stats[col] for col in columns}
+
+
+def _column_batches(columns, rows, itemsize):
+    """Splits columns into batches whose NumPy block stays under NUMERIC_BATCH_BYTES (at least one column each)."""
+    size = max(1, NUMERIC_BATCH_BYTES // max(rows * itemsize, 1))
+    return [columns[start:start + size] for start in range(0, len(columns), size)]
+
+
+def _partition_for_quantiles(block, counts, quantiles):
+    """
+    Partitions each column of a block in place for _quantiles_from_sorted.
+
+    Only the first and last non-null positions and the two neighbours of each
+    quantile's virtual index are put in their sorted positions, which is
+    linear per column instead of a full sort; nulls (NaN) go last. Positions
+    are placed one at a time on the still unordered tail, as a single-kth
+    partition is much faster in NumPy than one call with several kth.
+    """
+    for i, count in enumerate(counts):
+        if count == 0:
+            continue
+        virtual_index = (count - 1) * np.asarray(quantiles)
+        previous_index = np.floor(virtual_index).astype(np.int64)
+        kth = np.unique(np.concatenate([[0, count - 1], previous_index, np.minimum(previous_index + 1, count - 1)]))
+        column = block[:, i]
+        start = 0
+        for position in kth:
+            column[start:].partition(position - start)
+            start = position + 1
+
+
+def _quantiles_from_sorted(sorted_block, counts, quantiles):
+    """
+    Computes linear-interpolation quantiles of every column of a sorted block.
+
+    Uses the same virtual index and interpolation formula as numpy.quantile
+    (method='linear') on each column's first counts[i] values. The block only
+    needs those positions in sorted order (see _partition_for_quantiles).
+
+    Parameters:
+    -----------
+    sorted_block : numpy.ndarray
+        2D array sorted (or partitioned) along axis 0, with nulls at the end of each column
+    counts : numpy.ndarray
+        Number of non-null values per column
+    quantiles : list
+        Quantiles to compute (between 0 and 1)
+
+    Returns:
+    --------
+    numpy.ndarray : Array of shape (len(quantiles), n_columns)
+    """
+    n_columns = sorted_block.shape[1]
+    result = np.full((len(quantiles), n_columns), np.nan)
+    valid = counts > 0
+    if not valid.any():
+        return result
+
+    columns_index = np.arange(n_columns)[valid]
+    valid_counts = counts[valid]
+
+    for row, q in enumerate(quantiles):
+        virtual_index = (valid_counts - 1) * q
+        previous_index = np.floor(virtual_index).astype(np.int64)
+        next_index = np.minimum(previous_index + 1, valid_counts - 1)
+        gamma = virtual_index - previous_index
+
+        below = sorted_block[previous_index, columns_index].astype(np.float64)
+        above = sorted_block[next_index, columns_index].astype(np.float64)
+        difference = above - below
+        # Same two-sided lerp as numpy to get bit-identical results
+        result[row, valid] = np.where(gamma >= 0.5,
+                                      above - difference * (1 - gamma),
+                                      below + difference * gamma)
+
+    return result
+
+
+def create_streaming_summary(chunks, numeric_columns=None, categorical_columns=None, **options):
+    """
+    Creates the executive summary of data that is read in chunks.
+
+    Only per-column accumulators are kept in memory, so the data can be larger
+    than RAM. Typical sources are pd.read_csv(chunksize=...) and
+    FileManager.iter_file_chunks().
+
+    Parameters:
+    -----------
+    chunks : iterable of pandas.DataFrame
+        Chunks of the dataset, all with the same columns
+    numeric_columns : list, optional
+        List of specific numeric columns to analyze
+    categorical_columns : list, optional
+        List of specific categorical columns to analyze
+    **options :
+        Passed to StreamingSummary (sketch_size, heavy_hitters, track_duplicates, duplicate_mode)
+
+    Returns:
+    --------
+    dict : Dictionary with executive summary, as create_executive_summary
+    """
+    accumulator = StreamingSummary(numeric_columns, categorical_columns, **options)
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.summary()
+
+
+class StreamingSummary:
+    """
+    Mergeable summary statistics fed one chunk at a time.
+
+    Numeric columns keep count, mean and variance (Welford/Chan updates),
+    min, max and a KLL quantile sketch; categorical columns keep the most
+    frequent values and a HyperLogLog distinct counter. Partial states built
+    by different workers or from different files are combined with merge()
+    and can be pickled between processes.
+    """
+
+    def __init__(self, numeric_columns=None, categorical_columns=None,
+                 sketch_size=SKETCH_COMPACTOR_SIZE, heavy_hitters=HEAVY_HITTERS_CAPACITY,
+                 track_duplicates=True, duplicate_mode="exact"):
+        """
+        Initializes an empty summary.
+
+        Parameters:
+        -----------
+        numeric_columns : list, optional
+            Numeric columns to analyze (auto-detected from the first chunk)
+        categorical_columns : list, optional
+            Categorical columns to analyze (auto-detected from the first chunk)
+        sketch_size : int
+            Compactor size of the quantile sketches; quantiles are exact
+            until a column has more values than the sketch holds
+        heavy_hitters : int
+            Distinct values counted per categorical column; counts are exact
+            until a column has more distinct values than this
+        track_duplicates : bool
+            Whether to count duplicate rows with a DuplicateCounter
+        duplicate_mode : str
+            Mode of the DuplicateCounter ('exact' or 'approximate')
+        """
+        self.numeric_columns = numeric_columns
+        self.categorical_columns = categorical_columns
+        self.sketch_size = sketch_size
+        self.heavy_hitters = heavy_hitters
+        self.duplicates = DuplicateCounter(duplicate_mode) if track_duplicates else None
+        self.rows = 0
+        self.memory_bytes = 0
+        self.null_counts = pd.Series(dtype=np.int64)
+        self.data_types = {}
+        self.numeric = {}
+        self.categorical = {}
+
+    def update(self, chunk):
+        """
+        Adds a chunk of rows to the summary.
+
+        Parameters:
+        -----------
+        chunk : pandas.DataFrame
+            Chunk of the dataset
+
+        Returns:
+        --------
+        StreamingSummary : self, to allow chaining
+        """
+        if self.numeric_columns is None:
+            self.numeric_columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+        if self.categorical_columns is None:
+            self.categorical_columns = chunk.select_dtypes(include=['object', 'category']).columns.tolist()
+        for col, dtype in chunk.dtypes.items():
+            self.data_types.setdefault(col, dtype)
+
+        self.rows += len(chunk)
+        self.memory_bytes += measure_memory(chunk)
+        self.null_counts = self.null_counts.add(chunk.isnull().sum(), fill_value=0).astype(np.int64)
+
+        numeric_columns = [col for col in self.numeric_columns if col in chunk.columns]
+        if numeric_columns:
+            self._update_numeric(chunk, numeric_columns)
+
+        for col in self.categorical_columns:
+            if col in chunk.columns:
+                if col not in self.categorical:
+                    self.categorical[col] = _CategoricalAccumulator(self.heavy_hitters)
+                self.categorical[col].update(chunk[col])
+
+        if self.duplicates is not None:
+            self.duplicates.update(chunk)
+
+        return self
+
+    def _update_numeric(self, chunk, columns):
+        """Computes the moments of every numeric column of a chunk at once."""
+        block = chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(block)
+        counts = valid.sum(axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(valid, block, 0.0).sum(axis=0) / counts
+            deviations = np.where(valid, block - means, 0.0)
+            m2s = (deviations * deviations).sum(axis=0)
+        mins = np.fmin.reduce(block, axis=0) if len(block) else np.full(len(columns), np.nan)
+        maxs = np.fmax.reduce(block, axis=0) if len(block) else np.full(len(columns), np.nan)
+
+        for i, col in enumerate(columns):
+            if col not in self.numeric:
+                self.numeric[col] = _NumericAccumulator(self.sketch_size)
+            accumulator = self.numeric[col]
+            accumulator.add_moments(counts[i], means[i], m2s[i], mins[i], maxs[i])
+            if counts[i]:
+                accumulator.sketch.update(block[valid[:, i], i])
+
+    def merge(self, other):
+        """
+        Combines the state of another summary into this one.
+
+        Parameters:
+        -----------
+        other : StreamingSummary
+            Summary built from other chunks (another worker or file)
+
+        Returns:
+        --------
+        StreamingSummary : self, to allow chaining
+        """
+        if self.numeric_columns is None:
+            self.numeric_columns = other.numeric_columns
+        elif other.numeric_columns:
+            self.numeric_columns = self.numeric_columns + [col for col in other.numeric_columns
+                                                           if col not in self.numeric_columns]
+        if self.categorical_columns is None:
+            self.categorical_columns = other.categorical_columns
+        elif other.categorical_columns:
+            self.categorical_columns = self.categorical_columns + [col for col in other.categorical_columns
+                                                                   if col not in self.categorical_columns]
+        for col, dtype in other.data_types.items():
+            self.data_types.setdefault(col, dtype)
+
+        self.rows += other.rows
+        self.memory_bytes += other.memory_bytes
+        self.null_counts = self.null_counts.add(other.null_counts, fill_value=0).astype(np.int64)
+
+        for col, accumulator in other.numeric.items():
+            if col in self.numeric:
+                self.numeric[col].merge(accumulator)
+            else:
+                self.numeric[col] = copy.deepcopy(accumulator)
+        for col, accumulator in other.categorical.items():
+            if col in self.categorical:
+                self.categorical[col].merge(accumulator)
+            else:
+                self.categorical[col] = copy.deepcopy(accumulator)
+
+        if self.duplicates is not None and other.duplicates is not None:
+            self.duplicates.merge(other.duplicates)
+        else:
+            self.duplicates = None
+        return self
+
+    def duplicate_rows(self):
+        """Number of rows equal to a previous row, or None if not tracked."""
+        if self.duplicates is None:
+            return None
+        return self.duplicates.duplicate_rows()
+
+    def summary(self):
+        """
+        Builds the executive summary of everything added so far.
+
+        Returns:
+        --------
+        dict : Dictionary with the same sections as create_executive_summary,
+               plus 'approximation' listing the columns whose quantiles or
+               category counts come from a sketch instead of exact values
+        """
+        columns = len(self.null_counts)
+        total_nulls = self.null_counts.sum()
+        size = self.rows * columns
+
+        summary = {
+            'general_information': {
+                'rows': self.rows,
+                'columns': columns,
+                'memory_mb': self.memory_bytes / (1024 ** 2),
+                'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            },
+            'data_quality': {
+                'total_null_values': total_nulls,
+                'duplicate_rows': self.duplicate_rows(),
+                'completeness_percentage': ((size - total_nulls) / size) * 100 if size else np.nan
+            },
+            'numeric_columns': {},
+            'categorical_columns': {},
+            'approximation': {
+                'approximate_quantiles': [],
+                'approximate_categories': []
+            }
+        }
+
+        for col in self.numeric_columns or []:
+            if col in self.numeric:
+                accumulator = self.numeric[col]
+                summary['numeric_columns'][col] = accumulator.result(self.data_types[col], self.null_counts[col])
+                if not accumulator.sketch.is_exact():
+                    summary['approximation']['approximate_quantiles'].append(col)
+
+        for col in self.categorical_columns or []:
+            if col in self.categorical:
+                accumulator = self.categorical[col]
+                summary['categorical_columns'][col] = accumulator.result(self.null_counts[col])
+                if accumulator.pruned:
+                    summary['approximation']['approximate_categories'].append(col)
+
+        logger.info("Streaming summary generated for %d rows", self.rows)
+        return summary
+
+    def validation_report(self, dataset_name="Dataset"):
+        """
+        Builds the report of validate_dataframe from the accumulated state.
+
+        Parameters:
+        -----------
+        dataset_name : str
+            Descriptive name of the dataset for reports
+
+        Returns:
+        --------
+        dict : Dictionary with validation report
+        """
+        report = {
+            'dataset': dataset_name,
+            'rows': self.rows,
+            'columns': len(self.null_counts),
+            'null_values': self.null_counts.sum(),
+            'duplicates': self.duplicate_rows(),
+            'memory_mb': self.memory_bytes / (1024 ** 2),
+            'columns_with_nulls': self.null_counts.index[self.null_counts > 0].tolist(),
+            'data_types': dict(self.data_types)
+        }
+
+        logger.info("Validation completed for %s", dataset_name)
+        logger.info("  - Dimensions: %s rows x %s columns", report['rows'], report['columns'])
+        logger.info("  - Null values: %s", report['null_values'])
+        logger.info("  - Duplicates: %s", report['duplicates'])
+
+        return report
+
+
+class DuplicateCounter:
+    """
+    Counts duplicate rows across chunks and files from 64-bit row hashes.
+
+    Exact mode keeps two independent 64-bit hashes of every distinct row
+    (text values are hashed with a different key for each), so a false
+    duplicate needs a 128-bit collision; approximate mode keeps only a
+    fixed-size HyperLogLog sketch of the row hashes. Columns are matched by
+    name whatever their order. Numbers that float64 represents exactly are
+    hashed as float64, so a column read as int in one chunk and as float in
+    another still matches; larger integers are hashed from their own bits.
+    Counters fed by different workers or files are combined with merge().
+    """
+
+    def __init__(self, mode="exact", precision=DUPLICATE_SKETCH_PRECISION):
+        """
+        Initializes an empty counter.
+
+        Parameters:
+        -----------
+        mode : str
+            'exact' or 'approximate'
+        precision : int
+            HyperLogLog precision of approximate mode (2**precision registers)
+        """
+        if mode not in DUPLICATE_MODES:
+            raise ValueError(f"Unsupported duplicate mode: {mode}. Use one of: {DUPLICATE_MODES}")
+        self.mode = mode
+        self.rows = 0
+        self.columns = None
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8) if mode == 'approximate' else None
+        self._distinct = (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64))
+        self._pending = []
+        self._pending_rows = 0
+
+    def update(self, chunk):
+        """
+        Adds the rows of a chunk.
+
+        Parameters:
+        -----------
+        chunk : pandas.DataFrame
+            Chunk with the same columns as the first one, in any order
+
+        Returns:
+        --------
+        DuplicateCounter : self, to allow chaining
+        """
+        if self.columns is None:
+            # Hash in a fixed column order so counters of reordered files can be merged
+            self.columns = sorted(chunk.columns, key=str)
+        elif len(chunk.columns) != len(self.columns):
+            raise ValueError(f"Chunk columns {chunk.columns.tolist()} do not match {self.columns}")
+        chunk = chunk[self.columns]
+        self.rows += len(chunk)
+        if len(chunk) == 0:
+            return self
+
+        if self.mode == 'approximate':
+            _hll_update(self.registers, _row_hashes(chunk, stable=True)[0])
+        else:
+            self._add_hashes(*_row_hashes(chunk, stable=True, seeds=(0, ROW_HASH_SECOND_SEED)))
+        return self
+
+    def merge(self, other):
+        """
+        Combines the rows counted by another counter.
+
+        Parameters:
+        -----------
+        other : DuplicateCounter
+            Counter of the same mode built from other chunks or files
+
+        Returns:
+        --------
+        DuplicateCounter : self, to allow chaining
+        """
+        if other.mode != self.mode:
+            raise ValueError(f"Cannot merge a {other.mode} counter into a {self.mode} counter")
+        if self.columns is None:
+            self.columns = other.columns
+        elif other.columns is not None and other.columns != self.columns:
+            raise ValueError(f"Cannot merge counters of different columns: {other.columns} and {self.columns}")
+        self.rows += other.rows
+
+        if self.mode == 'approximate':
+            np.maximum(self.registers, other.registers, out=self.registers)
+        else:
+            for first, second in [other._distinct] + other._pending:
+                self._add_hashes(first, second)
+        return self
+
+    def _add_hashes(self, first, second):
+        """Queues row hashes, deduplicating once they outgrow the distinct ones (amortized linear)."""
+        self._pending.append((first, second))
+        self._pending_rows += len(first)
+        if self._pending_rows > max(len(self._distinct[0]), DUPLICATE_COMPACT_ROWS):
+            self._compact()
+
+    def _compact(self):
+        """Reduces the distinct and pending hashes to one pair per distinct row."""
+        first = np.concatenate([self._distinct[0]] + [pending[0] for pending in self._pending])
+        second = np.concatenate([self._distinct[1]] + [pending[1] for pending in self._pending])
+        self._pending = []
+        self._pending_rows = 0
+
+        # Only rows whose first hash repeats need the second hash to tell them apart
+        repeated = pd.Series(first).duplicated(keep=False).to_numpy()
+        pairs = pd.DataFrame({'first': first[repeated], 'second': second[repeated]}).drop_duplicates()
+        self._distinct = (np.concatenate([first[~repeated], pairs['first'].to_numpy()]),
+                          np.concatenate([second[~repeated], pairs['second'].to_numpy()]))
+
+    def distinct_rows(self):
+        """Number of distinct rows seen (an estimate in approximate mode)."""
+        if self.mode == 'approximate':
+            return min(_hll_estimate(self.registers), self.rows)
+        if self._pending:
+            self._compact()
+        return len(self._distinct[0])
+
+    def duplicate_rows(self):
+        """Number of rows equal to a previously seen row."""
+        return self.rows - self.distinct_rows()
+
+
+class _NumericAccumulator:
+    """Count, mean, variance, min, max and quantile sketch of one numeric column."""
+
+    def __init__(self, sketch_size):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.sketch = _QuantileSketch(sketch_size)
+
+    def add_moments(self, count, mean, m2, minimum, maximum):
+        """Combines the moments of a batch with Chan's parallel update of Welford's algorithm."""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = np.fmin(self.min, minimum)
+        self.max = np.fmax(self.max, maximum)
+
+    def merge(self, other):
+        """Combines another accumulator of the same column."""
+        self.add_moments(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+
+    def result(self, dtype, null_values):
+        """Statistics with the keys of the executive summary."""
+        quantiles = self.sketch.quantiles(SUMMARY_QUANTILES)
+        minimum, maximum = self.min, self.max
+        # Integer columns (also nullable Int64...) report integer bounds, as pandas does
+        numpy_dtype = getattr(dtype, 'numpy_dtype', dtype)
+        if self.count and isinstance(numpy_dtype, np.dtype) and numpy_dtype.kind in 'iu':
+            minimum, maximum = numpy_dtype.type(minimum), numpy_dtype.type(maximum)
+        return {
+            'count': int(self.count),
+            'mean': np.float64(self.mean) if self.count else np.nan,
+            'std': np.float64(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan,
+            'min': minimum,
+            'max': maximum,
+            'q25': quantiles[0],
+            'q50': quantiles[1],
+            'q75': quantiles[2],
+            'null_values': null_values
+        }
+
+
+class _CategoricalAccumulator:
+    """
+    Value counts of one categorical column, bounded to the most frequent values.
+
+    Counts are exact until the column has more than `capacity` distinct
+    values; then only the top values are kept and `error` bounds how much any
+    kept count can be underestimated. Distinct values are estimated with a
+    HyperLogLog sketch once counts are no longer exact.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.error = 0
+        self.pruned = False
+        self.registers = np.zeros(2 ** DISTINCT_SKETCH_PRECISION, dtype=np.uint8)
+
+    def update(self, series):
+        """Adds the values of a chunk."""
+        value_counts = series.value_counts()
+        value_counts = value_counts[value_counts > 0]
+        if isinstance(value_counts.index, pd.CategoricalIndex):
+            value_counts.index = value_counts.index.astype(object)
+        _hll_update(self.registers, pd.util.hash_array(value_counts.index.to_numpy()))
+        self._add_counts(value_counts)
+
+    def merge(self, other):
+        """Combines another accumulator of the same column."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        self.error += other.error
+        self.pruned = self.pruned or other.pruned
+        self._add_counts(other.counts)
+
+    def _add_counts(self, value_counts):
+        """Adds counts and keeps only the most frequent values above twice the capacity."""
+        self.counts = self.counts.add(value_counts, fill_value=0).astype(np.int64)
+        if len(self.counts) > 2 * self.capacity:
+            self.counts = self.counts.sort_values(ascending=False, kind='stable')
+            self.error += self.counts.iloc[self.capacity]
+            self.counts = self.counts.iloc[:self.capacity]
+            self.pruned = True
+
+    def result(self, null_values):
+        """Statistics with the keys of the executive summary."""
+        value_counts = self.counts.sort_values(ascending=False, kind='stable')
+        unique_values = _hll_estimate(self.registers) if self.pruned else len(value_counts)
+        return {
+            'unique_values': unique_values,
+            'most_frequent_value': value_counts.index[0] if len(value_counts) > 0 else None,
+            'max_frequency': value_counts.iloc[0] if len(value_counts) > 0 else 0,
+            'null_values': null_values,
+            'top_5_values': value_counts.head().to_dict()
+        }
+
+
+class _QuantileSketch:
+    """
+    KLL quantile sketch: a stack of compactors where level h holds items of weight 2**h.
+
+    While no compaction has happened the sketch holds every value and
+    quantiles are exact; afterwards the rank error is about 1/size.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng()
+
+    def update(self, values):
+        """Adds an array of non-null values."""
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Adds the compactors of another sketch level by level."""
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def is_exact(self):
+        """Whether the sketch still holds every value."""
+        return len(self.levels) == 1
+
+    def _capacity(self, level):
+        """Lower levels get geometrically smaller compactors (factor 2/3)."""
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.size * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        """Halves every full compactor, promoting every other sorted item one level up."""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                items = np.sort(items)
+                # An odd item out stays at this level so no weight is lost
+                keep = items[len(items) - len(items) % 2:]
+                promoted = items[self._rng.integers(2):len(items) - len(keep):2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantiles(self, quantiles):
+        """Quantile estimates (linear interpolation, exact while no compaction happened)."""
+        if self.is_exact():
+            if len(self.levels[0]) == 0:
+                return [np.nan] * len(quantiles)
+            return list(np.quantile(self.levels[0], quantiles))
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, weights = items[order], weights[order]
+        # Each item represents the centre of the ranks it stands for
+        ranks = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return list(np.interp(quantiles, ranks, items))
+
+
+def _row_hashes(df, stable=False, seeds=(0,)):
+    """
+    64-bit hash of every row of a DataFrame, one array per seed.
+
+    Numeric, boolean and datetime columns are hashed from the bits of their
+    values without building a hashtable. Other columns use factorize codes,
+    which are only comparable within df; with stable=True they are hashed
+    from their values, with a different key per seed, so hashes of
+    different chunks can be compared.
+    """
+    hashes = [np.full(len(df), seed, dtype=np.uint64) for seed in seeds]
+    multiplier = np.uint64(ROW_HASH_MULTIPLIER)
+    for position in range(df.shape[1]):
+        values = _column_hash_values(df.iloc[:, position], stable, ROW_HASH_KEYS[:len(seeds)])
+        for i in range(len(hashes)):
+            hashes[i] = _mix64(hashes[i] * multiplier + values[i])
+    return hashes
+
+
+def _column_hash_values(series, stable, hash_keys=ROW_HASH_KEYS[:1]):
+    """
+    64-bit values of a column such that equal values (and all nulls) give
+    equal results, one array per hash key. Only text values hashed with
+    stable=True depend on the key; the other values are exact.
+    """
+    dtype = series.dtype
+    if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return [_integer_hash_values(series)] * len(hash_keys)
+    if pd.api.types.is_bool_dtype(dtype) or (pd.api.types.is_numeric_dtype(dtype)
+                                             and not pd.api.types.is_complex_dtype(dtype)):
+        return [_float_hash_values(series.to_numpy(dtype=np.float64, na_value=np.nan))] * len(hash_keys)
+    if isinstance(dtype, np.dtype) and dtype.kind in 'mM':
+        return [series.to_numpy().view(np.uint64)] * len(hash_keys)
+    if stable:
+        values = series.to_numpy()
+        return [pd.util.hash_array(values, hash_key=hash_key) for hash_key in hash_keys]
+    return [pd.factorize(series)[0].astype(np.uint64)] * len(hash_keys)
+
+
+def _float_hash_values(values):
+    """Bits of float64 values with -0.0 turned into 0.0 and every NaN given the same bit pattern."""
+    values = values + 0.0
+    values[np.isnan(values)] = np.nan
+    return values.view(np.uint64)
+
+
+def _integer_hash_values(series):
+    """
+    Integers that float64 represents exactly get the bits of that float (so
+    they match the same value read as float); the rest keep their own bits.
+    """
+    integer_type = np.uint64 if series.dtype.kind == 'u' else np.int64
+    nulls = series.isna().to_numpy()
+    integers = series.to_numpy(dtype=integer_type, na_value=0)
+    floats = integers.astype(np.float64)
+    with np.errstate(invalid='ignore'):
+        exact = floats.astype(integer_type) == integers
+    floats[nulls] = np.nan
+    return np.where(exact | nulls, _float_hash_values(floats), integers.view(np.uint64))
+
+
+def _mix64(values):
+    """SplitMix64 finalizer: spreads every input bit over the whole 64-bit output."""
+    values = values ^ (values >> np.uint64(30))
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _hll_update(registers, hashes):
+    """Adds 64-bit hashes to HyperLogLog registers (low bits pick the register)."""
+    if len(hashes) == 0:
+        return
+    precision = len(registers).bit_length() - 1
+    index = (hashes & np.uint64(len(registers) - 1)).astype(np.intp)
+    rest = hashes >> np.uint64(precision)
+    # Position of the first set bit from the top of the remaining 64 - precision bits
+    bit_length = np.frexp(rest.astype(np.float64))[1]
+    rank = (64 - precision - bit_length + 1).astype(np.uint8)
+    np.maximum.at(registers, index, rank)
+
+
+def _hll_estimate(registers):
+    """HyperLogLog cardinality estimate with the small range correction."""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+@instrumented()
+def export_clean_data(df, filename, destination_folder="../data/resultados", split="sheets"):
+    """
+    Exports the clean DataFrame to Excel with timestamp.
+
+    The workbook is written in streaming mode, so memory stays bounded for
+    large exports and an iterator of chunks can be exported without
+    concatenating it. Rows beyond Excel's limit continue in new sheets or files.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        DataFrame to export, or chunks with the same columns
     filename : str
         Base filename (without extension)
     destination_folder : str
         Folder where to save the file
+    split : str
+        Where rows beyond Excel's row limit go: 'sheets' or 'files'
 
     Returns:
     --------
-    str : Complete path of saved file
+    str : Complete path of saved file (the first part when split across files)
     """
     # Create folder if it doesn't exist
     Path(destination_folder).mkdir(parents=True, exist_ok=True)
@@ -274,9 +1699,12 @@ def export_clean_data(df, filename, destination_folder="../data/resultados"):
     complete_path = Path(destination_folder) / complete_name
 
     # Export
-    df.to_excel(complete_path, index=False)
+    # Imported here so this module can still be used without file_manager
+    from file_manager import write_excel_streaming
+    paths, _ = write_excel_streaming(df, complete_path, split=split)
 
-    logger.info(f"Data exported successfully: {complete_path}")
+    logger.info("Data exported successfully: %s%s", complete_path,
+                f" ({len(paths)} files)" if len(paths) > 1 else "")
     return str(complete_path)
 
 
@@ -342,9 +1770,14 @@ if __name__ == "__main__":
     report = validate_dataframe(sample_data, "Test Data")
     clean_data = clean_column_names(sample_data)
     sales_outliers = detect_outliers_iqr(clean_data['sales'])
+    frame_outliers = detect_outliers_iqr_frame(clean_data, output='counts')
     data_with_dates = process_dates(clean_data, 'date')
     summary = create_executive_summary(data_with_dates)
 
     print_pretty_summary(summary)
 
+    # Same summary computed chunk by chunk
+    streaming_summary = create_streaming_summary(data_with_dates[i:i + 25] for i in range(0, len(data_with_dates), 25))
+    print_pretty_summary(streaming_summary)
+
     print("\nAll functions tested successfully!")
\ No newline at end of file
@@ -13,22 +13,123 @@ Date: {current_date}
 
 import pandas as pd
 import json
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from datetime import datetime
 import logging
 import shutil
-from typing import List, Dict, Optional, Union
+import threading
+import time
+import csv
+import codecs
+import errno
+import hashlib
+import importlib.util
+import io
+import os
+import uuid
+import zipfile
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, suppress
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Dict, Optional, Union, Tuple, Iterator, Iterable
+from xml.etree import ElementTree
+
+try:
+    from instrumentation import instrumented
+except ImportError:  # instrumentation.py was not copied along with this module
+    def instrumented(name=None, counter=None):
+        return lambda function: function
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# One machine-readable record per operation (see _log_metrics)
+metrics_logger = logging.getLogger(f"{__name__}.metrics")
+
+# CSV sniffing configuration
+CSV_DELIMITERS = [',', ';', '\t', '|']
+CSV_SAMPLE_BYTES = 64 * 1024
+CSV_FALLBACK_ENCODINGS = ['cp1252', 'latin-1']  # Tried in order when a byte past the sample does not decode
+CSV_HEADER_CHECK_ROWS = 5  # Rows compared with the first one before treating it as data
+
+# JSON lines detection reads blocks of this many characters and never parses a long first line
+JSON_LINES_SAMPLE_CHARS = 8 * 1024
+
+# Columnar formats read and written through pyarrow
+COLUMNAR_EXTENSIONS = ['.parquet', '.feather', '.arrow', '.ipc']
+
+# Excel readers in order of preference per extension (calamine is a Rust reader, pandas >= 2.2)
+EXCEL_ENGINES = {
+    '.xlsx': ['calamine', 'openpyxl'],
+    '.xls': ['calamine', 'xlrd']
+}
+EXCEL_ENGINE_PACKAGES = {
+    'calamine': ('python_calamine', 'python-calamine'),
+    'openpyxl': ('openpyxl', 'openpyxl'),
+    'xlrd': ('xlrd', 'xlrd')
+}
+
+# Streaming xlsx export
+EXCEL_MAX_ROWS = 1_048_576  # Rows per worksheet, header included
+EXCEL_WRITE_CHUNK_ROWS = 50_000  # Rows converted at a time when writing a DataFrame
+EXCEL_SPLIT_MODES = ['sheets', 'files']
+
+# Output compression: file suffix and level argument of each method
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst', 'lz4': '.lz4'}
+COMPRESSION_METHODS = {suffix: method for method, suffix in COMPRESSION_SUFFIXES.items()}
+COMPRESSION_LEVEL_ARGUMENTS = {'gzip': 'compresslevel', 'zstd': 'level', 'lz4': 'compression_level'}
+
+# Load cache configuration
+CACHE_MAX_SIZE_MB = 1024
+CACHE_HASH_BLOCK_BYTES = 1024 * 1024
+
+# Backup store: deduplicated objects and per-backup manifests under the project directory
+BACKUP_DIRECTORY_NAME = "backups"
+BACKUP_COMPRESSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+BACKUP_BLOCK_BYTES = 1024 * 1024  # Bytes read, hashed and compressed at a time
+BACKUP_MANIFEST_VERSION = 1
+
+# Snapshot of the directory tree reused by incremental files reports (stored in the cache directory)
+FILES_INDEX_NAME = "files_report_index.json"
+FILES_INDEX_VERSION = 1
+
+# Fuzzy file name matching: n-gram size and number of directory indexes kept in memory
+SIMILAR_NAME_NGRAM = 3
+SIMILAR_NAME_INDEXES = 32
+
+# Integrity scans: rows parsed per file, magic bytes per format and checksums of
+# validated files (stored in the cache directory)
+INTEGRITY_PROBE_ROWS = 5
+INTEGRITY_MAGIC_BYTES = {
+    '.xlsx': b'PK\x03\x04',
+    '.xls': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',
+    '.parquet': b'PAR1',
+    '.feather': b'ARROW1',
+    '.arrow': b'ARROW1',
+    '.ipc': b'ARROW1'
+}
+INTEGRITY_TRAILING_MAGIC = ['.parquet', '.feather', '.arrow', '.ipc']  # Formats that also end with their magic bytes
+INTEGRITY_INDEX_NAME = "integrity_index.json"
+INTEGRITY_INDEX_VERSION = 1
+
+# Retention: keys accepted in a rule, default rule and files deleted per task
+RETENTION_RULE_KEYS = ['pattern', 'days_old', 'min_size_mb', 'directories']
+RETENTION_DIRECTORIES = ['result', 'logs']
+DEFAULT_RETENTION_RULES = [{'pattern': 'temp_*', 'days_old': 7}]
+RETENTION_DELETE_BATCH = 256
+
 
 class FileManager:
     """
     File manager for data projects with advanced functionalities.
     """
 
-    def __init__(self, project_directory: str = "."):
+    def __init__(self, project_directory: str = ".", use_cache: bool = False,
+                 cache_max_size_mb: float = CACHE_MAX_SIZE_MB, cache_hash_content: bool = False,
+                 optimize_memory: bool = False, excel_engine: Optional[str] = None):
         """
         Initializes the file manager.
 
@@ -36,16 +137,32 @@ class FileManager:
         -----------
         project_directory : str
             Path to the project root directory
+        use_cache : bool
+            Whether load_file_auto uses the on-disk load cache by default
+        cache_max_size_mb : float
+            Size budget of the load cache before least recently used entries are evicted
+        cache_hash_content : bool
+            Whether cache keys include a hash of the file content besides size and mtime
+        optimize_memory : bool
+            Whether load_file_auto compacts dtypes by default (see data_processor.optimize_memory)
+        excel_engine : str, optional
+            pandas engine used for Excel files (defaults to the fastest installed one, see EXCEL_ENGINES)
         """
         self.project_directory = Path(project_directory)
         self.input_directory = self.project_directory / "data" / "input"
         self.results_directory = self.project_directory / "data" / "resultados"
         self.logs_directory = self.project_directory / "data" / "logs"
+        self.cache_directory = self.project_directory / "data" / "cache"
 
         # Create directories if they don't exist
         self._create_directory_structure()
 
-        logger.info(f"FileManager initialized in: {self.project_directory}")
+        self.use_cache = use_cache
+        self.cache = LoadCache(self.cache_directory, cache_max_size_mb, cache_hash_content)
+        self.optimize_memory = optimize_memory
+        self.excel_engine = excel_engine
+
+        logger.info("FileManager initialized in: %s", self.project_directory)
 
     def _create_directory_structure(self):
         """Creates the necessary directory structure."""
@@ -88,10 +205,31 @@ class FileManager:
         pattern = f"*{extension}" if extension else "*"
         files = list(path.glob(pattern))
 
-        logger.info(f"Found {len(files)} files in {directory}")
+        logger.info("Found %s files in %s", len(files), directory)
         return files
 
-    def load_file_auto(self, filename: str, directory: str = "input") -> pd.DataFrame:
+    def _resolve_data_file(self, filename: str, directory: str) -> Path:
+        """Builds the path of a data file and checks that it exists."""
+        directory_map = {
+            'input': self.input_directory,
+            'result': self.results_directory
+        }
+
+        file_path = directory_map[directory] / filename
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        return file_path
+
+    @instrumented()
+    def load_file_auto(self, filename: str, directory: str = "input",
+                       chunksize: Optional[int] = None,
+                       columns: Optional[List[str]] = None,
+                       filters: Optional[List[Tuple]] = None,
+                       use_cache: Optional[bool] = None,
+                       optimize_memory: Optional[bool] = None,
+                       sheet_name: Union[str, int] = 0) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Automatically loads a file detecting its format.
 
@@ -101,141 +239,666 @@ class FileManager:
             Name of the file to load
         directory : str
             Directory where to search ('input', 'result')
+        chunksize : int, optional
+            If given, returns an iterator of DataFrames with at most this many
+            rows each instead of loading the whole file (see iter_file_chunks)
+        columns : List[str], optional
+            Columns to read (Parquet, Feather, Arrow IPC and Excel only)
+        filters : List[Tuple], optional
+            Row filters pushed down to the reader, e.g. [('region', '==', 'North')]
+            (Parquet, Feather and Arrow IPC only)
+        use_cache : bool, optional
+            Whether to use the load cache for this call (defaults to the
+            use_cache value given to the constructor)
+        optimize_memory : bool, optional
+            Whether to downcast numbers and compact text columns after loading
+            (defaults to the optimize_memory value given to the constructor)
+        sheet_name : str or int
+            Excel sheet to read, by name or position (see load_excel_sheets for several sheets)
 
         Returns:
         --------
         pd.DataFrame : DataFrame with loaded data
         """
-        directory_map = {
-            'input': self.input_directory,
-            'result': self.results_directory
-        }
+        if chunksize is not None:
+            return self.iter_file_chunks(filename, directory, chunksize, columns, filters, sheet_name)
 
-        file_path = directory_map[directory] / filename
+        file_path = self._resolve_data_file(filename, directory)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        # Detect format (the inner suffix of compressed files such as results.csv.gz) and load
+        extension = _data_format(file_path)[0]
 
-        # Detect format and load
-        extension = file_path.suffix.lower()
+        if use_cache is None:
+            use_cache = self.use_cache
+        use_cache = use_cache and _is_cacheable(extension, columns, sheet_name)
+        started = time.perf_counter()
 
         try:
-            if extension in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
-                logger.info(f"Excel file loaded: {filename}")
+            df = self.cache.get(file_path) if use_cache else None
+            from_cache = df is not None
+
+            if from_cache:
+                logger.info("File loaded from cache: %s", filename)
+
+            elif extension in ['.xlsx', '.xls']:
+                engine = _excel_engine(extension, self.excel_engine)
+                df = _read_excel(file_path, sheet_name, columns, engine)
+                logger.info("Excel file loaded: %s (engine: %s)", filename, engine)
 
             elif extension == '.csv':
-                # Try to detect delimiter
-                df = self._load_csv_intelligent(file_path)
-                logger.info(f"CSV file loaded: {filename}")
+                # Detect delimiter and encoding
+                df, dialect = self._load_csv_intelligent(file_path)
+                df.attrs['csv_dialect'] = dialect
+                logger.info("CSV file loaded: %s", filename)
+
+            elif extension in ['.jsonl', '.ndjson'] or (extension == '.json' and _is_json_lines(file_path)):
+                with _pandas_source(file_path) as source:
+                    df = pd.read_json(source, lines=True, compression='infer')
+                logger.info("JSON lines file loaded: %s", filename)
 
             elif extension == '.json':
-                df = pd.read_json(file_path)
-                logger.info(f"JSON file loaded: {filename}")
+                with _pandas_source(file_path) as source:
+                    df = pd.read_json(source, compression='infer')
+                logger.info("JSON file loaded: %s", filename)
 
             elif extension in ['.txt', '.tsv']:
-                df = pd.read_csv(file_path, sep='\t')
-                logger.info(f"Text file loaded: {filename}")
+                with _pandas_source(file_path) as source:
+                    df = pd.read_csv(source, sep='\t', compression='infer')
+                logger.info("Text file loaded: %s", filename)
+
+            elif extension in COLUMNAR_EXTENSIONS:
+                df = _read_columnar_table(file_path, columns, filters).to_pandas()
+                logger.info("Columnar file loaded: %s", filename)
 
             else:
                 raise ValueError(f"Unsupported file format: {extension}")
 
+            if use_cache and not from_cache:
+                self.cache.put(file_path, df)
+
+            if optimize_memory is None:
+                optimize_memory = self.optimize_memory
+            if optimize_memory:
+                # Imported here so this module can still be used without data_processor
+                from data_processor import optimize_memory as optimize_dataframe_memory
+                df = optimize_dataframe_memory(df, inplace=True)
+
             # Validate loading
-            logger.info(f"  - Dimensions: {df.shape[0]} rows × {df.shape[1]} columns")
-            logger.info(f"  - Memory: {df.memory_usage(deep=True).sum() / (1024 ** 2):.2f} MB")
+            logger.info("  - Dimensions: %s rows × %s columns", df.shape[0], df.shape[1])
+            _log_metrics('load_file', started, df=df, path=file_path, file=filename, cached=from_cache)
 
             return df
 
         except Exception as e:
-            logger.error(f"Error loading file {filename}: {str(e)}")
+            logger.error("Error loading file %s: %s", filename, e)
             raise
 
-    def _load_csv_intelligent(self, file_path: Path) -> pd.DataFrame:
+    def iter_file_chunks(self, filename: str, directory: str = "input",
+                         chunksize: int = 100_000,
+                         columns: Optional[List[str]] = None,
+                         filters: Optional[List[Tuple]] = None,
+                         sheet_name: Union[str, int] = 0) -> Iterator[pd.DataFrame]:
         """
-        Loads a CSV automatically detecting delimiter and encoding.
+        Loads a file in chunks detecting its format.
+
+        Memory stays bounded by the chunk size: CSV/TSV/TXT and JSON lines are
+        streamed by pandas (also when compressed, e.g. results.csv.gz), .xlsx
+        sheets are paged row by row in read-only mode and columnar files are
+        scanned batch by batch. JSON documents and .xls sheets are loaded
+        completely and then sliced.
+
+        Parameters:
+        -----------
+        filename : str
+            Name of the file to load
+        directory : str
+            Directory where to search ('input', 'result')
+        chunksize : int
+            Maximum number of rows per chunk
+        columns : List[str], optional
+            Columns to read (Parquet, Feather, Arrow IPC and Excel only)
+        filters : List[Tuple], optional
+            Row filters pushed down to the reader (Parquet, Feather and Arrow IPC only)
+        sheet_name : str or int
+            Excel sheet to stream, by name or position
+
+        Returns:
+        --------
+        Iterator[pd.DataFrame] : Iterator over DataFrame chunks
         """
-        delimiters = [',', ';', '\t', '|']
-        encodings = ['utf-8', 'latin-1', 'cp1252']
+        if chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
 
-        for encoding in encodings:
-            for delim in delimiters:
-                try:
-                    df = pd.read_csv(file_path, sep=delim, encoding=encoding, nrows=5)
-                    if df.shape[1] > 1:  # If it has more than one column, probably correct
-                        # Load complete file
-                        complete_df = pd.read_csv(file_path, sep=delim, encoding=encoding)
-                        logger.debug(f"CSV loaded with delimiter '{delim}' and encoding '{encoding}'")
-                        return complete_df
-                except:
-                    continue
+        # Resolve eagerly so a missing file fails at call time, not on first iteration
+        file_path = self._resolve_data_file(filename, directory)
+        extension = _data_format(file_path)[0]
 
-        # If nothing works, use default configuration
-        logger.warning("Could not detect CSV format, using default configuration")
-        return pd.read_csv(file_path)
+        if extension in ['.xlsx', '.xls']:
+            reader = self._iter_excel_chunks(file_path, chunksize, sheet_name, columns)
+            logger.info("Streaming Excel file: %s", filename)
+
+        elif extension == '.csv':
+            reader = _iter_csv_chunks(file_path, chunksize, sniff_csv_dialect(file_path))
+            logger.info("Streaming CSV file: %s", filename)
+
+        elif extension in ['.jsonl', '.ndjson'] or (extension == '.json' and _is_json_lines(file_path)):
+            reader = _read_chunks(pd.read_json, file_path, lines=True, chunksize=chunksize)
+            logger.info("Streaming JSON lines file: %s", filename)
+
+        elif extension == '.json':
+            # A JSON document cannot be parsed incrementally by pandas
+            logger.warning("%s is not JSON lines, loading it completely before chunking", filename)
+            with _pandas_source(file_path) as source:
+                df = pd.read_json(source, compression='infer')
+            reader = (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
+
+        elif extension in ['.txt', '.tsv']:
+            reader = _read_chunks(pd.read_csv, file_path, sep='\t', chunksize=chunksize)
+            logger.info("Streaming text file: %s", filename)
+
+        elif extension in COLUMNAR_EXTENSIONS:
+            reader = _iter_columnar_batches(file_path, chunksize, columns, filters)
+            logger.info("Streaming columnar file: %s", filename)
+
+        else:
+            raise ValueError(f"Unsupported file format: {extension}")
+
+        return self._log_chunks(reader, file_path)
+
+    def _log_chunks(self, reader, file_path: Path) -> Iterator[pd.DataFrame]:
+        """Yields the chunks of a reader logging progress and totals."""
+        filename = file_path.name
+        total_rows = 0
+        total_chunks = 0
+        columns = 0
+        started = time.perf_counter()
+
+        try:
+            for chunk in reader:
+                total_chunks += 1
+                total_rows += len(chunk)
+                columns = chunk.shape[1]
+                logger.debug("  - Chunk %s: %s rows", total_chunks, len(chunk))
+                yield chunk
+        except Exception as e:
+            logger.error("Error loading file %s: %s", filename, e)
+            raise
+        finally:
+            if hasattr(reader, 'close'):
+                reader.close()
+
+        logger.info("  - Chunks: %s (%s rows in total)", total_chunks, total_rows)
+        _log_metrics('iter_file_chunks', started, shape=(total_rows, columns), path=file_path,
+                     file=filename, chunks=total_chunks)
+
+    def _iter_excel_chunks(self, file_path: Path, chunksize: int, sheet_name: Union[str, int] = 0,
+                           columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Pages through one sheet of a workbook in row ranges.
+
+        .xlsx files are read with openpyxl in read-only mode so only the
+        current page (and only the requested columns) is kept in memory.
+        .xls files are not streamed: their readers load the whole workbook
+        anyway, so the sheet is read once and sliced into chunks.
+        """
+        if file_path.suffix.lower() == '.xls':
+            logger.warning("%s is an .xls file, loading the sheet completely before chunking", file_path.name)
+            df = _read_excel(file_path, sheet_name, columns, _excel_engine('.xls', self.excel_engine))
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize]
+            return
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if isinstance(sheet_name, str) else workbook.worksheets[sheet_name]
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+
+            names = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+            if columns is not None:
+                missing = [col for col in columns if col not in names]
+                if missing:
+                    raise ValueError(f"Columns not found in sheet: {missing}")
+                positions = [names.index(col) for col in columns]
+                # Read-only rows stop at their last non-empty cell
+                rows = (tuple(row[i] if i < len(row) else None for i in positions) for row in rows)
+                names = list(columns)
+
+            page = []
+            for row in rows:
+                page.append(row)
+                if len(page) == chunksize:
+                    yield pd.DataFrame.from_records(page, columns=names)
+                    page = []
+            if page:
+                yield pd.DataFrame.from_records(page, columns=names)
+        finally:
+            workbook.close()
+
+    @instrumented()
+    def load_excel_sheets(self, filename: str, directory: str = "input",
+                          sheets: Optional[List[Union[str, int]]] = None,
+                          columns: Optional[List[str]] = None,
+                          executor: str = "auto", max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Loads several sheets of a workbook concurrently.
+
+        Each sheet is parsed by its own worker. Pure Python engines (openpyxl,
+        xlrd) run on a process pool so sheets are parsed in parallel, while
+        calamine runs on a thread pool.
 
-    def save_dataframe(self, df: pd.DataFrame, filename: str,
+        Parameters:
+        -----------
+        filename : str
+            Name of the Excel file to load
+        directory : str
+            Directory where to search ('input', 'result')
+        sheets : List[str or int], optional
+            Sheets to read, by name or position (defaults to every sheet)
+        columns : List[str], optional
+            Columns to read from each sheet
+        executor : str
+            'process', 'thread' or 'auto' (chooses per engine)
+        max_workers : int, optional
+            Maximum number of workers (defaults to the executor default)
+
+        Returns:
+        --------
+        Dict[str, pd.DataFrame] : DataFrames by sheet name, in workbook order
+        """
+        if executor not in ['auto', 'process', 'thread']:
+            raise ValueError("executor must be one of: ['auto', 'process', 'thread']")
+
+        file_path = self._resolve_data_file(filename, directory)
+        engine = _excel_engine(file_path.suffix.lower(), self.excel_engine)
+
+        sheet_names = _excel_sheet_names(file_path, engine)
+        if sheets is None:
+            sheets = sheet_names
+        sheets = [sheet_names[sheet] if isinstance(sheet, int) else sheet for sheet in sheets]
+
+        if executor == 'auto':
+            executor = 'thread' if engine == 'calamine' else 'process'
+        pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+
+        with pool_class(max_workers=max_workers) as pool:
+            futures = {sheet: pool.submit(_read_excel, file_path, sheet, columns, engine) for sheet in sheets}
+            results = {sheet: future.result() for sheet, future in futures.items()}
+
+        logger.info("Excel sheets loaded: %s (%s sheets, engine: %s)", filename, len(results), engine)
+        return results
+
+    @instrumented()
+    def load_many(self, pattern: str = "*", directory: str = "input",
+                  executor: str = "auto", max_workers: Optional[int] = None,
+                  combine: Union[bool, str] = False,
+                  **load_options) -> Tuple[Union[Dict[str, pd.DataFrame], pd.DataFrame, Iterator[pd.DataFrame]],
+                                           Dict[str, str]]:
+        """
+        Loads every file matching a pattern concurrently.
+
+        CSV/Excel/JSON parsing is CPU-bound and runs on a process pool, while
+        columnar formats (whose readers release the GIL) run on a thread pool.
+        A failing file is reported in the errors instead of aborting the batch.
+        On Windows the calling script must be guarded by
+        if __name__ == "__main__" when processes are used.
+
+        Parameters:
+        -----------
+        pattern : str
+            Glob pattern of the files to load (e.g., '*.csv')
+        directory : str
+            Directory where to search ('input', 'result')
+        executor : str
+            'process', 'thread' or 'auto' (chooses per file format)
+        max_workers : int, optional
+            Maximum number of workers per pool (defaults to the executor default)
+        combine : bool or str
+            If True, returns a single DataFrame indexed by ('source_file', row)
+            instead of a dict of DataFrames. If 'lazy', returns an iterator
+            that yields each file's DataFrame with that index in file order
+            as soon as it is parsed, so the combined frame is never built
+            (it can be passed to save_dataframe or create_streaming_summary)
+        **load_options
+            Additional arguments for load_file_auto (e.g., columns, filters, use_cache, optimize_memory)
+
+        Returns:
+        --------
+        Tuple : (DataFrames by filename, combined DataFrame or iterator of
+                 DataFrames, errors by filename). With combine='lazy' the
+                 errors dict is filled while the iterator is consumed
+        """
+        if executor not in ['auto', 'process', 'thread']:
+            raise ValueError("executor must be one of: ['auto', 'process', 'thread']")
+        if combine not in [False, True, 'lazy']:
+            raise ValueError("combine must be one of: [False, True, 'lazy']")
+
+        directory_map = {
+            'input': self.input_directory,
+            'result': self.results_directory
+        }
+        files = sorted(f for f in directory_map[directory].glob(pattern) if f.is_file())
+
+        # Cache lookups happen here so workers never write the cache index concurrently
+        use_cache = load_options.pop('use_cache', None)
+        if use_cache is None:
+            use_cache = self.use_cache
+
+        # Dtypes are compacted after caching (and after combining) so the cache keeps the raw frames
+        optimize_memory = load_options.pop('optimize_memory', None)
+        if optimize_memory is None:
+            optimize_memory = self.optimize_memory
+        if optimize_memory:
+            # Imported here so this module can still be used without data_processor
+            from data_processor import optimize_memory as optimize_dataframe_memory
+
+        errors = {}
+        loaded = self._iter_loaded_files(files, directory, executor, max_workers, use_cache, errors, load_options)
+
+        if combine == 'lazy':
+            # Each file is compacted on its own, as there is no combined frame
+            return _iter_combined(loaded, optimize_dataframe_memory if optimize_memory else None), errors
+
+        results = dict(loaded)
+
+        if combine:
+            if not results:
+                return pd.DataFrame(), errors
+            combined = pd.concat(results.values(), keys=list(results.keys()),
+                                 names=['source_file', None])
+            if optimize_memory:
+                combined = optimize_dataframe_memory(combined, inplace=True)
+            return combined, errors
+
+        if optimize_memory:
+            results = {name: optimize_dataframe_memory(df, inplace=True) for name, df in results.items()}
+        return results, errors
+
+    def _iter_loaded_files(self, files: List[Path], directory: str, executor: str, max_workers: Optional[int],
+                           use_cache: bool, errors: Dict[str, str], load_options: Dict) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Submits every file to its pool and yields (filename, DataFrame) in file order.
+
+        Cache hits are yielded without a worker; failures are added to errors.
+        Closing the iterator early cancels the files not started yet.
+        """
+        started = time.perf_counter()
+        pending = []
+        loaded_files = 0
+        loaded_rows = 0
+
+        with ExitStack() as stack:
+            pools = {}
+            for file_path in files:
+                extension = _data_format(file_path)[0]
+                cacheable = use_cache and _is_cacheable(extension, load_options.get('columns'),
+                                                        load_options.get('sheet_name', 0))
+                if cacheable:
+                    df = self.cache.get(file_path)
+                    if df is not None:
+                        logger.debug("File loaded from cache: %s", file_path.name)
+                        pending.append((file_path, False, df))
+                        continue
+
+                kind = executor
+                if kind == 'auto':
+                    kind = 'thread' if extension in COLUMNAR_EXTENSIONS else 'process'
+                if kind not in pools:
+                    pool_class = ProcessPoolExecutor if kind == 'process' else ThreadPoolExecutor
+                    pools[kind] = stack.enter_context(pool_class(max_workers=max_workers))
+
+                future = pools[kind].submit(self.load_file_auto, file_path.name, directory,
+                                            use_cache=False, optimize_memory=False, **load_options)
+                pending.append((file_path, cacheable, future))
+
+            try:
+                for file_path, cacheable, result in pending:
+                    if not isinstance(result, pd.DataFrame):
+                        try:
+                            result = result.result()
+                        except Exception as e:
+                            errors[file_path.name] = f"{type(e).__name__}: {str(e)}"
+                            logger.warning("File skipped: %s", file_path.name)
+                            continue
+                        if cacheable:
+                            self.cache.put(file_path, result)
+
+                    loaded_files += 1
+                    loaded_rows += len(result)
+                    yield file_path.name, result
+            finally:
+                for _, _, result in pending:
+                    if not isinstance(result, pd.DataFrame):
+                        result.cancel()
+
+        logger.info("Files loaded: %s of %s (%s errors)", loaded_files, len(files), len(errors))
+        _log_metrics('load_many', started, shape=(loaded_rows, None), files=loaded_files, errors=len(errors))
+
+    @instrumented()
+    def count_duplicate_rows(self, pattern: str = "*", directory: str = "input",
+                             mode: str = "exact", chunksize: int = 100_000) -> Tuple[Dict, Dict[str, str]]:
+        """
+        Counts duplicate rows across every file matching a pattern.
+
+        Files are streamed chunk by chunk into a single DuplicateCounter, so a
+        row is a duplicate if it appears earlier in the same file or in any
+        previous file. Memory is bounded by the chunk size plus 16 bytes per
+        distinct row (a fixed-size sketch in approximate mode).
+
+        Parameters:
+        -----------
+        pattern : str
+            Glob pattern of the files to check (e.g., '*.csv')
+        directory : str
+            Directory where to search ('input', 'result')
+        mode : str
+            'exact' or 'approximate' (see data_processor.DuplicateCounter)
+        chunksize : int
+            Maximum number of rows per chunk
+
+        Returns:
+        --------
+        Tuple : (report with files, rows, distinct and duplicate rows, errors by filename)
+        """
+        # Imported here so this module can still be used without data_processor
+        from data_processor import DuplicateCounter
+
+        directory_map = {
+            'input': self.input_directory,
+            'result': self.results_directory
+        }
+        files = sorted(f for f in directory_map[directory].glob(pattern) if f.is_file())
+
+        counter = DuplicateCounter(mode)
+        errors = {}
+        checked = []
+
+        for file_path in files:
+            # Count into a per-file counter so a failing file leaves the total untouched
+            file_counter = DuplicateCounter(mode)
+            try:
+                for chunk in self.iter_file_chunks(file_path.name, directory, chunksize=chunksize):
+                    file_counter.update(chunk)
+                counter.merge(file_counter)
+            except Exception as e:
+                errors[file_path.name] = f"{type(e).__name__}: {str(e)}"
+                logger.warning("File skipped: %s", file_path.name)
+                continue
+            checked.append(file_path.name)
+
+        report = {
+            'files': checked,
+            'mode': mode,
+            'rows': counter.rows,
+            'distinct_rows': counter.distinct_rows(),
+            'duplicate_rows': counter.duplicate_rows()
+        }
+
+        logger.info("Duplicate rows in %s files: %d of %d", len(checked), report['duplicate_rows'], report['rows'])
+        return report, errors
+
+    def _load_csv_intelligent(self, file_path: Path,
+                              dialect: Optional[Dict] = None) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Loads a CSV automatically detecting delimiter and encoding.
+
+        The dialect is sniffed from a single byte sample and the file is
+        parsed with the detected settings. If a byte past the sample does not
+        decode, the file is parsed again with the fallback encodings
+        (cp1252, then latin-1) and the returned dialect holds the one used.
+
+        Parameters:
+        -----------
+        file_path : Path
+            Path of the CSV file
+        dialect : Dict, optional
+            Previously detected dialect (see sniff_csv_dialect) to skip sniffing
+
+        Returns:
+        --------
+        Tuple[pd.DataFrame, Dict] : Loaded DataFrame and the dialect used
+        """
+        if dialect is None:
+            dialect = sniff_csv_dialect(file_path)
+
+        while True:
+            try:
+                with _pandas_source(file_path) as source:
+                    df = pd.read_csv(source, compression='infer', **csv_read_options(dialect))
+                break
+            except UnicodeDecodeError as e:
+                dialect = _fallback_dialect(file_path, dialect, e)
+        logger.debug("CSV loaded with delimiter '%s' and encoding '%s'", dialect['delimiter'], dialect['encoding'])
+        return df, dialect
+
+    @instrumented()
+    def save_dataframe(self, df: Union[pd.DataFrame, Iterable[pd.DataFrame]], filename: str,
                       include_timestamp: bool = True,
-                      format: str = 'xlsx') -> Path:
+                      format: str = 'xlsx', excel_split: str = 'sheets',
+                      compression: Optional[str] = None,
+                      compression_level: Optional[int] = None) -> Path:
         """
         Saves a DataFrame in the results directory.
 
+        'xlsx' files are written in streaming mode with bounded memory (see
+        write_excel_streaming), so an iterator of chunks (e.g. from
+        iter_file_chunks) can be saved as 'xlsx' or 'csv' without concatenating it.
+
+        Every file is written to a temporary file, fsynced and renamed into
+        place, so readers never see a partially written file.
+
         Parameters:
         -----------
-        df : pd.DataFrame
-            DataFrame to save
+        df : pd.DataFrame or Iterable[pd.DataFrame]
+            DataFrame to save, or chunks with the same columns ('xlsx' and 'csv' only)
         filename : str
             Base filename (without extension)
         include_timestamp : bool
             Whether to include timestamp in the name
         format : str
-            Output format ('xlsx', 'csv', 'json')
+            Output format ('xlsx', 'csv', 'json', 'parquet', 'feather', 'arrow').
+            Columnar formats are much faster than 'xlsx' for intermediate results
+        excel_split : str
+            Where rows beyond Excel's row limit go: 'sheets' or 'files'
+        compression : str, optional
+            'gzip', 'zstd' or 'lz4'. CSV and JSON files get the matching suffix
+            (e.g. '.csv.gz') and load_file_auto reads them back; Parquet, Feather and Arrow files compress their
+            columns instead (Feather and Arrow support 'zstd' and 'lz4' only)
+        compression_level : int, optional
+            Compression level (defaults to the codec default)
 
         Returns:
         --------
-        Path : Complete path of saved file
+        Path : Complete path of saved file (the first part when an xlsx export is split across files)
         """
+        if compression is not None and compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"compression must be one of: {list(COMPRESSION_SUFFIXES)}")
+        if compression is not None and format == 'xlsx':
+            raise ValueError("xlsx files are already zip-compressed, compression applies to the other formats")
+
+        # Compressed text formats keep their format in the name, e.g. results.csv.gz
+        suffix = COMPRESSION_SUFFIXES[compression] if compression and format in ['csv', 'json'] else ""
+
         # Generate complete name
         if include_timestamp:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            complete_name = f"{filename}_{timestamp}.{format}"
+            complete_name = f"{filename}_{timestamp}.{format}{suffix}"
         else:
-            complete_name = f"{filename}.{format}"
+            complete_name = f"{filename}.{format}{suffix}"
 
         complete_path = self.results_directory / complete_name
 
+        is_frame = isinstance(df, pd.DataFrame)
+        if not is_frame and format not in ['xlsx', 'csv']:
+            raise ValueError("Chunk iterators can only be saved as 'xlsx' or 'csv'")
+
         # Save according to format
+        started = time.perf_counter()
         try:
+            shape = df.shape if is_frame else None
+            pandas_compression = _pandas_compression(compression, compression_level)
             if format == 'xlsx':
-                df.to_excel(complete_path, index=False)
-            elif format == 'csv':
-                df.to_csv(complete_path, index=False, encoding='utf-8')
-            elif format == 'json':
-                df.to_json(complete_path, orient='records', indent=2, force_ascii=False)
-            else:
+                # Each workbook is saved atomically by the writer
+                paths, shape = write_excel_streaming(df, complete_path, split=excel_split)
+                if len(paths) > 1 and logger.isEnabledFor(logging.INFO):
+                    logger.info("  - Split into %s files: %s", len(paths), [p.name for p in paths])
+            elif format not in ['csv', 'json', 'parquet', 'feather', 'arrow']:
                 raise ValueError(f"Unsupported format: {format}")
-
-            logger.info(f"DataFrame saved: {complete_path}")
-            logger.info(f"  - Format: {format.upper()}")
-            logger.info(f"  - Dimensions: {df.shape[0]} rows × {df.shape[1]} columns")
+            else:
+                with _atomic_write(complete_path) as temporary_path:
+                    if format == 'csv':
+                        # Written through our own codec streams, since pandas cannot write lz4
+                        shape = _write_csv_chunks([df] if is_frame else df, temporary_path, pandas_compression)
+                    elif format == 'json':
+                        with _open_compressed(temporary_path, pandas_compression) as binary, \
+                                io.TextIOWrapper(binary, encoding='utf-8') as handle:
+                            df.to_json(handle, orient='records', indent=2, force_ascii=False)
+                    else:
+                        _write_columnar_table(df, temporary_path, format, compression, compression_level)
+
+            logger.info("DataFrame saved: %s", complete_path)
+            logger.info("  - Format: %s%s", format.upper(), f" ({compression})" if compression else "")
+            logger.info("  - Dimensions: %s rows × %s columns", shape[0], shape[1])
+            _log_metrics('save_dataframe', started, shape=shape, path=complete_path,
+                         file=complete_name, format=format, compression=compression)
 
             return complete_path
 
         except Exception as e:
-            logger.error(f"Error saving file: {str(e)}")
+            logger.error("Error saving file: %s", e)
             raise
 
-    def create_backup(self, source_directory: str = "result") -> Path:
+    def create_backup(self, source_directory: str = "result", incremental: bool = True,
+                      compression: Optional[str] = None, compression_level: Optional[int] = None,
+                      max_workers: Optional[int] = None) -> Path:
         """
         Creates a compressed backup of a directory.
 
+        Backups go to the deduplicated store in the 'backups' folder (see
+        BackupStore): files are compressed in parallel, identical contents
+        are stored once and, when incremental, files whose size and mtime
+        match the previous backup are not read again.
+
         Parameters:
         -----------
         source_directory : str
             Directory to backup ('input', 'result')
+        incremental : bool
+            Whether to reuse unchanged files from the previous backup of the directory
+        compression : str, optional
+            'zstd' or 'gzip' (defaults to zstd when zstandard is installed)
+        compression_level : int, optional
+            Compression level (defaults to the codec default)
+        max_workers : int, optional
+            Number of compression threads (defaults to the executor default)
 
         Returns:
         --------
-        Path : Path of created backup file
+        Path : Path of the backup manifest (restore it with restore_backup)
         """
         directory_map = {
             'input': self.input_directory,
@@ -245,54 +908,122 @@ class FileManager:
         if source_directory not in directory_map:
             raise ValueError(f"Directory must be one of: {list(directory_map.keys())}")
 
-        source = directory_map[source_directory]
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f"backup_{source_directory}_{timestamp}"
-        backup_path = self.project_directory / f"{backup_name}.zip"
-
         # Create backup
-        shutil.make_archive(str(backup_path.with_suffix('')), 'zip', str(source))
+        store = BackupStore(self.project_directory / BACKUP_DIRECTORY_NAME, compression,
+                            compression_level, max_workers)
+        manifest_path = store.backup(directory_map[source_directory], source_directory, incremental)
+
+        logger.info("Backup created: %s", manifest_path)
+        return manifest_path
+
+    def restore_backup(self, manifest_path: Union[str, Path], destination: Optional[Union[str, Path]] = None,
+                       max_workers: Optional[int] = None) -> Path:
+        """
+        Restores the files of a backup created by create_backup.
+
+        Parameters:
+        -----------
+        manifest_path : str or Path
+            Backup manifest returned by create_backup
+        destination : str or Path, optional
+            Directory to restore into (defaults to 'restored/<backup name>' in the project)
+        max_workers : int, optional
+            Number of decompression threads (defaults to the executor default)
+
+        Returns:
+        --------
+        Path : Directory with the restored files
+        """
+        manifest_path = Path(manifest_path)
+        if destination is None:
+            destination = self.project_directory / "restored" / manifest_path.stem
 
-        logger.info(f"Backup created: {backup_path}")
-        return backup_path
+        store = BackupStore(self.project_directory / BACKUP_DIRECTORY_NAME, max_workers=max_workers)
+        return store.restore(manifest_path, Path(destination))
 
-    def organize_files_by_date(self, directory: str = "result"):
+    def organize_files_by_date(self, directory: str = "result", dry_run: bool = False,
+                               max_workers: Optional[int] = None) -> Dict:
         """
         Organizes files in subdirectories by creation date.
 
+        The directory is listed once with os.scandir and the whole move plan
+        is built before anything is touched: each month folder is created
+        once, files whose target already exists are skipped and the moves
+        run on a thread pool. Files are renamed when the month folder is on
+        the same device and copied with shutil.move otherwise.
+
         Parameters:
         -----------
         directory : str
             Directory to organize ('result')
+        dry_run : bool
+            Whether to only return the plan and its estimated cost
+        max_workers : int, optional
+            Number of move threads (defaults to the executor default)
+
+        Returns:
+        --------
+        Dict : Move plan, estimated cost, files moved and errors by file name
         """
         if directory != "result":
             raise ValueError("Only 'result' directory can be organized")
 
-        files = self.list_files(directory)
-        files_moved = 0
-
-        for file in files:
-            if file.is_file():
-                # Get creation date
-                creation_date = datetime.fromtimestamp(file.stat().st_ctime)
-                date_folder = creation_date.strftime('%Y-%m')
+        plan = _plan_moves_by_date(self.results_directory)
+        report = {'plan': plan['moves'], 'cost': plan['cost'], 'dry_run': dry_run, 'moved': 0, 'errors': {}}
+        if dry_run:
+            cost = plan['cost']
+            logger.info("Organization plan: %s files to move, %s folders to create, %.2f MB to copy",
+                        cost['files'], cost['folders_to_create'], cost['bytes_to_copy'] / 1024**2)
+            return report
 
-                # Create month folder if doesn't exist
-                destination_folder = self.results_directory / date_folder
-                destination_folder.mkdir(exist_ok=True)
+        # Create each month folder once
+        failed_folders = {}
+        for folder in plan['folders']:
+            try:
+                (self.results_directory / folder).mkdir(exist_ok=True)
+            except OSError as e:
+                failed_folders[folder] = f"{type(e).__name__}: {str(e)}"
+                logger.warning("Could not create folder %s: %s", folder, e)
+
+        moves = []
+        for move in plan['moves']:
+            if move['folder'] in failed_folders:
+                report['errors'][move['name']] = failed_folders[move['folder']]
+            else:
+                moves.append(move)
 
-                # Move file
-                new_path = destination_folder / file.name
-                if not new_path.exists():
-                    shutil.move(str(file), str(new_path))
-                    files_moved += 1
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_move_file, move): move for move in moves}
+            for future in as_completed(futures):
+                move = futures[future]
+                try:
+                    future.result()
+                    report['moved'] += 1
+                except OSError as e:
+                    report['errors'][move['name']] = f"{type(e).__name__}: {str(e)}"
+                    logger.warning("File not moved: %s", move['name'])
 
-        logger.info(f"Files organized: {files_moved} files moved")
+        logger.info("Files organized: %s files moved", report['moved'])
+        return report
 
-    def generate_files_report(self) -> Dict:
+    def generate_files_report(self, incremental: bool = False) -> Dict:
         """
         Generates a complete report about project files.
 
+        Each directory is listed once with os.scandir and each file is
+        stat'ed once. The per-directory summaries are saved as a snapshot
+        index in the cache directory; in incremental mode only directories
+        whose mtime changed since the snapshot are listed again.
+
+        A directory's mtime changes when entries are added, removed or
+        renamed, but not when an existing file is rewritten in place, so an
+        incremental report may keep the old size of such files.
+
+        Parameters:
+        -----------
+        incremental : bool
+            Whether to reuse the snapshot of unchanged directories
+
         Returns:
         --------
         Dict : Report with file statistics
@@ -310,68 +1041,201 @@ class FileManager:
             'logs': self.logs_directory
         }
 
+        index_path = self.cache_directory / FILES_INDEX_NAME
+        previous = _load_files_index(index_path) if incremental else {}
+        index = {}
+        scanned = 0
+        reused = 0
+
         for name, path in directories.items():
             if path.exists():
-                files = list(path.rglob('*'))
-                files_only = [f for f in files if f.is_file()]
-
-                # Statistics by extension
-                extensions = {}
-                total_size = 0
-
-                for file in files_only:
-                    ext = file.suffix.lower() or 'no_extension'
-                    if ext not in extensions:
-                        extensions[ext] = {'count': 0, 'size_mb': 0}
-
-                    file_size = file.stat().st_size
-                    extensions[ext]['count'] += 1
-                    extensions[ext]['size_mb'] += file_size / (1024 ** 2)
-                    total_size += file_size
-
-                report['directories'][name] = {
-                    'total_files': len(files_only),
-                    'total_folders': len([f for f in files if f.is_dir()]),
-                    'total_size_mb': total_size / (1024 ** 2),
-                    'extensions': extensions,
-                    'newest_file': max(files_only,
-                                      key=lambda x: x.stat().st_mtime).name if files_only else None,
-                    'oldest_file': min(files_only,
-                                      key=lambda x: x.stat().st_mtime).name if files_only else None
-                }
-
-        logger.info("Files report generated")
+                tree = previous.get(name, {})
+                # A snapshot of another location (e.g. a moved project) is never reused
+                entries = tree.get('entries') if tree.get('path') == str(path) else None
+                entries, tree_scanned, tree_reused = _scan_directory_tree(path, entries)
+                index[name] = {'path': str(path), 'entries': entries}
+                scanned += tree_scanned
+                reused += tree_reused
+
+                report['directories'][name] = _summarize_directory_tree(entries)
+
+        try:
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+            with _atomic_write(index_path) as temporary_path:
+                with open(temporary_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': FILES_INDEX_VERSION, 'trees': index}, f)
+        except OSError as e:
+            logger.warning("Could not save the files index: %s", e)
+
+        logger.info("Files report generated (%s directories listed, %s reused from the index)", scanned, reused)
         return report
 
-    def clean_temporary_files(self, pattern: str = "temp_*", days_old: int = 7):
+    def scan_directory_integrity(self, directory: str = "input", incremental: bool = True,
+                                 max_workers: Optional[int] = None) -> Dict:
+        """
+        Validates every file of a directory concurrently with lightweight format probes.
+
+        Checksums are kept in the cache directory, so files unchanged since
+        the previous scan are skipped (see scan_integrity).
+
+        Parameters:
+        -----------
+        directory : str
+            Directory to scan ('input', 'result')
+        incremental : bool
+            Whether to skip files unchanged since the previous scan
+        max_workers : int, optional
+            Number of threads (defaults to the executor default)
+
+        Returns:
+        --------
+        Dict : Report per file and a summary with counts and throughput
+        """
+        directory_map = {
+            'input': self.input_directory,
+            'result': self.results_directory
+        }
+
+        if directory not in directory_map:
+            raise ValueError(f"Directory must be one of: {list(directory_map.keys())}")
+
+        index_path = self.cache_directory / f"{directory}_{INTEGRITY_INDEX_NAME}"
+        if not incremental and index_path.exists():
+            index_path.unlink()
+        return scan_integrity(directory_map[directory], index_path, max_workers)
+
+    def clean_temporary_files(self, pattern: str = "temp_*", days_old: int = 7) -> Dict:
         """
         Cleans temporary or old files.
 
+        Shortcut for apply_retention with a single age rule.
+
         Parameters:
         -----------
         pattern : str
             Pattern of filenames to clean
         days_old : int
             Delete files older than this number of days
+
+        Returns:
+        --------
+        Dict : Retention report (see apply_retention)
         """
-        import time
+        return self.apply_retention([{'pattern': pattern, 'days_old': days_old}])
 
-        files_deleted = 0
-        time_limit = time.time() - (days_old * 24 * 60 * 60)
+    def apply_retention(self, rules: Optional[List[Dict]] = None, budgets: Optional[Dict[str, float]] = None,
+                        dry_run: bool = False, max_workers: Optional[int] = None) -> Dict:
+        """
+        Deletes files from the result and logs directories by rules and size budgets.
 
-        for directory in [self.results_directory, self.logs_directory]:
-            for file in directory.glob(pattern):
-                if file.is_file() and file.stat().st_mtime < time_limit:
-                    try:
-                        file.unlink()
-                        files_deleted += 1
-                        logger.debug(f"File deleted: {file.name}")
-                    except Exception as e:
-                        logger.error(f"Error deleting {file.name}: {str(e)}")
+        Each directory tree is listed once with os.scandir. A file is deleted
+        when it matches any rule; then, for directories with a budget, the
+        oldest remaining files (by mtime) are evicted until the directory
+        fits its quota. Deletions run in batches on a thread pool.
+
+        Parameters:
+        -----------
+        rules : List[Dict], optional
+            Rules with any of the keys 'pattern' (glob relative to the
+            directory, '*' by default), 'days_old', 'min_size_mb' and
+            'directories' (subset of ['result', 'logs']); all given
+            conditions must hold. Defaults to temp_* files older than 7 days
+        budgets : Dict[str, float], optional
+            Maximum size in MB per directory, e.g. {'result': 500}
+        dry_run : bool
+            Whether to only report the files that would be deleted and the reclaimable bytes
+        max_workers : int, optional
+            Number of deletion threads (defaults to the executor default)
+
+        Returns:
+        --------
+        Dict : Per-directory sizes and reclaimable bytes (with the candidate
+               files in dry-run mode), files deleted, bytes freed and errors
+        """
+        directory_map = {
+            'result': self.results_directory,
+            'logs': self.logs_directory
+        }
+
+        rules = DEFAULT_RETENTION_RULES if rules is None else rules
+        budgets = budgets or {}
+        for name in budgets:
+            if name not in directory_map:
+                raise ValueError(f"Directory must be one of: {list(directory_map.keys())}")
+        for rule in rules:
+            unknown = set(rule) - set(RETENTION_RULE_KEYS)
+            if unknown:
+                raise ValueError(f"Unknown retention rule keys: {sorted(unknown)}. Use: {RETENTION_RULE_KEYS}")
+            for name in rule.get('directories', []):
+                if name not in directory_map:
+                    raise ValueError(f"Directory must be one of: {list(directory_map.keys())}")
+
+        now = time.time()
+        report = {'dry_run': dry_run, 'directories': {}, 'deleted': 0, 'freed_bytes': 0, 'errors': {}}
+        selected = []
+
+        for name, root in directory_map.items():
+            if not root.exists():
+                continue
+
+            files = list(_walk_files(root))
+            size = sum(stat.st_size for _, stat in files)
+            reasons = {}
+            for relative, stat in files:
+                for position, rule in enumerate(rules):
+                    if _retention_rule_matches(rule, name, relative, stat, now):
+                        reasons[relative] = f"rule {position}"
+                        break
+            remaining = size - sum(stat.st_size for relative, stat in files if relative in reasons)
+
+            # Evict the oldest remaining files until the directory fits its budget
+            quota = budgets.get(name)
+            quota_bytes = int(quota * 1024**2) if quota is not None else None
+            if quota_bytes is not None and remaining > quota_bytes:
+                kept = sorted((stat.st_mtime, relative, stat.st_size) for relative, stat in files
+                              if relative not in reasons)
+                for _, relative, file_size in kept:
+                    if remaining <= quota_bytes:
+                        break
+                    reasons[relative] = "budget"
+                    remaining -= file_size
+
+            directory_report = {
+                'files': len(files),
+                'size_bytes': size,
+                'quota_bytes': quota_bytes,
+                'selected': len(reasons),
+                'reclaimable_bytes': size - remaining,
+                'size_after_bytes': remaining
+            }
+            if dry_run:
+                directory_report['candidates'] = [
+                    {'file': relative, 'size_bytes': stat.st_size,
+                     'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(), 'reason': reasons[relative]}
+                    for relative, stat in files if relative in reasons
+                ]
+            report['directories'][name] = directory_report
+            selected.extend((str(root / relative), stat.st_size) for relative, stat in files if relative in reasons)
+
+        if dry_run:
+            reclaimable = sum(d['reclaimable_bytes'] for d in report['directories'].values())
+            logger.info("Retention plan: %s files, %.2f MB reclaimable", len(selected), reclaimable / 1024**2)
+            return report
 
-        logger.info(f"Cleanup completed: {files_deleted} files deleted")
+        batches = [selected[i:i + RETENTION_DELETE_BATCH] for i in range(0, len(selected), RETENTION_DELETE_BATCH)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for deleted, freed_bytes, errors in pool.map(_delete_files, batches):
+                report['deleted'] += deleted
+                report['freed_bytes'] += freed_bytes
+                report['errors'].update(errors)
+
+        for file, error in report['errors'].items():
+            logger.error("Error deleting %s: %s", file, error)
+        logger.info("Cleanup completed: %s files deleted, %.2f MB freed",
+                    report['deleted'], report['freed_bytes'] / 1024**2)
+        return report
 
-    def export_metadata(self, filename: str = "project_metadata"):
+    def export_metadata(self, filename: str = "project_metadata", incremental: bool = True):
         """
         Exports project metadata to JSON.
 
@@ -379,8 +1243,10 @@ class FileManager:
         -----------
         filename : str
             Base filename for metadata file
+        incremental : bool
+            Whether the files report reuses the snapshot index (see generate_files_report)
         """
-        report = self.generate_files_report()
+        report = self.generate_files_report(incremental=incremental)
 
         # Add additional information
         metadata = {
@@ -399,94 +1265,1687 @@ class FileManager:
         with open(metadata_path, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False, default=str)
 
-        logger.info(f"Metadata exported: {metadata_path}")
+        logger.info("Metadata exported: %s", metadata_path)
         return metadata_path
 
 
-# Independent utility functions
-def find_similar_files(directory: Path, base_name: str, threshold: float = 0.8) -> List[Path]:
+class LoadCache:
     """
-    Finds files with similar names using approximate matching.
+    Content-addressed on-disk cache of parsed DataFrames.
 
-    Parameters:
-    -----------
-    directory : Path
-        Directory where to search
-    base_name : str
-        Base name to compare
-    threshold : float
-        Similarity threshold (0-1)
-
-    Returns:
-    --------
-    List[Path] : List of similar files
+    Entries are keyed by file path, size, modification time and optionally a
+    hash of the content, and are stored as uncompressed Arrow IPC files so a
+    hit is a memory-mapped read instead of a full parse.
     """
-    from difflib import SequenceMatcher
 
-    similar_files = []
+    def __init__(self, cache_directory: Path, max_size_mb: float = CACHE_MAX_SIZE_MB,
+                 hash_content: bool = False):
+        """
+        Initializes the load cache.
 
-    for file in directory.glob('*'):
-        if file.is_file():
-            # Compare names without extension
-            name_without_ext = file.stem.lower()
-            base_name_lower = base_name.lower()
+        Parameters:
+        -----------
+        cache_directory : Path
+            Directory where cached frames and the index are stored
+        max_size_mb : float
+            Total size budget; least recently used entries are evicted above it
+        hash_content : bool
+            Whether keys include a hash of the file content
+        """
+        self.cache_directory = Path(cache_directory)
+        self.index_path = self.cache_directory / "index.json"
+        self.max_size_bytes = int(max_size_mb * 1024 ** 2)
+        self.hash_content = hash_content
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = None
+        self._hash_memo = {}
+
+    def _load_index(self) -> Dict:
+        """Loads the cache index from disk on first use."""
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                try:
+                    with open(self.index_path, 'r', encoding='utf-8') as f:
+                        self._index = json.load(f)
+                except (OSError, ValueError):
+                    logger.warning("Cache index is corrupted, starting with an empty cache")
+        return self._index
+
+    def _save_index(self):
+        """Writes the cache index atomically."""
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+
+    def _signature(self, file_path: Path) -> Dict:
+        """Builds the signature that identifies the current version of a file."""
+        stat = file_path.stat()
+        signature = {
+            'source': str(file_path.resolve()),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'content_hash': None
+        }
 
-            similarity = SequenceMatcher(None, base_name_lower, name_without_ext).ratio()
+        if self.hash_content:
+            # Hash each version of a file only once per session
+            memo_key = (signature['source'], stat.st_size, stat.st_mtime_ns)
+            if memo_key not in self._hash_memo:
+                digest = hashlib.blake2b(digest_size=16)
+                with open(file_path, 'rb') as f:
+                    for block in iter(lambda: f.read(CACHE_HASH_BLOCK_BYTES), b''):
+                        digest.update(block)
+                self._hash_memo[memo_key] = digest.hexdigest()
+            signature['content_hash'] = self._hash_memo[memo_key]
+
+        return signature
+
+    @staticmethod
+    def _key(signature: Dict) -> str:
+        """Derives the cache key from a file signature."""
+        payload = json.dumps(signature, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _remove(self, key: str):
+        """Deletes an entry and its data file."""
+        entry = self._index.pop(key, None)
+        if entry:
+            (self.cache_directory / entry['file']).unlink(missing_ok=True)
+
+    def get(self, file_path: Path) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached DataFrame of a file, or None on a miss.
 
-            if similarity >= threshold:
-                similar_files.append((file, similarity))
+        Entries of the same file with an outdated signature are invalidated.
 
-    # Sort by similarity descending
-    similar_files.sort(key=lambda x: x[1], reverse=True)
+        Parameters:
+        -----------
+        file_path : Path
+            Path of the source file
 
-    return [file for file, _ in similar_files]
+        Returns:
+        --------
+        pd.DataFrame or None : Cached DataFrame if the file is unchanged
+        """
+        index = self._load_index()
+        signature = self._signature(file_path)
+        key = self._key(signature)
+
+        # Invalidate stale versions of this file
+        stale = [k for k, entry in index.items()
+                 if entry['source'] == signature['source'] and k != key]
+        for stale_key in stale:
+            self._remove(stale_key)
+        if stale:
+            logger.debug("Cache entries invalidated for %s: %s", file_path.name, len(stale))
+            self._save_index()
+
+        entry = index.get(key)
+        if entry is None or not (self.cache_directory / entry['file']).exists():
+            self.misses += 1
+            return None
+
+        df = _read_columnar_table(self.cache_directory / entry['file']).to_pandas()
+        df.attrs.update(entry.get('attrs', {}))
+
+        entry['last_access'] = datetime.now().timestamp()
+        self._save_index()
+
+        self.hits += 1
+        return df
+
+    def put(self, file_path: Path, df: pd.DataFrame):
+        """
+        Stores the parsed DataFrame of a file and evicts entries over budget.
 
+        Frames that Arrow cannot represent (e.g. mixed-type object columns)
+        are skipped with a warning instead of failing the load.
 
-def validate_file_integrity(file_path: Path) -> Dict:
-    """
-    Validates the integrity of a data file.
+        Parameters:
+        -----------
+        file_path : Path
+            Path of the source file
+        df : pd.DataFrame
+            Parsed DataFrame to cache
+        """
+        index = self._load_index()
+        signature = self._signature(file_path)
+        key = self._key(signature)
+        data_file = f"{key}.arrow"
 
-    Parameters:
-    -----------
-    file_path : Path
-        Path to file to validate
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        try:
+            _write_columnar_table(df, self.cache_directory / data_file, 'arrow')
+        except Exception as e:
+            (self.cache_directory / data_file).unlink(missing_ok=True)
+            logger.warning("Could not cache %s: %s", file_path.name, e)
+            return
+
+        index[key] = {
+            **signature,
+            'file': data_file,
+            'bytes': (self.cache_directory / data_file).stat().st_size,
+            'last_access': datetime.now().timestamp(),
+            'attrs': {k: v for k, v in df.attrs.items() if _is_json_serializable(v)}
+        }
+        self._evict()
+        self._save_index()
+        logger.debug("Cached %s as %s", file_path.name, data_file)
+
+    def _evict(self):
+        """Evicts least recently used entries until the cache fits its budget."""
+        total = sum(entry['bytes'] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['last_access']):
+            if total <= self.max_size_bytes:
+                break
+            total -= self._index[key]['bytes']
+            self._remove(key)
+            self.evictions += 1
+
+    def invalidate(self, file_path: Optional[Path] = None):
+        """
+        Removes the entries of a file, or every entry when no file is given.
 
-    Returns:
-    --------
-    Dict : Validation report
-    """
-    report = {
-        'file': str(file_path),
-        'exists': file_path.exists(),
-        'is_file': file_path.is_file() if file_path.exists() else False,
-        'size_bytes': file_path.stat().st_size if file_path.exists() else 0,
-        'extension': file_path.suffix.lower(),
-        'readable': False,
-        'rows': 0,
-        'columns': 0,
-        'errors': []
+        Parameters:
+        -----------
+        file_path : Path, optional
+            Source file whose entries should be removed
+        """
+        index = self._load_index()
+        source = str(Path(file_path).resolve()) if file_path is not None else None
+        for key in [k for k, entry in index.items() if source is None or entry['source'] == source]:
+            self._remove(key)
+        self._save_index()
+
+    def stats(self) -> Dict:
+        """
+        Returns cache counters and current size.
+
+        Returns:
+        --------
+        Dict : Hits, misses, evictions, hit rate, entries and size in MB
+        """
+        index = self._load_index()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(index),
+            'size_mb': sum(entry['bytes'] for entry in index.values()) / (1024 ** 2)
+        }
+
+
+class BackupStore:
+    """
+    Incremental, deduplicated backup store.
+
+    Each distinct file content is stored once as a compressed object named
+    after its SHA-256 hash, and each backup is a JSON manifest mapping the
+    relative paths of the source to objects. Files are read, hashed and
+    compressed block by block on a thread pool (hashlib, zlib and zstandard
+    release the GIL), so peak memory depends on the number of workers, not
+    on the size of the backup.
+    """
+
+    def __init__(self, backup_directory: Path, compression: Optional[str] = None,
+                 compression_level: Optional[int] = None, max_workers: Optional[int] = None):
+        """
+        Initializes the backup store.
+
+        Parameters:
+        -----------
+        backup_directory : Path
+            Directory holding the 'objects' and 'manifests' folders
+        compression : str, optional
+            'zstd' or 'gzip' for new objects (defaults to zstd when zstandard is installed)
+        compression_level : int, optional
+            Compression level (defaults to the codec default)
+        max_workers : int, optional
+            Number of threads used to compress or restore files
+        """
+        if compression is None:
+            compression = 'zstd' if importlib.util.find_spec('zstandard') else 'gzip'
+        if compression not in BACKUP_COMPRESSIONS:
+            raise ValueError(f"compression must be one of: {list(BACKUP_COMPRESSIONS)}")
+
+        self.backup_directory = Path(backup_directory)
+        self.objects_directory = self.backup_directory / "objects"
+        self.manifests_directory = self.backup_directory / "manifests"
+        self.compression = compression
+        self.compression_level = compression_level
+        self.max_workers = max_workers
+        # Serializes the check-and-rename of objects, so identical files compressed
+        # concurrently are stored once and counted as deduplicated
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str, compression: str) -> Path:
+        """Path of the object of a content hash (fanned out by its first two characters)."""
+        return self.objects_directory / digest[:2] / f"{digest}{BACKUP_COMPRESSIONS[compression]}"
+
+    def latest_manifest(self, source_name: str) -> Optional[Path]:
+        """Returns the most recent manifest of a source, or None if it was never backed up."""
+        manifests = sorted(self.manifests_directory.glob(f"backup_{source_name}_*.json"))
+        return manifests[-1] if manifests else None
+
+    def backup(self, source: Path, source_name: str, incremental: bool = True) -> Path:
+        """
+        Backs up every file under a directory and writes its manifest.
+
+        Parameters:
+        -----------
+        source : Path
+            Directory to back up
+        source_name : str
+            Name used for the manifests of this directory (e.g. 'result')
+        incremental : bool
+            Whether files with the same size and mtime as in the latest
+            manifest reuse its objects without being read
+
+        Returns:
+        --------
+        Path : Path of the new manifest
+        """
+        parent = self.latest_manifest(source_name) if incremental else None
+        previous = _read_backup_manifest(parent)['files'] if parent else {}
+
+        files = {}
+        errors = {}
+        pending = []
+        stats = {'files': 0, 'unchanged': 0, 'stored': 0, 'deduplicated': 0,
+                 'bytes_read': 0, 'bytes_stored': 0}
+
+        for relative, stat in _walk_files(source):
+            stats['files'] += 1
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            old = previous.get(relative)
+            if (old and old['size'] == entry['size'] and old['mtime_ns'] == entry['mtime_ns']
+                    and self._object_path(old['hash'], old['compression']).exists()):
+                files[relative] = old
+                stats['unchanged'] += 1
+            else:
+                pending.append((relative, entry))
+
+        self.objects_directory.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._store_file, source / relative): (relative, entry)
+                       for relative, entry in pending}
+            for future in as_completed(futures):
+                relative, entry = futures[future]
+                try:
+                    digest, stored_bytes = future.result()
+                except OSError as e:
+                    errors[relative] = f"{type(e).__name__}: {str(e)}"
+                    logger.warning("File not backed up: %s", relative)
+                    continue
+
+                files[relative] = {**entry, 'hash': digest, 'compression': self.compression}
+                stats['bytes_read'] += entry['size']
+                if stored_bytes is None:
+                    stats['deduplicated'] += 1
+                else:
+                    stats['stored'] += 1
+                    stats['bytes_stored'] += stored_bytes
+
+        manifest = {
+            'version': BACKUP_MANIFEST_VERSION,
+            'source': source_name,
+            'source_path': str(source),
+            'created': datetime.now().isoformat(),
+            'parent': parent.name if parent else None,
+            'files': dict(sorted(files.items())),
+            'errors': errors,
+            'stats': stats
+        }
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        manifest_path = self.manifests_directory / f"backup_{source_name}_{timestamp}.json"
+        attempt = 1
+        while manifest_path.exists():
+            attempt += 1
+            manifest_path = self.manifests_directory / f"backup_{source_name}_{timestamp}_{attempt}.json"
+
+        self.manifests_directory.mkdir(parents=True, exist_ok=True)
+        with _atomic_write(manifest_path) as temporary_path:
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        logger.info("  - Files: %s (%s unchanged, %s stored, %s deduplicated, %s errors)",
+                    stats['files'], stats['unchanged'], stats['stored'], stats['deduplicated'], len(errors))
+        logger.info("  - Read: %.2f MB, stored: %.2f MB (%s)",
+                    stats['bytes_read'] / (1024 ** 2), stats['bytes_stored'] / (1024 ** 2), self.compression)
+        return manifest_path
+
+    def _store_file(self, file_path: Path) -> Tuple[str, Optional[int]]:
+        """
+        Hashes and compresses a file in one streaming pass.
+
+        Returns:
+        --------
+        Tuple : (content hash, compressed bytes stored, or None if the object already existed)
+        """
+        temporary_path = self.objects_directory / f".{uuid.uuid4().hex}.tmp"
+        hasher = hashlib.sha256()
+        compressor = _backup_compressor(self.compression, self.compression_level)
+
+        try:
+            with open(file_path, 'rb') as source, open(temporary_path, 'wb') as target:
+                while True:
+                    block = source.read(BACKUP_BLOCK_BYTES)
+                    if not block:
+                        break
+                    hasher.update(block)
+                    target.write(compressor.compress(block))
+                target.write(compressor.flush())
+                target.flush()
+                os.fsync(target.fileno())
+
+            digest = hasher.hexdigest()
+            object_path = self._object_path(digest, self.compression)
+            with self._lock:
+                if object_path.exists():
+                    temporary_path.unlink()
+                    return digest, None
+
+                object_path.parent.mkdir(exist_ok=True)
+                stored_bytes = temporary_path.stat().st_size
+                os.replace(temporary_path, object_path)
+            return digest, stored_bytes
+        except BaseException:
+            temporary_path.unlink(missing_ok=True)
+            raise
+
+    def restore(self, manifest_path: Path, destination: Path) -> Path:
+        """
+        Restores the files of a manifest, verifying their content hashes.
+
+        Parameters:
+        -----------
+        manifest_path : Path
+            Manifest written by backup
+        destination : Path
+            Directory to restore into
+
+        Returns:
+        --------
+        Path : Destination directory
+        """
+        files = _read_backup_manifest(manifest_path)['files']
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = []
+            for relative, entry in files.items():
+                if Path(relative).is_absolute() or '..' in Path(relative).parts:
+                    raise ValueError(f"Unsafe path in backup manifest: {relative}")
+                futures.append(pool.submit(self._restore_file, entry, destination / relative))
+            for future in as_completed(futures):
+                future.result()
+
+        logger.info("Backup restored: %s files in %s", len(files), destination)
+        return destination
+
+    def _restore_file(self, entry: Dict, file_path: Path):
+        """Decompresses one object to its path and restores its mtime."""
+        object_path = self._object_path(entry['hash'], entry['compression'])
+        hasher = hashlib.sha256()
+        decompressor = _backup_decompressor(entry['compression'])
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with _atomic_write(file_path) as temporary_path:
+            with open(object_path, 'rb') as source, open(temporary_path, 'wb') as target:
+                while True:
+                    block = source.read(BACKUP_BLOCK_BYTES)
+                    if not block:
+                        break
+                    data = decompressor.decompress(block)
+                    hasher.update(data)
+                    target.write(data)
+
+            if hasher.hexdigest() != entry['hash']:
+                raise ValueError(f"Corrupted backup object: {object_path}")
+
+        os.utime(file_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+
+
+# Independent utility functions
+def _walk_files(root: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yields the relative POSIX path and stat of every file under root (symbolic links to directories are not followed)."""
+    pending = ['']
+    while pending:
+        relative = pending.pop()
+        try:
+            with os.scandir(root / relative if relative else root) as iterator:
+                for entry in iterator:
+                    name = f"{relative}/{entry.name}" if relative else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(name)
+                        elif entry.is_file():
+                            yield name, entry.stat()
+                    except OSError:
+                        # Removed while listing
+                        continue
+        except OSError as e:
+            logger.warning("Could not list %s: %s", root / relative, e)
+
+
+def _plan_moves_by_date(directory: Path) -> Dict:
+    """
+    Builds the move plan of organize_files_by_date from a single listing of directory.
+
+    Each existing month folder is listed once to find the targets that
+    would be overwritten, and its device is compared with the device of
+    every file to tell renames from copies.
+    """
+    by_folder = {}
+    existing_folders = set()
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            # In-progress atomic writes (see _atomic_write) must stay where they are
+            if entry.name.startswith('.') and entry.name.endswith('.tmp'):
+                continue
+            try:
+                if entry.is_dir():
+                    existing_folders.add(entry.name)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    folder = datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m')
+                    by_folder.setdefault(folder, []).append((entry.name, stat))
+            except OSError:
+                # Removed while listing
+                continue
+
+    directory_device = os.stat(directory).st_dev
+    moves = []
+    folders_to_create = []
+    skipped = 0
+    for folder, files in sorted(by_folder.items()):
+        target = directory / folder
+        taken = set()
+        device = directory_device
+        if folder in existing_folders:
+            try:
+                with os.scandir(target) as iterator:
+                    taken = {entry.name for entry in iterator}
+                device = target.stat().st_dev
+            except OSError as e:
+                logger.warning("Could not list %s: %s", target, e)
+        else:
+            folders_to_create.append(folder)
+
+        for name, stat in sorted(files):
+            if name in taken:
+                skipped += 1
+                continue
+            moves.append({
+                'name': name,
+                'folder': folder,
+                'source': str(directory / name),
+                'destination': str(target / name),
+                'size': stat.st_size,
+                'rename': stat.st_dev == device
+            })
+
+    copies = [move for move in moves if not move['rename']]
+    cost = {
+        'files': len(moves),
+        'renames': len(moves) - len(copies),
+        'copies': len(copies),
+        'bytes_to_copy': sum(move['size'] for move in copies),
+        'folders_to_create': len(folders_to_create),
+        'skipped': skipped
     }
+    return {'moves': moves, 'folders': folders_to_create, 'cost': cost}
 
-    if not report['exists']:
-        report['errors'].append("File does not exist")
-        return report
 
-    if not report['is_file']:
-        report['errors'].append("Path does not point to a file")
-        return report
+def _move_file(move: Dict):
+    """Moves one file of a plan, renaming it when possible and copying it otherwise."""
+    if move['rename']:
+        try:
+            os.rename(move['source'], move['destination'])
+            return
+        except OSError as e:
+            # The device check can be fooled by bind mounts
+            if e.errno != errno.EXDEV:
+                raise
+    shutil.move(move['source'], move['destination'])
+
+
+def _retention_rule_matches(rule: Dict, directory_name: str, relative: str,
+                            stat: os.stat_result, now: float) -> bool:
+    """Checks whether a file meets every condition of a retention rule."""
+    if directory_name not in rule.get('directories', RETENTION_DIRECTORIES):
+        return False
+    # Anchored like glob: 'temp_*' only matches top-level files, 'sub/*' one level down
+    pattern = PurePosixPath(rule.get('pattern', '*'))
+    path = PurePosixPath(relative)
+    if len(path.parts) != len(pattern.parts) or not path.match(str(pattern)):
+        return False
+    if rule.get('days_old') is not None and stat.st_mtime >= now - rule['days_old'] * 24 * 60 * 60:
+        return False
+    if rule.get('min_size_mb') is not None and stat.st_size < rule['min_size_mb'] * 1024**2:
+        return False
+    return True
+
+
+def _delete_files(files: List[Tuple[str, int]]) -> Tuple[int, int, Dict[str, str]]:
+    """Deletes a batch of (path, size) files, returning the files deleted, the bytes freed and the errors by path."""
+    deleted = 0
+    freed_bytes = 0
+    errors = {}
+    for path, size in files:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            # Already removed
+            continue
+        except OSError as e:
+            errors[path] = f"{type(e).__name__}: {str(e)}"
+            continue
+        deleted += 1
+        freed_bytes += size
+    return deleted, freed_bytes, errors
+
+
+def _read_backup_manifest(manifest_path: Path) -> Dict:
+    """Reads a backup manifest, checking its version."""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != BACKUP_MANIFEST_VERSION:
+        raise ValueError(f"Unsupported backup manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def _backup_compressor(compression: str, level: Optional[int] = None):
+    """Streaming compressor producing standard .zst or .gz data."""
+    if compression == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+    # wbits=31 writes a gzip header and trailer
+    return zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+
+
+def _backup_decompressor(compression: str):
+    """Streaming decompressor for objects written by _backup_compressor."""
+    if compression == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(31)
+
+
+def _load_files_index(index_path: Path) -> Dict:
+    """Reads the trees of a files report snapshot, or an empty dict if it is missing or outdated."""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index.get('trees', {}) if index.get('version') == FILES_INDEX_VERSION else {}
 
-    if report['size_bytes'] == 0:
-        report['errors'].append("Empty file")
+
+def _scan_directory_tree(root: Path, previous: Optional[Dict] = None) -> Tuple[Dict, int, int]:
+    """
+    Summarizes every directory under root, reusing unchanged ones from a snapshot.
+
+    Symbolic links to directories are not followed.
+
+    Returns:
+    --------
+    Tuple : (summaries by relative directory, directories listed, directories reused)
+    """
+    previous = previous or {}
+    entries = {}
+    scanned = 0
+    reused = 0
+
+    pending = ['.']
+    while pending:
+        relative = pending.pop()
+        path = root if relative == '.' else root / relative
+        try:
+            # Read before listing, so changes made during the listing trigger a rescan next time
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+
+        entry = previous.get(relative)
+        if entry is not None and entry['mtime_ns'] == mtime_ns:
+            reused += 1
+        else:
+            entry = _summarize_directory(path, mtime_ns)
+            scanned += 1
+
+        entries[relative] = entry
+        pending.extend(name if relative == '.' else f"{relative}/{name}" for name in entry['subdirs'])
+
+    return entries, scanned, reused
+
+
+def _summarize_directory(path: Path, mtime_ns: int) -> Dict:
+    """Lists one directory with os.scandir, stat'ing each file once."""
+    summary = {
+        'mtime_ns': mtime_ns,
+        'subdirs': [],
+        'files': 0,
+        'size': 0,
+        'extensions': {},
+        'newest': None,
+        'oldest': None
+    }
+
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        summary['subdirs'].append(entry.name)
+                        continue
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # Removed while listing
+                    continue
+
+                ext = os.path.splitext(entry.name)[1].lower() or 'no_extension'
+                counts = summary['extensions'].setdefault(ext, [0, 0])
+                counts[0] += 1
+                counts[1] += stat.st_size
+                summary['files'] += 1
+                summary['size'] += stat.st_size
+
+                if summary['newest'] is None or stat.st_mtime > summary['newest'][0]:
+                    summary['newest'] = [stat.st_mtime, entry.name]
+                if summary['oldest'] is None or stat.st_mtime < summary['oldest'][0]:
+                    summary['oldest'] = [stat.st_mtime, entry.name]
+    except OSError as e:
+        logger.warning("Could not list %s: %s", path, e)
+
+    return summary
+
+
+def _summarize_directory_tree(entries: Dict) -> Dict:
+    """Combines the directory summaries of a tree into the files report section."""
+    extensions = {}
+    total_size = 0
+    newest = None
+    oldest = None
+
+    for entry in entries.values():
+        total_size += entry['size']
+        for ext, (count, size) in entry['extensions'].items():
+            stats = extensions.setdefault(ext, {'count': 0, 'size_mb': 0})
+            stats['count'] += count
+            stats['size_mb'] += size / (1024 ** 2)
+        if entry['newest'] and (newest is None or entry['newest'][0] > newest[0]):
+            newest = entry['newest']
+        if entry['oldest'] and (oldest is None or entry['oldest'][0] < oldest[0]):
+            oldest = entry['oldest']
+
+    return {
+        'total_files': sum(entry['files'] for entry in entries.values()),
+        'total_folders': sum(len(entry['subdirs']) for entry in entries.values()),
+        'total_size_mb': total_size / (1024 ** 2),
+        'extensions': extensions,
+        'newest_file': newest[1] if newest else None,
+        'oldest_file': oldest[1] if oldest else None
+    }
+
+
+class SimilarNameIndex:
+    """
+    N-gram inverted index of the file names of a directory for fuzzy matching.
+
+    Names are compared in lowercase and without extension with
+    difflib.SequenceMatcher, as find_similar_files always did, but the exact
+    ratio only runs on names that pass three cheap bounds which never
+    discard a match: length, shared n-grams (q-gram lemma) and quick_ratio.
+    Files sharing a stem are compared once.
+    """
+
+    def __init__(self, directory: Path, ngram: int = SIMILAR_NAME_NGRAM):
+        """
+        Initializes the index and lists the directory.
+
+        Parameters:
+        -----------
+        directory : Path
+            Directory whose file names are indexed
+        ngram : int
+            Size of the indexed n-grams
+        """
+        self.directory = Path(directory)
+        self.ngram = ngram
+        self.files = {}  # file name -> stem
+        self.stems = {}  # stem -> file names, n-gram counts and character counts
+        self.postings = {}  # n-gram -> {stem: count}
+        self.lengths = {}  # stem length -> stems
+        self._mtime_ns = None
+        self._listed_ns = 0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self, force: bool = False) -> Tuple[int, int]:
+        """
+        Lists the directory again and indexes only the names added or removed since the last listing.
+
+        The listing is skipped while the directory mtime is unchanged, unless
+        it changed shortly before the last listing (coarse timestamps).
+
+        Parameters:
+        -----------
+        force : bool
+            Whether to list the directory even if its mtime is unchanged
+
+        Returns:
+        --------
+        Tuple[int, int] : Number of names added and removed
+        """
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if (not force and mtime_ns is not None and mtime_ns == self._mtime_ns
+                and self._listed_ns - mtime_ns > 2 * 10**9):
+            return 0, 0
+
+        listed_ns = time.time_ns()
+        names = set()
+        if mtime_ns is not None:
+            with os.scandir(self.directory) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_file():
+                            names.add(entry.name)
+                    except OSError:
+                        # Removed while listing
+                        continue
+
+        with self._lock:
+            removed = self.files.keys() - names
+            added = names - self.files.keys()
+            for name in removed:
+                self._remove(name)
+            for name in added:
+                self._add(name)
+            self._mtime_ns = mtime_ns
+            self._listed_ns = listed_ns
+
+        if added or removed:
+            logger.debug("Similar name index of %s: %s added, %s removed", self.directory, len(added), len(removed))
+        return len(added), len(removed)
+
+    def _add(self, name: str):
+        """Adds a file name to the index."""
+        stem = Path(name).stem.lower()
+        self.files[name] = stem
+        entry = self.stems.get(stem)
+        if entry is None:
+            grams = Counter(_ngrams(stem, self.ngram))
+            entry = self.stems[stem] = {'files': set(), 'grams': grams, 'chars': Counter(stem)}
+            for gram, count in grams.items():
+                self.postings.setdefault(gram, {})[stem] = count
+            self.lengths.setdefault(len(stem), set()).add(stem)
+        entry['files'].add(name)
+
+    def _remove(self, name: str):
+        """Removes a file name from the index."""
+        stem = self.files.pop(name)
+        entry = self.stems[stem]
+        entry['files'].discard(name)
+        if entry['files']:
+            return
+        del self.stems[stem]
+        for gram in entry['grams']:
+            posting = self.postings[gram]
+            del posting[stem]
+            if not posting:
+                del self.postings[gram]
+        self.lengths[len(stem)].discard(stem)
+        if not self.lengths[len(stem)]:
+            del self.lengths[len(stem)]
+
+    def find(self, base_name: str, threshold: float = 0.8) -> List[Path]:
+        """
+        Finds the files whose name is similar to base_name.
+
+        Parameters:
+        -----------
+        base_name : str
+            Base name to compare
+        threshold : float
+            Similarity threshold (0-1)
+
+        Returns:
+        --------
+        List[Path] : Similar files, most similar first
+        """
+        return self.find_many([base_name], threshold)[base_name]
+
+    def find_many(self, base_names: Iterable[str], threshold: float = 0.8) -> Dict[str, List[Path]]:
+        """
+        Finds the similar files of many base names at once.
+
+        Parameters:
+        -----------
+        base_names : Iterable[str]
+            Base names to compare
+        threshold : float
+            Similarity threshold (0-1)
+
+        Returns:
+        --------
+        Dict[str, List[Path]] : Similar files of each base name, most similar first
+        """
+        results = {}
+        matches = {}
+        with self._lock:
+            for base_name in base_names:
+                query = base_name.lower()
+                if query not in matches:
+                    matches[query] = [self.directory / name for name in self._match(query, threshold)]
+                results[base_name] = matches[query]
+        return results
+
+    def _match(self, query: str, threshold: float) -> List[str]:
+        """Returns the file names whose stem has a ratio of at least threshold with query."""
+        query_length = len(query)
+        query_chars = Counter(query)
+        matcher = SequenceMatcher(None, query)
+        shared_by_length = None
+        scored = []
+
+        for length, stems in self.lengths.items():
+            total = query_length + length
+            # Length bound: at most min(query_length, length) characters can match
+            if total and 2.0 * min(query_length, length) / total < threshold:
+                continue
+
+            # N-gram bound: a ratio >= threshold allows at most this many insertions and deletions,
+            # and each of them destroys at most `ngram` shared n-grams
+            max_distance = int((1 - threshold) * total + 1e-9)
+            min_shared = max(query_length, length) - self.ngram + 1 - self.ngram * max_distance
+            if min_shared > 0:
+                if shared_by_length is None:
+                    shared_by_length = self._shared_ngrams(query)
+                candidates = [stem for stem, shared in shared_by_length.get(length, ()) if shared >= min_shared]
+            else:
+                candidates = stems
+
+            for stem in candidates:
+                # quick_ratio bound: characters in common regardless of order
+                if total and 2.0 * sum((query_chars & self.stems[stem]['chars']).values()) / total < threshold:
+                    continue
+                matcher.set_seq2(stem)
+                similarity = matcher.ratio()
+                if similarity >= threshold:
+                    scored.extend((similarity, name) for name in self.stems[stem]['files'])
+
+        # Sort by similarity descending
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [name for _, name in scored]
+
+    def _shared_ngrams(self, query: str) -> Dict[int, List[Tuple[str, int]]]:
+        """Counts the n-grams each indexed stem shares with query, grouped by stem length."""
+        shared = Counter()
+        for gram, count in Counter(_ngrams(query, self.ngram)).items():
+            for stem, stem_count in self.postings.get(gram, {}).items():
+                shared[stem] += min(count, stem_count)
+        by_length = {}
+        for stem, count in shared.items():
+            by_length.setdefault(len(stem), []).append((stem, count))
+        return by_length
+
+
+def _ngrams(text: str, n: int) -> List[str]:
+    """Returns the overlapping n-grams of text."""
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+@lru_cache(maxsize=SIMILAR_NAME_INDEXES)
+def _similar_name_index(directory: str) -> SimilarNameIndex:
+    """Returns the index of a directory, built on first use and kept for later queries."""
+    return SimilarNameIndex(Path(directory))
+
+
+def find_similar_files(directory: Path, base_name: str, threshold: float = 0.8) -> List[Path]:
+    """
+    Finds files with similar names using approximate matching.
+
+    Uses the SimilarNameIndex of the directory, built on the first query
+    and refreshed incrementally on the following ones.
+
+    Parameters:
+    -----------
+    directory : Path
+        Directory where to search
+    base_name : str
+        Base name to compare
+    threshold : float
+        Similarity threshold (0-1)
+
+    Returns:
+    --------
+    List[Path] : List of similar files
+    """
+    return find_similar_files_batch(directory, [base_name], threshold)[base_name]
+
+
+def find_similar_files_batch(directory: Path, base_names: Iterable[str],
+                             threshold: float = 0.8) -> Dict[str, List[Path]]:
+    """
+    Finds files with names similar to each of many base names.
+
+    Parameters:
+    -----------
+    directory : Path
+        Directory where to search
+    base_names : Iterable[str]
+        Base names to compare
+    threshold : float
+        Similarity threshold (0-1)
+
+    Returns:
+    --------
+    Dict[str, List[Path]] : Similar files of each base name, most similar first
+    """
+    index = _similar_name_index(str(Path(directory).resolve()))
+    index.refresh()
+    results = index.find_many(base_names, threshold)
+    # Keep the directory as given by the caller
+    return {base_name: [Path(directory) / file.name for file in files] for base_name, files in results.items()}
+
+
+def _detect_encoding(sample: bytes) -> str:
+    """
+    Detects the text encoding of a byte sample.
+
+    Checks for a BOM first, then UTF-8 validity, and finally falls back to
+    cp1252 (when Windows-only characters are present) or latin-1.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    try:
+        # Incremental decoder tolerates a multi-byte character cut at the end of the sample
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # Bytes 0x80-0x9F are control characters in latin-1 but printable in cp1252
+    if any(0x80 <= byte <= 0x9F for byte in sample):
+        try:
+            sample.decode('cp1252')
+            return 'cp1252'
+        except UnicodeDecodeError:
+            pass
+
+    return 'latin-1'
+
+
+def _is_number(value: str) -> bool:
+    """Checks if a CSV field looks like a number."""
+    try:
+        float(value.strip().replace(',', '.'))
+        return True
+    except ValueError:
+        return False
+
+
+def sniff_csv_dialect(file_path: Path, sample_bytes: int = CSV_SAMPLE_BYTES) -> Dict:
+    """
+    Detects encoding, delimiter, quoting and header of a CSV file.
+
+    Reads a single fixed-size byte sample and works everything out in memory,
+    so the file is opened only once regardless of the number of candidates.
+
+    Parameters:
+    -----------
+    file_path : Path
+        Path of the CSV file
+    sample_bytes : int
+        Size of the sample read from the start of the file
+
+    Returns:
+    --------
+    Dict : Detected dialect ('encoding', 'delimiter', 'quotechar',
+           'has_header', 'detected')
+    """
+    with _open_decompressed(file_path) as f:
+        sample = f.read(sample_bytes)
+        complete = len(f.read(1)) == 0
+
+    encoding = _detect_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=complete)
+
+    # Drop the last line if the sample cut it in half
+    lines = text.splitlines()
+    if not complete and len(lines) > 1:
+        lines = lines[:-1]
+    text = '\n'.join(lines)
+
+    dialect = {
+        'encoding': encoding,
+        'delimiter': ',',
+        'quotechar': '"',
+        'has_header': True,
+        'detected': False
+    }
+
+    if not text.strip():
+        return dialect
+
+    try:
+        sniffed = csv.Sniffer().sniff(text, delimiters=''.join(CSV_DELIMITERS))
+        dialect['delimiter'] = sniffed.delimiter
+        dialect['quotechar'] = sniffed.quotechar or '"'
+        dialect['detected'] = True
+    except csv.Error:
+        # Fall back to the delimiter with the most consistent count per line
+        best_score = 0
+        for delim in CSV_DELIMITERS:
+            counts = [line.count(delim) for line in lines[:50] if line.strip()]
+            if counts and min(counts) > 0:
+                score = min(counts) * sum(1 for c in counts if c == counts[0])
+                if score > best_score:
+                    best_score = score
+                    dialect['delimiter'] = delim
+                    dialect['detected'] = True
+
+    # Header: kept like pandas does unless the evidence is strong. The first row
+    # is data only if it mixes numbers and text exactly like the rows below it;
+    # an all-numeric first row (e.g. years) stays the header.
+    rows = list(csv.reader(lines[:CSV_HEADER_CHECK_ROWS + 1], delimiter=dialect['delimiter'],
+                           quotechar=dialect['quotechar']))
+    if len(rows) > 1:
+        first_types = [_is_number(field) for field in rows[0]]
+        if any(first_types) and not all(first_types) and all(
+                [_is_number(field) for field in row] == first_types for row in rows[1:]):
+            dialect['has_header'] = False
+
+    if not dialect['detected']:
+        logger.warning("Could not detect CSV format, using default configuration")
+
+    return dialect
+
+
+def _is_json_lines(file_path: Path) -> bool:
+    """
+    Checks if a JSON file holds one record per line (JSON lines).
+
+    Only a bounded prefix is parsed: an array ('[...') is never JSON lines,
+    a first line that fits in the sample must parse as an object, and a
+    longer one is skipped unparsed. Another line starting with '{' must
+    follow, so a single-line JSON document written with pandas' default
+    orient is not mistaken for JSON lines.
+    """
+    with io.TextIOWrapper(_open_decompressed(file_path), encoding='utf-8') as f:
+        first_line, newline, rest = f.read(JSON_LINES_SAMPLE_CHARS).lstrip().partition('\n')
+        if not first_line.startswith('{'):
+            return False
+
+        if newline:
+            try:
+                if not isinstance(json.loads(first_line), dict):
+                    return False
+            except ValueError:
+                return False
+        else:
+            # Long first line: read on to its end without parsing it
+            while not newline:
+                block = f.read(JSON_LINES_SAMPLE_CHARS)
+                if not block:
+                    return False
+                _, newline, rest = block.partition('\n')
+
+        rest = rest.lstrip()
+        while not rest:
+            block = f.read(JSON_LINES_SAMPLE_CHARS)
+            if not block:
+                return False
+            rest = block.lstrip()
+        return rest.startswith('{')
+
+
+def _memory_bytes(df: pd.DataFrame) -> int:
+    """Memory of a DataFrame in bytes, estimated with data_processor.measure_memory when it is available."""
+    try:
+        # Imported here so this module can still be used without data_processor
+        from data_processor import measure_memory
+    except ImportError:
+        return int(df.memory_usage(deep=True).sum())
+    return int(measure_memory(df))
+
+
+def _log_metrics(operation: str, started: float, shape: Optional[Tuple[int, int]] = None,
+                 df: Optional[pd.DataFrame] = None, path: Optional[Path] = None, **fields) -> None:
+    """
+    Logs one machine-readable metrics record for an operation.
+
+    The record (operation, rows, columns, bytes in memory, file_bytes on
+    disk, seconds plus any extra fields) is logged as JSON on the metrics
+    logger and attached to the log record as `metrics`. Nothing is measured
+    unless INFO is enabled for the metrics logger.
+
+    Parameters:
+    -----------
+    operation : str
+        Name of the operation
+    started : float
+        time.perf_counter() value when the operation started
+    shape : Tuple[int, int], optional
+        (rows, columns) processed (defaults to the shape of df)
+    df : pd.DataFrame, optional
+        DataFrame whose memory is reported as bytes
+    path : Path, optional
+        File whose size on disk is reported as file_bytes
+    **fields
+        Additional values for the record
+    """
+    if not metrics_logger.isEnabledFor(logging.INFO):
+        return
+
+    metrics = {'operation': operation, 'rows': None, 'columns': None, 'bytes': None, 'file_bytes': None,
+               'seconds': round(time.perf_counter() - started, 6)}
+    if shape is None and df is not None:
+        shape = df.shape
+    if shape is not None:
+        metrics['rows'], metrics['columns'] = (None if value is None else int(value) for value in shape)
+    if df is not None:
+        metrics['bytes'] = _memory_bytes(df)
+    if path is not None:
+        try:
+            metrics['file_bytes'] = path.stat().st_size
+        except OSError:
+            pass
+    metrics.update(fields)
+
+    metrics_logger.info("%s", json.dumps(metrics, default=str), extra={'metrics': metrics})
+
+
+def _is_cacheable(extension: str, columns: Optional[List[str]], sheet_name: Union[str, int]) -> bool:
+    """
+    Checks if a load can go through the load cache.
+
+    Columnar files are already fast to read, and the cache stores whole
+    default reads only, so projected or other-sheet loads never hit it.
+    """
+    return extension not in COLUMNAR_EXTENSIONS and columns is None and sheet_name == 0
+
+
+@lru_cache(maxsize=None)
+def _excel_engine(extension: str, preferred: Optional[str] = None) -> str:
+    """
+    Returns the pandas engine used to read an Excel file.
+
+    A preferred engine is used as given (so any engine pandas supports can
+    be plugged in); otherwise the first installed engine of EXCEL_ENGINES.
+    """
+    if preferred is not None:
+        if preferred in EXCEL_ENGINE_PACKAGES and not _excel_engine_installed(preferred):
+            raise ImportError(f"Excel engine '{preferred}' is not installed. "
+                              f"Install it with: pip install {EXCEL_ENGINE_PACKAGES[preferred][1]}")
+        return preferred
+
+    candidates = EXCEL_ENGINES.get(extension, ['openpyxl'])
+    for engine in candidates:
+        if _excel_engine_installed(engine):
+            return engine
+
+    raise ImportError(f"Reading {extension} files requires one of: {candidates}. "
+                      f"Install it with: pip install {EXCEL_ENGINE_PACKAGES[candidates[-1]][1]}")
+
+
+def _excel_engine_installed(engine: str) -> bool:
+    """Checks if an Excel engine and its pandas reader are available."""
+    if importlib.util.find_spec(EXCEL_ENGINE_PACKAGES[engine][0]) is None:
+        return False
+    # pandas < 2.2 has no calamine reader
+    return engine != 'calamine' or importlib.util.find_spec('pandas.io.excel._calamine') is not None
+
+
+def _read_excel(file_path: Path, sheet_name: Union[str, int] = 0,
+                columns: Optional[List[str]] = None, engine: Optional[str] = None, **options) -> pd.DataFrame:
+    """Reads one sheet of an Excel file with the given engine and column projection."""
+    return pd.read_excel(file_path, sheet_name=sheet_name, usecols=columns, engine=engine, **options)
+
+
+def _excel_sheet_names(file_path: Path, engine: str) -> List[str]:
+    """Lists the sheets of a workbook without parsing their cells."""
+    if engine == 'openpyxl':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            return workbook.sheetnames
+        finally:
+            workbook.close()
+
+    with pd.ExcelFile(file_path, engine=engine) as workbook:
+        return workbook.sheet_names
+
+
+def _import_pyarrow():
+    """Imports pyarrow with a helpful message when it is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet/Feather/Arrow formats require pyarrow. "
+                          "Install it with: pip install pyarrow") from e
+    return pyarrow
+
+
+def _read_columnar_table(file_path: Path, columns: Optional[List[str]] = None,
+                         filters: Optional[List[Tuple]] = None):
+    """
+    Reads a Parquet, Feather or Arrow IPC file into a pyarrow Table.
+
+    Parquet filters are pushed down to skip whole row groups using their
+    statistics. Feather/Arrow IPC files are memory-mapped, so uncompressed
+    files are read without copying the column buffers.
+    """
+    pa = _import_pyarrow()
+
+    if file_path.suffix.lower() == '.parquet':
+        return pa.parquet.read_table(file_path, columns=columns, filters=filters, memory_map=True)
+
+    # Memory-mapped columns are not copied, so filter first and project afterwards
+    table = pa.feather.read_table(file_path, memory_map=True)
+    if filters:
+        table = table.filter(pa.parquet.filters_to_expression(filters))
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def _iter_columnar_batches(file_path: Path, chunksize: int,
+                           columns: Optional[List[str]] = None,
+                           filters: Optional[List[Tuple]] = None) -> Iterator[pd.DataFrame]:
+    """Scans a columnar file batch by batch applying projection and filters."""
+    pa = _import_pyarrow()
+
+    file_format = 'parquet' if file_path.suffix.lower() == '.parquet' else 'ipc'
+    dataset = pa.dataset.dataset(file_path, format=file_format)
+    expression = pa.parquet.filters_to_expression(filters) if filters else None
+
+    for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=chunksize):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def _write_columnar_table(df: pd.DataFrame, file_path: Path, format: str,
+                          compression: Optional[str] = None, compression_level: Optional[int] = None):
+    """
+    Writes a DataFrame as Parquet, Feather or Arrow IPC.
+
+    By default 'parquet' uses Snappy and 'feather' LZ4 to save disk; 'arrow'
+    is written uncompressed so it can be memory-mapped back with zero copies
+    (a compression codec gives that up).
+    """
+    if compression == 'gzip' and format != 'parquet':
+        raise ValueError("Feather/Arrow files support 'zstd' or 'lz4' compression only")
+
+    pa = _import_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    if format == 'parquet':
+        pa.parquet.write_table(table, file_path, compression=compression or 'snappy',
+                               compression_level=compression_level)
+    elif format == 'feather':
+        pa.feather.write_feather(table, file_path, compression=compression or 'lz4',
+                                 compression_level=compression_level)
+    else:
+        pa.feather.write_feather(table, file_path, compression=compression or 'uncompressed',
+                                 compression_level=compression_level)
+
+
+def _pandas_compression(compression: Optional[str], compression_level: Optional[int] = None) -> Optional[Dict]:
+    """Builds the compression argument of pandas writers for a method and level."""
+    if compression is None:
+        return None
+    options = {'method': compression}
+    if compression_level is not None:
+        options[COMPRESSION_LEVEL_ARGUMENTS[compression]] = compression_level
+    return options
+
+
+def _open_compressed(file_path: Path, compression: Optional[Dict] = None):
+    """Opens a binary file for writing through the codec of a pandas compression argument."""
+    if compression is None:
+        return open(file_path, 'wb')
+
+    options = {k: v for k, v in compression.items() if k != 'method'}
+    if compression['method'] == 'gzip':
+        import gzip
+        return gzip.open(file_path, 'wb', **options)
+    if compression['method'] == 'zstd':
+        import zstandard
+        return zstandard.open(file_path, 'wb', cctx=zstandard.ZstdCompressor(**options))
+    import lz4.frame
+    return lz4.frame.open(file_path, 'wb', **options)
+
+
+def _data_format(file_path: Path) -> Tuple[str, Optional[str]]:
+    """Returns the format suffix of a data file and its compression method, e.g. ('.csv', 'gzip') for results.csv.gz."""
+    suffixes = [suffix.lower() for suffix in file_path.suffixes] or ['']
+    compression = COMPRESSION_METHODS.get(suffixes[-1])
+    if compression is None or len(suffixes) < 2:
+        return suffixes[-1], None
+    return suffixes[-2], compression
+
+
+def _open_decompressed(file_path: Path):
+    """Opens a data file for binary reading, decompressing it when its last suffix names a codec."""
+    compression = _data_format(file_path)[1]
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(file_path, 'rb')
+    if compression == 'zstd':
+        import zstandard
+        return zstandard.open(file_path, 'rb')
+    if compression == 'lz4':
+        import lz4.frame
+        return lz4.frame.open(file_path, 'rb')
+    return open(file_path, 'rb')
+
+
+@contextmanager
+def _pandas_source(file_path: Path):
+    """
+    Yields what a pandas reader should open for a data file.
+
+    Plain, gzip and zstd files are passed as paths so pandas infers the codec
+    from the suffix (compression='infer'); lz4, which pandas cannot read, is
+    passed as a decompressed stream.
+    """
+    if _data_format(file_path)[1] != 'lz4':
+        yield file_path
+        return
+    with _open_decompressed(file_path) as handle:
+        yield handle
+
+
+def _fallback_dialect(file_path: Path, dialect: Dict, error: UnicodeDecodeError) -> Dict:
+    """Returns the dialect with the next fallback encoding after a decode error, re-raising it when none is left."""
+    encoding = dialect['encoding']
+    if encoding.startswith('utf-16') or encoding == CSV_FALLBACK_ENCODINGS[-1]:
+        raise error
+    fallback = CSV_FALLBACK_ENCODINGS[CSV_FALLBACK_ENCODINGS.index(encoding) + 1] \
+        if encoding in CSV_FALLBACK_ENCODINGS else CSV_FALLBACK_ENCODINGS[0]
+    logger.warning("%s does not decode as %s past the sniffed sample (%s), reading it as %s",
+                   file_path.name, encoding, error.reason, fallback)
+    return {**dialect, 'encoding': fallback}
+
+
+def _iter_csv_chunks(file_path: Path, chunksize: int, dialect: Dict) -> Iterator[pd.DataFrame]:
+    """
+    Streams a CSV in chunks with a sniffed dialect.
+
+    A decode error past the sample restarts the stream with the next fallback
+    encoding, skipping the rows that were already yielded.
+    """
+    yielded = 0
+    while True:
+        try:
+            skip = yielded
+            for chunk in _read_chunks(pd.read_csv, file_path, chunksize=chunksize, **csv_read_options(dialect)):
+                if skip >= len(chunk):
+                    skip -= len(chunk)
+                    continue
+                chunk = chunk.iloc[skip:]
+                skip = 0
+                yielded += len(chunk)
+                yield chunk
+            return
+        except UnicodeDecodeError as e:
+            dialect = _fallback_dialect(file_path, dialect, e)
+
+
+def _iter_combined(loaded: Iterator[Tuple[str, pd.DataFrame]], optimize=None) -> Iterator[pd.DataFrame]:
+    """Yields loaded frames indexed by ('source_file', row), the lazy counterpart of a combined load_many frame."""
+    for name, df in loaded:
+        if optimize is not None:
+            df = optimize(df, inplace=True)
+        yield df.set_axis(pd.MultiIndex.from_product([[name], df.index], names=['source_file', None]))
+
+
+def _read_chunks(read, file_path: Path, **options) -> Iterator[pd.DataFrame]:
+    """Yields the chunks of a pandas chunked reader, keeping the (decompressed) source open while iterating."""
+    with _pandas_source(file_path) as source, read(source, compression='infer', **options) as reader:
+        yield from reader
+
+
+@contextmanager
+def _atomic_write(file_path: Path) -> Iterator[Path]:
+    """
+    Yields a temporary path next to file_path and moves it into place once written.
+
+    The data is fsynced before the rename and the rename itself afterwards,
+    so readers see either the previous file or the complete new one. The
+    temporary file is removed if writing fails.
+    """
+    file_path = Path(file_path)
+    # Hidden and in the same directory, so the rename never crosses file systems
+    temporary_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        yield temporary_path
+        with open(temporary_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+
+    # Persist the directory entry (not supported on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        directory_fd = os.open(file_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+
+def write_excel_streaming(data: Union[pd.DataFrame, Iterable[pd.DataFrame]], file_path: Path,
+                          sheet_name: str = "Sheet1", split: str = "sheets",
+                          chunksize: int = EXCEL_WRITE_CHUNK_ROWS,
+                          max_rows: int = EXCEL_MAX_ROWS) -> Tuple[List[Path], Tuple[int, int]]:
+    """
+    Writes a DataFrame or an iterator of chunks to xlsx with bounded memory.
+
+    openpyxl's write-only mode streams each row to disk, so only the chunk
+    being converted is kept in memory, unlike df.to_excel which builds every
+    cell of the workbook first. Rows beyond the sheet limit continue in a new
+    sheet ('Sheet1', 'Sheet1_2', ...) or a new file ('name.xlsx', 'name_2.xlsx', ...).
+    Each file is renamed into place only once complete.
+
+    Parameters:
+    -----------
+    data : pd.DataFrame or Iterable[pd.DataFrame]
+        DataFrame or chunks with the same columns (the index is not written)
+    file_path : Path
+        Path of the xlsx file (of the first part when split across files)
+    sheet_name : str
+        Name of the first sheet
+    split : str
+        Where rows beyond max_rows go: 'sheets' or 'files'
+    chunksize : int
+        Rows converted at a time when data is a DataFrame
+    max_rows : int
+        Rows per sheet, header included (Excel's limit by default)
+
+    Returns:
+    --------
+    Tuple : (paths of the written files, (rows, columns) written)
+    """
+    if split not in EXCEL_SPLIT_MODES:
+        raise ValueError(f"split must be one of: {EXCEL_SPLIT_MODES}")
+    if max_rows < 2:
+        raise ValueError("max_rows must leave room for the header and one row")
+
+    from openpyxl import Workbook
+
+    file_path = Path(file_path)
+    chunks = data
+    if isinstance(data, pd.DataFrame):
+        # An empty frame still yields one chunk so its header is written
+        chunks = (data.iloc[start:start + chunksize] for start in range(0, max(len(data), 1), chunksize))
+
+    paths = []
+    workbook = None
+    sheet = None
+    sheet_rows = 0
+    total_sheets = 0
+    total_rows = 0
+    header = None
+
+    def start_sheet():
+        nonlocal workbook, sheet, sheet_rows, total_sheets
+        if workbook is None or split == 'files':
+            if workbook is not None:
+                _save_workbook(workbook, paths[-1])
+            workbook = Workbook(write_only=True)
+            part = len(paths) + 1
+            paths.append(file_path if part == 1 else file_path.with_name(f"{file_path.stem}_{part}{file_path.suffix}"))
+        total_sheets += 1
+        title = sheet_name if total_sheets == 1 or split == 'files' else f"{sheet_name}_{total_sheets}"
+        sheet = workbook.create_sheet(title)
+        sheet.append(header)
+        sheet_rows = 1
+
+    try:
+        for chunk in chunks:
+            if header is None:
+                header = [str(col) for col in chunk.columns]
+                start_sheet()
+            elif [str(col) for col in chunk.columns] != header:
+                raise ValueError("All chunks must have the same columns")
+
+            for row in _excel_rows(chunk):
+                if sheet_rows == max_rows:
+                    start_sheet()
+                sheet.append(row)
+                sheet_rows += 1
+            total_rows += len(chunk)
+    except BaseException:
+        if workbook is not None:
+            _discard_workbook(workbook)
+        raise
+
+    if workbook is None:
+        raise ValueError("No chunks to write")
+    _save_workbook(workbook, paths[-1])
+
+    return paths, (total_rows, len(header))
+
+
+def _save_workbook(workbook, file_path: Path):
+    """Saves a write-only workbook atomically."""
+    with _atomic_write(file_path) as temporary_path:
+        workbook.save(temporary_path)
+
+
+def _discard_workbook(workbook):
+    """Closes the sheets of an unsaved write-only workbook and removes their temporary files."""
+    for sheet in workbook.worksheets:
+        if sheet._writer is None:
+            continue
+        with suppress(OSError, ValueError):
+            if not sheet.closed:
+                sheet.close()
+            sheet._writer.cleanup()
+
+
+def _excel_rows(chunk: pd.DataFrame) -> Iterator[Tuple]:
+    """Converts a chunk to rows of Python values, with nulls as empty cells."""
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def _write_csv_chunks(chunks: Iterable[pd.DataFrame], file_path: Path,
+                      compression: Optional[Dict] = None) -> Tuple[int, int]:
+    """Writes chunks to one (optionally compressed) CSV stream with a single header; returns the (rows, columns) written."""
+    rows = 0
+    columns = 0
+    with _open_compressed(file_path, compression) as binary, \
+            io.TextIOWrapper(binary, encoding='utf-8', newline='') as handle:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(handle, header=i == 0, index=False)
+            rows += len(chunk)
+            columns = chunk.shape[1]
+    return rows, columns
+
+
+def _is_json_serializable(value) -> bool:
+    """Checks if a value can be stored in a JSON file."""
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def csv_read_options(dialect: Dict) -> Dict:
+    """
+    Translates a sniffed dialect into keyword arguments for pd.read_csv.
+
+    Parameters:
+    -----------
+    dialect : Dict
+        Dialect returned by sniff_csv_dialect
+
+    Returns:
+    --------
+    Dict : Keyword arguments for pd.read_csv
+    """
+    return {
+        'sep': dialect['delimiter'],
+        'encoding': dialect['encoding'],
+        'quotechar': dialect['quotechar'],
+        'header': 0 if dialect['has_header'] else None
+    }
+
+
+def validate_file_integrity(file_path: Path) -> Dict:
+    """
+    Validates the integrity of a data file.
+
+    Parameters:
+    -----------
+    file_path : Path
+        Path to file to validate
+
+    Returns:
+    --------
+    Dict : Validation report
+    """
+    report = _integrity_report(file_path)
+    if report['errors']:
         return report
 
     # Try to read the file
     try:
         if report['extension'] in ['.xlsx', '.xls']:
-            df = pd.read_excel(file_path, nrows=5)
+            df = _read_excel(file_path, engine=_excel_engine(report['extension']), nrows=5)
         elif report['extension'] == '.csv':
             df = pd.read_csv(file_path, nrows=5)
         elif report['extension'] == '.json':
-            df = pd.read_json(file_path, nrows=5)
+            # nrows is only supported for JSON lines
+            if _is_json_lines(file_path):
+                df = pd.read_json(file_path, lines=True, nrows=5)
+            else:
+                df = pd.read_json(file_path).head(5)
         else:
             report['errors'].append(f"Unsupported format: {report['extension']}")
             return report
@@ -501,6 +2960,309 @@ def validate_file_integrity(file_path: Path) -> Dict:
     return report
 
 
+def probe_file_integrity(file_path: Path, rows: int = INTEGRITY_PROBE_ROWS) -> Dict:
+    """
+    Validates a data file with a lightweight format probe instead of a pandas reader.
+
+    Binary formats are checked by their magic bytes, xlsx files through the
+    zip central directory and an incremental parse of the first rows of the
+    first worksheet, CSV files by their first lines and JSON files with an
+    incremental parse of the first records.
+
+    Parameters:
+    -----------
+    file_path : Path
+        Path to file to validate
+    rows : int
+        Number of data rows parsed
+
+    Returns:
+    --------
+    Dict : Validation report (same keys as validate_file_integrity; rows and
+           columns stay 0 for formats only checked by their magic bytes)
+    """
+    report = _integrity_report(file_path)
+    if report['errors']:
+        return report
+
+    extension = report['extension']
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(max(len(magic) for magic in INTEGRITY_MAGIC_BYTES.values()))
+            magic = INTEGRITY_MAGIC_BYTES.get(extension)
+            if magic and not head.startswith(magic):
+                raise ValueError(f"Not a {extension} file (unexpected magic bytes)")
+            if extension in INTEGRITY_TRAILING_MAGIC:
+                f.seek(-len(magic), os.SEEK_END)
+                if f.read() != magic:
+                    raise ValueError("File is truncated (missing trailing magic bytes)")
+
+        if extension == '.xlsx':
+            report['rows'], report['columns'] = _probe_xlsx(file_path, rows)
+        elif extension == '.csv':
+            report['rows'], report['columns'] = _probe_csv(file_path, rows)
+        elif extension in ['.json', '.jsonl', '.ndjson']:
+            report['rows'], report['columns'] = _probe_json(file_path, rows)
+        elif extension not in INTEGRITY_MAGIC_BYTES:
+            report['errors'].append(f"Unsupported format: {extension}")
+            return report
+
+        report['readable'] = True
+
+    except Exception as e:
+        report['errors'].append(f"Error reading file: {str(e)}")
+
+    return report
+
+
+def scan_integrity(directory: Path, index_path: Optional[Path] = None, max_workers: Optional[int] = None,
+                   rows: int = INTEGRITY_PROBE_ROWS) -> Dict:
+    """
+    Validates every file under a directory concurrently with probe_file_integrity.
+
+    Each file is checksummed (SHA-256) and the checksums are saved with the
+    reports in index_path. On a re-scan, files whose size and mtime are
+    unchanged are skipped without being read, and files whose checksum is
+    unchanged are not probed again.
+
+    Parameters:
+    -----------
+    directory : Path
+        Directory to scan (subdirectories included)
+    index_path : Path, optional
+        JSON file where checksums and reports are kept between scans
+    max_workers : int, optional
+        Number of threads (defaults to the executor default)
+    rows : int
+        Number of data rows parsed per file
+
+    Returns:
+    --------
+    Dict : Report per relative path and a summary with counts and throughput
+    """
+    directory = Path(directory)
+    start = time.perf_counter()
+    previous = _load_integrity_index(index_path, directory) if index_path else {}
+
+    entries = {}
+    summary = {'files': 0, 'valid': 0, 'invalid': 0, 'skipped': 0, 'probed': 0,
+               'bytes': 0, 'bytes_hashed': 0}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_scan_file_integrity, directory / relative, stat, previous.get(relative), rows):
+                   relative for relative, stat in _walk_files(directory)}
+        for future in as_completed(futures):
+            relative = futures[future]
+            entry, hashed, probed = future.result()
+            entries[relative] = entry
+            summary['files'] += 1
+            summary['bytes'] += entry['size']
+            if hashed:
+                summary['bytes_hashed'] += entry['size']
+            if probed:
+                summary['probed'] += 1
+            else:
+                summary['skipped'] += 1
+            if entry['report']['readable'] and not entry['report']['errors']:
+                summary['valid'] += 1
+            else:
+                summary['invalid'] += 1
+
+    if index_path:
+        try:
+            Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+            with _atomic_write(index_path) as temporary_path:
+                with open(temporary_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': INTEGRITY_INDEX_VERSION, 'directory': str(directory),
+                               'files': entries}, f)
+        except OSError as e:
+            logger.warning("Could not save the integrity index: %s", e)
+
+    elapsed = time.perf_counter() - start
+    summary['seconds'] = round(elapsed, 3)
+    summary['files_per_second'] = round(summary['files'] / elapsed, 1) if elapsed else 0.0
+    summary['mb_per_second'] = round(summary['bytes'] / 1024**2 / elapsed, 2) if elapsed else 0.0
+
+    logger.info("Integrity scan of %s: %s/%s valid, %s unchanged, %s files/s",
+                directory, summary['valid'], summary['files'], summary['skipped'], summary['files_per_second'])
+    return {
+        'directory': str(directory),
+        'files': {relative: entries[relative]['report'] for relative in sorted(entries)},
+        'summary': summary
+    }
+
+
+def _integrity_report(file_path: Path) -> Dict:
+    """Creates a validation report, with an error if the path is not a non-empty file."""
+    file_path = Path(file_path)
+    try:
+        stat = file_path.stat()
+    except OSError:
+        stat = None
+
+    report = {
+        'file': str(file_path),
+        'exists': stat is not None,
+        'is_file': stat is not None and file_path.is_file(),
+        'size_bytes': stat.st_size if stat else 0,
+        'extension': file_path.suffix.lower(),
+        'readable': False,
+        'rows': 0,
+        'columns': 0,
+        'errors': []
+    }
+
+    if not report['exists']:
+        report['errors'].append("File does not exist")
+    elif not report['is_file']:
+        report['errors'].append("Path does not point to a file")
+    elif report['size_bytes'] == 0:
+        report['errors'].append("Empty file")
+    return report
+
+
+def _probe_xlsx(file_path: Path, rows: int) -> Tuple[int, int]:
+    """Checks the zip central directory of an xlsx file and parses the first rows of its first worksheet."""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            missing = [name for name in ['[Content_Types].xml', 'xl/workbook.xml'] if name not in names]
+            if missing:
+                raise ValueError(f"Not an xlsx workbook (missing {', '.join(missing)})")
+            worksheets = sorted(name for name in names if name.startswith('xl/worksheets/') and name.endswith('.xml'))
+            if not worksheets:
+                raise ValueError("Workbook has no worksheets")
+            worksheet = 'xl/worksheets/sheet1.xml' if 'xl/worksheets/sheet1.xml' in names else worksheets[0]
+
+            # Only the first rows are decompressed and parsed
+            sheet_rows = 0
+            columns = 0
+            with archive.open(worksheet) as stream:
+                for _, element in ElementTree.iterparse(stream):
+                    if element.tag.endswith('}row'):
+                        if sheet_rows == 0:
+                            columns = sum(1 for cell in element if cell.tag.endswith('}c'))
+                        sheet_rows += 1
+                        element.clear()
+                        if sheet_rows > rows:
+                            break
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Corrupt zip container: {str(e)}")
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Corrupt worksheet XML: {str(e)}")
+    # The first row is the header
+    return max(sheet_rows - 1, 0), columns
+
+
+def _probe_csv(file_path: Path, rows: int) -> Tuple[int, int]:
+    """Parses the first lines of a CSV file with its sniffed dialect."""
+    dialect = sniff_csv_dialect(file_path)
+    with open(file_path, 'r', encoding=dialect['encoding'], newline='') as f:
+        reader = csv.reader(f, delimiter=dialect['delimiter'], quotechar=dialect['quotechar'])
+        header = next(reader, [])
+        columns = len(header)
+        data_rows = 0 if dialect['has_header'] else 1
+        for row in reader:
+            if data_rows >= rows:
+                break
+            if len(row) > columns:
+                raise ValueError(f"Expected {columns} fields in line {reader.line_num}, saw {len(row)}")
+            data_rows += 1
+    return data_rows, columns
+
+
+def _probe_json(file_path: Path, rows: int) -> Tuple[int, int]:
+    """
+    Parses the first records of a JSON array or of a JSON lines file without loading the whole file.
+
+    The first character decides the layout before anything is parsed, and at
+    most `rows` records are decoded; only a single top-level object (pandas'
+    default orient) has to be parsed whole.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buffer = f.read(CSV_SAMPLE_BYTES).lstrip()
+        if not buffer.startswith('['):
+            if file_path.suffix.lower() in ['.jsonl', '.ndjson'] or _is_json_lines(file_path):
+                records = []
+                f.seek(0)
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+                        if len(records) == rows:
+                            break
+                return len(records), len(records[0]) if records and isinstance(records[0], dict) else 0
+
+            # A top-level object (e.g. pandas' default orient) must be parsed whole
+            document = json.loads(buffer + f.read())
+            if not isinstance(document, dict):
+                raise ValueError("Top-level JSON value is not an array or an object")
+            first = next(iter(document.values()), None)
+            return min(len(first), rows) if isinstance(first, (dict, list)) else 0, len(document)
+
+        # Decode one array element at a time, reading more text only when an element is cut
+        records = []
+        position = 1
+        complete = False
+        while len(records) < rows:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                break
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+                records.append(record)
+            except json.JSONDecodeError:
+                if complete:
+                    raise
+                more = f.read(CSV_SAMPLE_BYTES)
+                complete = not more
+                buffer = buffer[position:] + more
+                position = 0
+    return len(records), len(records[0]) if records and isinstance(records[0], dict) else 0
+
+
+def _load_integrity_index(index_path: Path, directory: Path) -> Dict:
+    """Loads the entries of an integrity index, or an empty dict if missing, outdated or of another directory."""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if index.get('version') != INTEGRITY_INDEX_VERSION or index.get('directory') != str(directory):
+        return {}
+    return index.get('files', {})
+
+
+def _scan_file_integrity(file_path: Path, stat: os.stat_result, previous: Optional[Dict],
+                         rows: int) -> Tuple[Dict, bool, bool]:
+    """
+    Validates one file of an integrity scan.
+
+    Returns the index entry and whether the file was hashed and probed.
+    """
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if previous and previous['size'] == entry['size'] and previous['mtime_ns'] == entry['mtime_ns']:
+        return previous, False, False
+
+    try:
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(BACKUP_BLOCK_BYTES), b''):
+                hasher.update(block)
+        entry['hash'] = hasher.hexdigest()
+    except OSError as e:
+        entry['hash'] = None
+        entry['report'] = _integrity_report(file_path)
+        entry['report']['errors'].append(f"Error reading file: {str(e)}")
+        return entry, False, True
+
+    if previous and previous.get('hash') == entry['hash']:
+        return {**entry, 'report': previous['report']}, True, False
+
+    entry['report'] = probe_file_integrity(file_path, rows)
+    return entry, True, True
+
+
 if __name__ == "__main__":
     # Test code
     print("Testing FileManager module...")
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+instrumentation.py
+==================
+
+Timing and profiling instrumentation for the helpers modules.
+
+Operations decorated with @instrumented() (or wrapped in measure()) record
+wall time, CPU time, peak RSS, the tracemalloc peak, rows and bytes of
+every call into an in-process registry, which can be exported as JSON or
+in the Prometheus text format. Instrumentation is off until enable() is
+called; while it is off a decorated function only pays one flag check.
+
+Usage:
+    import instrumentation
+    instrumentation.enable(trace_memory=True)
+    ...
+    print(instrumentation.REGISTRY.to_prometheus())
+
+Author: Your name
+Date: {current_date}
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Prefix of the exported Prometheus metrics
+PROMETHEUS_PREFIX = "project_operation"
+
+# Exported statistics: (name, Prometheus type, help text)
+INSTRUMENTATION_METRICS = [
+    ('calls', 'counter', "Calls of the operation"),
+    ('errors', 'counter', "Calls that raised an exception"),
+    ('wall_seconds', 'counter', "Wall time spent in the operation"),
+    ('wall_seconds_max', 'gauge', "Slowest call of the operation"),
+    ('cpu_seconds', 'counter', "CPU time of the process during the operation"),
+    ('rows', 'counter', "Rows processed by the operation"),
+    ('bytes', 'counter', "Bytes processed by the operation"),
+    ('peak_rss_bytes', 'gauge', "Peak resident memory of the process after a call"),
+    ('rss_growth_bytes_max', 'gauge', "Largest growth of the peak resident memory during a call"),
+    ('traced_peak_bytes_max', 'gauge', "Largest tracemalloc peak above the memory in use at the start of a call")
+]
+
+# Instrumentation state: whether calls are recorded and whether tracemalloc is used
+_enabled = False
+_trace_memory = False
+_stacks = threading.local()  # Open measurements of each thread (for nested tracemalloc peaks)
+
+
+class Measurement:
+    """
+    One call being measured. Rows and bytes can be set by the measured code
+    (e.g. inside a measure() block) when they are not taken from its result.
+    """
+
+    __slots__ = ['name', 'rows', 'bytes', 'traced_floor']
+
+    def __init__(self, name: str, rows: Optional[int] = None, bytes: Optional[int] = None):
+        self.name = name
+        self.rows = rows
+        self.bytes = bytes
+        self.traced_floor = 0  # tracemalloc peak of nested calls, which reset the peak
+
+
+# Handed out by measure() when instrumentation is disabled
+_NULL_MEASUREMENT = Measurement("")
+
+
+class InstrumentationRegistry:
+    """
+    Thread-safe aggregate of the measurements of every operation.
+
+    Times, rows and bytes are summed per operation; memory values keep their
+    maximum. Calls made in worker processes (e.g. by FileManager.load_many
+    with a process pool) are recorded in the registry of those processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float, error: bool = False,
+               rows: Optional[int] = None, bytes: Optional[int] = None, peak_rss_bytes: Optional[int] = None,
+               rss_growth_bytes: Optional[int] = None, traced_peak_bytes: Optional[int] = None):
+        """Adds one call to the statistics of an operation."""
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = {metric: 0 for metric, _, _ in INSTRUMENTATION_METRICS}
+            stats['calls'] += 1
+            stats['errors'] += int(error)
+            stats['wall_seconds'] += wall_seconds
+            stats['wall_seconds_max'] = max(stats['wall_seconds_max'], wall_seconds)
+            stats['cpu_seconds'] += cpu_seconds
+            stats['rows'] += rows or 0
+            stats['bytes'] += bytes or 0
+            stats['peak_rss_bytes'] = max(stats['peak_rss_bytes'], peak_rss_bytes or 0)
+            stats['rss_growth_bytes_max'] = max(stats['rss_growth_bytes_max'], rss_growth_bytes or 0)
+            stats['traced_peak_bytes_max'] = max(stats['traced_peak_bytes_max'], traced_peak_bytes or 0)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Returns a copy of the statistics by operation name."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in sorted(self._operations.items())}
+
+    def reset(self):
+        """Discards every recorded call."""
+        with self._lock:
+            self._operations.clear()
+
+    def to_json(self, path: Optional[Path] = None) -> str:
+        """
+        Exports the statistics as JSON.
+
+        Parameters:
+        -----------
+        path : Path, optional
+            File where the document is also written
+
+        Returns:
+        --------
+        str : JSON document with the generation time and the statistics by operation
+        """
+        document = json.dumps({
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'trace_memory': _trace_memory,
+            'operations': self.snapshot()
+        }, indent=2)
+        if path is not None:
+            Path(path).write_text(document, encoding='utf-8')
+        return document
+
+    def to_prometheus(self, path: Optional[Path] = None) -> str:
+        """
+        Exports the statistics in the Prometheus text exposition format,
+        one metric per statistic labelled by operation.
+
+        Parameters:
+        -----------
+        path : Path, optional
+            File where the text is also written (e.g. for the node_exporter textfile collector)
+
+        Returns:
+        --------
+        str : Metrics in Prometheus text format
+        """
+        operations = self.snapshot()
+        lines = []
+        for metric, metric_type, help_text in INSTRUMENTATION_METRICS:
+            full_name = f"{PROMETHEUS_PREFIX}_{metric}" + ("_total" if metric_type == 'counter' else "")
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for name, stats in operations.items():
+                lines.append(f'{full_name}{{operation="{_escape_label(name)}"}} {stats[metric]}')
+        text = "\n".join(lines) + "\n"
+        if path is not None:
+            Path(path).write_text(text, encoding='utf-8')
+        return text
+
+
+# Registry that instrumented() and measure() record into
+REGISTRY = InstrumentationRegistry()
+
+
+def enable(trace_memory: bool = False):
+    """
+    Starts recording instrumented calls.
+
+    Parameters:
+    -----------
+    trace_memory : bool
+        Whether to also trace Python allocations with tracemalloc, which
+        reports the peak memory of each call but slows allocations down
+    """
+    global _enabled, _trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _trace_memory = trace_memory
+    _enabled = True
+    logger.info("Instrumentation enabled (tracemalloc: %s)", trace_memory)
+
+
+def disable():
+    """Stops recording instrumented calls (recorded statistics are kept)."""
+    global _enabled, _trace_memory
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = False
+    _trace_memory = False
+
+
+def is_enabled() -> bool:
+    """Checks if instrumented calls are being recorded."""
+    return _enabled
+
+
+@contextmanager
+def measure(name: str, rows: Optional[int] = None, bytes: Optional[int] = None) -> Iterator[Measurement]:
+    """
+    Measures a block of code as one call of an operation.
+
+    CPU time is the CPU time of the whole process, so work done by other
+    threads at the same time is included. The tracemalloc peak is only
+    measured when instrumentation was enabled with trace_memory=True.
+
+    Parameters:
+    -----------
+    name : str
+        Name of the operation
+    rows : int, optional
+        Rows processed (can also be set on the yielded measurement)
+    bytes : int, optional
+        Bytes processed (can also be set on the yielded measurement)
+
+    Returns:
+    --------
+    Iterator[Measurement] : Measurement of the block
+    """
+    if not _enabled:
+        yield _NULL_MEASUREMENT
+        return
+
+    measurement = Measurement(name, rows, bytes)
+    trace_memory = _trace_memory and tracemalloc.is_tracing()
+    stack = _measurement_stack()
+    if trace_memory:
+        traced_before, traced_peak = tracemalloc.get_traced_memory()
+        if stack:
+            # Resetting the peak hides it from the enclosing call, so keep it there
+            stack[-1].traced_floor = max(stack[-1].traced_floor, traced_peak)
+        tracemalloc.reset_peak()
+    stack.append(measurement)
+    rss_before = _peak_rss_bytes()
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    error = False
+    try:
+        yield measurement
+    except BaseException:
+        error = True
+        raise
+    finally:
+        wall_seconds = time.perf_counter() - started
+        cpu_seconds = time.process_time() - cpu_started
+        stack.pop()
+        traced_peak_bytes = None
+        if trace_memory:
+            traced_peak = max(tracemalloc.get_traced_memory()[1], measurement.traced_floor)
+            traced_peak_bytes = max(traced_peak - traced_before, 0)
+            if stack:
+                stack[-1].traced_floor = max(stack[-1].traced_floor, traced_peak)
+        rss_after = _peak_rss_bytes()
+        REGISTRY.record(name, wall_seconds, cpu_seconds, error, measurement.rows, measurement.bytes,
+                        peak_rss_bytes=rss_after,
+                        rss_growth_bytes=rss_after - rss_before if rss_after is not None else None,
+                        traced_peak_bytes=traced_peak_bytes)
+
+
+def instrumented(name: Optional[str] = None,
+                 counter: Optional[Callable] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator that measures every call of a function with measure().
+
+    Rows and bytes are taken from the result when it is a DataFrame (rows
+    and shallow memory), a dict of DataFrames or a file path (size on disk),
+    otherwise from the first DataFrame argument. While instrumentation is
+    disabled the function is called directly.
+
+    Parameters:
+    -----------
+    name : str, optional
+        Name of the operation (defaults to the qualified function name)
+    counter : callable, optional
+        counter(result, args, kwargs) -> (rows, bytes), replacing the default counting
+
+    Returns:
+    --------
+    Callable : Decorator
+    """
+    def decorator(function):
+        operation = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with measure(operation) as measurement:
+                result = function(*args, **kwargs)
+                counted = counter(result, args, kwargs) if counter is not None else _count(result, args)
+                measurement.rows, measurement.bytes = counted
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _count(result, args: Tuple) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Default (rows, bytes) of a call: those of its result (the first item of
+    a tuple result) when it is a DataFrame, a dict of DataFrames or a file
+    path, with whatever is missing taken from its first DataFrame argument.
+    """
+    rows = size = None
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, dict) and result and all(_is_frame(value) for value in result.values()):
+        counts = [_count_frame(value) for value in result.values()]
+        rows, size = sum(rows for rows, _ in counts), sum(size for _, size in counts)
+    elif _is_frame(result):
+        rows, size = _count_frame(result)
+    elif isinstance(result, (Path, str)):
+        try:
+            size = os.stat(result).st_size
+        except (OSError, ValueError):
+            pass
+
+    if rows is None:
+        frame = next((value for value in args if _is_frame(value)), None)
+        if frame is not None:
+            rows, frame_size = _count_frame(frame)
+            size = frame_size if size is None else size
+    return rows, size
+
+
+def _is_frame(value) -> bool:
+    """Checks if a value is a DataFrame without importing pandas."""
+    return hasattr(value, 'memory_usage') and hasattr(value, 'columns') and getattr(value, 'ndim', 0) == 2
+
+
+def _count_frame(df) -> Tuple[int, int]:
+    """
+    Rows and shallow memory of a DataFrame, summed from its column arrays
+    (df.memory_usage builds a Series per call and deep memory sizes every string).
+    """
+    arrays = getattr(getattr(df, '_mgr', None), 'arrays', None)
+    if arrays is None:
+        return len(df), int(df.memory_usage(index=True, deep=False).sum())
+    return len(df), int(df.index.nbytes + sum(getattr(array, 'nbytes', 0) for array in arrays))
+
+
+def _measurement_stack() -> list:
+    """Open measurements of the current thread."""
+    stack = getattr(_stacks, 'stack', None)
+    if stack is None:
+        stack = _stacks.stack = []
+    return stack
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident memory of the process in bytes, from resource on Unix or
+    psutil on Windows (None when neither is available).
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    return None
+
+
+def _escape_label(value: str) -> str:
+    """Escapes a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+if __name__ == "__main__":
+    # Usage example
+    logging.basicConfig(level=logging.INFO)
+    enable(trace_memory=True)
+
+    @instrumented()
+    def build_table(size):
+        return [list(range(100)) for _ in range(size)]
+
+    for size in [1_000, 10_000]:
+        build_table(size)
+    with measure("sleep") as measurement:
+        time.sleep(0.05)
+        measurement.rows = 1
+
+    print(REGISTRY.to_json())
+    print(REGISTRY.to_prometheus())
@@ -20,8 +20,12 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "helpers"))
 
 # Standard imports
-from datetime import datetime
+from datetime import datetime, timedelta
+import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 
 # Third-party imports (uncomment as needed)
 # import pandas as pd
@@ -32,26 +36,160 @@ import logging
 # from helpers.data_processor import DataProcessor
 # from helpers.file_manager import FileManager
 
+# Timing instrumentation of the helpers (standard library only)
+import instrumentation
+
+# Log files: size at which the daily file is rotated and rotated files kept per day
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Background thread that writes queued log records (see setup_logging)
+_log_listener = None
+
+# Instrumentation of the helpers: environment variables that turn it on and report formats
+INSTRUMENT_ENV_VAR = "PROJECT_INSTRUMENT"  # 'json' or 'prometheus' ('1' means json)
+TRACE_MEMORY_ENV_VAR = "PROJECT_TRACE_MEMORY"
+INSTRUMENT_FORMATS = ['json', 'prometheus']
+
+class DailyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Writes to <log_dir>/project_YYYYMMDD.log, switching to a new file at
+    midnight and rotating the current one (.1, .2, ...) when it reaches max_bytes.
+    """
+
+    def __init__(self, log_dir, prefix="project", max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        self.log_dir = Path(log_dir)
+        self.prefix = prefix
+        self._start_day(datetime.now().date())
+        super().__init__(self.baseFilename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding='utf-8', delay=True)
+
+    def _start_day(self, day):
+        """Point the handler to the file of the given day."""
+        self.day = day
+        self.baseFilename = os.path.abspath(self.log_dir / f"{self.prefix}_{day.strftime('%Y%m%d')}.log")
+        self.next_day_at = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record):
+        if record.created >= self.next_day_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        today = datetime.now().date()
+        if today == self.day:
+            super().doRollover()
+            return
+        # New day: close the previous day's file and start today's
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self._start_day(today)
+
 def setup_logging():
     """
     Configure the logging system for the project.
     Logs are saved in the data/logs/ folder
+
+    Loggers only put records on a queue; a background thread writes them
+    to the daily log file and the console, so logging calls never wait for
+    disk or terminal I/O. The queue is flushed when the program exits.
     """
+    global _log_listener
+    if _log_listener is not None:
+        return logging.getLogger(__name__)
+
     # Create logs directory if it doesn't exist
     log_dir = Path("data/logs")
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_dir / f"project_{datetime.now().strftime('%Y%m%d')}.log"),
-            logging.StreamHandler()
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = DailyRotatingFileHandler(log_dir)
+    console_handler = logging.StreamHandler()
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+
+    # Configure logging (the queue handler keeps the bare message; the listener's handlers format it)
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                                   respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(stop_logging)
     return logging.getLogger(__name__)
 
+def stop_logging():
+    """
+    Write the records still in the queue and close the log handlers.
+    Runs automatically at exit.
+    """
+    global _log_listener
+    if _log_listener is None:
+        return
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = None
+
+def setup_instrumentation(report_format=None, trace_memory=False):
+    """
+    Turn on the timing instrumentation of the helpers if it was requested
+    with --instrument or the PROJECT_INSTRUMENT environment variable.
+    The report is written to data/logs/ when the program exits.
+
+    Parameters:
+    -----------
+    report_format : str, optional
+        'json' or 'prometheus' (defaults to the environment variable; None keeps it off)
+    trace_memory : bool
+        Whether to also measure memory peaks with tracemalloc (or PROJECT_TRACE_MEMORY=1)
+
+    Returns:
+    --------
+    str : Report format, or None if instrumentation stays off
+    """
+    if report_format is None:
+        value = os.environ.get(INSTRUMENT_ENV_VAR, "").strip().lower()
+        if value in ['', '0', 'false', 'no', 'off']:
+            return None
+        report_format = value if value in INSTRUMENT_FORMATS else 'json'
+    trace_memory = trace_memory or os.environ.get(TRACE_MEMORY_ENV_VAR, "") == "1"
+
+    instrumentation.enable(trace_memory=trace_memory)
+    atexit.register(write_instrumentation_report, report_format)
+    return report_format
+
+def write_instrumentation_report(report_format="json"):
+    """
+    Write the instrumentation statistics to data/logs/instrumentation_YYYYMMDD_HHMMSS.json
+    (or .prom for the Prometheus text format).
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_dir = Path("data/logs")
+    log_dir.mkdir(parents=True, exist_ok=True)
+    if report_format == 'prometheus':
+        report_path = log_dir / f"instrumentation_{timestamp}.prom"
+        instrumentation.REGISTRY.to_prometheus(report_path)
+    else:
+        report_path = log_dir / f"instrumentation_{timestamp}.json"
+        instrumentation.REGISTRY.to_json(report_path)
+    logging.getLogger(__name__).info("Instrumentation report saved: %s", report_path)
+    return report_path
+
+def parse_arguments(argv=None):
+    """
+    Parse the command line options of the program.
+    """
+    parser = argparse.ArgumentParser(description="My Complete Python Project")
+    parser.add_argument('--instrument', nargs='?', const='json', choices=INSTRUMENT_FORMATS,
+                        help="Time the helpers and write a report to data/logs/ "
+                             f"(same as {INSTRUMENT_ENV_VAR}=json|prometheus)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help=f"Also measure memory peaks with tracemalloc, slower (same as {TRACE_MEMORY_ENV_VAR}=1)")
+    return parser.parse_args(argv)
+
 def verify_project_structure():
     """
     Verify that all necessary folders exist.
@@ -135,10 +273,15 @@ def main():
     Main function of the program.
     Coordinates all project operations.
     """
+    args = parse_arguments()
+
     # Configure logging
     logger = setup_logging()
     logger.info("Starting application")
 
+    # Timing instrumentation (off unless requested)
+    setup_instrumentation(args.instrument, args.trace_memory)
+
     # Show information
     show_project_info()
 
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_summary.py
+====================
+
+Benchmark of data_processor.create_executive_summary.
+
+Compares the vectorized numeric engine against the previous per-column
+loop on a wide synthetic DataFrame and checks that both produce the
+same statistics.
+
+Usage:
+    python scripts/benchmark_summary.py --rows 1000000 --columns 200
+
+Author: Your name
+Date: {current_date}
+"""
+
+import argparse
+import numbers
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add helpers directory to path for importing custom modules
+sys.path.append(str(Path(__file__).parent.parent / "helpers"))
+
+from data_processor import create_executive_summary, _summarize_numeric_columns
+
+
+def per_column_executive_summary(df, numeric_columns):
+    """
+    Reference implementation: the previous summary, with one set of pandas
+    reductions per numeric column and the null mask recomputed per section.
+    """
+    return {
+        'data_quality': {
+            'total_null_values': df.isnull().sum().sum(),
+            'duplicate_rows': df.duplicated().sum(),
+            'completeness_percentage': ((df.size - df.isnull().sum().sum()) / df.size) * 100
+        },
+        'numeric_columns': per_column_numeric_statistics(df, numeric_columns)
+    }
+
+
+def per_column_numeric_statistics(df, numeric_columns):
+    """
+    Reference numeric section: dropna, mean, std, min, max and three quantiles per column.
+    """
+    statistics = {}
+    for col in numeric_columns:
+        series = df[col].dropna()
+        statistics[col] = {
+            'count': len(series),
+            'mean': series.mean(),
+            'std': series.std(),
+            'min': series.min(),
+            'max': series.max(),
+            'q25': series.quantile(0.25),
+            'q50': series.quantile(0.50),
+            'q75': series.quantile(0.75),
+            'null_values': df[col].isnull().sum()
+        }
+    return statistics
+
+
+def create_sample_data(rows, columns, seed=42):
+    """
+    Creates a wide DataFrame with float (with nulls) and integer columns.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        if i % 2 == 0:
+            values = rng.normal(100, 15, rows)
+            values[rng.random(rows) < 0.05] = np.nan
+            data[f'float_{i}'] = values
+        else:
+            data[f'int_{i}'] = rng.integers(0, 1000, rows)
+    return pd.DataFrame(data)
+
+
+def same_value(a, b):
+    """
+    Compares two statistics treating NaN as equal.
+
+    Means and standard deviations of columns with nulls are summed in a
+    different order than after dropna(), so they may differ in the last bits.
+    Counts may be Python or NumPy integers.
+    """
+    if pd.isna(a) and pd.isna(b):
+        return True
+    if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+        return a == b
+    if type(a) != type(b):
+        return False
+    return a == b or bool(np.isclose(a, b, rtol=1e-12, atol=0))
+
+
+def time_call(function, repeat):
+    """Returns the best wall time of several calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of create_executive_summary")
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--columns', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = create_sample_data(args.rows, args.columns)
+    numeric_columns = df.columns.tolist()
+    print(f"Data: {args.rows:,} rows × {args.columns} columns")
+
+    # Correctness check against the per-column reference
+    expected = per_column_executive_summary(df, numeric_columns)
+    actual = create_executive_summary(df, numeric_columns, [])
+    mismatches = [(col, key) for col in numeric_columns for key in expected['numeric_columns'][col]
+                  if not same_value(expected['numeric_columns'][col][key], actual['numeric_columns'][col][key])]
+    mismatches += [key for key in expected['data_quality']
+                   if not same_value(expected['data_quality'][key], actual['data_quality'][key])]
+    if mismatches:
+        print(f"Mismatching statistics: {mismatches[:10]}")
+        sys.exit(1)
+    print("Output matches the per-column implementation")
+
+    null_counts = df.isnull().sum()
+    timings = {
+        'Numeric statistics': (
+            time_call(lambda: per_column_numeric_statistics(df, numeric_columns), args.repeat),
+            time_call(lambda: _summarize_numeric_columns(df, numeric_columns, null_counts), args.repeat)
+        ),
+        'Complete summary': (
+            time_call(lambda: per_column_executive_summary(df, numeric_columns), args.repeat),
+            time_call(lambda: create_executive_summary(df, numeric_columns, []), args.repeat)
+        )
+    }
+
+    print(f"{'':20} {'per-column':>12} {'vectorized':>12} {'speedup':>9}")
+    for name, (per_column_time, vectorized_time) in timings.items():
+        print(f"{name:20} {per_column_time:>11.3f}s {vectorized_time:>11.3f}s "
+              f"{per_column_time / vectorized_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,16 +11,79 @@ Autor: Tu nombre
 Fecha: {fecha_actual}
 """
 
+import copy
+import json
+import re
+import time
+import weakref
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import logging
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+try:
+    from instrumentation import instrumentado
+except ImportError:  # instrumentation.py no se copió junto con este módulo
+    def instrumentado(nombre=None, contador=None):
+        return lambda funcion: funcion
+
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Un registro legible por máquina por operación (ver _registrar_metricas)
+logger_metricas = logging.getLogger(f"{__name__}.metrics")
+
+# Cuantiles reportados para columnas numéricas en el resumen ejecutivo
+CUANTILES_RESUMEN = [0.25, 0.50, 0.75]
+
+# Los bloques numéricos se copian en lotes de columnas de a lo sumo estos bytes
+BYTES_LOTE_NUMERICO = 64 * 1024 ** 2
+
+# Optimización de memoria
+RATIO_MAX_UNICOS_CATEGORIA = 0.5  # Columnas de texto con menos valores distintos por fila pasan a category
+TIPOS_REDUCCION_ENTEROS = [np.int8, np.int16, np.int32]
+TIPOS_REDUCCION_SIN_SIGNO = [np.uint8, np.uint16, np.uint32]
+
+# Medición de memoria
+TAMAÑO_MUESTRA_MEMORIA = 1000  # Valores por columna object medidos por la estimación muestreada
+_MEMO_MEMORIA = {}  # (id del frame, tamaño de muestra o None si es exacta) -> (referencia débil, versión, bytes)
+
+# Normalización de nombres de columnas
+TAMAÑO_MEMO_NOMBRES_COLUMNAS = 4096  # Nombres y encabezados distintos recordados entre llamadas
+MODOS_COLISION_COLUMNAS = ['warn', 'raise', 'suffix']
+
+# Componentes de fecha que procesar_fechas puede extraer (y su atributo en Series.dt)
+COMPONENTES_FECHA = ['año', 'mes', 'dia', 'dia_semana', 'trimestre', 'es_fin_semana']
+ATRIBUTOS_COMPONENTES_FECHA = {'año': 'year', 'mes': 'month', 'dia': 'day', 'trimestre': 'quarter'}
+# Mismos valores que Series.dt.day_name()
+DIAS_SEMANA = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+TAMAÑO_MUESTRA_FORMATO_FECHA = 1000  # Valores verificados contra el formato de fecha inferido
 
+# Formatos de resultado de detectar_outliers_iqr_dataframe
+SALIDAS_OUTLIERS = ['mask', 'indices', 'counts']
+
+# Tamaños de los acumuladores del resumen por bloques
+TAMAÑO_COMPACTADOR_SKETCH = 1000  # Elementos por compactador del sketch de cuantiles
+CAPACIDAD_VALORES_FRECUENTES = 1000  # Valores distintos contados por columna categórica
+PRECISION_SKETCH_DISTINTOS = 12  # HyperLogLog usa 2**12 registros (~1,6% de error)
+
+# Detección de duplicados a partir de hashes de fila de 64 bits
+MODOS_DUPLICADOS = ['exact', 'approximate']
+PRECISION_SKETCH_DUPLICADOS = 14  # 2**14 registros (~0,8% de error en filas distintas)
+FILAS_COMPACTAR_DUPLICADOS = 1_000_000  # Hashes de fila pendientes antes de deduplicarlos
+MULTIPLICADOR_HASH_FILA = 0x100000001B3  # Encadena los hashes de columna para que importe su orden
+SEMILLA_SEGUNDO_HASH_FILA = 0x9E3779B97F4A7C15  # Semilla del hash independiente del modo exacto
+CLAVES_HASH_FILA = ['0123456789123456', 'f3a9c1e07b5d2864']  # Claves de hash_array para textos, una por semilla
+
+
+@instrumentado()
 def validar_dataframe(df, nombre_dataset="Dataset"):
     """
     Valida un DataFrame y reporta problemas comunes.
@@ -36,53 +99,415 @@ def validar_dataframe(df, nombre_dataset="Dataset"):
     --------
     dict : Diccionario con el reporte de validación
     """
+    inicio = time.perf_counter()
     reporte = {
         'dataset': nombre_dataset,
         'filas': len(df),
         'columnas': len(df.columns),
         'valores_nulos': df.isnull().sum().sum(),
-        'duplicados': df.duplicated().sum(),
-        'memoria_mb': df.memory_usage(deep=True).sum() / (1024 ** 2),
+        'duplicados': contar_filas_duplicadas(df),
+        'memoria_mb': medir_memoria(df) / (1024 ** 2),
         'columnas_con_nulos': df.columns[df.isnull().any()].tolist(),
         'tipos_datos': df.dtypes.to_dict()
     }
 
-    logger.info(f"Validación completada para {nombre_dataset}")
-    logger.info(f"  - Dimensiones: {reporte['filas']} filas x {reporte['columnas']} columnas")
-    logger.info(f"  - Valores nulos: {reporte['valores_nulos']}")
-    logger.info(f"  - Duplicados: {reporte['duplicados']}")
+    logger.info("Validación completada para %s", nombre_dataset)
+    logger.info("  - Dimensiones: %s filas x %s columnas", reporte['filas'], reporte['columnas'])
+    logger.info("  - Valores nulos: %s", reporte['valores_nulos'])
+    logger.info("  - Duplicados: %s", reporte['duplicados'])
+    _registrar_metricas('validar_dataframe', inicio, df, dataset=nombre_dataset)
 
     return reporte
 
 
-def limpiar_nombres_columnas(df):
+@instrumentado()
+def optimizar_memoria(df, en_lugar=False, ratio_categoria=RATIO_MAX_UNICOS_CATEGORIA,
+                      reducir_decimales=True, texto_arrow=True, enteros_sin_signo=False):
+    """
+    Reduce la memoria de un DataFrame convirtiendo cada columna a un tipo más pequeño.
+
+    - Los enteros pasan al menor tipo del mismo signo que contenga su rango;
+      las columnas con signo pasan a sin signo solo con enteros_sin_signo=True,
+      porque restar en una columna sin signo da la vuelta en vez de quedar negativo.
+    - float64 pasa a float32 solo si todos los valores sobreviven la conversión.
+    - Las columnas de texto con pocos valores distintos pasan a category; el
+      resto de columnas solo de texto usa el tipo string respaldado por Arrow.
+
+    Los enteros más pequeños pueden desbordarse en operaciones aritméticas
+    posteriores, así que está pensado para datos cargados que se leen más
+    de lo que se modifican. El reporte antes/después se registra en el log
+    y se guarda en df.attrs['optimizacion_memoria'].
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame a optimizar
+    en_lugar : bool
+        Si es True, convierte las columnas del propio df
+    ratio_categoria : float
+        Máximo de valores distintos por fila para que una columna de texto pase a category
+    reducir_decimales : bool
+        Si intentar float64 -> float32
+    texto_arrow : bool
+        Si convertir el resto de columnas de texto a strings de Arrow (requiere pyarrow)
+    enteros_sin_signo : bool
+        Si las columnas de enteros con signo sin valores negativos pueden pasar a sin signo
+
+    Returns:
+    --------
+    pandas.DataFrame : DataFrame con tipos optimizados
+    """
+    inicio = time.perf_counter()
+    memoria_antes = medir_memoria(df)
+    df_optimizado = df if en_lugar else df.copy(deep=False)
+    tipo_texto = _tipo_texto_arrow() if texto_arrow else None
+    conversiones = {}
+
+    for col in df_optimizado.columns:
+        serie = df_optimizado[col]
+        nuevo_tipo = _tipo_optimizado(serie, ratio_categoria, reducir_decimales, tipo_texto, enteros_sin_signo)
+        if nuevo_tipo is not None:
+            conversiones[col] = f"{serie.dtype} -> {nuevo_tipo}"
+            df_optimizado[col] = serie.astype(nuevo_tipo)
+
+    memoria_despues = medir_memoria(df_optimizado)
+    reporte = {
+        'memoria_antes_mb': float(memoria_antes / (1024 ** 2)),
+        'memoria_despues_mb': float(memoria_despues / (1024 ** 2)),
+        'reduccion_porcentaje': float((1 - memoria_despues / memoria_antes) * 100) if memoria_antes else 0.0,
+        'conversiones': conversiones
+    }
+    df_optimizado.attrs['optimizacion_memoria'] = reporte
+
+    logger.info("Memoria optimizada: %.2f MB -> %.2f MB (%.1f%% menos, %s columnas convertidas)",
+                reporte['memoria_antes_mb'], reporte['memoria_despues_mb'], reporte['reduccion_porcentaje'],
+                len(conversiones))
+    _registrar_metricas('optimizar_memoria', inicio, df_optimizado, bytes_memoria=memoria_despues,
+                        bytes_antes=memoria_antes, conversiones=len(conversiones))
+    return df_optimizado
+
+
+def _tipo_optimizado(serie, ratio_categoria, reducir_decimales, tipo_texto, enteros_sin_signo=False):
+    """Menor tipo seguro para una columna, o None para mantener el actual."""
+    tipo = serie.dtype
+    if not isinstance(tipo, np.dtype):
+        # Tipos de extensión: solo se compacta el tipo string por defecto (no categórico)
+        if isinstance(tipo, pd.StringDtype) and _es_baja_cardinalidad(serie, ratio_categoria):
+            return 'category'
+        return None
+
+    if tipo.kind in 'iu':
+        if len(serie) == 0:
+            return None
+        minimo, maximo = serie.min(), serie.max()
+        sin_signo = tipo.kind == 'u' or (enteros_sin_signo and minimo >= 0)
+        candidatos = TIPOS_REDUCCION_SIN_SIGNO if sin_signo else TIPOS_REDUCCION_ENTEROS
+        for candidato in candidatos:
+            info = np.iinfo(candidato)
+            if info.min <= minimo and maximo <= info.max and np.dtype(candidato).itemsize < tipo.itemsize:
+                return np.dtype(candidato)
+        return None
+
+    if tipo == np.float64 and reducir_decimales:
+        valores = serie.to_numpy()
+        convertidos = valores.astype(np.float32)
+        # NaN != NaN, así que los nulos se comparan aparte
+        if np.array_equal(convertidos.astype(np.float64), valores, equal_nan=True):
+            return np.dtype(np.float32)
+        return None
+
+    if tipo == object and pd.api.types.infer_dtype(serie, skipna=True) == 'string':
+        if _es_baja_cardinalidad(serie, ratio_categoria):
+            return 'category'
+        return tipo_texto
+
+    return None
+
+
+def _es_baja_cardinalidad(serie, ratio_categoria):
+    """Si una columna tiene pocos valores distintos por fila para guardarse como category."""
+    return len(serie) > 0 and serie.nunique() <= ratio_categoria * len(serie)
+
+
+def _tipo_texto_arrow():
+    """Tipo string respaldado por Arrow, o None (con una advertencia) si pyarrow no está instalado."""
+    try:
+        return pd.StringDtype(storage="pyarrow")
+    except ImportError:
+        logger.warning("pyarrow no está instalado, las columnas de texto mantienen el tipo object. "
+                       "Instálalo con: pip install pyarrow")
+        return None
+
+
+def medir_memoria(df, exacto=False, tamaño_muestra=TAMAÑO_MUESTRA_MEMORIA):
+    """
+    Mide la memoria de un DataFrame en bytes, índice incluido.
+
+    df.memory_usage(deep=True) mide cada objeto de Python de cada columna
+    object. Aquí solo las columnas object (y un índice object) se miden en
+    profundidad, a partir de una muestra aleatoria de tamaño_muestra valores
+    salvo que exacto sea True; los demás dtypes reportan el tamaño exacto
+    de sus buffers.
+
+    Los resultados se memorizan por frame y se reutilizan mientras conserve
+    el mismo índice, columnas y arreglos de columnas, así que volver a medir
+    el mismo frame (p. ej. al cargarlo y luego validarlo) no cuesta nada.
+    Los valores editados en el lugar no se detectan; usar exacto=True tras
+    esas ediciones.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame a medir
+    exacto : bool
+        Si se mide cada objeto en lugar de una muestra
+    tamaño_muestra : int
+        Valores muestreados por columna object
+
+    Returns:
+    --------
+    int : Memoria en bytes (estimada salvo que sea exacta)
+    """
+    version = _version_frame(df)
+    claves = [(id(df), None)] if exacto else [(id(df), None), (id(df), tamaño_muestra)]
+    for clave in claves:
+        memo = _MEMO_MEMORIA.get(clave)
+        if memo is not None and memo[0]() is df and memo[1] == version:
+            return memo[2]
+
+    filas = len(df)
+    muestreado = not exacto and filas > tamaño_muestra
+    if muestreado:
+        posiciones = np.random.default_rng(0).integers(0, filas, tamaño_muestra)
+    total = 0
+    for valores in [df.index] + [df.iloc[:, i] for i in range(df.shape[1])]:
+        if muestreado and valores.dtype == object:
+            muestra = valores[posiciones] if isinstance(valores, pd.Index) else valores.iloc[posiciones]
+            total += _bytes_profundos(muestra) * filas / tamaño_muestra
+        else:
+            total += _bytes_profundos(valores)
+    total = int(total)
+
+    if version is not None:
+        clave = (id(df), tamaño_muestra if muestreado else None)
+        _MEMO_MEMORIA[clave] = (weakref.ref(df, lambda _, clave=clave: _MEMO_MEMORIA.pop(clave, None)),
+                                version, total)
+    return total
+
+
+def _version_frame(df):
+    """
+    Identidad del índice, las columnas y cada arreglo de columna de un frame.
+
+    Asignar, agregar o eliminar columnas y reindexar reemplazan algunos de
+    estos objetos, lo que invalida las mediciones memorizadas.
+    """
+    arreglos = getattr(getattr(df, '_mgr', None), 'arrays', None)
+    if arreglos is None:
+        return None
+    return df.shape, id(df.index), id(df.columns), tuple(id(arreglo) for arreglo in arreglos)
+
+
+def _bytes_profundos(valores):
+    """Memoria profunda de una Series (sin su índice) o de un Index."""
+    if isinstance(valores, pd.Index):
+        return valores.memory_usage(deep=True)
+    return valores.memory_usage(deep=True, index=False)
+
+
+def _registrar_metricas(operacion, inicio, df=None, dimensiones=None, bytes_memoria=None, **campos):
+    """
+    Registra un registro de métricas legible por máquina para una operación.
+
+    El registro (operacion, filas, columnas, bytes, segundos y cualquier
+    campo adicional) se escribe como JSON en el logger de métricas y se
+    adjunta al registro de log como `metricas`. No se mide nada si INFO no
+    está habilitado para el logger de métricas.
+
+    Parameters:
+    -----------
+    operacion : str
+        Nombre de la operación
+    inicio : float
+        Valor de time.perf_counter() al iniciar la operación
+    df : pandas.DataFrame, optional
+        DataFrame resultante, cuyas dimensiones y memoria se reportan
+    dimensiones : tuple, optional
+        (filas, columnas) procesadas (por defecto las dimensiones de df)
+    bytes_memoria : int, optional
+        Bytes ya medidos (por defecto medir_memoria(df))
+    **campos
+        Valores adicionales para el registro
+    """
+    if not logger_metricas.isEnabledFor(logging.INFO):
+        return
+
+    metricas = {'operacion': operacion, 'filas': None, 'columnas': None, 'bytes': None,
+                'segundos': round(time.perf_counter() - inicio, 6)}
+    if dimensiones is None and df is not None:
+        dimensiones = df.shape
+    if dimensiones is not None:
+        metricas['filas'], metricas['columnas'] = int(dimensiones[0]), int(dimensiones[1])
+    if bytes_memoria is None and df is not None:
+        bytes_memoria = medir_memoria(df)
+    if bytes_memoria is not None:
+        metricas['bytes'] = int(bytes_memoria)
+    metricas.update({clave: valor.item() if isinstance(valor, np.generic) else valor
+                     for clave, valor in campos.items()})
+
+    logger_metricas.info("%s", json.dumps(metricas, default=str), extra={'metricas': metricas})
+
+
+@instrumentado()
+def contar_filas_duplicadas(df, modo="exact"):
+    """
+    Cuenta las filas iguales a una fila anterior, como df.duplicated().sum().
+
+    Cada fila se reduce a un hash de 64 bits con hashing vectorizado por
+    columna en lugar de construir tuplas por fila. En modo exacto solo se
+    comparan valor a valor las filas cuyo hash se repite, así que una
+    colisión de hash nunca infla el conteo; el modo aproximado estima las
+    filas distintas con un sketch HyperLogLog y no compara nada.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame a revisar
+    modo : str
+        'exact' o 'approximate' (~0,8% de error en el número de filas distintas)
+
+    Returns:
+    --------
+    int : Número de filas duplicadas
+    """
+    if modo not in MODOS_DUPLICADOS:
+        raise ValueError(f"Modo de duplicados no soportado: {modo}. Usa uno de: {MODOS_DUPLICADOS}")
+    if len(df) == 0:
+        return 0
+
+    hashes = _hashes_filas(df)[0]
+    if modo == 'approximate':
+        registros = np.zeros(2 ** PRECISION_SKETCH_DUPLICADOS, dtype=np.uint8)
+        _hll_actualizar(registros, hashes)
+        return max(len(df) - _hll_estimar(registros), 0)
+
+    # Las filas con hash único no pueden ser duplicadas; solo se verifica el resto
+    candidatas = pd.Series(hashes).duplicated(keep=False).to_numpy()
+    if not candidatas.any():
+        return 0
+    return int(df[candidatas].duplicated().sum())
+
+
+@instrumentado()
+def limpiar_nombres_columnas(df, en_lugar=False, copiar_datos=True, en_colision="warn"):
     """
     Limpia y estandariza los nombres de columnas.
 
+    Los nombres se normalizan una vez por encabezado distinto y se recuerdan
+    entre llamadas, así que los archivos diarios con las mismas columnas se
+    saltan el trabajo con textos.
+
     Parameters:
     -----------
     df : pandas.DataFrame
         DataFrame con columnas a limpiar
+    en_lugar : bool
+        Si es True, renombra las columnas del mismo df y lo retorna
+    copiar_datos : bool
+        Si es False, retorna una copia superficial que comparte los buffers de
+        datos con df (una vista copy-on-write si pandas tiene copy-on-write activo)
+    en_colision : str
+        Qué hacer cuando varios nombres quedan iguales al limpiarlos: 'warn'
+        (registrar y mantener los duplicados), 'raise' (ValueError) o
+        'suffix' (agregar _2, _3...)
 
     Returns:
     --------
     pandas.DataFrame : DataFrame con columnas limpias
     """
-    df_clean = df.copy()
+    if en_colision not in MODOS_COLISION_COLUMNAS:
+        raise ValueError(f"Modo de colisión no soportado: {en_colision}. Usa uno de: {MODOS_COLISION_COLUMNAS}")
+
+    inicio = time.perf_counter()
+    nombres_limpios, colisiones = _limpiar_encabezado(tuple(df.columns), en_colision == 'suffix')
+    if colisiones:
+        if en_colision == 'raise':
+            raise ValueError(f"Los nombres de columnas colisionan al limpiarlos: {colisiones}")
+        if en_colision == 'warn':
+            logger.warning("Los nombres de columnas colisionan al limpiarlos: %s", colisiones)
+        else:
+            logger.info("Nombres de columnas en colisión numerados: %s", colisiones)
 
-    # Limpiar nombres de columnas
-    df_clean.columns = (df_clean.columns
-                        .str.strip()  # Quitar espacios
-                        .str.lower()  # Minúsculas
-                        .str.replace(' ', '_')  # Espacios por guiones bajos
-                        .str.replace('[^a-zA-Z0-9_]', '', regex=True)  # Solo alfanuméricos y _
-                        .str.replace('_+', '_', regex=True)  # Múltiples _ por uno solo
-                        .str.strip('_'))  # Quitar _ al inicio/final
+    if en_lugar:
+        df_clean = df
+    else:
+        df_clean = df.copy(deep=copiar_datos)
+    df_clean.columns = list(nombres_limpios)
 
-    logger.info(f"Nombres de columnas limpiados: {list(df_clean.columns)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Nombres de columnas limpiados: %s", list(nombres_limpios))
+    _registrar_metricas('limpiar_nombres_columnas', inicio, df_clean, colisiones=len(colisiones))
     return df_clean
 
 
+def encontrar_colisiones_nombres_columnas(columnas):
+    """
+    Encuentra nombres de columnas que quedan iguales al limpiarlos.
+
+    Parameters:
+    -----------
+    columnas : iterable
+        Nombres de columnas originales
+
+    Returns:
+    --------
+    dict : Nombre limpio -> lista de nombres originales, solo para los que colisionan
+    """
+    colisiones = _limpiar_encabezado(tuple(columnas), False)[1]
+    # Copiar para que quien llama no pueda modificar el resultado memorizado
+    return {nombre_limpio: list(nombres) for nombre_limpio, nombres in colisiones.items()}
+
+
+@lru_cache(maxsize=TAMAÑO_MEMO_NOMBRES_COLUMNAS)
+def _limpiar_encabezado(columnas, agregar_sufijos):
+    """
+    Limpia un encabezado completo, memorizado por la tupla de nombres originales.
+
+    Retorna los nombres limpios como tupla y las colisiones (nombre limpio ->
+    nombres originales); con agregar_sufijos, los nombres limpios repetidos
+    reciben _2, _3... en orden.
+    """
+    nombres_limpios = [_limpiar_nombre_columna(nombre) for nombre in columnas]
+
+    originales = {}
+    for nombre, nombre_limpio in zip(columnas, nombres_limpios):
+        originales.setdefault(nombre_limpio, []).append(nombre)
+    colisiones = {nombre_limpio: nombres for nombre_limpio, nombres in originales.items() if len(nombres) > 1}
+
+    if agregar_sufijos and colisiones:
+        vistos = {}
+        ocupados = set(nombres_limpios)
+        for i, nombre_limpio in enumerate(nombres_limpios):
+            vistos[nombre_limpio] = vistos.get(nombre_limpio, 0) + 1
+            if vistos[nombre_limpio] > 1:
+                sufijo = vistos[nombre_limpio]
+                while f"{nombre_limpio}_{sufijo}" in ocupados:
+                    sufijo += 1
+                nombres_limpios[i] = f"{nombre_limpio}_{sufijo}"
+                ocupados.add(nombres_limpios[i])
+
+    return tuple(nombres_limpios), colisiones
+
+
+@lru_cache(maxsize=TAMAÑO_MEMO_NOMBRES_COLUMNAS)
+def _limpiar_nombre_columna(nombre):
+    """Aplica las reglas de limpiar_nombres_columnas a un solo nombre."""
+    nombre_limpio = str(nombre).strip().lower().replace(' ', '_')  # Espacios por guiones bajos
+    nombre_limpio = re.sub('[^a-zA-Z0-9_]', '', nombre_limpio)  # Solo alfanuméricos y _
+    nombre_limpio = re.sub('_+', '_', nombre_limpio)  # Múltiples _ por uno solo
+    return nombre_limpio.strip('_')  # Quitar _ al inicio/final
+
+
 def detectar_outliers_iqr(serie, multiplicador=1.5):
     """
     Detecta outliers usando el método IQR (Rango Intercuartil).
@@ -99,11 +524,10 @@ def detectar_outliers_iqr(serie, multiplicador=1.5):
     dict : Información sobre outliers detectados
     """
     if not pd.api.types.is_numeric_dtype(serie):
-        logger.warning(f"La serie {serie.name} no es numérica, saltando detección de outliers")
+        logger.warning("La serie %s no es numérica, saltando detección de outliers", serie.name)
         return None
 
-    Q1 = serie.quantile(0.25)
-    Q3 = serie.quantile(0.75)
+    Q1, Q3 = serie.quantile([0.25, 0.75])
     IQR = Q3 - Q1
 
     limite_inferior = Q1 - multiplicador * IQR
@@ -123,11 +547,114 @@ def detectar_outliers_iqr(serie, multiplicador=1.5):
         'indices_outliers': outliers.index.tolist()
     }
 
-    logger.info(f"Outliers en {serie.name}: {len(outliers)} ({resultado['porcentaje_outliers']:.1f}%)")
+    logger.info("Outliers en %s: %s (%.1f%%)", serie.name, len(outliers), resultado['porcentaje_outliers'])
     return resultado
 
 
-def procesar_fechas(df, columna_fecha, formato_fecha=None):
+@instrumentado()
+def detectar_outliers_iqr_dataframe(df, columnas_numericas=None, multiplicador=1.5, salida="mask"):
+    """
+    Detecta outliers IQR en todas las columnas numéricas de un DataFrame a la vez.
+
+    Las columnas se copian a bloques NumPy float64 de a lo sumo
+    BYTES_LOTE_NUMERICO, así la memoria extra queda acotada sin importar la
+    cantidad de columnas. Q1 y Q3 de cada columna salen de una partición de
+    una copia de solo esa columna (mismos valores que Series.quantile), y los
+    outliers se marcan con una comparación vectorizada por bloque. Los
+    outliers se retornan como máscara booleana o como arrays de posiciones de
+    fila en lugar de listas de valores y etiquetas.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame a analizar
+    columnas_numericas : list, optional
+        Columnas a analizar (por defecto todas las columnas numéricas)
+    multiplicador : float
+        Multiplicador para el rango IQR (default: 1.5)
+    salida : str
+        'mask' (DataFrame booleano alineado con df), 'indices' (array NumPy de
+        posiciones de fila por columna) o 'counts' (solo límites y conteos)
+
+    Returns:
+    --------
+    dict : DataFrame 'resumen' con límites y conteos por columna, más
+           'mascara' o 'indices' según la salida
+    """
+    if salida not in SALIDAS_OUTLIERS:
+        raise ValueError(f"Salida no soportada: {salida}. Usa una de: {SALIDAS_OUTLIERS}")
+
+    inicio = time.perf_counter()
+    if columnas_numericas is None:
+        columnas_numericas = df.select_dtypes(include=[np.number]).columns.tolist()
+    columnas = []
+    for col in columnas_numericas:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            columnas.append(col)
+        else:
+            logger.warning("La serie %s no es numérica, saltando detección de outliers", col)
+
+    limites_inferiores = np.full(len(columnas), np.nan)
+    limites_superiores = np.full(len(columnas), np.nan)
+    outliers = np.zeros(len(columnas), dtype=np.int64)
+    mascara = np.zeros((len(df), len(columnas)), dtype=bool, order='F') if salida == 'mask' else None
+    indices = {}
+    bytes_memoria = 0
+
+    desde = 0
+    for lote in _lotes_columnas(columnas, len(df), np.dtype(np.float64).itemsize):
+        # El orden Fortran mantiene cada columna contigua para las particiones y comparaciones por columna
+        bloque = np.asfortranarray(df[lote].to_numpy(dtype=np.float64, na_value=np.nan))
+        bytes_memoria = max(bytes_memoria, bloque.nbytes)
+        conteos = (~np.isnan(bloque)).sum(axis=0)
+        cuartiles = np.empty((2, len(lote)))
+        for i in range(len(lote)):
+            # El bloque mantiene el orden de las filas para la comparación, así que cada columna se particiona en una copia
+            columna = bloque[:, i:i + 1].copy(order='F')
+            _particionar_para_cuantiles(columna, conteos[i:i + 1], [0.25, 0.75])
+            cuartiles[:, i:i + 1] = _cuantiles_desde_ordenado(columna, conteos[i:i + 1], [0.25, 0.75])
+        iqr = cuartiles[1] - cuartiles[0]
+        inferior = cuartiles[0] - multiplicador * iqr
+        superior = cuartiles[1] + multiplicador * iqr
+
+        # NaN nunca se compara como outlier
+        mascara_lote = (bloque < inferior) | (bloque > superior)
+        hasta = desde + len(lote)
+        limites_inferiores[desde:hasta] = inferior
+        limites_superiores[desde:hasta] = superior
+        outliers[desde:hasta] = mascara_lote.sum(axis=0)
+        if salida == 'mask':
+            mascara[:, desde:hasta] = mascara_lote
+        elif salida == 'indices':
+            indices.update({col: np.flatnonzero(mascara_lote[:, i]) for i, col in enumerate(lote)})
+        desde = hasta
+
+    total_valores = len(df)
+
+    resultado = {
+        'resumen': pd.DataFrame({
+            'total_valores': total_valores,
+            'outliers_detectados': outliers,
+            'porcentaje_outliers': outliers / total_valores * 100 if total_valores else np.nan,
+            'limite_inferior': limites_inferiores,
+            'limite_superior': limites_superiores
+        }, index=pd.Index(columnas, name='columna'))
+    }
+    if salida == 'mask':
+        resultado['mascara'] = pd.DataFrame(mascara, index=df.index, columns=columnas)
+    elif salida == 'indices':
+        resultado['indices'] = indices
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Outliers en %s columnas: %s valores", len(columnas), outliers.sum())
+    _registrar_metricas('detectar_outliers_iqr_dataframe', inicio, dimensiones=(len(df), len(columnas)),
+                        bytes_memoria=bytes_memoria, outliers=outliers.sum())
+    return resultado
+
+
+@instrumentado()
+def procesar_fechas(df, columna_fecha, formato_fecha=None, componentes=None,
+                    en_lugar=False, solo_columnas_nuevas=False, cache=True):
     """
     Convierte una columna a formato datetime y extrae componentes útiles.
 
@@ -138,44 +665,116 @@ def procesar_fechas(df, columna_fecha, formato_fecha=None):
     columna_fecha : str
         Nombre de la columna con fechas
     formato_fecha : str, optional
-        Formato específico de fecha (ej: '%Y-%m-%d')
+        Formato específico de fecha (ej: '%Y-%m-%d'); si se omite se infiere
+        de una muestra de la columna
+    componentes : list, optional
+        Componentes a extraer (default: todos los de COMPONENTES_FECHA)
+    en_lugar : bool
+        Si es True, agrega las columnas al mismo df en lugar de a una copia
+    solo_columnas_nuevas : bool
+        Si es True, retorna solo las columnas de componentes extraídos
+    cache : bool
+        Si es True, cada texto de fecha distinto se interpreta una sola vez
 
     Returns:
     --------
     pandas.DataFrame : DataFrame con columnas de fecha procesadas
     """
-    df_processed = df.copy()
-
+    if componentes is None:
+        componentes = COMPONENTES_FECHA
+    desconocidos = [componente for componente in componentes if componente not in COMPONENTES_FECHA]
+    if desconocidos:
+        raise ValueError(f"Componentes de fecha no soportados: {desconocidos}. Usa: {COMPONENTES_FECHA}")
+    if en_lugar and solo_columnas_nuevas:
+        raise ValueError("en_lugar y solo_columnas_nuevas no se pueden usar juntos")
+
+    inicio = time.perf_counter()
     try:
         # Convertir a datetime
-        if formato_fecha:
-            df_processed[columna_fecha] = pd.to_datetime(df_processed[columna_fecha],
-                                                         format=formato_fecha)
-        else:
-            df_processed[columna_fecha] = pd.to_datetime(df_processed[columna_fecha])
+        fecha_col = _interpretar_fechas(df[columna_fecha], formato_fecha, cache)
 
-        # Extraer componentes útiles
-        fecha_col = df_processed[columna_fecha]
+        # Extraer los componentes pedidos
         base_name = columna_fecha.replace('_fecha', '').replace('fecha_', '')
-
-        df_processed[f'{base_name}_año'] = fecha_col.dt.year
-        df_processed[f'{base_name}_mes'] = fecha_col.dt.month
-        df_processed[f'{base_name}_dia'] = fecha_col.dt.day
-        df_processed[f'{base_name}_dia_semana'] = fecha_col.dt.day_name()
-        df_processed[f'{base_name}_trimestre'] = fecha_col.dt.quarter
-        df_processed[f'{base_name}_es_fin_semana'] = fecha_col.dt.weekday >= 5
-
-        logger.info(f"Columna {columna_fecha} procesada correctamente")
-        logger.info(f"  - Rango: {fecha_col.min()} a {fecha_col.max()}")
-        logger.info(f"  - Columnas creadas: año, mes, día, día_semana, trimestre, es_fin_semana")
+        columnas_nuevas = {}
+        dia_semana = None
+        for componente in componentes:
+            if componente in ['dia_semana', 'es_fin_semana'] and dia_semana is None:
+                dia_semana = fecha_col.dt.weekday.to_numpy(dtype=np.float64, na_value=np.nan)
+            columnas_nuevas[f'{base_name}_{componente}'] = _componente_fecha(fecha_col, componente, dia_semana)
+
+        if solo_columnas_nuevas:
+            df_processed = pd.DataFrame(columnas_nuevas, index=df.index)
+        else:
+            # Basta una copia superficial: las columnas se reemplazan, nunca se escriben
+            df_processed = df if en_lugar else df.copy(deep=False)
+            df_processed[columna_fecha] = fecha_col
+            for nombre, valores in columnas_nuevas.items():
+                df_processed[nombre] = valores
+
+        logger.info("Columna %s procesada correctamente", columna_fecha)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  - Rango: %s a %s", fecha_col.min(), fecha_col.max())
+        logger.info("  - Columnas creadas: %s", ', '.join(componentes))
+        _registrar_metricas('procesar_fechas', inicio, df_processed, columna=columna_fecha,
+                            componentes=len(componentes))
 
     except Exception as e:
-        logger.error(f"Error procesando fechas en columna {columna_fecha}: {str(e)}")
+        logger.error("Error procesando fechas en columna %s: %s", columna_fecha, e)
         raise
 
     return df_processed
 
 
+def _interpretar_fechas(serie, formato_fecha=None, cache=True):
+    """
+    Convierte una Series a datetime.
+
+    Sin formato, se infiere uno de los primeros valores y se verifica en una
+    muestra para que pandas use su ruta de formato fijo. Con cache, la
+    columna se factoriza y cada valor distinto se interpreta una vez, lo que
+    abarata las columnas con timestamps repetidos.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return serie
+    if formato_fecha is None:
+        formato_fecha = _inferir_formato_fecha(serie)
+    if not cache:
+        return pd.to_datetime(serie, format=formato_fecha)
+
+    codigos, unicos = pd.factorize(serie)
+    interpretadas = pd.DatetimeIndex(pd.to_datetime(unicos, format=formato_fecha))
+    return pd.Series(interpretadas.take(codigos, allow_fill=True, fill_value=pd.NaT),
+                     index=serie.index, name=serie.name)
+
+
+def _inferir_formato_fecha(serie):
+    """Adivina el formato strftime de una columna de texto, o None si ningún formato único sirve para sus primeros valores."""
+    muestra = serie.dropna().iloc[:TAMAÑO_MUESTRA_FORMATO_FECHA]
+    if len(muestra) == 0 or not isinstance(muestra.iloc[0], str):
+        return None
+
+    formato_fecha = guess_datetime_format(muestra.iloc[0])
+    if formato_fecha is None:
+        return None
+    try:
+        pd.to_datetime(muestra, format=formato_fecha)
+    except (ValueError, TypeError):
+        logger.debug("El formato de fecha inferido %s no sirve para la muestra, se usa el de pandas", formato_fecha)
+        return None
+    return formato_fecha
+
+
+def _componente_fecha(fecha_col, componente, dia_semana=None):
+    """Extrae un componente de fecha; dia_semana se construye como categórica a partir de los códigos del día."""
+    if componente == 'dia_semana':
+        codigos = np.where(np.isnan(dia_semana), -1, dia_semana).astype(np.int8)
+        return pd.Categorical.from_codes(codigos, categories=DIAS_SEMANA, ordered=True)
+    if componente == 'es_fin_semana':
+        return dia_semana >= 5
+    return getattr(fecha_col.dt, ATRIBUTOS_COMPONENTES_FECHA[componente])
+
+
+@instrumentado()
 def crear_resumen_ejecutivo(df, columnas_numericas=None, columnas_categoricas=None):
     """
     Crea un resumen ejecutivo completo del DataFrame.
@@ -193,6 +792,8 @@ def crear_resumen_ejecutivo(df, columnas_numericas=None, columnas_categoricas=No
     --------
     dict : Diccionario con el resumen ejecutivo
     """
+    inicio = time.perf_counter()
+
     # Detectar columnas automáticamente si no se especifican
     if columnas_numericas is None:
         columnas_numericas = df.select_dtypes(include=[np.number]).columns.tolist()
@@ -200,37 +801,29 @@ def crear_resumen_ejecutivo(df, columnas_numericas=None, columnas_categoricas=No
     if columnas_categoricas is None:
         columnas_categoricas = df.select_dtypes(include=['object', 'category']).columns.tolist()
 
+    # Un único conteo de nulos compartido por las secciones de calidad y por columna
+    nulos_por_columna = df.isnull().sum()
+    total_nulos = nulos_por_columna.sum()
+
     resumen = {
         'informacion_general': {
             'filas': len(df),
             'columnas': len(df.columns),
-            'memoria_mb': df.memory_usage(deep=True).sum() / (1024 ** 2),
+            'memoria_mb': medir_memoria(df) / (1024 ** 2),
             'fecha_analisis': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         },
         'calidad_datos': {
-            'valores_nulos_total': df.isnull().sum().sum(),
-            'filas_duplicadas': df.duplicated().sum(),
-            'completitud_porcentaje': ((df.size - df.isnull().sum().sum()) / df.size) * 100
+            'valores_nulos_total': total_nulos,
+            'filas_duplicadas': contar_filas_duplicadas(df),
+            'completitud_porcentaje': ((df.size - total_nulos) / df.size) * 100
         },
         'columnas_numericas': {},
         'columnas_categoricas': {}
     }
 
     # Análisis de columnas numéricas
-    for col in columnas_numericas:
-        if col in df.columns:
-            serie = df[col].dropna()
-            resumen['columnas_numericas'][col] = {
-                'count': len(serie),
-                'mean': serie.mean(),
-                'std': serie.std(),
-                'min': serie.min(),
-                'max': serie.max(),
-                'q25': serie.quantile(0.25),
-                'q50': serie.quantile(0.50),
-                'q75': serie.quantile(0.75),
-                'valores_nulos': df[col].isnull().sum()
-            }
+    columnas_numericas = [col for col in columnas_numericas if col in df.columns]
+    resumen['columnas_numericas'] = _resumir_columnas_numericas(df, columnas_numericas, nulos_por_columna)
 
     # Análisis de columnas categóricas
     for col in columnas_categoricas:
@@ -240,30 +833,881 @@ def crear_resumen_ejecutivo(df, columnas_numericas=None, columnas_categoricas=No
                 'valores_unicos': df[col].nunique(),
                 'valor_mas_frecuente': value_counts.index[0] if len(value_counts) > 0 else None,
                 'frecuencia_max': value_counts.iloc[0] if len(value_counts) > 0 else 0,
-                'valores_nulos': df[col].isnull().sum(),
+                'valores_nulos': nulos_por_columna[col],
                 'top_5_valores': value_counts.head().to_dict()
             }
 
     logger.info("Resumen ejecutivo generado correctamente")
+    _registrar_metricas('crear_resumen_ejecutivo', inicio, df)
     return resumen
 
 
-def exportar_datos_limpios(df, nombre_archivo, carpeta_destino="../data/result"):
+def _resumir_columnas_numericas(df, columnas, nulos_por_columna):
     """
-    Exporta el DataFrame limpio a Excel con timestamp.
+    Calcula las estadísticas numéricas del resumen ejecutivo.
+
+    Las columnas con dtype NumPy entero o float64 se agrupan por dtype y se
+    resumen con reducciones vectorizadas sobre bloques NumPy de a lo sumo
+    BYTES_LOTE_NUMERICO, así la memoria extra queda acotada sin importar la
+    cantidad de columnas. Cada columna del bloque se particiona en el lugar en
+    las posiciones del mínimo, el máximo y los cuantiles en vez de ordenarse.
+    Cualquier otro dtype (nullable, float32...) usa el camino de pandas por columna.
 
     Parameters:
     -----------
     df : pandas.DataFrame
-        DataFrame a exportar
+        DataFrame a resumir
+    columnas : list
+        Columnas numéricas presentes en df
+    nulos_por_columna : pandas.Series
+        Valores nulos por columna, compartidos con el resto del resumen
+
+    Returns:
+    --------
+    dict : Estadísticas por columna, en el orden de columnas
+    """
+    estadisticas = {}
+    grupos = {}
+
+    for col in columnas:
+        dtype = df[col].dtype
+        if isinstance(dtype, np.dtype) and (dtype.kind in 'iu' or dtype == np.float64):
+            grupos.setdefault(dtype, []).append(col)
+        else:
+            serie = df[col].dropna()
+            estadisticas[col] = {
+                'count': len(serie),
+                'mean': serie.mean(),
+                'std': serie.std(),
+                'min': serie.min(),
+                'max': serie.max(),
+                'q25': serie.quantile(0.25),
+                'q50': serie.quantile(0.50),
+                'q75': serie.quantile(0.75),
+                'valores_nulos': nulos_por_columna[col]
+            }
+
+    lotes = [(dtype, lote) for dtype, columnas_grupo in grupos.items()
+             for lote in _lotes_columnas(columnas_grupo, len(df), dtype.itemsize)]
+    for dtype, columnas_grupo in lotes:
+        # El orden Fortran mantiene cada columna contigua para las reducciones y particiones
+        # por columna; la copia es propia, así que puede particionarse en el lugar
+        bloque = np.asfortranarray(df[columnas_grupo].to_numpy(dtype=dtype, copy=True))
+        conteos = len(df) - nulos_por_columna[columnas_grupo].to_numpy()
+
+        # La media y la desviación estándar comparten una copia del bloque con ceros en los nulos
+        valores = bloque.astype(np.float64, order='F')
+        if dtype.kind == 'f':
+            validos = ~np.isnan(bloque)
+            valores[~validos] = 0.0
+        else:
+            validos = True
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Las columnas completamente nulas producen estadísticas NaN, igual que pandas
+            medias = valores.sum(axis=0) / conteos
+            np.subtract(valores, medias, out=valores, where=validos)
+            np.multiply(valores, valores, out=valores)
+            desviaciones = np.sqrt(valores.sum(axis=0) / (conteos - 1))
+        desviaciones[conteos < 2] = np.nan
+
+        # Particionar deja mínimo, máximo y los vecinos de cada cuantil en su posición ordenada (NaN queda al final)
+        del valores
+        _particionar_para_cuantiles(bloque, conteos, CUANTILES_RESUMEN)
+        cuantiles = _cuantiles_desde_ordenado(bloque, conteos, CUANTILES_RESUMEN)
+        tiene_valores = conteos > 0
+        ultimo = np.maximum(conteos - 1, 0)
+        indice_columnas = np.arange(len(columnas_grupo))
+        minimos = bloque[0, :] if len(bloque) else np.full(len(columnas_grupo), np.nan)
+        maximos = bloque[ultimo, indice_columnas] if len(bloque) else np.full(len(columnas_grupo), np.nan)
+        if dtype.kind == 'f':
+            minimos = np.where(tiene_valores, minimos, np.nan)
+            maximos = np.where(tiene_valores, maximos, np.nan)
+
+        for i, col in enumerate(columnas_grupo):
+            estadisticas[col] = {
+                'count': int(conteos[i]),
+                'mean': medias[i],
+                'std': desviaciones[i],
+                'min': minimos[i],
+                'max': maximos[i],
+                'q25': cuantiles[0, i],
+                'q50': cuantiles[1, i],
+                'q75': cuantiles[2, i],
+                'valores_nulos': nulos_por_columna[col]
+            }
+
+    return {col: estadisticas[col] for col in columnas}
+
+
+def _lotes_columnas(columnas, filas, bytes_por_valor):
+    """Divide las columnas en lotes cuyo bloque NumPy queda bajo BYTES_LOTE_NUMERICO (al menos una columna cada uno)."""
+    tamaño = max(1, BYTES_LOTE_NUMERICO // max(filas * bytes_por_valor, 1))
+    return [columnas[inicio:inicio + tamaño] for inicio in range(0, len(columnas), tamaño)]
+
+
+def _particionar_para_cuantiles(bloque, conteos, cuantiles):
+    """
+    Particiona en el lugar cada columna de un bloque para _cuantiles_desde_ordenado.
+
+    Solo la primera y la última posición no nula y los dos vecinos del índice
+    virtual de cada cuantil quedan en su posición ordenada, lo que es lineal
+    por columna en vez de un ordenamiento completo; los nulos (NaN) van al
+    final. Las posiciones se ubican de a una sobre la cola aún sin ordenar,
+    ya que en NumPy una partición con un solo kth es mucho más rápida que una
+    llamada con varios.
+    """
+    for i, conteo in enumerate(conteos):
+        if conteo == 0:
+            continue
+        indice_virtual = (conteo - 1) * np.asarray(cuantiles)
+        indice_anterior = np.floor(indice_virtual).astype(np.int64)
+        kth = np.unique(np.concatenate([[0, conteo - 1], indice_anterior, np.minimum(indice_anterior + 1, conteo - 1)]))
+        columna = bloque[:, i]
+        inicio = 0
+        for posicion in kth:
+            columna[inicio:].partition(posicion - inicio)
+            inicio = posicion + 1
+
+
+def _cuantiles_desde_ordenado(bloque_ordenado, conteos, cuantiles):
+    """
+    Calcula cuantiles con interpolación lineal de cada columna de un bloque ordenado.
+
+    Usa el mismo índice virtual y fórmula de interpolación que numpy.quantile
+    (method='linear') sobre los primeros conteos[i] valores de cada columna.
+    El bloque solo necesita esas posiciones ordenadas (ver _particionar_para_cuantiles).
+
+    Parameters:
+    -----------
+    bloque_ordenado : numpy.ndarray
+        Array 2D ordenado (o particionado) en el eje 0, con los nulos al final de cada columna
+    conteos : numpy.ndarray
+        Cantidad de valores no nulos por columna
+    cuantiles : list
+        Cuantiles a calcular (entre 0 y 1)
+
+    Returns:
+    --------
+    numpy.ndarray : Array de forma (len(cuantiles), n_columnas)
+    """
+    n_columnas = bloque_ordenado.shape[1]
+    resultado = np.full((len(cuantiles), n_columnas), np.nan)
+    validas = conteos > 0
+    if not validas.any():
+        return resultado
+
+    indice_columnas = np.arange(n_columnas)[validas]
+    conteos_validos = conteos[validas]
+
+    for fila, q in enumerate(cuantiles):
+        indice_virtual = (conteos_validos - 1) * q
+        indice_anterior = np.floor(indice_virtual).astype(np.int64)
+        indice_siguiente = np.minimum(indice_anterior + 1, conteos_validos - 1)
+        gamma = indice_virtual - indice_anterior
+
+        inferior = bloque_ordenado[indice_anterior, indice_columnas].astype(np.float64)
+        superior = bloque_ordenado[indice_siguiente, indice_columnas].astype(np.float64)
+        diferencia = superior - inferior
+        # La misma interpolación a dos lados que numpy para obtener resultados idénticos
+        resultado[fila, validas] = np.where(gamma >= 0.5,
+                                            superior - diferencia * (1 - gamma),
+                                            inferior + diferencia * gamma)
+
+    return resultado
+
+
+def crear_resumen_por_bloques(bloques, columnas_numericas=None, columnas_categoricas=None, **opciones):
+    """
+    Crea el resumen ejecutivo de datos que se leen por bloques.
+
+    Solo se mantienen en memoria acumuladores por columna, así que los datos
+    pueden ser más grandes que la RAM. Fuentes típicas son
+    pd.read_csv(chunksize=...) y FileManager.iterar_archivo_por_bloques().
+
+    Parameters:
+    -----------
+    bloques : iterable de pandas.DataFrame
+        Bloques del dataset, todos con las mismas columnas
+    columnas_numericas : list, optional
+        Lista de columnas numéricas específicas a analizar
+    columnas_categoricas : list, optional
+        Lista de columnas categóricas específicas a analizar
+    **opciones :
+        Se pasan a StreamingSummary (tamaño_sketch, valores_frecuentes, contar_duplicados, modo_duplicados)
+
+    Returns:
+    --------
+    dict : Diccionario con el resumen ejecutivo, como crear_resumen_ejecutivo
+    """
+    acumulador = StreamingSummary(columnas_numericas, columnas_categoricas, **opciones)
+    for bloque in bloques:
+        acumulador.actualizar(bloque)
+    return acumulador.resumen()
+
+
+class StreamingSummary:
+    """
+    Estadísticas de resumen combinables alimentadas bloque a bloque.
+
+    Las columnas numéricas mantienen conteo, media y varianza (actualizaciones
+    de Welford/Chan), mínimo, máximo y un sketch KLL de cuantiles; las
+    categóricas mantienen los valores más frecuentes y un contador
+    HyperLogLog de distintos. Los estados parciales construidos por distintos
+    workers o desde distintos archivos se combinan con combinar() y pueden
+    serializarse con pickle entre procesos.
+    """
+
+    def __init__(self, columnas_numericas=None, columnas_categoricas=None,
+                 tamaño_sketch=TAMAÑO_COMPACTADOR_SKETCH, valores_frecuentes=CAPACIDAD_VALORES_FRECUENTES,
+                 contar_duplicados=True, modo_duplicados="exact"):
+        """
+        Inicializa un resumen vacío.
+
+        Parameters:
+        -----------
+        columnas_numericas : list, optional
+            Columnas numéricas a analizar (se detectan en el primer bloque)
+        columnas_categoricas : list, optional
+            Columnas categóricas a analizar (se detectan en el primer bloque)
+        tamaño_sketch : int
+            Tamaño de compactador de los sketches de cuantiles; los cuantiles
+            son exactos hasta que una columna tiene más valores de los que cabe
+        valores_frecuentes : int
+            Valores distintos contados por columna categórica; los conteos son
+            exactos hasta que una columna tiene más valores distintos que esto
+        contar_duplicados : bool
+            Si se cuentan las filas duplicadas con un DuplicateCounter
+        modo_duplicados : str
+            Modo del DuplicateCounter ('exact' o 'approximate')
+        """
+        self.columnas_numericas = columnas_numericas
+        self.columnas_categoricas = columnas_categoricas
+        self.tamaño_sketch = tamaño_sketch
+        self.valores_frecuentes = valores_frecuentes
+        self.duplicados = DuplicateCounter(modo_duplicados) if contar_duplicados else None
+        self.filas = 0
+        self.bytes_memoria = 0
+        self.nulos_por_columna = pd.Series(dtype=np.int64)
+        self.tipos_datos = {}
+        self.numericas = {}
+        self.categoricas = {}
+
+    def actualizar(self, bloque):
+        """
+        Agrega un bloque de filas al resumen.
+
+        Parameters:
+        -----------
+        bloque : pandas.DataFrame
+            Bloque del dataset
+
+        Returns:
+        --------
+        StreamingSummary : self, para permitir encadenar llamadas
+        """
+        if self.columnas_numericas is None:
+            self.columnas_numericas = bloque.select_dtypes(include=[np.number]).columns.tolist()
+        if self.columnas_categoricas is None:
+            self.columnas_categoricas = bloque.select_dtypes(include=['object', 'category']).columns.tolist()
+        for col, dtype in bloque.dtypes.items():
+            self.tipos_datos.setdefault(col, dtype)
+
+        self.filas += len(bloque)
+        self.bytes_memoria += medir_memoria(bloque)
+        self.nulos_por_columna = self.nulos_por_columna.add(bloque.isnull().sum(), fill_value=0).astype(np.int64)
+
+        columnas_numericas = [col for col in self.columnas_numericas if col in bloque.columns]
+        if columnas_numericas:
+            self._actualizar_numericas(bloque, columnas_numericas)
+
+        for col in self.columnas_categoricas:
+            if col in bloque.columns:
+                if col not in self.categoricas:
+                    self.categoricas[col] = _CategoricalAccumulator(self.valores_frecuentes)
+                self.categoricas[col].actualizar(bloque[col])
+
+        if self.duplicados is not None:
+            self.duplicados.actualizar(bloque)
+
+        return self
+
+    def _actualizar_numericas(self, bloque, columnas):
+        """Calcula los momentos de todas las columnas numéricas de un bloque a la vez."""
+        matriz = bloque[columnas].to_numpy(dtype=np.float64, na_value=np.nan)
+        validos = ~np.isnan(matriz)
+        conteos = validos.sum(axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            medias = np.where(validos, matriz, 0.0).sum(axis=0) / conteos
+            desviaciones = np.where(validos, matriz - medias, 0.0)
+            m2s = (desviaciones * desviaciones).sum(axis=0)
+        minimos = np.fmin.reduce(matriz, axis=0) if len(matriz) else np.full(len(columnas), np.nan)
+        maximos = np.fmax.reduce(matriz, axis=0) if len(matriz) else np.full(len(columnas), np.nan)
+
+        for i, col in enumerate(columnas):
+            if col not in self.numericas:
+                self.numericas[col] = _NumericAccumulator(self.tamaño_sketch)
+            acumulador = self.numericas[col]
+            acumulador.agregar_momentos(conteos[i], medias[i], m2s[i], minimos[i], maximos[i])
+            if conteos[i]:
+                acumulador.sketch.actualizar(matriz[validos[:, i], i])
+
+    def combinar(self, otro):
+        """
+        Combina el estado de otro resumen con este.
+
+        Parameters:
+        -----------
+        otro : StreamingSummary
+            Resumen construido con otros bloques (otro worker o archivo)
+
+        Returns:
+        --------
+        StreamingSummary : self, para permitir encadenar llamadas
+        """
+        if self.columnas_numericas is None:
+            self.columnas_numericas = otro.columnas_numericas
+        elif otro.columnas_numericas:
+            self.columnas_numericas = self.columnas_numericas + [col for col in otro.columnas_numericas
+                                                                 if col not in self.columnas_numericas]
+        if self.columnas_categoricas is None:
+            self.columnas_categoricas = otro.columnas_categoricas
+        elif otro.columnas_categoricas:
+            self.columnas_categoricas = self.columnas_categoricas + [col for col in otro.columnas_categoricas
+                                                                     if col not in self.columnas_categoricas]
+        for col, dtype in otro.tipos_datos.items():
+            self.tipos_datos.setdefault(col, dtype)
+
+        self.filas += otro.filas
+        self.bytes_memoria += otro.bytes_memoria
+        self.nulos_por_columna = self.nulos_por_columna.add(otro.nulos_por_columna, fill_value=0).astype(np.int64)
+
+        for col, acumulador in otro.numericas.items():
+            if col in self.numericas:
+                self.numericas[col].combinar(acumulador)
+            else:
+                self.numericas[col] = copy.deepcopy(acumulador)
+        for col, acumulador in otro.categoricas.items():
+            if col in self.categoricas:
+                self.categoricas[col].combinar(acumulador)
+            else:
+                self.categoricas[col] = copy.deepcopy(acumulador)
+
+        if self.duplicados is not None and otro.duplicados is not None:
+            self.duplicados.combinar(otro.duplicados)
+        else:
+            self.duplicados = None
+        return self
+
+    def filas_duplicadas(self):
+        """Número de filas iguales a una fila anterior, o None si no se cuentan."""
+        if self.duplicados is None:
+            return None
+        return self.duplicados.filas_duplicadas()
+
+    def resumen(self):
+        """
+        Construye el resumen ejecutivo de todo lo agregado hasta ahora.
+
+        Returns:
+        --------
+        dict : Diccionario con las mismas secciones que crear_resumen_ejecutivo,
+               más 'aproximacion' con las columnas cuyos cuantiles o conteos de
+               categorías vienen de un sketch en lugar de valores exactos
+        """
+        columnas = len(self.nulos_por_columna)
+        total_nulos = self.nulos_por_columna.sum()
+        tamaño = self.filas * columnas
+
+        resumen = {
+            'informacion_general': {
+                'filas': self.filas,
+                'columnas': columnas,
+                'memoria_mb': self.bytes_memoria / (1024 ** 2),
+                'fecha_analisis': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            },
+            'calidad_datos': {
+                'valores_nulos_total': total_nulos,
+                'filas_duplicadas': self.filas_duplicadas(),
+                'completitud_porcentaje': ((tamaño - total_nulos) / tamaño) * 100 if tamaño else np.nan
+            },
+            'columnas_numericas': {},
+            'columnas_categoricas': {},
+            'aproximacion': {
+                'cuantiles_aproximados': [],
+                'categorias_aproximadas': []
+            }
+        }
+
+        for col in self.columnas_numericas or []:
+            if col in self.numericas:
+                acumulador = self.numericas[col]
+                resumen['columnas_numericas'][col] = acumulador.resultado(self.tipos_datos[col],
+                                                                          self.nulos_por_columna[col])
+                if not acumulador.sketch.es_exacto():
+                    resumen['aproximacion']['cuantiles_aproximados'].append(col)
+
+        for col in self.columnas_categoricas or []:
+            if col in self.categoricas:
+                acumulador = self.categoricas[col]
+                resumen['columnas_categoricas'][col] = acumulador.resultado(self.nulos_por_columna[col])
+                if acumulador.podado:
+                    resumen['aproximacion']['categorias_aproximadas'].append(col)
+
+        logger.info("Resumen por bloques generado para %d filas", self.filas)
+        return resumen
+
+    def reporte_validacion(self, nombre_dataset="Dataset"):
+        """
+        Construye el reporte de validar_dataframe a partir del estado acumulado.
+
+        Parameters:
+        -----------
+        nombre_dataset : str
+            Nombre descriptivo del dataset para los reportes
+
+        Returns:
+        --------
+        dict : Diccionario con el reporte de validación
+        """
+        reporte = {
+            'dataset': nombre_dataset,
+            'filas': self.filas,
+            'columnas': len(self.nulos_por_columna),
+            'valores_nulos': self.nulos_por_columna.sum(),
+            'duplicados': self.filas_duplicadas(),
+            'memoria_mb': self.bytes_memoria / (1024 ** 2),
+            'columnas_con_nulos': self.nulos_por_columna.index[self.nulos_por_columna > 0].tolist(),
+            'tipos_datos': dict(self.tipos_datos)
+        }
+
+        logger.info("Validación completada para %s", nombre_dataset)
+        logger.info("  - Dimensiones: %s filas x %s columnas", reporte['filas'], reporte['columnas'])
+        logger.info("  - Valores nulos: %s", reporte['valores_nulos'])
+        logger.info("  - Duplicados: %s", reporte['duplicados'])
+
+        return reporte
+
+
+class DuplicateCounter:
+    """
+    Cuenta filas duplicadas entre bloques y archivos a partir de hashes de fila de 64 bits.
+
+    El modo exacto guarda dos hashes independientes de 64 bits por fila
+    distinta (los textos se hashean con una clave distinta para cada uno),
+    así que un falso duplicado requiere una colisión de 128 bits; el modo
+    aproximado solo guarda un sketch HyperLogLog de tamaño fijo. Las columnas
+    se emparejan por nombre sin importar su orden. Los números que float64
+    representa exactamente se hashean como float64, para que una columna
+    leída como int en un bloque y como float en otro siga coincidiendo; los
+    enteros más grandes se hashean a partir de sus propios bits. Los
+    contadores de distintos workers o archivos se combinan con combinar().
+    """
+
+    def __init__(self, modo="exact", precision=PRECISION_SKETCH_DUPLICADOS):
+        """
+        Inicializa un contador vacío.
+
+        Parameters:
+        -----------
+        modo : str
+            'exact' o 'approximate'
+        precision : int
+            Precisión HyperLogLog del modo aproximado (2**precision registros)
+        """
+        if modo not in MODOS_DUPLICADOS:
+            raise ValueError(f"Modo de duplicados no soportado: {modo}. Usa uno de: {MODOS_DUPLICADOS}")
+        self.modo = modo
+        self.filas = 0
+        self.columnas = None
+        self.registros = np.zeros(2 ** precision, dtype=np.uint8) if modo == 'approximate' else None
+        self._distintos = (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64))
+        self._pendientes = []
+        self._filas_pendientes = 0
+
+    def actualizar(self, bloque):
+        """
+        Agrega las filas de un bloque.
+
+        Parameters:
+        -----------
+        bloque : pandas.DataFrame
+            Bloque con las mismas columnas que el primero, en cualquier orden
+
+        Returns:
+        --------
+        DuplicateCounter : self, para permitir encadenar llamadas
+        """
+        if self.columnas is None:
+            # Hashear en un orden de columnas fijo para poder combinar archivos reordenados
+            self.columnas = sorted(bloque.columns, key=str)
+        elif len(bloque.columns) != len(self.columnas):
+            raise ValueError(f"Las columnas del bloque {bloque.columns.tolist()} no coinciden con {self.columnas}")
+        bloque = bloque[self.columnas]
+        self.filas += len(bloque)
+        if len(bloque) == 0:
+            return self
+
+        if self.modo == 'approximate':
+            _hll_actualizar(self.registros, _hashes_filas(bloque, estable=True)[0])
+        else:
+            self._agregar_hashes(*_hashes_filas(bloque, estable=True, semillas=(0, SEMILLA_SEGUNDO_HASH_FILA)))
+        return self
+
+    def combinar(self, otro):
+        """
+        Combina las filas contadas por otro contador.
+
+        Parameters:
+        -----------
+        otro : DuplicateCounter
+            Contador del mismo modo construido con otros bloques o archivos
+
+        Returns:
+        --------
+        DuplicateCounter : self, para permitir encadenar llamadas
+        """
+        if otro.modo != self.modo:
+            raise ValueError(f"No se puede combinar un contador {otro.modo} con uno {self.modo}")
+        if self.columnas is None:
+            self.columnas = otro.columnas
+        elif otro.columnas is not None and otro.columnas != self.columnas:
+            raise ValueError(f"No se pueden combinar contadores de distintas columnas: {otro.columnas} y {self.columnas}")
+        self.filas += otro.filas
+
+        if self.modo == 'approximate':
+            np.maximum(self.registros, otro.registros, out=self.registros)
+        else:
+            for primero, segundo in [otro._distintos] + otro._pendientes:
+                self._agregar_hashes(primero, segundo)
+        return self
+
+    def _agregar_hashes(self, primero, segundo):
+        """Encola hashes de fila y los deduplica cuando superan a los distintos (costo lineal amortizado)."""
+        self._pendientes.append((primero, segundo))
+        self._filas_pendientes += len(primero)
+        if self._filas_pendientes > max(len(self._distintos[0]), FILAS_COMPACTAR_DUPLICADOS):
+            self._compactar()
+
+    def _compactar(self):
+        """Reduce los hashes distintos y pendientes a un par por fila distinta."""
+        primero = np.concatenate([self._distintos[0]] + [pendiente[0] for pendiente in self._pendientes])
+        segundo = np.concatenate([self._distintos[1]] + [pendiente[1] for pendiente in self._pendientes])
+        self._pendientes = []
+        self._filas_pendientes = 0
+
+        # Solo las filas cuyo primer hash se repite necesitan el segundo para distinguirse
+        repetidos = pd.Series(primero).duplicated(keep=False).to_numpy()
+        pares = pd.DataFrame({'primero': primero[repetidos], 'segundo': segundo[repetidos]}).drop_duplicates()
+        self._distintos = (np.concatenate([primero[~repetidos], pares['primero'].to_numpy()]),
+                           np.concatenate([segundo[~repetidos], pares['segundo'].to_numpy()]))
+
+    def filas_distintas(self):
+        """Número de filas distintas vistas (una estimación en modo aproximado)."""
+        if self.modo == 'approximate':
+            return min(_hll_estimar(self.registros), self.filas)
+        if self._pendientes:
+            self._compactar()
+        return len(self._distintos[0])
+
+    def filas_duplicadas(self):
+        """Número de filas iguales a una fila vista antes."""
+        return self.filas - self.filas_distintas()
+
+
+class _NumericAccumulator:
+    """Conteo, media, varianza, mínimo, máximo y sketch de cuantiles de una columna numérica."""
+
+    def __init__(self, tamaño_sketch):
+        self.conteo = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = np.nan
+        self.maximo = np.nan
+        self.sketch = _QuantileSketch(tamaño_sketch)
+
+    def agregar_momentos(self, conteo, media, m2, minimo, maximo):
+        """Combina los momentos de un lote con la actualización paralela de Chan del algoritmo de Welford."""
+        if conteo == 0:
+            return
+        total = self.conteo + conteo
+        delta = media - self.media
+        self.media += delta * conteo / total
+        self.m2 += m2 + delta * delta * self.conteo * conteo / total
+        self.conteo = total
+        self.minimo = np.fmin(self.minimo, minimo)
+        self.maximo = np.fmax(self.maximo, maximo)
+
+    def combinar(self, otro):
+        """Combina otro acumulador de la misma columna."""
+        self.agregar_momentos(otro.conteo, otro.media, otro.m2, otro.minimo, otro.maximo)
+        self.sketch.combinar(otro.sketch)
+
+    def resultado(self, dtype, valores_nulos):
+        """Estadísticas con las claves del resumen ejecutivo."""
+        cuantiles = self.sketch.cuantiles(CUANTILES_RESUMEN)
+        minimo, maximo = self.minimo, self.maximo
+        # Las columnas enteras (también Int64 nullable...) reportan límites enteros, como pandas
+        dtype_numpy = getattr(dtype, 'numpy_dtype', dtype)
+        if self.conteo and isinstance(dtype_numpy, np.dtype) and dtype_numpy.kind in 'iu':
+            minimo, maximo = dtype_numpy.type(minimo), dtype_numpy.type(maximo)
+        return {
+            'count': int(self.conteo),
+            'mean': np.float64(self.media) if self.conteo else np.nan,
+            'std': np.float64(np.sqrt(self.m2 / (self.conteo - 1))) if self.conteo > 1 else np.nan,
+            'min': minimo,
+            'max': maximo,
+            'q25': cuantiles[0],
+            'q50': cuantiles[1],
+            'q75': cuantiles[2],
+            'valores_nulos': valores_nulos
+        }
+
+
+class _CategoricalAccumulator:
+    """
+    Conteo de valores de una columna categórica, limitado a los más frecuentes.
+
+    Los conteos son exactos hasta que la columna tiene más de `capacidad`
+    valores distintos; desde entonces solo se guardan los más frecuentes y
+    `error` acota cuánto puede subestimarse cualquier conteo guardado. Los
+    valores distintos se estiman con un sketch HyperLogLog cuando los conteos
+    dejan de ser exactos.
+    """
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self.conteos = pd.Series(dtype=np.int64)
+        self.error = 0
+        self.podado = False
+        self.registros = np.zeros(2 ** PRECISION_SKETCH_DISTINTOS, dtype=np.uint8)
+
+    def actualizar(self, serie):
+        """Agrega los valores de un bloque."""
+        value_counts = serie.value_counts()
+        value_counts = value_counts[value_counts > 0]
+        if isinstance(value_counts.index, pd.CategoricalIndex):
+            value_counts.index = value_counts.index.astype(object)
+        _hll_actualizar(self.registros, pd.util.hash_array(value_counts.index.to_numpy()))
+        self._sumar_conteos(value_counts)
+
+    def combinar(self, otro):
+        """Combina otro acumulador de la misma columna."""
+        np.maximum(self.registros, otro.registros, out=self.registros)
+        self.error += otro.error
+        self.podado = self.podado or otro.podado
+        self._sumar_conteos(otro.conteos)
+
+    def _sumar_conteos(self, value_counts):
+        """Suma conteos y guarda solo los valores más frecuentes al superar el doble de la capacidad."""
+        self.conteos = self.conteos.add(value_counts, fill_value=0).astype(np.int64)
+        if len(self.conteos) > 2 * self.capacidad:
+            self.conteos = self.conteos.sort_values(ascending=False, kind='stable')
+            self.error += self.conteos.iloc[self.capacidad]
+            self.conteos = self.conteos.iloc[:self.capacidad]
+            self.podado = True
+
+    def resultado(self, valores_nulos):
+        """Estadísticas con las claves del resumen ejecutivo."""
+        value_counts = self.conteos.sort_values(ascending=False, kind='stable')
+        valores_unicos = _hll_estimar(self.registros) if self.podado else len(value_counts)
+        return {
+            'valores_unicos': valores_unicos,
+            'valor_mas_frecuente': value_counts.index[0] if len(value_counts) > 0 else None,
+            'frecuencia_max': value_counts.iloc[0] if len(value_counts) > 0 else 0,
+            'valores_nulos': valores_nulos,
+            'top_5_valores': value_counts.head().to_dict()
+        }
+
+
+class _QuantileSketch:
+    """
+    Sketch de cuantiles KLL: una pila de compactadores donde el nivel h guarda elementos de peso 2**h.
+
+    Mientras no haya compactado, el sketch guarda todos los valores y los
+    cuantiles son exactos; después el error de rango es de aproximadamente 1/tamaño.
+    """
+
+    def __init__(self, tamaño):
+        self.tamaño = tamaño
+        self.niveles = [np.empty(0)]
+        self._rng = np.random.default_rng()
+
+    def actualizar(self, valores):
+        """Agrega un array de valores no nulos."""
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self._comprimir()
+
+    def combinar(self, otro):
+        """Agrega los compactadores de otro sketch nivel por nivel."""
+        for nivel, elementos in enumerate(otro.niveles):
+            if nivel == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            self.niveles[nivel] = np.concatenate([self.niveles[nivel], elementos])
+        self._comprimir()
+
+    def es_exacto(self):
+        """Si el sketch todavía guarda todos los valores."""
+        return len(self.niveles) == 1
+
+    def _capacidad(self, nivel):
+        """Los niveles inferiores tienen compactadores geométricamente menores (factor 2/3)."""
+        profundidad = len(self.niveles) - nivel - 1
+        return max(int(np.ceil(self.tamaño * (2 / 3) ** profundidad)), 2)
+
+    def _comprimir(self):
+        """Reduce a la mitad cada compactador lleno, subiendo un elemento ordenado de cada dos al siguiente nivel."""
+        nivel = 0
+        while nivel < len(self.niveles):
+            elementos = self.niveles[nivel]
+            if len(elementos) > self._capacidad(nivel):
+                elementos = np.sort(elementos)
+                # Un elemento impar sobrante se queda en este nivel para no perder peso
+                sobrante = elementos[len(elementos) - len(elementos) % 2:]
+                promovidos = elementos[self._rng.integers(2):len(elementos) - len(sobrante):2]
+                self.niveles[nivel] = sobrante
+                if nivel + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], promovidos])
+            nivel += 1
+
+    def cuantiles(self, cuantiles):
+        """Estimación de cuantiles (interpolación lineal, exacta mientras no haya compactado)."""
+        if self.es_exacto():
+            if len(self.niveles[0]) == 0:
+                return [np.nan] * len(cuantiles)
+            return list(np.quantile(self.niveles[0], cuantiles))
+
+        elementos = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(elementos_nivel), 2.0 ** nivel)
+                                for nivel, elementos_nivel in enumerate(self.niveles)])
+        orden = np.argsort(elementos, kind='stable')
+        elementos, pesos = elementos[orden], pesos[orden]
+        # Cada elemento representa el centro de los rangos que sustituye
+        rangos = (np.cumsum(pesos) - pesos / 2) / pesos.sum()
+        return list(np.interp(cuantiles, rangos, elementos))
+
+
+def _hashes_filas(df, estable=False, semillas=(0,)):
+    """
+    Hash de 64 bits de cada fila de un DataFrame, un array por semilla.
+
+    Las columnas numéricas, booleanas y de fecha se hashean a partir de los
+    bits de sus valores sin construir una tabla hash. Las demás columnas usan
+    los códigos de factorize, que solo son comparables dentro de df; con
+    estable=True se hashean a partir de sus valores, con una clave distinta
+    por semilla, para poder comparar hashes de distintos bloques.
+    """
+    hashes = [np.full(len(df), semilla, dtype=np.uint64) for semilla in semillas]
+    multiplicador = np.uint64(MULTIPLICADOR_HASH_FILA)
+    for posicion in range(df.shape[1]):
+        valores = _valores_hash_columna(df.iloc[:, posicion], estable, CLAVES_HASH_FILA[:len(semillas)])
+        for i in range(len(hashes)):
+            hashes[i] = _mezclar64(hashes[i] * multiplicador + valores[i])
+    return hashes
+
+
+def _valores_hash_columna(serie, estable, claves_hash=CLAVES_HASH_FILA[:1]):
+    """
+    Valores de 64 bits de una columna tales que valores iguales (y todos los
+    nulos) den el mismo resultado, un array por clave de hash. Solo los
+    textos hasheados con estable=True dependen de la clave; los demás valores son exactos.
+    """
+    dtype = serie.dtype
+    if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return [_valores_hash_enteros(serie)] * len(claves_hash)
+    if pd.api.types.is_bool_dtype(dtype) or (pd.api.types.is_numeric_dtype(dtype)
+                                             and not pd.api.types.is_complex_dtype(dtype)):
+        return [_valores_hash_float(serie.to_numpy(dtype=np.float64, na_value=np.nan))] * len(claves_hash)
+    if isinstance(dtype, np.dtype) and dtype.kind in 'mM':
+        return [serie.to_numpy().view(np.uint64)] * len(claves_hash)
+    if estable:
+        valores = serie.to_numpy()
+        return [pd.util.hash_array(valores, hash_key=clave_hash) for clave_hash in claves_hash]
+    return [pd.factorize(serie)[0].astype(np.uint64)] * len(claves_hash)
+
+
+def _valores_hash_float(valores):
+    """Bits de valores float64 con -0.0 convertido en 0.0 y el mismo patrón de bits para todos los NaN."""
+    valores = valores + 0.0
+    valores[np.isnan(valores)] = np.nan
+    return valores.view(np.uint64)
+
+
+def _valores_hash_enteros(serie):
+    """
+    Los enteros que float64 representa exactamente reciben los bits de ese
+    float (así coinciden con el mismo valor leído como float); los demás
+    conservan sus propios bits.
+    """
+    tipo_entero = np.uint64 if serie.dtype.kind == 'u' else np.int64
+    nulos = serie.isna().to_numpy()
+    enteros = serie.to_numpy(dtype=tipo_entero, na_value=0)
+    floats = enteros.astype(np.float64)
+    with np.errstate(invalid='ignore'):
+        exactos = floats.astype(tipo_entero) == enteros
+    floats[nulos] = np.nan
+    return np.where(exactos | nulos, _valores_hash_float(floats), enteros.view(np.uint64))
+
+
+def _mezclar64(valores):
+    """Finalizador SplitMix64: reparte cada bit de entrada por toda la salida de 64 bits."""
+    valores = valores ^ (valores >> np.uint64(30))
+    valores *= np.uint64(0xBF58476D1CE4E5B9)
+    valores ^= valores >> np.uint64(27)
+    valores *= np.uint64(0x94D049BB133111EB)
+    return valores ^ (valores >> np.uint64(31))
+
+
+def _hll_actualizar(registros, hashes):
+    """Agrega hashes de 64 bits a los registros HyperLogLog (los bits bajos eligen el registro)."""
+    if len(hashes) == 0:
+        return
+    precision = len(registros).bit_length() - 1
+    indice = (hashes & np.uint64(len(registros) - 1)).astype(np.intp)
+    resto = hashes >> np.uint64(precision)
+    # Posición del primer bit activo desde arriba en los 64 - precision bits restantes
+    longitud_bits = np.frexp(resto.astype(np.float64))[1]
+    rango = (64 - precision - longitud_bits + 1).astype(np.uint8)
+    np.maximum.at(registros, indice, rango)
+
+
+def _hll_estimar(registros):
+    """Estimación de cardinalidad HyperLogLog con la corrección para rangos pequeños."""
+    m = len(registros)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimacion = alpha * m * m / np.sum(np.ldexp(1.0, -registros.astype(np.int64)))
+    ceros = np.count_nonzero(registros == 0)
+    if estimacion <= 2.5 * m and ceros:
+        estimacion = m * np.log(m / ceros)
+    return int(round(estimacion))
+
+
+@instrumentado()
+def exportar_datos_limpios(df, nombre_archivo, carpeta_destino="../data/result", division="sheets"):
+    """
+    Exporta el DataFrame limpio a Excel con timestamp.
+
+    El libro se escribe en streaming, así que la memoria queda acotada en
+    exportaciones grandes y un iterador de bloques puede exportarse sin
+    concatenarlo. Las filas que superan el límite de Excel continúan en
+    hojas o archivos nuevos.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        DataFrame a exportar, o bloques con las mismas columnas
     nombre_archivo : str
         Nombre base del archivo (sin extensión)
     carpeta_destino : str
         Carpeta donde guardar el archivo
+    division : str
+        Dónde van las filas que superan el límite de Excel: 'sheets' (hojas) o 'files' (archivos)
 
     Returns:
     --------
-    str : Ruta completa del archivo guardado
+    str : Ruta completa del archivo guardado (la primera parte si se divide en varios archivos)
     """
     # Crear carpeta si no existe
     Path(carpeta_destino).mkdir(parents=True, exist_ok=True)
@@ -274,9 +1718,12 @@ def exportar_datos_limpios(df, nombre_archivo, carpeta_destino="../data/result")
     ruta_completa = Path(carpeta_destino) / nombre_completo
 
     # Exportar
-    df.to_excel(ruta_completa, index=False)
+    # Se importa aquí para que este módulo pueda usarse sin file_manager
+    from file_manager import escribir_excel_streaming
+    rutas, _ = escribir_excel_streaming(df, ruta_completa, division=division)
 
-    logger.info(f"Datos exportados exitosamente: {ruta_completa}")
+    logger.info("Datos exportados exitosamente: %s%s", ruta_completa,
+                f" ({len(rutas)} archivos)" if len(rutas) > 1 else "")
     return str(ruta_completa)
 
 
@@ -342,9 +1789,14 @@ if __name__ == "__main__":
     reporte = validar_dataframe(datos_ejemplo, "Datos de Prueba")
     datos_limpios = limpiar_nombres_columnas(datos_ejemplo)
     outliers_ventas = detectar_outliers_iqr(datos_limpios['ventas'])
+    outliers_dataframe = detectar_outliers_iqr_dataframe(datos_limpios, salida='counts')
     datos_con_fechas = procesar_fechas(datos_limpios, 'fecha')
     resumen = crear_resumen_ejecutivo(datos_con_fechas)
 
     imprimir_resumen_bonito(resumen)
 
+    # El mismo resumen calculado bloque a bloque
+    resumen_bloques = crear_resumen_por_bloques(datos_con_fechas[i:i + 25] for i in range(0, len(datos_con_fechas), 25))
+    imprimir_resumen_bonito(resumen_bloques)
+
     print("\n🎉 Todas las funciones probadas exitosamente!")
\ No newline at end of file
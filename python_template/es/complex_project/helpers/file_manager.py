@@ -13,22 +13,123 @@ Fecha: {fecha_actual}
 
 import pandas as pd
 import json
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from datetime import datetime
 import logging
 import shutil
-from typing import List, Dict, Optional, Union
+import threading
+import time
+import csv
+import codecs
+import errno
+import hashlib
+import importlib.util
+import io
+import os
+import uuid
+import zipfile
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, suppress
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Dict, Optional, Union, Tuple, Iterator, Iterable
+from xml.etree import ElementTree
+
+try:
+    from instrumentation import instrumentado
+except ImportError:  # instrumentation.py no se copió junto con este módulo
+    def instrumentado(nombre=None, contador=None):
+        return lambda funcion: funcion
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Un registro legible por máquina por operación (ver _registrar_metricas)
+logger_metricas = logging.getLogger(f"{__name__}.metrics")
+
+# Configuración de detección de CSV
+DELIMITADORES_CSV = [',', ';', '\t', '|']
+BYTES_MUESTRA_CSV = 64 * 1024
+ENCODINGS_ALTERNATIVOS_CSV = ['cp1252', 'latin-1']  # Se prueban en orden si un byte fuera de la muestra no se decodifica
+FILAS_VERIFICACION_ENCABEZADO_CSV = 5  # Filas comparadas con la primera antes de tratarla como datos
+
+# La detección de JSON lines lee bloques de estos caracteres y nunca interpreta una primera línea larga
+CARACTERES_MUESTRA_JSON_LINES = 8 * 1024
+
+# Formatos columnares leídos y escritos con pyarrow
+EXTENSIONES_COLUMNARES = ['.parquet', '.feather', '.arrow', '.ipc']
+
+# Lectores de Excel en orden de preferencia por extensión (calamine es un lector en Rust, pandas >= 2.2)
+MOTORES_EXCEL = {
+    '.xlsx': ['calamine', 'openpyxl'],
+    '.xls': ['calamine', 'xlrd']
+}
+PAQUETES_MOTORES_EXCEL = {
+    'calamine': ('python_calamine', 'python-calamine'),
+    'openpyxl': ('openpyxl', 'openpyxl'),
+    'xlrd': ('xlrd', 'xlrd')
+}
+
+# Exportación xlsx en streaming
+EXCEL_MAX_FILAS = 1_048_576  # Filas por hoja, encabezado incluido
+EXCEL_FILAS_BLOQUE_ESCRITURA = 50_000  # Filas convertidas a la vez al escribir un DataFrame
+MODOS_DIVISION_EXCEL = ['sheets', 'files']
+
+# Compresión de salida: sufijo de archivo y argumento de nivel de cada método
+SUFIJOS_COMPRESION = {'gzip': '.gz', 'zstd': '.zst', 'lz4': '.lz4'}
+METODOS_COMPRESION = {sufijo: metodo for metodo, sufijo in SUFIJOS_COMPRESION.items()}
+ARGUMENTOS_NIVEL_COMPRESION = {'gzip': 'compresslevel', 'zstd': 'level', 'lz4': 'compression_level'}
+
+# Configuración del cache de carga
+CACHE_TAMAÑO_MAX_MB = 1024
+CACHE_BYTES_BLOQUE_HASH = 1024 * 1024
+
+# Almacén de backups: objetos deduplicados y un manifiesto por backup dentro del directorio del proyecto
+NOMBRE_DIRECTORIO_BACKUPS = "backups"
+COMPRESIONES_BACKUP = {'zstd': '.zst', 'gzip': '.gz'}
+BYTES_BLOQUE_BACKUP = 1024 * 1024  # Bytes leídos, hasheados y comprimidos a la vez
+VERSION_MANIFIESTO_BACKUP = 1
+
+# Instantánea del árbol de directorios reutilizada por los reportes incrementales (guardada en el directorio del cache)
+NOMBRE_INDICE_ARCHIVOS = "indice_reporte_archivos.json"
+VERSION_INDICE_ARCHIVOS = 1
+
+# Coincidencia aproximada de nombres de archivo: tamaño de n-grama y número de índices de directorio en memoria
+NGRAMA_NOMBRES_SIMILARES = 3
+INDICES_NOMBRES_SIMILARES = 32
+
+# Escaneos de integridad: filas parseadas por archivo, bytes mágicos por formato y
+# checksums de los archivos validados (guardados en el directorio del cache)
+FILAS_SONDEO_INTEGRIDAD = 5
+BYTES_MAGICOS_INTEGRIDAD = {
+    '.xlsx': b'PK\x03\x04',
+    '.xls': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',
+    '.parquet': b'PAR1',
+    '.feather': b'ARROW1',
+    '.arrow': b'ARROW1',
+    '.ipc': b'ARROW1'
+}
+MAGIA_FINAL_INTEGRIDAD = ['.parquet', '.feather', '.arrow', '.ipc']  # Formatos que también terminan con sus bytes mágicos
+NOMBRE_INDICE_INTEGRIDAD = "indice_integridad.json"
+VERSION_INDICE_INTEGRIDAD = 1
+
+# Retención: claves aceptadas en una regla, regla por defecto y archivos eliminados por tarea
+CLAVES_REGLA_RETENCION = ['patron', 'dias_antiguedad', 'tamaño_min_mb', 'directorios']
+DIRECTORIOS_RETENCION = ['result', 'logs']
+REGLAS_RETENCION_POR_DEFECTO = [{'patron': 'temp_*', 'dias_antiguedad': 7}]
+LOTE_ELIMINACION_RETENCION = 256
+
 
 class FileManager:
     """
     Gestor de archivos para proyectos de datos con funcionalidades avanzadas.
     """
 
-    def __init__(self, directorio_proyecto: str = "."):
+    def __init__(self, directorio_proyecto: str = ".", usar_cache: bool = False,
+                 cache_tamaño_max_mb: float = CACHE_TAMAÑO_MAX_MB, cache_hash_contenido: bool = False,
+                 optimizar_memoria: bool = False, motor_excel: Optional[str] = None):
         """
         Inicializa el gestor de archivos.
 
@@ -36,16 +137,32 @@ class FileManager:
         -----------
         directorio_proyecto : str
             Ruta al directorio raíz del proyecto
+        usar_cache : bool
+            Si cargar_archivo_auto usa por defecto el cache de carga en disco
+        cache_tamaño_max_mb : float
+            Tamaño máximo del cache de carga antes de desalojar las entradas menos usadas
+        cache_hash_contenido : bool
+            Si las claves del cache incluyen un hash del contenido además del tamaño y mtime
+        optimizar_memoria : bool
+            Si cargar_archivo_auto compacta los tipos por defecto (ver data_processor.optimizar_memoria)
+        motor_excel : str, optional
+            Motor de pandas para archivos Excel (por defecto el más rápido instalado, ver MOTORES_EXCEL)
         """
         self.directorio_proyecto = Path(directorio_proyecto)
         self.directorio_insumos = self.directorio_proyecto / "data" / "input"
         self.directorio_resultados = self.directorio_proyecto / "data" / "result"
         self.directorio_logs = self.directorio_proyecto / "data" / "logs"
+        self.directorio_cache = self.directorio_proyecto / "data" / "cache"
 
         # Crear directorios si no existen
         self._crear_estructura_directorios()
 
-        logger.info(f"FileManager inicializado en: {self.directorio_proyecto}")
+        self.usar_cache = usar_cache
+        self.cache = LoadCache(self.directorio_cache, cache_tamaño_max_mb, cache_hash_contenido)
+        self.optimizar_memoria = optimizar_memoria
+        self.motor_excel = motor_excel
+
+        logger.info("FileManager inicializado en: %s", self.directorio_proyecto)
 
     def _crear_estructura_directorios(self):
         """Crea la estructura de directorios necesaria."""
@@ -88,10 +205,31 @@ class FileManager:
         patron = f"*{extension}" if extension else "*"
         archivos = list(ruta.glob(patron))
 
-        logger.info(f"Encontrados {len(archivos)} archivos en {directorio}")
+        logger.info("Encontrados %s archivos en %s", len(archivos), directorio)
         return archivos
 
-    def cargar_archivo_auto(self, nombre_archivo: str, directorio: str = "input") -> pd.DataFrame:
+    def _resolver_archivo_datos(self, nombre_archivo: str, directorio: str) -> Path:
+        """Construye la ruta de un archivo de datos y verifica que exista."""
+        directorio_map = {
+            'input': self.directorio_insumos,
+            'result': self.directorio_resultados
+        }
+
+        ruta_archivo = directorio_map[directorio] / nombre_archivo
+
+        if not ruta_archivo.exists():
+            raise FileNotFoundError(f"Archivo no encontrado: {ruta_archivo}")
+
+        return ruta_archivo
+
+    @instrumentado()
+    def cargar_archivo_auto(self, nombre_archivo: str, directorio: str = "input",
+                            tamaño_bloque: Optional[int] = None,
+                            columnas: Optional[List[str]] = None,
+                            filtros: Optional[List[Tuple]] = None,
+                            usar_cache: Optional[bool] = None,
+                            optimizar_memoria: Optional[bool] = None,
+                            nombre_hoja: Union[str, int] = 0) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Carga automáticamente un archivo detectando su formato.
 
@@ -101,141 +239,678 @@ class FileManager:
             Nombre del archivo a cargar
         directorio : str
             Directorio donde buscar ('input', 'result')
+        tamaño_bloque : int, optional
+            Si se indica, retorna un iterador de DataFrames con como máximo esta
+            cantidad de filas cada uno en lugar de cargar todo el archivo
+            (ver iterar_archivo_por_bloques)
+        columnas : List[str], optional
+            Columnas a leer (solo Parquet, Feather, Arrow IPC y Excel)
+        filtros : List[Tuple], optional
+            Filtros de filas aplicados por el lector, ej: [('region', '==', 'Norte')]
+            (solo Parquet, Feather y Arrow IPC)
+        usar_cache : bool, optional
+            Si usar el cache de carga en esta llamada (por defecto el valor
+            usar_cache indicado al constructor)
+        optimizar_memoria : bool, optional
+            Si reducir los números y compactar las columnas de texto después de cargar
+            (por defecto el valor optimizar_memoria indicado al constructor)
+        nombre_hoja : str or int
+            Hoja de Excel a leer, por nombre o posición (ver cargar_hojas_excel para varias hojas)
 
         Returns:
         --------
         pd.DataFrame : DataFrame con los datos cargados
         """
-        directorio_map = {
-            'input': self.directorio_insumos,
-            'result': self.directorio_resultados
-        }
+        if tamaño_bloque is not None:
+            return self.iterar_archivo_por_bloques(nombre_archivo, directorio, tamaño_bloque,
+                                                   columnas, filtros, nombre_hoja)
 
-        ruta_archivo = directorio_map[directorio] / nombre_archivo
+        ruta_archivo = self._resolver_archivo_datos(nombre_archivo, directorio)
 
-        if not ruta_archivo.exists():
-            raise FileNotFoundError(f"Archivo no encontrado: {ruta_archivo}")
+        # Detectar formato (el sufijo interior de los comprimidos como resultados.csv.gz) y cargar
+        extension = _formato_datos(ruta_archivo)[0]
 
-        # Detectar formato y cargar
-        extension = ruta_archivo.suffix.lower()
+        if usar_cache is None:
+            usar_cache = self.usar_cache
+        usar_cache = usar_cache and _es_cacheable(extension, columnas, nombre_hoja)
+        inicio = time.perf_counter()
 
         try:
-            if extension in ['.xlsx', '.xls']:
-                df = pd.read_excel(ruta_archivo)
-                logger.info(f"Archivo Excel cargado: {nombre_archivo}")
+            df = self.cache.obtener(ruta_archivo) if usar_cache else None
+            desde_cache = df is not None
+
+            if desde_cache:
+                logger.info("Archivo cargado desde cache: %s", nombre_archivo)
+
+            elif extension in ['.xlsx', '.xls']:
+                motor = _motor_excel(extension, self.motor_excel)
+                df = _leer_excel(ruta_archivo, nombre_hoja, columnas, motor)
+                logger.info("Archivo Excel cargado: %s (motor: %s)", nombre_archivo, motor)
 
             elif extension == '.csv':
-                # Intentar detectar delimitador
-                df = self._cargar_csv_inteligente(ruta_archivo)
-                logger.info(f"Archivo CSV cargado: {nombre_archivo}")
+                # Detectar delimitador y encoding
+                df, dialecto = self._cargar_csv_inteligente(ruta_archivo)
+                df.attrs['dialecto_csv'] = dialecto
+                logger.info("Archivo CSV cargado: %s", nombre_archivo)
+
+            elif extension in ['.jsonl', '.ndjson'] or (extension == '.json' and _es_json_lines(ruta_archivo)):
+                with _fuente_pandas(ruta_archivo) as fuente:
+                    df = pd.read_json(fuente, lines=True, compression='infer')
+                logger.info("Archivo JSON lines cargado: %s", nombre_archivo)
 
             elif extension == '.json':
-                df = pd.read_json(ruta_archivo)
-                logger.info(f"Archivo JSON cargado: {nombre_archivo}")
+                with _fuente_pandas(ruta_archivo) as fuente:
+                    df = pd.read_json(fuente, compression='infer')
+                logger.info("Archivo JSON cargado: %s", nombre_archivo)
 
             elif extension in ['.txt', '.tsv']:
-                df = pd.read_csv(ruta_archivo, sep='\t')
-                logger.info(f"Archivo de texto cargado: {nombre_archivo}")
+                with _fuente_pandas(ruta_archivo) as fuente:
+                    df = pd.read_csv(fuente, sep='\t', compression='infer')
+                logger.info("Archivo de texto cargado: %s", nombre_archivo)
+
+            elif extension in EXTENSIONES_COLUMNARES:
+                df = _leer_tabla_columnar(ruta_archivo, columnas, filtros).to_pandas()
+                logger.info("Archivo columnar cargado: %s", nombre_archivo)
 
             else:
                 raise ValueError(f"Formato de archivo no soportado: {extension}")
 
+            if usar_cache and not desde_cache:
+                self.cache.guardar(ruta_archivo, df)
+
+            if optimizar_memoria is None:
+                optimizar_memoria = self.optimizar_memoria
+            if optimizar_memoria:
+                # Se importa aquí para que este módulo pueda usarse sin data_processor
+                from data_processor import optimizar_memoria as optimizar_memoria_dataframe
+                df = optimizar_memoria_dataframe(df, en_lugar=True)
+
             # Validar carga
-            logger.info(f"  - Dimensiones: {df.shape[0]} filas × {df.shape[1]} columnas")
-            logger.info(f"  - Memoria: {df.memory_usage(deep=True).sum() / (1024 ** 2):.2f} MB")
+            logger.info("  - Dimensiones: %s filas × %s columnas", df.shape[0], df.shape[1])
+            _registrar_metricas('cargar_archivo', inicio, df=df, ruta=ruta_archivo, archivo=nombre_archivo,
+                                desde_cache=desde_cache)
 
             return df
 
         except Exception as e:
-            logger.error(f"Error cargando archivo {nombre_archivo}: {str(e)}")
+            logger.error("Error cargando archivo %s: %s", nombre_archivo, e)
             raise
 
-    def _cargar_csv_inteligente(self, ruta_archivo: Path) -> pd.DataFrame:
+    def iterar_archivo_por_bloques(self, nombre_archivo: str, directorio: str = "input",
+                                   tamaño_bloque: int = 100_000,
+                                   columnas: Optional[List[str]] = None,
+                                   filtros: Optional[List[Tuple]] = None,
+                                   nombre_hoja: Union[str, int] = 0) -> Iterator[pd.DataFrame]:
         """
-        Carga un CSV detectando automáticamente el delimitador y encoding.
+        Carga un archivo por bloques detectando su formato.
+
+        La memoria queda acotada por el tamaño del bloque: CSV/TSV/TXT y JSON lines
+        se leen en streaming con pandas (también comprimidos, ej: resultados.csv.gz),
+        las hojas .xlsx se paginan fila a fila en modo solo lectura y los
+        archivos columnares se recorren lote a lote. Los documentos JSON y las
+        hojas .xls se cargan completos y luego se dividen.
+
+        Parameters:
+        -----------
+        nombre_archivo : str
+            Nombre del archivo a cargar
+        directorio : str
+            Directorio donde buscar ('input', 'result')
+        tamaño_bloque : int
+            Cantidad máxima de filas por bloque
+        columnas : List[str], optional
+            Columnas a leer (solo Parquet, Feather, Arrow IPC y Excel)
+        filtros : List[Tuple], optional
+            Filtros de filas aplicados por el lector (solo Parquet, Feather y Arrow IPC)
+        nombre_hoja : str or int
+            Hoja de Excel a leer por bloques, por nombre o posición
+
+        Returns:
+        --------
+        Iterator[pd.DataFrame] : Iterador sobre los bloques del DataFrame
         """
-        delimitadores = [',', ';', '\t', '|']
-        encodings = ['utf-8', 'latin-1', 'cp1252']
+        if tamaño_bloque <= 0:
+            raise ValueError("tamaño_bloque debe ser un entero positivo")
 
-        for encoding in encodings:
-            for delim in delimitadores:
-                try:
-                    df = pd.read_csv(ruta_archivo, sep=delim, encoding=encoding, nrows=5)
-                    if df.shape[1] > 1:  # Si tiene más de una columna, probablemente es correcto
-                        # Cargar el archivo completo
-                        df_completo = pd.read_csv(ruta_archivo, sep=delim, encoding=encoding)
-                        logger.debug(f"CSV cargado con delimitador '{delim}' y encoding '{encoding}'")
-                        return df_completo
-                except:
-                    continue
+        # Resolver de inmediato para que un archivo inexistente falle al llamar, no al iterar
+        ruta_archivo = self._resolver_archivo_datos(nombre_archivo, directorio)
+        extension = _formato_datos(ruta_archivo)[0]
 
-        # Si nada funciona, usar configuración por defecto
-        logger.warning("No se pudo detectar formato CSV, usando configuración por defecto")
-        return pd.read_csv(ruta_archivo)
+        if extension in ['.xlsx', '.xls']:
+            lector = self._iterar_bloques_excel(ruta_archivo, tamaño_bloque, nombre_hoja, columnas)
+            logger.info("Leyendo archivo Excel por bloques: %s", nombre_archivo)
+
+        elif extension == '.csv':
+            lector = _iterar_bloques_csv(ruta_archivo, tamaño_bloque, detectar_dialecto_csv(ruta_archivo))
+            logger.info("Leyendo archivo CSV por bloques: %s", nombre_archivo)
+
+        elif extension in ['.jsonl', '.ndjson'] or (extension == '.json' and _es_json_lines(ruta_archivo)):
+            lector = _leer_bloques(pd.read_json, ruta_archivo, lines=True, chunksize=tamaño_bloque)
+            logger.info("Leyendo archivo JSON lines por bloques: %s", nombre_archivo)
+
+        elif extension == '.json':
+            # pandas no puede parsear un documento JSON de forma incremental
+            logger.warning("%s no es JSON lines, se carga completo antes de dividirlo", nombre_archivo)
+            with _fuente_pandas(ruta_archivo) as fuente:
+                df = pd.read_json(fuente, compression='infer')
+            lector = (df.iloc[inicio:inicio + tamaño_bloque] for inicio in range(0, len(df), tamaño_bloque))
+
+        elif extension in ['.txt', '.tsv']:
+            lector = _leer_bloques(pd.read_csv, ruta_archivo, sep='\t', chunksize=tamaño_bloque)
+            logger.info("Leyendo archivo de texto por bloques: %s", nombre_archivo)
+
+        elif extension in EXTENSIONES_COLUMNARES:
+            lector = _iterar_lotes_columnares(ruta_archivo, tamaño_bloque, columnas, filtros)
+            logger.info("Leyendo archivo columnar por bloques: %s", nombre_archivo)
+
+        else:
+            raise ValueError(f"Formato de archivo no soportado: {extension}")
+
+        return self._registrar_bloques(lector, ruta_archivo)
+
+    def _registrar_bloques(self, lector, ruta_archivo: Path) -> Iterator[pd.DataFrame]:
+        """Entrega los bloques de un lector registrando el progreso y los totales."""
+        nombre_archivo = ruta_archivo.name
+        total_filas = 0
+        total_bloques = 0
+        columnas = 0
+        inicio = time.perf_counter()
+
+        try:
+            for bloque in lector:
+                total_bloques += 1
+                total_filas += len(bloque)
+                columnas = bloque.shape[1]
+                logger.debug("  - Bloque %s: %s filas", total_bloques, len(bloque))
+                yield bloque
+        except Exception as e:
+            logger.error("Error cargando archivo %s: %s", nombre_archivo, e)
+            raise
+        finally:
+            if hasattr(lector, 'close'):
+                lector.close()
+
+        logger.info("  - Bloques: %s (%s filas en total)", total_bloques, total_filas)
+        _registrar_metricas('iterar_archivo_por_bloques', inicio, dimensiones=(total_filas, columnas),
+                            ruta=ruta_archivo, archivo=nombre_archivo, bloques=total_bloques)
+
+    def _iterar_bloques_excel(self, ruta_archivo: Path, tamaño_bloque: int, nombre_hoja: Union[str, int] = 0,
+                              columnas: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Pagina una hoja de un libro en rangos de filas.
+
+        Los archivos .xlsx se leen con openpyxl en modo solo lectura, así que solo
+        la página actual (y solo las columnas pedidas) se mantiene en memoria.
+        Los .xls no se leen en streaming: sus lectores cargan el libro completo
+        de todos modos, así que la hoja se lee una vez y se divide en bloques.
+        """
+        if ruta_archivo.suffix.lower() == '.xls':
+            logger.warning("%s es un archivo .xls, se carga la hoja completa antes de dividirla", ruta_archivo.name)
+            df = _leer_excel(ruta_archivo, nombre_hoja, columnas, _motor_excel('.xls', self.motor_excel))
+            for inicio in range(0, len(df), tamaño_bloque):
+                yield df.iloc[inicio:inicio + tamaño_bloque]
+            return
+
+        from openpyxl import load_workbook
+
+        libro = load_workbook(ruta_archivo, read_only=True, data_only=True)
+        try:
+            hoja = libro[nombre_hoja] if isinstance(nombre_hoja, str) else libro.worksheets[nombre_hoja]
+            filas = hoja.iter_rows(values_only=True)
+            encabezado = next(filas, None)
+            if encabezado is None:
+                return
+
+            nombres = [f"Unnamed: {i}" if nombre is None else nombre for i, nombre in enumerate(encabezado)]
+            if columnas is not None:
+                faltantes = [col for col in columnas if col not in nombres]
+                if faltantes:
+                    raise ValueError(f"Columnas no encontradas en la hoja: {faltantes}")
+                posiciones = [nombres.index(col) for col in columnas]
+                # Las filas en modo solo lectura terminan en su última celda con valor
+                filas = (tuple(fila[i] if i < len(fila) else None for i in posiciones) for fila in filas)
+                nombres = list(columnas)
+
+            pagina = []
+            for fila in filas:
+                pagina.append(fila)
+                if len(pagina) == tamaño_bloque:
+                    yield pd.DataFrame.from_records(pagina, columns=nombres)
+                    pagina = []
+            if pagina:
+                yield pd.DataFrame.from_records(pagina, columns=nombres)
+        finally:
+            libro.close()
+
+    @instrumentado()
+    def cargar_hojas_excel(self, nombre_archivo: str, directorio: str = "input",
+                           hojas: Optional[List[Union[str, int]]] = None,
+                           columnas: Optional[List[str]] = None,
+                           ejecutor: str = "auto", max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Carga varias hojas de un libro de forma concurrente.
+
+        Cada hoja la procesa su propio worker. Los motores en Python puro
+        (openpyxl, xlrd) usan un pool de procesos para procesar las hojas en
+        paralelo, mientras que calamine usa un pool de hilos.
 
-    def guardar_dataframe(self, df: pd.DataFrame, nombre_archivo: str,
+        Parameters:
+        -----------
+        nombre_archivo : str
+            Nombre del archivo Excel a cargar
+        directorio : str
+            Directorio donde buscar ('input', 'result')
+        hojas : List[str or int], optional
+            Hojas a leer, por nombre o posición (por defecto todas)
+        columnas : List[str], optional
+            Columnas a leer de cada hoja
+        ejecutor : str
+            'process', 'thread' o 'auto' (elige según el motor)
+        max_workers : int, optional
+            Cantidad máxima de workers (por defecto la del ejecutor)
+
+        Returns:
+        --------
+        Dict[str, pd.DataFrame] : DataFrames por nombre de hoja, en el orden del libro
+        """
+        if ejecutor not in ['auto', 'process', 'thread']:
+            raise ValueError("ejecutor debe ser uno de: ['auto', 'process', 'thread']")
+
+        ruta_archivo = self._resolver_archivo_datos(nombre_archivo, directorio)
+        motor = _motor_excel(ruta_archivo.suffix.lower(), self.motor_excel)
+
+        nombres_hojas = _nombres_hojas_excel(ruta_archivo, motor)
+        if hojas is None:
+            hojas = nombres_hojas
+        hojas = [nombres_hojas[hoja] if isinstance(hoja, int) else hoja for hoja in hojas]
+
+        if ejecutor == 'auto':
+            ejecutor = 'thread' if motor == 'calamine' else 'process'
+        clase_pool = ProcessPoolExecutor if ejecutor == 'process' else ThreadPoolExecutor
+
+        with clase_pool(max_workers=max_workers) as pool:
+            futuros = {hoja: pool.submit(_leer_excel, ruta_archivo, hoja, columnas, motor) for hoja in hojas}
+            resultados = {hoja: futuro.result() for hoja, futuro in futuros.items()}
+
+        logger.info("Hojas de Excel cargadas: %s (%s hojas, motor: %s)", nombre_archivo, len(resultados), motor)
+        return resultados
+
+    @instrumentado()
+    def cargar_varios(self, patron: str = "*", directorio: str = "input",
+                      ejecutor: str = "auto", max_workers: Optional[int] = None,
+                      combinar: Union[bool, str] = False,
+                      **opciones_carga) -> Tuple[Union[Dict[str, pd.DataFrame], pd.DataFrame, Iterator[pd.DataFrame]],
+                                                 Dict[str, str]]:
+        """
+        Carga de forma concurrente todos los archivos que coinciden con un patrón.
+
+        El parseo de CSV/Excel/JSON usa CPU y se ejecuta en un pool de procesos,
+        mientras que los formatos columnares (cuyos lectores liberan el GIL) usan
+        un pool de hilos. Un archivo con error se reporta en los errores en lugar
+        de abortar el lote. En Windows el script que lo llama debe estar protegido
+        con if __name__ == "__main__" cuando se usan procesos.
+
+        Parameters:
+        -----------
+        patron : str
+            Patrón glob de los archivos a cargar (ej: '*.csv')
+        directorio : str
+            Directorio donde buscar ('input', 'result')
+        ejecutor : str
+            'process', 'thread' o 'auto' (elige según el formato de cada archivo)
+        max_workers : int, optional
+            Cantidad máxima de workers por pool (por defecto la del ejecutor)
+        combinar : bool or str
+            Si es True, retorna un único DataFrame indexado por ('archivo_origen', fila)
+            en lugar de un diccionario de DataFrames. Si es 'lazy', retorna un
+            iterador que entrega el DataFrame de cada archivo con ese índice, en
+            el orden de los archivos y apenas se parsea, sin construir nunca el
+            DataFrame combinado (puede pasarse a guardar_dataframe o crear_resumen_streaming)
+        **opciones_carga
+            Argumentos adicionales para cargar_archivo_auto (ej: columnas, filtros, usar_cache, optimizar_memoria)
+
+        Returns:
+        --------
+        Tuple : (DataFrames por nombre de archivo, DataFrame combinado o iterador
+                 de DataFrames, errores por nombre de archivo). Con combinar='lazy'
+                 el diccionario de errores se completa mientras se consume el iterador
+        """
+        if ejecutor not in ['auto', 'process', 'thread']:
+            raise ValueError("ejecutor debe ser uno de: ['auto', 'process', 'thread']")
+        if combinar not in [False, True, 'lazy']:
+            raise ValueError("combinar debe ser uno de: [False, True, 'lazy']")
+
+        directorio_map = {
+            'input': self.directorio_insumos,
+            'result': self.directorio_resultados
+        }
+        archivos = sorted(f for f in directorio_map[directorio].glob(patron) if f.is_file())
+
+        # Las consultas al cache se hacen aquí para que los workers nunca escriban el índice a la vez
+        usar_cache = opciones_carga.pop('usar_cache', None)
+        if usar_cache is None:
+            usar_cache = self.usar_cache
+
+        # Los tipos se compactan después del cache (y de combinar) para que el cache guarde los DataFrames originales
+        optimizar_memoria = opciones_carga.pop('optimizar_memoria', None)
+        if optimizar_memoria is None:
+            optimizar_memoria = self.optimizar_memoria
+        if optimizar_memoria:
+            # Se importa aquí para que este módulo pueda usarse sin data_processor
+            from data_processor import optimizar_memoria as optimizar_memoria_dataframe
+
+        errores = {}
+        cargados = self._iterar_archivos_cargados(archivos, directorio, ejecutor, max_workers, usar_cache,
+                                                  errores, opciones_carga)
+
+        if combinar == 'lazy':
+            # Cada archivo se compacta por separado, ya que no hay DataFrame combinado
+            return _iterar_combinados(cargados, optimizar_memoria_dataframe if optimizar_memoria else None), errores
+
+        resultados = dict(cargados)
+
+        if combinar:
+            if not resultados:
+                return pd.DataFrame(), errores
+            combinado = pd.concat(resultados.values(), keys=list(resultados.keys()),
+                                  names=['archivo_origen', None])
+            if optimizar_memoria:
+                combinado = optimizar_memoria_dataframe(combinado, en_lugar=True)
+            return combinado, errores
+
+        if optimizar_memoria:
+            resultados = {nombre: optimizar_memoria_dataframe(df, en_lugar=True) for nombre, df in resultados.items()}
+
+        return resultados, errores
+
+    def _iterar_archivos_cargados(self, archivos: List[Path], directorio: str, ejecutor: str,
+                                  max_workers: Optional[int], usar_cache: bool, errores: Dict[str, str],
+                                  opciones_carga: Dict) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Envía cada archivo a su pool y entrega (nombre_archivo, DataFrame) en el orden de los archivos.
+
+        Los aciertos de cache se entregan sin worker; los fallos se agregan a errores.
+        Cerrar el iterador antes de tiempo cancela los archivos que aún no empezaron.
+        """
+        inicio = time.perf_counter()
+        pendientes = []
+        archivos_cargados = 0
+        filas_cargadas = 0
+
+        with ExitStack() as stack:
+            pools = {}
+            for ruta_archivo in archivos:
+                extension = _formato_datos(ruta_archivo)[0]
+                cacheable = usar_cache and _es_cacheable(extension, opciones_carga.get('columnas'),
+                                                         opciones_carga.get('nombre_hoja', 0))
+                if cacheable:
+                    df = self.cache.obtener(ruta_archivo)
+                    if df is not None:
+                        logger.debug("Archivo cargado desde cache: %s", ruta_archivo.name)
+                        pendientes.append((ruta_archivo, False, df))
+                        continue
+
+                tipo = ejecutor
+                if tipo == 'auto':
+                    tipo = 'thread' if extension in EXTENSIONES_COLUMNARES else 'process'
+                if tipo not in pools:
+                    clase_pool = ProcessPoolExecutor if tipo == 'process' else ThreadPoolExecutor
+                    pools[tipo] = stack.enter_context(clase_pool(max_workers=max_workers))
+
+                futuro = pools[tipo].submit(self.cargar_archivo_auto, ruta_archivo.name, directorio,
+                                            usar_cache=False, optimizar_memoria=False, **opciones_carga)
+                pendientes.append((ruta_archivo, cacheable, futuro))
+
+            try:
+                for ruta_archivo, cacheable, resultado in pendientes:
+                    if not isinstance(resultado, pd.DataFrame):
+                        try:
+                            resultado = resultado.result()
+                        except Exception as e:
+                            errores[ruta_archivo.name] = f"{type(e).__name__}: {str(e)}"
+                            logger.warning("Archivo omitido: %s", ruta_archivo.name)
+                            continue
+                        if cacheable:
+                            self.cache.guardar(ruta_archivo, resultado)
+
+                    archivos_cargados += 1
+                    filas_cargadas += len(resultado)
+                    yield ruta_archivo.name, resultado
+            finally:
+                for _, _, resultado in pendientes:
+                    if not isinstance(resultado, pd.DataFrame):
+                        resultado.cancel()
+
+        logger.info("Archivos cargados: %s de %s (%s errores)", archivos_cargados, len(archivos), len(errores))
+        _registrar_metricas('cargar_varios', inicio, dimensiones=(filas_cargadas, None),
+                            archivos=archivos_cargados, errores=len(errores))
+
+    @instrumentado()
+    def contar_filas_duplicadas(self, patron: str = "*", directorio: str = "input",
+                                modo: str = "exact", tamaño_bloque: int = 100_000) -> Tuple[Dict, Dict[str, str]]:
+        """
+        Cuenta filas duplicadas entre todos los archivos que coinciden con un patrón.
+
+        Los archivos se leen bloque a bloque en un único DuplicateCounter, así
+        que una fila es duplicada si aparece antes en el mismo archivo o en
+        cualquier archivo anterior. La memoria queda acotada por el tamaño de
+        bloque más 16 bytes por fila distinta (un sketch de tamaño fijo en
+        modo aproximado).
+
+        Parameters:
+        -----------
+        patron : str
+            Patrón glob de los archivos a revisar (ej: '*.csv')
+        directorio : str
+            Directorio donde buscar ('input', 'result')
+        modo : str
+            'exact' o 'approximate' (ver data_processor.DuplicateCounter)
+        tamaño_bloque : int
+            Número máximo de filas por bloque
+
+        Returns:
+        --------
+        Tuple : (reporte con archivos, filas, filas distintas y duplicadas, errores por archivo)
+        """
+        # Se importa aquí para que este módulo pueda usarse sin data_processor
+        from data_processor import DuplicateCounter
+
+        directorio_map = {
+            'input': self.directorio_insumos,
+            'result': self.directorio_resultados
+        }
+        archivos = sorted(f for f in directorio_map[directorio].glob(patron) if f.is_file())
+
+        contador = DuplicateCounter(modo)
+        errores = {}
+        revisados = []
+
+        for ruta_archivo in archivos:
+            # Contar en un contador por archivo para que un archivo fallido no altere el total
+            contador_archivo = DuplicateCounter(modo)
+            try:
+                for bloque in self.iterar_archivo_por_bloques(ruta_archivo.name, directorio,
+                                                              tamaño_bloque=tamaño_bloque):
+                    contador_archivo.actualizar(bloque)
+                contador.combinar(contador_archivo)
+            except Exception as e:
+                errores[ruta_archivo.name] = f"{type(e).__name__}: {str(e)}"
+                logger.warning("Archivo omitido: %s", ruta_archivo.name)
+                continue
+            revisados.append(ruta_archivo.name)
+
+        reporte = {
+            'archivos': revisados,
+            'modo': modo,
+            'filas': contador.filas,
+            'filas_distintas': contador.filas_distintas(),
+            'filas_duplicadas': contador.filas_duplicadas()
+        }
+
+        logger.info("Filas duplicadas en %s archivos: %d de %d",
+                    len(revisados), reporte['filas_duplicadas'], reporte['filas'])
+        return reporte, errores
+
+    def _cargar_csv_inteligente(self, ruta_archivo: Path,
+                                dialecto: Optional[Dict] = None) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Carga un CSV detectando automáticamente el delimitador y encoding.
+
+        El dialecto se detecta a partir de una única muestra de bytes y el
+        archivo se parsea con la configuración detectada. Si un byte fuera de
+        la muestra no se decodifica, el archivo se parsea de nuevo con los
+        encodings alternativos (cp1252 y luego latin-1) y el dialecto devuelto
+        contiene el utilizado.
+
+        Parameters:
+        -----------
+        ruta_archivo : Path
+            Ruta del archivo CSV
+        dialecto : Dict, optional
+            Dialecto detectado previamente (ver detectar_dialecto_csv) para omitir la detección
+
+        Returns:
+        --------
+        Tuple[pd.DataFrame, Dict] : DataFrame cargado y el dialecto utilizado
+        """
+        if dialecto is None:
+            dialecto = detectar_dialecto_csv(ruta_archivo)
+
+        while True:
+            try:
+                with _fuente_pandas(ruta_archivo) as fuente:
+                    df = pd.read_csv(fuente, compression='infer', **opciones_lectura_csv(dialecto))
+                break
+            except UnicodeDecodeError as e:
+                dialecto = _dialecto_alternativo(ruta_archivo, dialecto, e)
+        logger.debug("CSV cargado con delimitador '%s' y encoding '%s'", dialecto['delimitador'], dialecto['encoding'])
+        return df, dialecto
+
+    @instrumentado()
+    def guardar_dataframe(self, df: Union[pd.DataFrame, Iterable[pd.DataFrame]], nombre_archivo: str,
                           incluir_timestamp: bool = True,
-                          formato: str = 'xlsx') -> Path:
+                          formato: str = 'xlsx', division_excel: str = 'sheets',
+                          compresion: Optional[str] = None,
+                          nivel_compresion: Optional[int] = None) -> Path:
         """
         Guarda un DataFrame en el directorio de result.
 
+        Los archivos 'xlsx' se escriben en streaming con memoria acotada (ver
+        escribir_excel_streaming), así que un iterador de bloques (ej: de
+        iterar_archivo_por_bloques) puede guardarse como 'xlsx' o 'csv' sin concatenarlo.
+
+        Cada archivo se escribe en un archivo temporal, se sincroniza con fsync
+        y se renombra a su lugar, así que nunca se lee un archivo a medio escribir.
+
         Parameters:
         -----------
-        df : pd.DataFrame
-            DataFrame a guardar
+        df : pd.DataFrame or Iterable[pd.DataFrame]
+            DataFrame a guardar, o bloques con las mismas columnas (solo 'xlsx' y 'csv')
         nombre_archivo : str
             Nombre base del archivo (sin extensión)
         incluir_timestamp : bool
             Si incluir timestamp en el nombre
         formato : str
-            Formato de salida ('xlsx', 'csv', 'json')
+            Formato de salida ('xlsx', 'csv', 'json', 'parquet', 'feather', 'arrow').
+            Los formatos columnares son mucho más rápidos que 'xlsx' para resultados intermedios
+        division_excel : str
+            Dónde van las filas que superan el límite de Excel: 'sheets' (hojas) o 'files' (archivos)
+        compresion : str, optional
+            'gzip', 'zstd' o 'lz4'. Los archivos CSV y JSON reciben el sufijo
+            correspondiente (ej: '.csv.gz') y cargar_archivo_auto los vuelve a leer; los Parquet, Feather y Arrow comprimen
+            sus columnas (Feather y Arrow solo soportan 'zstd' y 'lz4')
+        nivel_compresion : int, optional
+            Nivel de compresión (por defecto el del códec)
 
         Returns:
         --------
-        Path : Ruta completa del archivo guardado
+        Path : Ruta completa del archivo guardado (la primera parte si un xlsx se divide en varios archivos)
         """
+        if compresion is not None and compresion not in SUFIJOS_COMPRESION:
+            raise ValueError(f"compresion debe ser uno de: {list(SUFIJOS_COMPRESION)}")
+        if compresion is not None and formato == 'xlsx':
+            raise ValueError("Los archivos xlsx ya están comprimidos en zip, la compresión aplica a los otros formatos")
+
+        # Los formatos de texto comprimidos mantienen su formato en el nombre, ej: resultados.csv.gz
+        sufijo = SUFIJOS_COMPRESION[compresion] if compresion and formato in ['csv', 'json'] else ""
+
         # Generar nombre completo
         if incluir_timestamp:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            nombre_completo = f"{nombre_archivo}_{timestamp}.{formato}"
+            nombre_completo = f"{nombre_archivo}_{timestamp}.{formato}{sufijo}"
         else:
-            nombre_completo = f"{nombre_archivo}.{formato}"
+            nombre_completo = f"{nombre_archivo}.{formato}{sufijo}"
 
         ruta_completa = self.directorio_resultados / nombre_completo
 
+        es_dataframe = isinstance(df, pd.DataFrame)
+        if not es_dataframe and formato not in ['xlsx', 'csv']:
+            raise ValueError("Los iteradores de bloques solo pueden guardarse como 'xlsx' o 'csv'")
+
         # Guardar según formato
+        inicio = time.perf_counter()
         try:
+            dimensiones = df.shape if es_dataframe else None
+            compresion_pandas = _compresion_pandas(compresion, nivel_compresion)
             if formato == 'xlsx':
-                df.to_excel(ruta_completa, index=False)
-            elif formato == 'csv':
-                df.to_csv(ruta_completa, index=False, encoding='utf-8')
-            elif formato == 'json':
-                df.to_json(ruta_completa, orient='records', indent=2, force_ascii=False)
-            else:
+                # El escritor guarda cada libro de forma atómica
+                rutas, dimensiones = escribir_excel_streaming(df, ruta_completa, division=division_excel)
+                if len(rutas) > 1 and logger.isEnabledFor(logging.INFO):
+                    logger.info("  - Dividido en %s archivos: %s", len(rutas), [r.name for r in rutas])
+            elif formato not in ['csv', 'json', 'parquet', 'feather', 'arrow']:
                 raise ValueError(f"Formato no soportado: {formato}")
-
-            logger.info(f"DataFrame guardado: {ruta_completa}")
-            logger.info(f"  - Formato: {formato.upper()}")
-            logger.info(f"  - Dimensiones: {df.shape[0]} filas × {df.shape[1]} columnas")
+            else:
+                with _escritura_atomica(ruta_completa) as ruta_temporal:
+                    if formato == 'csv':
+                        # Se escribe con nuestros propios flujos de compresión, pandas no puede escribir lz4
+                        dimensiones = _escribir_bloques_csv([df] if es_dataframe else df, ruta_temporal,
+                                                            compresion_pandas)
+                    elif formato == 'json':
+                        with _abrir_comprimido(ruta_temporal, compresion_pandas) as binario, \
+                                io.TextIOWrapper(binario, encoding='utf-8') as manejador:
+                            df.to_json(manejador, orient='records', indent=2, force_ascii=False)
+                    else:
+                        _escribir_tabla_columnar(df, ruta_temporal, formato, compresion, nivel_compresion)
+
+            logger.info("DataFrame guardado: %s", ruta_completa)
+            logger.info("  - Formato: %s%s", formato.upper(), f" ({compresion})" if compresion else "")
+            logger.info("  - Dimensiones: %s filas × %s columnas", dimensiones[0], dimensiones[1])
+            _registrar_metricas('guardar_dataframe', inicio, dimensiones=dimensiones, ruta=ruta_completa,
+                                archivo=nombre_completo, formato=formato, compresion=compresion)
 
             return ruta_completa
 
         except Exception as e:
-            logger.error(f"Error guardando archivo: {str(e)}")
+            logger.error("Error guardando archivo: %s", e)
             raise
 
-    def crear_backup(self, directorio_origen: str = "result") -> Path:
+    def crear_backup(self, directorio_origen: str = "result", incremental: bool = True,
+                     compresion: Optional[str] = None, nivel_compresion: Optional[int] = None,
+                     max_workers: Optional[int] = None) -> Path:
         """
         Crea un backup comprimido de un directorio.
 
+        Los backups van al almacén deduplicado de la carpeta 'backups' (ver
+        BackupStore): los archivos se comprimen en paralelo, los contenidos
+        idénticos se guardan una vez y, si es incremental, los archivos cuyo
+        tamaño y mtime coinciden con el backup anterior no se vuelven a leer.
+
         Parameters:
         -----------
         directorio_origen : str
             Directorio a respaldar ('input', 'result')
+        incremental : bool
+            Si reutilizar los archivos sin cambios del backup anterior del directorio
+        compresion : str, optional
+            'zstd' o 'gzip' (por defecto zstd si zstandard está instalado)
+        nivel_compresion : int, optional
+            Nivel de compresión (por defecto el del códec)
+        max_workers : int, optional
+            Cantidad de hilos de compresión (por defecto la del ejecutor)
 
         Returns:
         --------
-        Path : Ruta del archivo de backup creado
+        Path : Ruta del manifiesto del backup (se restaura con restaurar_backup)
         """
         directorio_map = {
             'input': self.directorio_insumos,
@@ -245,54 +920,124 @@ class FileManager:
         if directorio_origen not in directorio_map:
             raise ValueError(f"Directorio debe ser uno de: {list(directorio_map.keys())}")
 
-        origen = directorio_map[directorio_origen]
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        nombre_backup = f"backup_{directorio_origen}_{timestamp}"
-        ruta_backup = self.directorio_proyecto / f"{nombre_backup}.zip"
-
         # Crear backup
-        shutil.make_archive(str(ruta_backup.with_suffix('')), 'zip', str(origen))
+        almacen = BackupStore(self.directorio_proyecto / NOMBRE_DIRECTORIO_BACKUPS, compresion,
+                              nivel_compresion, max_workers)
+        ruta_manifiesto = almacen.respaldar(directorio_map[directorio_origen], directorio_origen, incremental)
+
+        logger.info("Backup creado: %s", ruta_manifiesto)
+        return ruta_manifiesto
+
+    def restaurar_backup(self, ruta_manifiesto: Union[str, Path], destino: Optional[Union[str, Path]] = None,
+                         max_workers: Optional[int] = None) -> Path:
+        """
+        Restaura los archivos de un backup creado por crear_backup.
+
+        Parameters:
+        -----------
+        ruta_manifiesto : str or Path
+            Manifiesto del backup retornado por crear_backup
+        destino : str or Path, optional
+            Directorio donde restaurar (por defecto 'restaurados/<nombre del backup>' en el proyecto)
+        max_workers : int, optional
+            Cantidad de hilos de descompresión (por defecto la del ejecutor)
+
+        Returns:
+        --------
+        Path : Directorio con los archivos restaurados
+        """
+        ruta_manifiesto = Path(ruta_manifiesto)
+        if destino is None:
+            destino = self.directorio_proyecto / "restaurados" / ruta_manifiesto.stem
 
-        logger.info(f"Backup creado: {ruta_backup}")
-        return ruta_backup
+        almacen = BackupStore(self.directorio_proyecto / NOMBRE_DIRECTORIO_BACKUPS, max_workers=max_workers)
+        return almacen.restaurar(ruta_manifiesto, Path(destino))
 
-    def organizar_archivos_por_fecha(self, directorio: str = "result"):
+    def organizar_archivos_por_fecha(self, directorio: str = "result", simulacion: bool = False,
+                                     max_workers: Optional[int] = None) -> Dict:
         """
         Organiza archivos en subdirectorios por fecha de creación.
 
+        El directorio se lista una sola vez con os.scandir y el plan completo
+        de movimientos se arma antes de tocar nada: cada carpeta por mes se
+        crea una vez, se omiten los archivos cuyo destino ya existe y los
+        movimientos se ejecutan en un pool de hilos. Los archivos se
+        renombran cuando la carpeta del mes está en el mismo dispositivo y se
+        copian con shutil.move en caso contrario.
+
         Parameters:
         -----------
         directorio : str
             Directorio a organizar ('result')
+        simulacion : bool
+            Si solo se retorna el plan y su costo estimado
+        max_workers : int, opcional
+            Número de hilos de movimiento (por defecto el del ejecutor)
+
+        Returns:
+        --------
+        Dict : Plan de movimientos, costo estimado, archivos movidos y errores por nombre de archivo
         """
         if directorio != "result":
             raise ValueError("Solo se puede organizar el directorio 'result'")
 
-        archivos = self.listar_archivos(directorio)
-        archivos_movidos = 0
-
-        for archivo in archivos:
-            if archivo.is_file():
-                # Obtener fecha de creación
-                fecha_creacion = datetime.fromtimestamp(archivo.stat().st_ctime)
-                carpeta_fecha = fecha_creacion.strftime('%Y-%m')
+        plan = _planificar_movimientos_por_fecha(self.directorio_resultados)
+        reporte = {'plan': plan['movimientos'], 'costo': plan['costo'], 'simulacion': simulacion,
+                   'movidos': 0, 'errores': {}}
+        if simulacion:
+            costo = plan['costo']
+            logger.info("Plan de organización: %s archivos a mover, %s carpetas a crear, %.2f MB a copiar",
+                        costo['archivos'], costo['carpetas_a_crear'], costo['bytes_a_copiar'] / 1024**2)
+            return reporte
 
-                # Crear carpeta por mes si no existe
-                carpeta_destino = self.directorio_resultados / carpeta_fecha
-                carpeta_destino.mkdir(exist_ok=True)
+        # Crear cada carpeta por mes una sola vez
+        carpetas_fallidas = {}
+        for carpeta in plan['carpetas']:
+            try:
+                (self.directorio_resultados / carpeta).mkdir(exist_ok=True)
+            except OSError as e:
+                carpetas_fallidas[carpeta] = f"{type(e).__name__}: {str(e)}"
+                logger.warning("No se pudo crear la carpeta %s: %s", carpeta, e)
+
+        movimientos = []
+        for movimiento in plan['movimientos']:
+            if movimiento['carpeta'] in carpetas_fallidas:
+                reporte['errores'][movimiento['nombre']] = carpetas_fallidas[movimiento['carpeta']]
+            else:
+                movimientos.append(movimiento)
 
-                # Mover archivo
-                nuevo_path = carpeta_destino / archivo.name
-                if not nuevo_path.exists():
-                    shutil.move(str(archivo), str(nuevo_path))
-                    archivos_movidos += 1
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futuros = {pool.submit(_mover_archivo, movimiento): movimiento for movimiento in movimientos}
+            for futuro in as_completed(futuros):
+                movimiento = futuros[futuro]
+                try:
+                    futuro.result()
+                    reporte['movidos'] += 1
+                except OSError as e:
+                    reporte['errores'][movimiento['nombre']] = f"{type(e).__name__}: {str(e)}"
+                    logger.warning("Archivo no movido: %s", movimiento['nombre'])
 
-        logger.info(f"Archivos organizados: {archivos_movidos} archivos movidos")
+        logger.info("Archivos organizados: %s archivos movidos", reporte['movidos'])
+        return reporte
 
-    def generar_reporte_archivos(self) -> Dict:
+    def generar_reporte_archivos(self, incremental: bool = False) -> Dict:
         """
         Genera un reporte completo sobre los archivos del proyecto.
 
+        Cada directorio se lista una sola vez con os.scandir y a cada archivo
+        se le hace stat una sola vez. Los resúmenes por directorio se guardan
+        como un índice instantáneo en el directorio del cache; en modo
+        incremental solo se vuelven a listar los directorios cuyo mtime cambió.
+
+        El mtime de un directorio cambia al agregar, eliminar o renombrar
+        entradas, pero no al reescribir un archivo existente, así que un
+        reporte incremental puede mantener el tamaño anterior de esos archivos.
+
+        Parameters:
+        -----------
+        incremental : bool
+            Si reutilizar la instantánea de los directorios sin cambios
+
         Returns:
         --------
         Dict : Reporte con estadísticas de archivos
@@ -310,68 +1055,208 @@ class FileManager:
             'logs': self.directorio_logs
         }
 
+        ruta_indice = self.directorio_cache / NOMBRE_INDICE_ARCHIVOS
+        anterior = _cargar_indice_archivos(ruta_indice) if incremental else {}
+        indice = {}
+        listados = 0
+        reutilizados = 0
+
         for nombre, ruta in directorios.items():
             if ruta.exists():
-                archivos = list(ruta.rglob('*'))
-                archivos_solo = [f for f in archivos if f.is_file()]
-
-                # Estadísticas por extensión
-                extensiones = {}
-                tamaño_total = 0
-
-                for archivo in archivos_solo:
-                    ext = archivo.suffix.lower() or 'sin_extension'
-                    if ext not in extensiones:
-                        extensiones[ext] = {'count': 0, 'tamaño_mb': 0}
-
-                    tamaño_archivo = archivo.stat().st_size
-                    extensiones[ext]['count'] += 1
-                    extensiones[ext]['tamaño_mb'] += tamaño_archivo / (1024 ** 2)
-                    tamaño_total += tamaño_archivo
-
-                reporte['directorios'][nombre] = {
-                    'total_archivos': len(archivos_solo),
-                    'total_carpetas': len([f for f in archivos if f.is_dir()]),
-                    'tamaño_total_mb': tamaño_total / (1024 ** 2),
-                    'extensiones': extensiones,
-                    'archivo_mas_reciente': max(archivos_solo,
-                                                key=lambda x: x.stat().st_mtime).name if archivos_solo else None,
-                    'archivo_mas_antiguo': min(archivos_solo,
-                                               key=lambda x: x.stat().st_mtime).name if archivos_solo else None
-                }
-
-        logger.info("Reporte de archivos generado")
+                arbol = anterior.get(nombre, {})
+                # Nunca se reutiliza la instantánea de otra ubicación (ej: un proyecto movido)
+                entradas = arbol.get('entradas') if arbol.get('ruta') == str(ruta) else None
+                entradas, listados_arbol, reutilizados_arbol = _recorrer_arbol_directorios(ruta, entradas)
+                indice[nombre] = {'ruta': str(ruta), 'entradas': entradas}
+                listados += listados_arbol
+                reutilizados += reutilizados_arbol
+
+                reporte['directorios'][nombre] = _resumir_arbol_directorios(entradas)
+
+        try:
+            self.directorio_cache.mkdir(parents=True, exist_ok=True)
+            with _escritura_atomica(ruta_indice) as ruta_temporal:
+                with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                    json.dump({'version': VERSION_INDICE_ARCHIVOS, 'arboles': indice}, f)
+        except OSError as e:
+            logger.warning("No se pudo guardar el índice de archivos: %s", e)
+
+        logger.info("Reporte de archivos generado (%s directorios listados, %s reutilizados del índice)",
+                    listados, reutilizados)
         return reporte
 
-    def limpiar_archivos_temporales(self, patron: str = "temp_*", dias_antiguedad: int = 7):
+    def escanear_integridad_directorio(self, directorio: str = "input", incremental: bool = True,
+                                      max_workers: Optional[int] = None) -> Dict:
+        """
+        Valida concurrentemente todos los archivos de un directorio con sondeos livianos del formato.
+
+        Los checksums se guardan en el directorio del cache, así que los
+        archivos sin cambios desde el escaneo anterior se omiten (ver escanear_integridad).
+
+        Parameters:
+        -----------
+        directorio : str
+            Directorio a escanear ('input', 'result')
+        incremental : bool
+            Si se omiten los archivos sin cambios desde el escaneo anterior
+        max_workers : int, opcional
+            Número de hilos (por defecto el del ejecutor)
+
+        Returns:
+        --------
+        Dict : Reporte por archivo y un resumen con conteos y rendimiento
+        """
+        directorio_map = {
+            'input': self.directorio_insumos,
+            'result': self.directorio_resultados
+        }
+
+        if directorio not in directorio_map:
+            raise ValueError(f"Directorio debe ser uno de: {list(directorio_map.keys())}")
+
+        ruta_indice = self.directorio_cache / f"{directorio}_{NOMBRE_INDICE_INTEGRIDAD}"
+        if not incremental and ruta_indice.exists():
+            ruta_indice.unlink()
+        return escanear_integridad(directorio_map[directorio], ruta_indice, max_workers)
+
+    def limpiar_archivos_temporales(self, patron: str = "temp_*", dias_antiguedad: int = 7) -> Dict:
         """
         Limpia archivos temporales o antiguos.
 
+        Atajo de aplicar_retencion con una sola regla de antigüedad.
+
         Parameters:
         -----------
         patron : str
             Patrón de nombres de archivo a limpiar
         dias_antiguedad : int
             Eliminar archivos más antiguos que este número de días
+
+        Returns:
+        --------
+        Dict : Reporte de retención (ver aplicar_retencion)
         """
-        import time
+        return self.aplicar_retencion([{'patron': patron, 'dias_antiguedad': dias_antiguedad}])
 
-        archivos_eliminados = 0
-        limite_tiempo = time.time() - (dias_antiguedad * 24 * 60 * 60)
+    def aplicar_retencion(self, reglas: Optional[List[Dict]] = None, presupuestos: Optional[Dict[str, float]] = None,
+                          simulacion: bool = False, max_workers: Optional[int] = None) -> Dict:
+        """
+        Elimina archivos de los directorios de resultados y logs según reglas y presupuestos de tamaño.
 
-        for directorio in [self.directorio_resultados, self.directorio_logs]:
-            for archivo in directorio.glob(patron):
-                if archivo.is_file() and archivo.stat().st_mtime < limite_tiempo:
-                    try:
-                        archivo.unlink()
-                        archivos_eliminados += 1
-                        logger.debug(f"Archivo eliminado: {archivo.name}")
-                    except Exception as e:
-                        logger.error(f"Error eliminando {archivo.name}: {str(e)}")
+        Cada árbol de directorios se lista una sola vez con os.scandir. Un
+        archivo se elimina cuando cumple alguna regla; luego, en los
+        directorios con presupuesto, se desalojan los archivos restantes más
+        antiguos (por mtime) hasta que el directorio quepa en su cuota. Las
+        eliminaciones se ejecutan por lotes en un pool de hilos.
+
+        Parameters:
+        -----------
+        reglas : List[Dict], opcional
+            Reglas con cualquiera de las claves 'patron' (glob relativo al
+            directorio, '*' por defecto), 'dias_antiguedad', 'tamaño_min_mb'
+            y 'directorios' (subconjunto de ['result', 'logs']); deben
+            cumplirse todas las condiciones indicadas. Por defecto, archivos
+            temp_* con más de 7 días
+        presupuestos : Dict[str, float], opcional
+            Tamaño máximo en MB por directorio, p. ej. {'result': 500}
+        simulacion : bool
+            Si solo se reportan los archivos que se eliminarían y los bytes recuperables
+        max_workers : int, opcional
+            Número de hilos de eliminación (por defecto el del ejecutor)
+
+        Returns:
+        --------
+        Dict : Tamaños y bytes recuperables por directorio (con los archivos
+               candidatos en modo simulación), archivos eliminados, bytes liberados y errores
+        """
+        directorio_map = {
+            'result': self.directorio_resultados,
+            'logs': self.directorio_logs
+        }
+
+        reglas = REGLAS_RETENCION_POR_DEFECTO if reglas is None else reglas
+        presupuestos = presupuestos or {}
+        for nombre in presupuestos:
+            if nombre not in directorio_map:
+                raise ValueError(f"Directorio debe ser uno de: {list(directorio_map.keys())}")
+        for regla in reglas:
+            desconocidas = set(regla) - set(CLAVES_REGLA_RETENCION)
+            if desconocidas:
+                raise ValueError(f"Claves de regla de retención desconocidas: {sorted(desconocidas)}. "
+                                 f"Usar: {CLAVES_REGLA_RETENCION}")
+            for nombre in regla.get('directorios', []):
+                if nombre not in directorio_map:
+                    raise ValueError(f"Directorio debe ser uno de: {list(directorio_map.keys())}")
+
+        ahora = time.time()
+        reporte = {'simulacion': simulacion, 'directorios': {}, 'eliminados': 0, 'bytes_liberados': 0, 'errores': {}}
+        seleccionados = []
+
+        for nombre, raiz in directorio_map.items():
+            if not raiz.exists():
+                continue
+
+            archivos = list(_recorrer_archivos(raiz))
+            tamaño = sum(stat.st_size for _, stat in archivos)
+            motivos = {}
+            for relativo, stat in archivos:
+                for posicion, regla in enumerate(reglas):
+                    if _regla_retencion_coincide(regla, nombre, relativo, stat, ahora):
+                        motivos[relativo] = f"regla {posicion}"
+                        break
+            restante = tamaño - sum(stat.st_size for relativo, stat in archivos if relativo in motivos)
+
+            # Desalojar los archivos restantes más antiguos hasta que el directorio quepa en su presupuesto
+            cuota = presupuestos.get(nombre)
+            cuota_bytes = int(cuota * 1024**2) if cuota is not None else None
+            if cuota_bytes is not None and restante > cuota_bytes:
+                conservados = sorted((stat.st_mtime, relativo, stat.st_size) for relativo, stat in archivos
+                                     if relativo not in motivos)
+                for _, relativo, tamaño_archivo in conservados:
+                    if restante <= cuota_bytes:
+                        break
+                    motivos[relativo] = "presupuesto"
+                    restante -= tamaño_archivo
+
+            reporte_directorio = {
+                'archivos': len(archivos),
+                'tamaño_bytes': tamaño,
+                'cuota_bytes': cuota_bytes,
+                'seleccionados': len(motivos),
+                'bytes_recuperables': tamaño - restante,
+                'tamaño_final_bytes': restante
+            }
+            if simulacion:
+                reporte_directorio['candidatos'] = [
+                    {'archivo': relativo, 'tamaño_bytes': stat.st_size,
+                     'modificado': datetime.fromtimestamp(stat.st_mtime).isoformat(), 'motivo': motivos[relativo]}
+                    for relativo, stat in archivos if relativo in motivos
+                ]
+            reporte['directorios'][nombre] = reporte_directorio
+            seleccionados.extend((str(raiz / relativo), stat.st_size) for relativo, stat in archivos
+                                 if relativo in motivos)
+
+        if simulacion:
+            recuperables = sum(d['bytes_recuperables'] for d in reporte['directorios'].values())
+            logger.info("Plan de retención: %s archivos, %.2f MB recuperables",
+                        len(seleccionados), recuperables / 1024**2)
+            return reporte
 
-        logger.info(f"Limpieza completada: {archivos_eliminados} archivos eliminados")
+        lotes = [seleccionados[i:i + LOTE_ELIMINACION_RETENCION]
+                 for i in range(0, len(seleccionados), LOTE_ELIMINACION_RETENCION)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for eliminados, bytes_liberados, errores in pool.map(_eliminar_archivos, lotes):
+                reporte['eliminados'] += eliminados
+                reporte['bytes_liberados'] += bytes_liberados
+                reporte['errores'].update(errores)
+
+        for archivo, error in reporte['errores'].items():
+            logger.error("Error eliminando %s: %s", archivo, error)
+        logger.info("Limpieza completada: %s archivos eliminados, %.2f MB liberados",
+                    reporte['eliminados'], reporte['bytes_liberados'] / 1024**2)
+        return reporte
 
-    def exportar_metadatos(self, nombre_archivo: str = "metadatos_proyecto"):
+    def exportar_metadatos(self, nombre_archivo: str = "metadatos_proyecto", incremental: bool = True):
         """
         Exporta metadatos del proyecto a JSON.
 
@@ -379,8 +1264,10 @@ class FileManager:
         -----------
         nombre_archivo : str
             Nombre base del archivo de metadatos
+        incremental : bool
+            Si el reporte de archivos reutiliza el índice instantáneo (ver generar_reporte_archivos)
         """
-        reporte = self.generar_reporte_archivos()
+        reporte = self.generar_reporte_archivos(incremental=incremental)
 
         # Agregar información adicional
         metadatos = {
@@ -399,94 +1286,1700 @@ class FileManager:
         with open(ruta_metadatos, 'w', encoding='utf-8') as f:
             json.dump(metadatos, f, indent=2, ensure_ascii=False, default=str)
 
-        logger.info(f"Metadatos exportados: {ruta_metadatos}")
+        logger.info("Metadatos exportados: %s", ruta_metadatos)
         return ruta_metadatos
 
 
-# Funciones de utilidad independientes
-def encontrar_archivos_similares(directorio: Path, nombre_base: str, threshold: float = 0.8) -> List[Path]:
+class LoadCache:
     """
-    Encuentra archivos con nombres similares usando coincidencia aproximada.
+    Cache en disco de DataFrames parseados, direccionado por contenido.
 
-    Parameters:
-    -----------
-    directorio : Path
-        Directorio donde buscar
-    nombre_base : str
-        Nombre base para comparar
-    threshold : float
-        Umbral de similitud (0-1)
-
-    Returns:
-    --------
-    List[Path] : Lista de archivos similares
+    Las entradas se identifican por ruta, tamaño, fecha de modificación y
+    opcionalmente un hash del contenido, y se guardan como Arrow IPC sin
+    comprimir, así que un acierto es una lectura mapeada en memoria en lugar
+    de un parseo completo.
     """
-    from difflib import SequenceMatcher
 
-    archivos_similares = []
+    def __init__(self, directorio_cache: Path, tamaño_max_mb: float = CACHE_TAMAÑO_MAX_MB,
+                 hash_contenido: bool = False):
+        """
+        Inicializa el cache de carga.
 
-    for archivo in directorio.glob('*'):
-        if archivo.is_file():
-            # Comparar nombres sin extensión
-            nombre_sin_ext = archivo.stem.lower()
-            nombre_base_lower = nombre_base.lower()
+        Parameters:
+        -----------
+        directorio_cache : Path
+            Directorio donde se guardan los DataFrames y el índice
+        tamaño_max_mb : float
+            Tamaño total máximo; por encima se desalojan las entradas menos usadas
+        hash_contenido : bool
+            Si las claves incluyen un hash del contenido del archivo
+        """
+        self.directorio_cache = Path(directorio_cache)
+        self.ruta_indice = self.directorio_cache / "index.json"
+        self.tamaño_max_bytes = int(tamaño_max_mb * 1024 ** 2)
+        self.hash_contenido = hash_contenido
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._indice = None
+        self._memo_hash = {}
+
+    def _cargar_indice(self) -> Dict:
+        """Carga el índice del cache desde disco en el primer uso."""
+        if self._indice is None:
+            self._indice = {}
+            if self.ruta_indice.exists():
+                try:
+                    with open(self.ruta_indice, 'r', encoding='utf-8') as f:
+                        self._indice = json.load(f)
+                except (OSError, ValueError):
+                    logger.warning("El índice del cache está corrupto, se inicia con un cache vacío")
+        return self._indice
+
+    def _guardar_indice(self):
+        """Escribe el índice del cache de forma atómica."""
+        self.directorio_cache.mkdir(parents=True, exist_ok=True)
+        ruta_temporal = self.ruta_indice.with_suffix('.tmp')
+        with open(ruta_temporal, 'w', encoding='utf-8') as f:
+            json.dump(self._indice, f, indent=2, ensure_ascii=False)
+        os.replace(ruta_temporal, self.ruta_indice)
+
+    def _firma(self, ruta_archivo: Path) -> Dict:
+        """Construye la firma que identifica la versión actual de un archivo."""
+        stat = ruta_archivo.stat()
+        firma = {
+            'origen': str(ruta_archivo.resolve()),
+            'tamaño': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash_contenido': None
+        }
 
-            similitud = SequenceMatcher(None, nombre_base_lower, nombre_sin_ext).ratio()
+        if self.hash_contenido:
+            # Calcular el hash de cada versión de un archivo una sola vez por sesión
+            clave_memo = (firma['origen'], stat.st_size, stat.st_mtime_ns)
+            if clave_memo not in self._memo_hash:
+                digest = hashlib.blake2b(digest_size=16)
+                with open(ruta_archivo, 'rb') as f:
+                    for bloque in iter(lambda: f.read(CACHE_BYTES_BLOQUE_HASH), b''):
+                        digest.update(bloque)
+                self._memo_hash[clave_memo] = digest.hexdigest()
+            firma['hash_contenido'] = self._memo_hash[clave_memo]
+
+        return firma
+
+    @staticmethod
+    def _clave(firma: Dict) -> str:
+        """Deriva la clave del cache a partir de la firma de un archivo."""
+        contenido = json.dumps(firma, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(contenido, digest_size=16).hexdigest()
+
+    def _eliminar(self, clave: str):
+        """Elimina una entrada y su archivo de datos."""
+        entrada = self._indice.pop(clave, None)
+        if entrada:
+            (self.directorio_cache / entrada['archivo']).unlink(missing_ok=True)
+
+    def obtener(self, ruta_archivo: Path) -> Optional[pd.DataFrame]:
+        """
+        Retorna el DataFrame en cache de un archivo, o None si no está.
 
-            if similitud >= threshold:
-                archivos_similares.append((archivo, similitud))
+        Las entradas del mismo archivo con una firma desactualizada se invalidan.
 
-    # Ordenar por similitud descendente
-    archivos_similares.sort(key=lambda x: x[1], reverse=True)
+        Parameters:
+        -----------
+        ruta_archivo : Path
+            Ruta del archivo de origen
 
-    return [archivo for archivo, _ in archivos_similares]
+        Returns:
+        --------
+        pd.DataFrame o None : DataFrame en cache si el archivo no cambió
+        """
+        indice = self._cargar_indice()
+        firma = self._firma(ruta_archivo)
+        clave = self._clave(firma)
+
+        # Invalidar versiones desactualizadas de este archivo
+        obsoletas = [c for c, entrada in indice.items()
+                     if entrada['origen'] == firma['origen'] and c != clave]
+        for clave_obsoleta in obsoletas:
+            self._eliminar(clave_obsoleta)
+        if obsoletas:
+            logger.debug("Entradas de cache invalidadas para %s: %s", ruta_archivo.name, len(obsoletas))
+            self._guardar_indice()
+
+        entrada = indice.get(clave)
+        if entrada is None or not (self.directorio_cache / entrada['archivo']).exists():
+            self.fallos += 1
+            return None
+
+        df = _leer_tabla_columnar(self.directorio_cache / entrada['archivo']).to_pandas()
+        df.attrs.update(entrada.get('attrs', {}))
+
+        entrada['ultimo_acceso'] = datetime.now().timestamp()
+        self._guardar_indice()
+
+        self.aciertos += 1
+        return df
+
+    def guardar(self, ruta_archivo: Path, df: pd.DataFrame):
+        """
+        Guarda el DataFrame parseado de un archivo y desaloja lo que exceda el límite.
 
+        Los DataFrames que Arrow no puede representar (ej: columnas object con
+        tipos mezclados) se omiten con una advertencia en lugar de hacer fallar la carga.
 
-def validar_integridad_archivo(ruta_archivo: Path) -> Dict:
-    """
-    Valida la integridad de un archivo de datos.
+        Parameters:
+        -----------
+        ruta_archivo : Path
+            Ruta del archivo de origen
+        df : pd.DataFrame
+            DataFrame parseado a guardar
+        """
+        indice = self._cargar_indice()
+        firma = self._firma(ruta_archivo)
+        clave = self._clave(firma)
+        archivo_datos = f"{clave}.arrow"
 
-    Parameters:
-    -----------
-    ruta_archivo : Path
-        Ruta al archivo a validar
+        self.directorio_cache.mkdir(parents=True, exist_ok=True)
+        try:
+            _escribir_tabla_columnar(df, self.directorio_cache / archivo_datos, 'arrow')
+        except Exception as e:
+            (self.directorio_cache / archivo_datos).unlink(missing_ok=True)
+            logger.warning("No se pudo guardar en cache %s: %s", ruta_archivo.name, e)
+            return
+
+        indice[clave] = {
+            **firma,
+            'archivo': archivo_datos,
+            'bytes': (self.directorio_cache / archivo_datos).stat().st_size,
+            'ultimo_acceso': datetime.now().timestamp(),
+            'attrs': {k: v for k, v in df.attrs.items() if _es_serializable_json(v)}
+        }
+        self._desalojar()
+        self._guardar_indice()
+        logger.debug("%s guardado en cache como %s", ruta_archivo.name, archivo_datos)
+
+    def _desalojar(self):
+        """Desaloja las entradas menos usadas hasta que el cache quepa en su límite."""
+        total = sum(entrada['bytes'] for entrada in self._indice.values())
+        for clave in sorted(self._indice, key=lambda c: self._indice[c]['ultimo_acceso']):
+            if total <= self.tamaño_max_bytes:
+                break
+            total -= self._indice[clave]['bytes']
+            self._eliminar(clave)
+            self.desalojos += 1
+
+    def invalidar(self, ruta_archivo: Optional[Path] = None):
+        """
+        Elimina las entradas de un archivo, o todas si no se indica archivo.
 
-    Returns:
-    --------
-    Dict : Reporte de validación
-    """
-    reporte = {
-        'archivo': str(ruta_archivo),
-        'existe': ruta_archivo.exists(),
-        'es_archivo': ruta_archivo.is_file() if ruta_archivo.exists() else False,
-        'tamaño_bytes': ruta_archivo.stat().st_size if ruta_archivo.exists() else 0,
-        'extension': ruta_archivo.suffix.lower(),
-        'legible': False,
-        'filas': 0,
-        'columnas': 0,
-        'errores': []
+        Parameters:
+        -----------
+        ruta_archivo : Path, optional
+            Archivo de origen cuyas entradas se deben eliminar
+        """
+        indice = self._cargar_indice()
+        origen = str(Path(ruta_archivo).resolve()) if ruta_archivo is not None else None
+        for clave in [c for c, entrada in indice.items() if origen is None or entrada['origen'] == origen]:
+            self._eliminar(clave)
+        self._guardar_indice()
+
+    def estadisticas(self) -> Dict:
+        """
+        Retorna los contadores del cache y su tamaño actual.
+
+        Returns:
+        --------
+        Dict : Aciertos, fallos, desalojos, tasa de aciertos, entradas y tamaño en MB
+        """
+        indice = self._cargar_indice()
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            'entradas': len(indice),
+            'tamaño_mb': sum(entrada['bytes'] for entrada in indice.values()) / (1024 ** 2)
+        }
+
+
+class BackupStore:
+    """
+    Almacén de backups incremental y deduplicado.
+
+    Cada contenido distinto se guarda una vez como un objeto comprimido con
+    el nombre de su hash SHA-256, y cada backup es un manifiesto JSON que
+    asocia las rutas relativas del origen con objetos. Los archivos se leen,
+    hashean y comprimen bloque a bloque en un pool de hilos (hashlib, zlib y
+    zstandard liberan el GIL), así que la memoria máxima depende de la
+    cantidad de workers, no del tamaño del backup.
+    """
+
+    def __init__(self, directorio_backups: Path, compresion: Optional[str] = None,
+                 nivel_compresion: Optional[int] = None, max_workers: Optional[int] = None):
+        """
+        Inicializa el almacén de backups.
+
+        Parameters:
+        -----------
+        directorio_backups : Path
+            Directorio que contiene las carpetas 'objetos' y 'manifiestos'
+        compresion : str, optional
+            'zstd' o 'gzip' para los objetos nuevos (por defecto zstd si zstandard está instalado)
+        nivel_compresion : int, optional
+            Nivel de compresión (por defecto el del códec)
+        max_workers : int, optional
+            Cantidad de hilos para comprimir o restaurar archivos
+        """
+        if compresion is None:
+            compresion = 'zstd' if importlib.util.find_spec('zstandard') else 'gzip'
+        if compresion not in COMPRESIONES_BACKUP:
+            raise ValueError(f"compresion debe ser uno de: {list(COMPRESIONES_BACKUP)}")
+
+        self.directorio_backups = Path(directorio_backups)
+        self.directorio_objetos = self.directorio_backups / "objetos"
+        self.directorio_manifiestos = self.directorio_backups / "manifiestos"
+        self.compresion = compresion
+        self.nivel_compresion = nivel_compresion
+        self.max_workers = max_workers
+        # Serializa la verificación y el renombrado de objetos, para que archivos idénticos
+        # comprimidos a la vez se guarden una sola vez y cuenten como deduplicados
+        self._lock = threading.Lock()
+
+    def _ruta_objeto(self, hash_contenido: str, compresion: str) -> Path:
+        """Ruta del objeto de un hash de contenido (repartido por sus dos primeros caracteres)."""
+        return self.directorio_objetos / hash_contenido[:2] / f"{hash_contenido}{COMPRESIONES_BACKUP[compresion]}"
+
+    def ultimo_manifiesto(self, nombre_origen: str) -> Optional[Path]:
+        """Retorna el manifiesto más reciente de un origen, o None si nunca se respaldó."""
+        manifiestos = sorted(self.directorio_manifiestos.glob(f"backup_{nombre_origen}_*.json"))
+        return manifiestos[-1] if manifiestos else None
+
+    def respaldar(self, origen: Path, nombre_origen: str, incremental: bool = True) -> Path:
+        """
+        Respalda todos los archivos bajo un directorio y escribe su manifiesto.
+
+        Parameters:
+        -----------
+        origen : Path
+            Directorio a respaldar
+        nombre_origen : str
+            Nombre usado para los manifiestos de este directorio (ej: 'result')
+        incremental : bool
+            Si los archivos con el mismo tamaño y mtime que en el último
+            manifiesto reutilizan sus objetos sin leerse
+
+        Returns:
+        --------
+        Path : Ruta del nuevo manifiesto
+        """
+        padre = self.ultimo_manifiesto(nombre_origen) if incremental else None
+        anteriores = _leer_manifiesto_backup(padre)['archivos'] if padre else {}
+
+        archivos = {}
+        errores = {}
+        pendientes = []
+        estadisticas = {'archivos': 0, 'sin_cambios': 0, 'guardados': 0, 'deduplicados': 0,
+                        'bytes_leidos': 0, 'bytes_guardados': 0}
+
+        for relativo, stat in _recorrer_archivos(origen):
+            estadisticas['archivos'] += 1
+            entrada = {'tamaño': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            anterior = anteriores.get(relativo)
+            if (anterior and anterior['tamaño'] == entrada['tamaño'] and anterior['mtime_ns'] == entrada['mtime_ns']
+                    and self._ruta_objeto(anterior['hash'], anterior['compresion']).exists()):
+                archivos[relativo] = anterior
+                estadisticas['sin_cambios'] += 1
+            else:
+                pendientes.append((relativo, entrada))
+
+        self.directorio_objetos.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futuros = {pool.submit(self._guardar_archivo, origen / relativo): (relativo, entrada)
+                       for relativo, entrada in pendientes}
+            for futuro in as_completed(futuros):
+                relativo, entrada = futuros[futuro]
+                try:
+                    hash_contenido, bytes_guardados = futuro.result()
+                except OSError as e:
+                    errores[relativo] = f"{type(e).__name__}: {str(e)}"
+                    logger.warning("Archivo no respaldado: %s", relativo)
+                    continue
+
+                archivos[relativo] = {**entrada, 'hash': hash_contenido, 'compresion': self.compresion}
+                estadisticas['bytes_leidos'] += entrada['tamaño']
+                if bytes_guardados is None:
+                    estadisticas['deduplicados'] += 1
+                else:
+                    estadisticas['guardados'] += 1
+                    estadisticas['bytes_guardados'] += bytes_guardados
+
+        manifiesto = {
+            'version': VERSION_MANIFIESTO_BACKUP,
+            'origen': nombre_origen,
+            'ruta_origen': str(origen),
+            'creado': datetime.now().isoformat(),
+            'padre': padre.name if padre else None,
+            'archivos': dict(sorted(archivos.items())),
+            'errores': errores,
+            'estadisticas': estadisticas
+        }
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        ruta_manifiesto = self.directorio_manifiestos / f"backup_{nombre_origen}_{timestamp}.json"
+        intento = 1
+        while ruta_manifiesto.exists():
+            intento += 1
+            ruta_manifiesto = self.directorio_manifiestos / f"backup_{nombre_origen}_{timestamp}_{intento}.json"
+
+        self.directorio_manifiestos.mkdir(parents=True, exist_ok=True)
+        with _escritura_atomica(ruta_manifiesto) as ruta_temporal:
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+
+        logger.info("  - Archivos: %s (%s sin cambios, %s guardados, %s deduplicados, %s errores)",
+                    estadisticas['archivos'], estadisticas['sin_cambios'], estadisticas['guardados'],
+                    estadisticas['deduplicados'], len(errores))
+        logger.info("  - Leído: %.2f MB, guardado: %.2f MB (%s)",
+                    estadisticas['bytes_leidos'] / (1024 ** 2), estadisticas['bytes_guardados'] / (1024 ** 2),
+                    self.compresion)
+        return ruta_manifiesto
+
+    def _guardar_archivo(self, ruta_archivo: Path) -> Tuple[str, Optional[int]]:
+        """
+        Hashea y comprime un archivo en una sola pasada en streaming.
+
+        Returns:
+        --------
+        Tuple : (hash del contenido, bytes comprimidos guardados, o None si el objeto ya existía)
+        """
+        ruta_temporal = self.directorio_objetos / f".{uuid.uuid4().hex}.tmp"
+        hasher = hashlib.sha256()
+        compresor = _compresor_backup(self.compresion, self.nivel_compresion)
+
+        try:
+            with open(ruta_archivo, 'rb') as origen, open(ruta_temporal, 'wb') as destino:
+                while True:
+                    bloque = origen.read(BYTES_BLOQUE_BACKUP)
+                    if not bloque:
+                        break
+                    hasher.update(bloque)
+                    destino.write(compresor.compress(bloque))
+                destino.write(compresor.flush())
+                destino.flush()
+                os.fsync(destino.fileno())
+
+            hash_contenido = hasher.hexdigest()
+            ruta_objeto = self._ruta_objeto(hash_contenido, self.compresion)
+            with self._lock:
+                if ruta_objeto.exists():
+                    ruta_temporal.unlink()
+                    return hash_contenido, None
+
+                ruta_objeto.parent.mkdir(exist_ok=True)
+                bytes_guardados = ruta_temporal.stat().st_size
+                os.replace(ruta_temporal, ruta_objeto)
+            return hash_contenido, bytes_guardados
+        except BaseException:
+            ruta_temporal.unlink(missing_ok=True)
+            raise
+
+    def restaurar(self, ruta_manifiesto: Path, destino: Path) -> Path:
+        """
+        Restaura los archivos de un manifiesto, verificando sus hashes de contenido.
+
+        Parameters:
+        -----------
+        ruta_manifiesto : Path
+            Manifiesto escrito por respaldar
+        destino : Path
+            Directorio donde restaurar
+
+        Returns:
+        --------
+        Path : Directorio de destino
+        """
+        archivos = _leer_manifiesto_backup(ruta_manifiesto)['archivos']
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futuros = []
+            for relativo, entrada in archivos.items():
+                if Path(relativo).is_absolute() or '..' in Path(relativo).parts:
+                    raise ValueError(f"Ruta insegura en el manifiesto del backup: {relativo}")
+                futuros.append(pool.submit(self._restaurar_archivo, entrada, destino / relativo))
+            for futuro in as_completed(futuros):
+                futuro.result()
+
+        logger.info("Backup restaurado: %s archivos en %s", len(archivos), destino)
+        return destino
+
+    def _restaurar_archivo(self, entrada: Dict, ruta_archivo: Path):
+        """Descomprime un objeto en su ruta y restaura su mtime."""
+        ruta_objeto = self._ruta_objeto(entrada['hash'], entrada['compresion'])
+        hasher = hashlib.sha256()
+        descompresor = _descompresor_backup(entrada['compresion'])
+
+        ruta_archivo.parent.mkdir(parents=True, exist_ok=True)
+        with _escritura_atomica(ruta_archivo) as ruta_temporal:
+            with open(ruta_objeto, 'rb') as origen, open(ruta_temporal, 'wb') as destino:
+                while True:
+                    bloque = origen.read(BYTES_BLOQUE_BACKUP)
+                    if not bloque:
+                        break
+                    datos = descompresor.decompress(bloque)
+                    hasher.update(datos)
+                    destino.write(datos)
+
+            if hasher.hexdigest() != entrada['hash']:
+                raise ValueError(f"Objeto de backup corrupto: {ruta_objeto}")
+
+        os.utime(ruta_archivo, ns=(entrada['mtime_ns'], entrada['mtime_ns']))
+
+
+# Funciones de utilidad independientes
+def _recorrer_archivos(raiz: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """Entrega la ruta relativa POSIX y el stat de cada archivo bajo raiz (no se siguen los enlaces simbólicos a directorios)."""
+    pendientes = ['']
+    while pendientes:
+        relativo = pendientes.pop()
+        try:
+            with os.scandir(raiz / relativo if relativo else raiz) as iterador:
+                for entrada in iterador:
+                    nombre = f"{relativo}/{entrada.name}" if relativo else entrada.name
+                    try:
+                        if entrada.is_dir(follow_symlinks=False):
+                            pendientes.append(nombre)
+                        elif entrada.is_file():
+                            yield nombre, entrada.stat()
+                    except OSError:
+                        # Eliminado durante el listado
+                        continue
+        except OSError as e:
+            logger.warning("No se pudo listar %s: %s", raiz / relativo, e)
+
+
+def _planificar_movimientos_por_fecha(directorio: Path) -> Dict:
+    """
+    Arma el plan de movimientos de organizar_archivos_por_fecha a partir de un solo listado del directorio.
+
+    Cada carpeta por mes existente se lista una vez para encontrar los
+    destinos que se sobrescribirían, y su dispositivo se compara con el de
+    cada archivo para distinguir renombrados de copias.
+    """
+    por_carpeta = {}
+    carpetas_existentes = set()
+    with os.scandir(directorio) as iterador:
+        for entrada in iterador:
+            # Las escrituras atómicas en curso (ver _escritura_atomica) deben quedarse donde están
+            if entrada.name.startswith('.') and entrada.name.endswith('.tmp'):
+                continue
+            try:
+                if entrada.is_dir():
+                    carpetas_existentes.add(entrada.name)
+                elif entrada.is_file():
+                    stat = entrada.stat()
+                    carpeta = datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m')
+                    por_carpeta.setdefault(carpeta, []).append((entrada.name, stat))
+            except OSError:
+                # Eliminado durante el listado
+                continue
+
+    dispositivo_directorio = os.stat(directorio).st_dev
+    movimientos = []
+    carpetas_a_crear = []
+    omitidos = 0
+    for carpeta, archivos in sorted(por_carpeta.items()):
+        destino = directorio / carpeta
+        ocupados = set()
+        dispositivo = dispositivo_directorio
+        if carpeta in carpetas_existentes:
+            try:
+                with os.scandir(destino) as iterador:
+                    ocupados = {entrada.name for entrada in iterador}
+                dispositivo = destino.stat().st_dev
+            except OSError as e:
+                logger.warning("No se pudo listar %s: %s", destino, e)
+        else:
+            carpetas_a_crear.append(carpeta)
+
+        for nombre, stat in sorted(archivos):
+            if nombre in ocupados:
+                omitidos += 1
+                continue
+            movimientos.append({
+                'nombre': nombre,
+                'carpeta': carpeta,
+                'origen': str(directorio / nombre),
+                'destino': str(destino / nombre),
+                'tamaño': stat.st_size,
+                'renombrar': stat.st_dev == dispositivo
+            })
+
+    copias = [movimiento for movimiento in movimientos if not movimiento['renombrar']]
+    costo = {
+        'archivos': len(movimientos),
+        'renombrados': len(movimientos) - len(copias),
+        'copias': len(copias),
+        'bytes_a_copiar': sum(movimiento['tamaño'] for movimiento in copias),
+        'carpetas_a_crear': len(carpetas_a_crear),
+        'omitidos': omitidos
     }
+    return {'movimientos': movimientos, 'carpetas': carpetas_a_crear, 'costo': costo}
 
-    if not reporte['existe']:
-        reporte['errores'].append("Archivo no existe")
-        return reporte
 
-    if not reporte['es_archivo']:
-        reporte['errores'].append("La ruta no apunta a un archivo")
-        return reporte
+def _mover_archivo(movimiento: Dict):
+    """Mueve un archivo de un plan, renombrándolo cuando es posible y copiándolo en caso contrario."""
+    if movimiento['renombrar']:
+        try:
+            os.rename(movimiento['origen'], movimiento['destino'])
+            return
+        except OSError as e:
+            # La comparación de dispositivos puede fallar con montajes bind
+            if e.errno != errno.EXDEV:
+                raise
+    shutil.move(movimiento['origen'], movimiento['destino'])
+
+
+def _regla_retencion_coincide(regla: Dict, nombre_directorio: str, relativo: str,
+                              stat: os.stat_result, ahora: float) -> bool:
+    """Verifica si un archivo cumple todas las condiciones de una regla de retención."""
+    if nombre_directorio not in regla.get('directorios', DIRECTORIOS_RETENCION):
+        return False
+    # Anclado como glob: 'temp_*' solo coincide con archivos del primer nivel, 'sub/*' un nivel más abajo
+    patron = PurePosixPath(regla.get('patron', '*'))
+    ruta = PurePosixPath(relativo)
+    if len(ruta.parts) != len(patron.parts) or not ruta.match(str(patron)):
+        return False
+    if regla.get('dias_antiguedad') is not None and stat.st_mtime >= ahora - regla['dias_antiguedad'] * 24 * 60 * 60:
+        return False
+    if regla.get('tamaño_min_mb') is not None and stat.st_size < regla['tamaño_min_mb'] * 1024**2:
+        return False
+    return True
+
+
+def _eliminar_archivos(archivos: List[Tuple[str, int]]) -> Tuple[int, int, Dict[str, str]]:
+    """Elimina un lote de archivos (ruta, tamaño), retornando los archivos eliminados, los bytes liberados y los errores por ruta."""
+    eliminados = 0
+    bytes_liberados = 0
+    errores = {}
+    for ruta, tamaño in archivos:
+        try:
+            os.unlink(ruta)
+        except FileNotFoundError:
+            # Ya eliminado
+            continue
+        except OSError as e:
+            errores[ruta] = f"{type(e).__name__}: {str(e)}"
+            continue
+        eliminados += 1
+        bytes_liberados += tamaño
+    return eliminados, bytes_liberados, errores
+
+
+def _leer_manifiesto_backup(ruta_manifiesto: Path) -> Dict:
+    """Lee un manifiesto de backup, verificando su versión."""
+    with open(ruta_manifiesto, 'r', encoding='utf-8') as f:
+        manifiesto = json.load(f)
+    if manifiesto.get('version') != VERSION_MANIFIESTO_BACKUP:
+        raise ValueError(f"Versión de manifiesto de backup no soportada: {manifiesto.get('version')}")
+    return manifiesto
+
+
+def _compresor_backup(compresion: str, nivel: Optional[int] = None):
+    """Compresor en streaming que produce datos .zst o .gz estándar."""
+    if compresion == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3 if nivel is None else nivel).compressobj()
+    # wbits=31 escribe el encabezado y el cierre de gzip
+    return zlib.compressobj(6 if nivel is None else nivel, zlib.DEFLATED, 31)
+
+
+def _descompresor_backup(compresion: str):
+    """Descompresor en streaming para los objetos escritos por _compresor_backup."""
+    if compresion == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(31)
+
+
+def _cargar_indice_archivos(ruta_indice: Path) -> Dict:
+    """Lee los árboles de una instantánea del reporte de archivos, o un dict vacío si falta o está desactualizada."""
+    try:
+        with open(ruta_indice, 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return indice.get('arboles', {}) if indice.get('version') == VERSION_INDICE_ARCHIVOS else {}
 
-    if reporte['tamaño_bytes'] == 0:
-        reporte['errores'].append("Archivo vacío")
+
+def _recorrer_arbol_directorios(raiz: Path, anterior: Optional[Dict] = None) -> Tuple[Dict, int, int]:
+    """
+    Resume cada directorio bajo raiz, reutilizando los que no cambiaron de una instantánea.
+
+    No se siguen los enlaces simbólicos a directorios.
+
+    Returns:
+    --------
+    Tuple : (resúmenes por directorio relativo, directorios listados, directorios reutilizados)
+    """
+    anterior = anterior or {}
+    entradas = {}
+    listados = 0
+    reutilizados = 0
+
+    pendientes = ['.']
+    while pendientes:
+        relativo = pendientes.pop()
+        ruta = raiz if relativo == '.' else raiz / relativo
+        try:
+            # Se lee antes de listar, así los cambios hechos durante el listado provocan un nuevo listado la próxima vez
+            mtime_ns = os.stat(ruta).st_mtime_ns
+        except OSError:
+            continue
+
+        entrada = anterior.get(relativo)
+        if entrada is not None and entrada['mtime_ns'] == mtime_ns:
+            reutilizados += 1
+        else:
+            entrada = _resumir_directorio(ruta, mtime_ns)
+            listados += 1
+
+        entradas[relativo] = entrada
+        pendientes.extend(nombre if relativo == '.' else f"{relativo}/{nombre}" for nombre in entrada['subdirectorios'])
+
+    return entradas, listados, reutilizados
+
+
+def _resumir_directorio(ruta: Path, mtime_ns: int) -> Dict:
+    """Lista un directorio con os.scandir, haciendo stat una sola vez por archivo."""
+    resumen = {
+        'mtime_ns': mtime_ns,
+        'subdirectorios': [],
+        'archivos': 0,
+        'tamaño': 0,
+        'extensiones': {},
+        'mas_reciente': None,
+        'mas_antiguo': None
+    }
+
+    try:
+        with os.scandir(ruta) as iterador:
+            for entrada in iterador:
+                try:
+                    if entrada.is_dir(follow_symlinks=False):
+                        resumen['subdirectorios'].append(entrada.name)
+                        continue
+                    if not entrada.is_file():
+                        continue
+                    stat = entrada.stat()
+                except OSError:
+                    # Eliminado durante el listado
+                    continue
+
+                ext = os.path.splitext(entrada.name)[1].lower() or 'sin_extension'
+                conteos = resumen['extensiones'].setdefault(ext, [0, 0])
+                conteos[0] += 1
+                conteos[1] += stat.st_size
+                resumen['archivos'] += 1
+                resumen['tamaño'] += stat.st_size
+
+                if resumen['mas_reciente'] is None or stat.st_mtime > resumen['mas_reciente'][0]:
+                    resumen['mas_reciente'] = [stat.st_mtime, entrada.name]
+                if resumen['mas_antiguo'] is None or stat.st_mtime < resumen['mas_antiguo'][0]:
+                    resumen['mas_antiguo'] = [stat.st_mtime, entrada.name]
+    except OSError as e:
+        logger.warning("No se pudo listar %s: %s", ruta, e)
+
+    return resumen
+
+
+def _resumir_arbol_directorios(entradas: Dict) -> Dict:
+    """Combina los resúmenes de directorio de un árbol en la sección del reporte de archivos."""
+    extensiones = {}
+    tamaño_total = 0
+    mas_reciente = None
+    mas_antiguo = None
+
+    for entrada in entradas.values():
+        tamaño_total += entrada['tamaño']
+        for ext, (conteo, tamaño) in entrada['extensiones'].items():
+            estadisticas = extensiones.setdefault(ext, {'count': 0, 'tamaño_mb': 0})
+            estadisticas['count'] += conteo
+            estadisticas['tamaño_mb'] += tamaño / (1024 ** 2)
+        if entrada['mas_reciente'] and (mas_reciente is None or entrada['mas_reciente'][0] > mas_reciente[0]):
+            mas_reciente = entrada['mas_reciente']
+        if entrada['mas_antiguo'] and (mas_antiguo is None or entrada['mas_antiguo'][0] < mas_antiguo[0]):
+            mas_antiguo = entrada['mas_antiguo']
+
+    return {
+        'total_archivos': sum(entrada['archivos'] for entrada in entradas.values()),
+        'total_carpetas': sum(len(entrada['subdirectorios']) for entrada in entradas.values()),
+        'tamaño_total_mb': tamaño_total / (1024 ** 2),
+        'extensiones': extensiones,
+        'archivo_mas_reciente': mas_reciente[1] if mas_reciente else None,
+        'archivo_mas_antiguo': mas_antiguo[1] if mas_antiguo else None
+    }
+
+
+class SimilarNameIndex:
+    """
+    Índice invertido de n-gramas de los nombres de archivo de un directorio para coincidencia aproximada.
+
+    Los nombres se comparan en minúsculas y sin extensión con
+    difflib.SequenceMatcher, como siempre lo hizo encontrar_archivos_similares,
+    pero el ratio exacto solo se calcula para los nombres que pasan tres
+    cotas baratas que nunca descartan una coincidencia: longitud, n-gramas
+    compartidos (lema de q-gramas) y quick_ratio. Los archivos con la misma
+    raíz se comparan una sola vez.
+    """
+
+    def __init__(self, directorio: Path, ngrama: int = NGRAMA_NOMBRES_SIMILARES):
+        """
+        Inicializa el índice y lista el directorio.
+
+        Parameters:
+        -----------
+        directorio : Path
+            Directorio cuyos nombres de archivo se indexan
+        ngrama : int
+            Tamaño de los n-gramas indexados
+        """
+        self.directorio = Path(directorio)
+        self.ngrama = ngrama
+        self.archivos = {}  # nombre de archivo -> raíz
+        self.raices = {}  # raíz -> nombres de archivo, conteo de n-gramas y de caracteres
+        self.indice_invertido = {}  # n-grama -> {raíz: conteo}
+        self.longitudes = {}  # longitud de la raíz -> raíces
+        self._mtime_ns = None
+        self._listado_ns = 0
+        self._lock = threading.Lock()
+        self.refrescar()
+
+    def refrescar(self, forzar: bool = False) -> Tuple[int, int]:
+        """
+        Vuelve a listar el directorio e indexa solo los nombres agregados o eliminados desde el último listado.
+
+        El listado se omite mientras el mtime del directorio no cambie, salvo
+        que haya cambiado poco antes del último listado (marcas de tiempo gruesas).
+
+        Parameters:
+        -----------
+        forzar : bool
+            Si se lista el directorio aunque su mtime no haya cambiado
+
+        Returns:
+        --------
+        Tuple[int, int] : Número de nombres agregados y eliminados
+        """
+        try:
+            mtime_ns = os.stat(self.directorio).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if (not forzar and mtime_ns is not None and mtime_ns == self._mtime_ns
+                and self._listado_ns - mtime_ns > 2 * 10**9):
+            return 0, 0
+
+        listado_ns = time.time_ns()
+        nombres = set()
+        if mtime_ns is not None:
+            with os.scandir(self.directorio) as iterador:
+                for entrada in iterador:
+                    try:
+                        if entrada.is_file():
+                            nombres.add(entrada.name)
+                    except OSError:
+                        # Eliminado durante el listado
+                        continue
+
+        with self._lock:
+            eliminados = self.archivos.keys() - nombres
+            agregados = nombres - self.archivos.keys()
+            for nombre in eliminados:
+                self._quitar(nombre)
+            for nombre in agregados:
+                self._agregar(nombre)
+            self._mtime_ns = mtime_ns
+            self._listado_ns = listado_ns
+
+        if agregados or eliminados:
+            logger.debug("Índice de nombres similares de %s: %s agregados, %s eliminados",
+                         self.directorio, len(agregados), len(eliminados))
+        return len(agregados), len(eliminados)
+
+    def _agregar(self, nombre: str):
+        """Agrega un nombre de archivo al índice."""
+        raiz = Path(nombre).stem.lower()
+        self.archivos[nombre] = raiz
+        entrada = self.raices.get(raiz)
+        if entrada is None:
+            ngramas = Counter(_ngramas(raiz, self.ngrama))
+            entrada = self.raices[raiz] = {'archivos': set(), 'ngramas': ngramas, 'caracteres': Counter(raiz)}
+            for ngrama, conteo in ngramas.items():
+                self.indice_invertido.setdefault(ngrama, {})[raiz] = conteo
+            self.longitudes.setdefault(len(raiz), set()).add(raiz)
+        entrada['archivos'].add(nombre)
+
+    def _quitar(self, nombre: str):
+        """Quita un nombre de archivo del índice."""
+        raiz = self.archivos.pop(nombre)
+        entrada = self.raices[raiz]
+        entrada['archivos'].discard(nombre)
+        if entrada['archivos']:
+            return
+        del self.raices[raiz]
+        for ngrama in entrada['ngramas']:
+            lista = self.indice_invertido[ngrama]
+            del lista[raiz]
+            if not lista:
+                del self.indice_invertido[ngrama]
+        self.longitudes[len(raiz)].discard(raiz)
+        if not self.longitudes[len(raiz)]:
+            del self.longitudes[len(raiz)]
+
+    def buscar(self, nombre_base: str, threshold: float = 0.8) -> List[Path]:
+        """
+        Encuentra los archivos cuyo nombre es similar a nombre_base.
+
+        Parameters:
+        -----------
+        nombre_base : str
+            Nombre base para comparar
+        threshold : float
+            Umbral de similitud (0-1)
+
+        Returns:
+        --------
+        List[Path] : Archivos similares, el más similar primero
+        """
+        return self.buscar_varios([nombre_base], threshold)[nombre_base]
+
+    def buscar_varios(self, nombres_base: Iterable[str], threshold: float = 0.8) -> Dict[str, List[Path]]:
+        """
+        Encuentra los archivos similares de muchos nombres base a la vez.
+
+        Parameters:
+        -----------
+        nombres_base : Iterable[str]
+            Nombres base para comparar
+        threshold : float
+            Umbral de similitud (0-1)
+
+        Returns:
+        --------
+        Dict[str, List[Path]] : Archivos similares de cada nombre base, el más similar primero
+        """
+        resultados = {}
+        coincidencias = {}
+        with self._lock:
+            for nombre_base in nombres_base:
+                consulta = nombre_base.lower()
+                if consulta not in coincidencias:
+                    coincidencias[consulta] = [self.directorio / nombre
+                                               for nombre in self._coincidencias(consulta, threshold)]
+                resultados[nombre_base] = coincidencias[consulta]
+        return resultados
+
+    def _coincidencias(self, consulta: str, threshold: float) -> List[str]:
+        """Retorna los nombres de archivo cuya raíz tiene un ratio de al menos threshold con consulta."""
+        longitud_consulta = len(consulta)
+        caracteres_consulta = Counter(consulta)
+        comparador = SequenceMatcher(None, consulta)
+        compartidos_por_longitud = None
+        puntuados = []
+
+        for longitud, raices in self.longitudes.items():
+            total = longitud_consulta + longitud
+            # Cota de longitud: coinciden como máximo min(longitud_consulta, longitud) caracteres
+            if total and 2.0 * min(longitud_consulta, longitud) / total < threshold:
+                continue
+
+            # Cota de n-gramas: un ratio >= threshold permite como máximo estas inserciones y
+            # eliminaciones, y cada una destruye como máximo `ngrama` n-gramas compartidos
+            distancia_maxima = int((1 - threshold) * total + 1e-9)
+            minimo_compartidos = (max(longitud_consulta, longitud) - self.ngrama + 1
+                                  - self.ngrama * distancia_maxima)
+            if minimo_compartidos > 0:
+                if compartidos_por_longitud is None:
+                    compartidos_por_longitud = self._ngramas_compartidos(consulta)
+                candidatas = [raiz for raiz, compartidos in compartidos_por_longitud.get(longitud, ())
+                              if compartidos >= minimo_compartidos]
+            else:
+                candidatas = raices
+
+            for raiz in candidatas:
+                # Cota de quick_ratio: caracteres en común sin importar el orden
+                comunes = sum((caracteres_consulta & self.raices[raiz]['caracteres']).values())
+                if total and 2.0 * comunes / total < threshold:
+                    continue
+                comparador.set_seq2(raiz)
+                similitud = comparador.ratio()
+                if similitud >= threshold:
+                    puntuados.extend((similitud, nombre) for nombre in self.raices[raiz]['archivos'])
+
+        # Ordenar por similitud descendente
+        puntuados.sort(key=lambda x: (-x[0], x[1]))
+        return [nombre for _, nombre in puntuados]
+
+    def _ngramas_compartidos(self, consulta: str) -> Dict[int, List[Tuple[str, int]]]:
+        """Cuenta los n-gramas que cada raíz indexada comparte con consulta, agrupados por longitud de la raíz."""
+        compartidos = Counter()
+        for ngrama, conteo in Counter(_ngramas(consulta, self.ngrama)).items():
+            for raiz, conteo_raiz in self.indice_invertido.get(ngrama, {}).items():
+                compartidos[raiz] += min(conteo, conteo_raiz)
+        por_longitud = {}
+        for raiz, conteo in compartidos.items():
+            por_longitud.setdefault(len(raiz), []).append((raiz, conteo))
+        return por_longitud
+
+
+def _ngramas(texto: str, n: int) -> List[str]:
+    """Retorna los n-gramas superpuestos de texto."""
+    return [texto[i:i + n] for i in range(len(texto) - n + 1)]
+
+
+@lru_cache(maxsize=INDICES_NOMBRES_SIMILARES)
+def _indice_nombres_similares(directorio: str) -> SimilarNameIndex:
+    """Retorna el índice de un directorio, construido en el primer uso y conservado para las consultas siguientes."""
+    return SimilarNameIndex(Path(directorio))
+
+
+def encontrar_archivos_similares(directorio: Path, nombre_base: str, threshold: float = 0.8) -> List[Path]:
+    """
+    Encuentra archivos con nombres similares usando coincidencia aproximada.
+
+    Usa el SimilarNameIndex del directorio, construido en la primera
+    consulta y refrescado de forma incremental en las siguientes.
+
+    Parameters:
+    -----------
+    directorio : Path
+        Directorio donde buscar
+    nombre_base : str
+        Nombre base para comparar
+    threshold : float
+        Umbral de similitud (0-1)
+
+    Returns:
+    --------
+    List[Path] : Lista de archivos similares
+    """
+    return encontrar_archivos_similares_lote(directorio, [nombre_base], threshold)[nombre_base]
+
+
+def encontrar_archivos_similares_lote(directorio: Path, nombres_base: Iterable[str],
+                                      threshold: float = 0.8) -> Dict[str, List[Path]]:
+    """
+    Encuentra archivos con nombres similares a cada uno de muchos nombres base.
+
+    Parameters:
+    -----------
+    directorio : Path
+        Directorio donde buscar
+    nombres_base : Iterable[str]
+        Nombres base para comparar
+    threshold : float
+        Umbral de similitud (0-1)
+
+    Returns:
+    --------
+    Dict[str, List[Path]] : Archivos similares de cada nombre base, el más similar primero
+    """
+    indice = _indice_nombres_similares(str(Path(directorio).resolve()))
+    indice.refrescar()
+    resultados = indice.buscar_varios(nombres_base, threshold)
+    # Conservar el directorio tal como lo indicó quien llama
+    return {nombre_base: [Path(directorio) / archivo.name for archivo in archivos]
+            for nombre_base, archivos in resultados.items()}
+
+
+def _detectar_encoding(muestra: bytes) -> str:
+    """
+    Detecta el encoding de texto de una muestra de bytes.
+
+    Revisa primero el BOM, luego la validez UTF-8 y finalmente recurre a
+    cp1252 (cuando hay caracteres exclusivos de Windows) o latin-1.
+    """
+    if muestra.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if muestra.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    try:
+        # El decodificador incremental tolera un carácter multibyte cortado al final de la muestra
+        codecs.getincrementaldecoder('utf-8')().decode(muestra, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # Los bytes 0x80-0x9F son caracteres de control en latin-1 pero imprimibles en cp1252
+    if any(0x80 <= byte <= 0x9F for byte in muestra):
+        try:
+            muestra.decode('cp1252')
+            return 'cp1252'
+        except UnicodeDecodeError:
+            pass
+
+    return 'latin-1'
+
+
+def _es_numero(valor: str) -> bool:
+    """Verifica si un campo CSV parece un número."""
+    try:
+        float(valor.strip().replace(',', '.'))
+        return True
+    except ValueError:
+        return False
+
+
+def detectar_dialecto_csv(ruta_archivo: Path, bytes_muestra: int = BYTES_MUESTRA_CSV) -> Dict:
+    """
+    Detecta encoding, delimitador, comillas y encabezado de un archivo CSV.
+
+    Lee una única muestra de bytes de tamaño fijo y resuelve todo en memoria,
+    por lo que el archivo se abre una sola vez sin importar cuántos candidatos haya.
+
+    Parameters:
+    -----------
+    ruta_archivo : Path
+        Ruta del archivo CSV
+    bytes_muestra : int
+        Tamaño de la muestra leída desde el inicio del archivo
+
+    Returns:
+    --------
+    Dict : Dialecto detectado ('encoding', 'delimitador', 'comillas',
+           'tiene_encabezado', 'detectado')
+    """
+    with _abrir_descomprimido(ruta_archivo) as f:
+        muestra = f.read(bytes_muestra)
+        completo = len(f.read(1)) == 0
+
+    encoding = _detectar_encoding(muestra)
+    texto = codecs.getincrementaldecoder(encoding)(errors='replace').decode(muestra, final=completo)
+
+    # Descartar la última línea si la muestra la cortó a la mitad
+    lineas = texto.splitlines()
+    if not completo and len(lineas) > 1:
+        lineas = lineas[:-1]
+    texto = '\n'.join(lineas)
+
+    dialecto = {
+        'encoding': encoding,
+        'delimitador': ',',
+        'comillas': '"',
+        'tiene_encabezado': True,
+        'detectado': False
+    }
+
+    if not texto.strip():
+        return dialecto
+
+    try:
+        detectado = csv.Sniffer().sniff(texto, delimiters=''.join(DELIMITADORES_CSV))
+        dialecto['delimitador'] = detectado.delimiter
+        dialecto['comillas'] = detectado.quotechar or '"'
+        dialecto['detectado'] = True
+    except csv.Error:
+        # Recurrir al delimitador con el conteo más consistente por línea
+        mejor_puntaje = 0
+        for delim in DELIMITADORES_CSV:
+            conteos = [linea.count(delim) for linea in lineas[:50] if linea.strip()]
+            if conteos and min(conteos) > 0:
+                puntaje = min(conteos) * sum(1 for c in conteos if c == conteos[0])
+                if puntaje > mejor_puntaje:
+                    mejor_puntaje = puntaje
+                    dialecto['delimitador'] = delim
+                    dialecto['detectado'] = True
+
+    # Encabezado: se mantiene como en pandas salvo evidencia fuerte. La primera
+    # fila es un dato solo si mezcla números y texto igual que las filas de
+    # abajo; una primera fila solo numérica (ej: años) sigue siendo el encabezado.
+    filas = list(csv.reader(lineas[:FILAS_VERIFICACION_ENCABEZADO_CSV + 1], delimiter=dialecto['delimitador'],
+                            quotechar=dialecto['comillas']))
+    if len(filas) > 1:
+        tipos_primera = [_es_numero(campo) for campo in filas[0]]
+        if any(tipos_primera) and not all(tipos_primera) and all(
+                [_es_numero(campo) for campo in fila] == tipos_primera for fila in filas[1:]):
+            dialecto['tiene_encabezado'] = False
+
+    if not dialecto['detectado']:
+        logger.warning("No se pudo detectar formato CSV, usando configuración por defecto")
+
+    return dialecto
+
+
+def _es_json_lines(ruta_archivo: Path) -> bool:
+    """
+    Verifica si un archivo JSON contiene un registro por línea (JSON lines).
+
+    Solo se interpreta un prefijo acotado: un array ('[...') nunca es JSON
+    lines, una primera línea que cabe en la muestra debe ser un objeto y una
+    más larga se salta sin interpretarla. Debe seguir otra línea que empiece
+    con '{', para no confundir con JSON lines un documento de una sola línea
+    escrito con el orient por defecto de pandas.
+    """
+    with io.TextIOWrapper(_abrir_descomprimido(ruta_archivo), encoding='utf-8') as f:
+        primera_linea, salto, resto = f.read(CARACTERES_MUESTRA_JSON_LINES).lstrip().partition('\n')
+        if not primera_linea.startswith('{'):
+            return False
+
+        if salto:
+            try:
+                if not isinstance(json.loads(primera_linea), dict):
+                    return False
+            except ValueError:
+                return False
+        else:
+            # Primera línea larga: se lee hasta su final sin interpretarla
+            while not salto:
+                bloque = f.read(CARACTERES_MUESTRA_JSON_LINES)
+                if not bloque:
+                    return False
+                _, salto, resto = bloque.partition('\n')
+
+        resto = resto.lstrip()
+        while not resto:
+            bloque = f.read(CARACTERES_MUESTRA_JSON_LINES)
+            if not bloque:
+                return False
+            resto = bloque.lstrip()
+        return resto.startswith('{')
+
+
+def _memoria_bytes(df: pd.DataFrame) -> int:
+    """Memoria de un DataFrame en bytes, estimada con data_processor.medir_memoria cuando está disponible."""
+    try:
+        # Se importa aquí para que este módulo pueda usarse sin data_processor
+        from data_processor import medir_memoria
+    except ImportError:
+        return int(df.memory_usage(deep=True).sum())
+    return int(medir_memoria(df))
+
+
+def _registrar_metricas(operacion: str, inicio: float, dimensiones: Optional[Tuple[int, int]] = None,
+                        df: Optional[pd.DataFrame] = None, ruta: Optional[Path] = None, **campos) -> None:
+    """
+    Registra un registro de métricas legible por máquina para una operación.
+
+    El registro (operacion, filas, columnas, bytes en memoria, bytes_archivo
+    en disco, segundos y cualquier campo adicional) se escribe como JSON en
+    el logger de métricas y se adjunta al registro de log como `metricas`.
+    No se mide nada si INFO no está habilitado para el logger de métricas.
+
+    Parameters:
+    -----------
+    operacion : str
+        Nombre de la operación
+    inicio : float
+        Valor de time.perf_counter() al iniciar la operación
+    dimensiones : Tuple[int, int], optional
+        (filas, columnas) procesadas (por defecto las dimensiones de df)
+    df : pd.DataFrame, optional
+        DataFrame cuya memoria se reporta como bytes
+    ruta : Path, optional
+        Archivo cuyo tamaño en disco se reporta como bytes_archivo
+    **campos
+        Valores adicionales para el registro
+    """
+    if not logger_metricas.isEnabledFor(logging.INFO):
+        return
+
+    metricas = {'operacion': operacion, 'filas': None, 'columnas': None, 'bytes': None, 'bytes_archivo': None,
+                'segundos': round(time.perf_counter() - inicio, 6)}
+    if dimensiones is None and df is not None:
+        dimensiones = df.shape
+    if dimensiones is not None:
+        metricas['filas'], metricas['columnas'] = (None if valor is None else int(valor) for valor in dimensiones)
+    if df is not None:
+        metricas['bytes'] = _memoria_bytes(df)
+    if ruta is not None:
+        try:
+            metricas['bytes_archivo'] = ruta.stat().st_size
+        except OSError:
+            pass
+    metricas.update(campos)
+
+    logger_metricas.info("%s", json.dumps(metricas, default=str), extra={'metricas': metricas})
+
+
+def _es_cacheable(extension: str, columnas: Optional[List[str]], nombre_hoja: Union[str, int]) -> bool:
+    """
+    Verifica si una carga puede pasar por el cache de carga.
+
+    Los archivos columnares ya se leen rápido, y el cache guarda solo lecturas
+    completas por defecto, así que las cargas proyectadas o de otra hoja nunca lo usan.
+    """
+    return extension not in EXTENSIONES_COLUMNARES and columnas is None and nombre_hoja == 0
+
+
+@lru_cache(maxsize=None)
+def _motor_excel(extension: str, preferido: Optional[str] = None) -> str:
+    """
+    Retorna el motor de pandas con el que se lee un archivo Excel.
+
+    Un motor preferido se usa tal cual (así puede conectarse cualquier motor
+    que pandas soporte); si no, el primero instalado de MOTORES_EXCEL.
+    """
+    if preferido is not None:
+        if preferido in PAQUETES_MOTORES_EXCEL and not _motor_excel_instalado(preferido):
+            raise ImportError(f"El motor de Excel '{preferido}' no está instalado. "
+                              f"Instálalo con: pip install {PAQUETES_MOTORES_EXCEL[preferido][1]}")
+        return preferido
+
+    candidatos = MOTORES_EXCEL.get(extension, ['openpyxl'])
+    for motor in candidatos:
+        if _motor_excel_instalado(motor):
+            return motor
+
+    raise ImportError(f"Leer archivos {extension} requiere uno de: {candidatos}. "
+                      f"Instálalo con: pip install {PAQUETES_MOTORES_EXCEL[candidatos[-1]][1]}")
+
+
+def _motor_excel_instalado(motor: str) -> bool:
+    """Verifica si un motor de Excel y su lector de pandas están disponibles."""
+    if importlib.util.find_spec(PAQUETES_MOTORES_EXCEL[motor][0]) is None:
+        return False
+    # pandas < 2.2 no tiene lector calamine
+    return motor != 'calamine' or importlib.util.find_spec('pandas.io.excel._calamine') is not None
+
+
+def _leer_excel(ruta_archivo: Path, nombre_hoja: Union[str, int] = 0,
+                columnas: Optional[List[str]] = None, motor: Optional[str] = None, **opciones) -> pd.DataFrame:
+    """Lee una hoja de un archivo Excel con el motor y la proyección de columnas indicados."""
+    return pd.read_excel(ruta_archivo, sheet_name=nombre_hoja, usecols=columnas, engine=motor, **opciones)
+
+
+def _nombres_hojas_excel(ruta_archivo: Path, motor: str) -> List[str]:
+    """Lista las hojas de un libro sin procesar sus celdas."""
+    if motor == 'openpyxl':
+        from openpyxl import load_workbook
+
+        libro = load_workbook(ruta_archivo, read_only=True)
+        try:
+            return libro.sheetnames
+        finally:
+            libro.close()
+
+    with pd.ExcelFile(ruta_archivo, engine=motor) as libro:
+        return libro.sheet_names
+
+
+def _importar_pyarrow():
+    """Importa pyarrow con un mensaje útil cuando no está instalado."""
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Los formatos Parquet/Feather/Arrow requieren pyarrow. "
+                          "Instálalo con: pip install pyarrow") from e
+    return pyarrow
+
+
+def _leer_tabla_columnar(ruta_archivo: Path, columnas: Optional[List[str]] = None,
+                         filtros: Optional[List[Tuple]] = None):
+    """
+    Lee un archivo Parquet, Feather o Arrow IPC como una Table de pyarrow.
+
+    En Parquet los filtros se aplican en la lectura para saltar row groups
+    completos usando sus estadísticas. Los archivos Feather/Arrow IPC se mapean
+    en memoria, así que los no comprimidos se leen sin copiar los buffers.
+    """
+    pa = _importar_pyarrow()
+
+    if ruta_archivo.suffix.lower() == '.parquet':
+        return pa.parquet.read_table(ruta_archivo, columns=columnas, filters=filtros, memory_map=True)
+
+    # Las columnas mapeadas en memoria no se copian, así que se filtra primero y se proyecta después
+    tabla = pa.feather.read_table(ruta_archivo, memory_map=True)
+    if filtros:
+        tabla = tabla.filter(pa.parquet.filters_to_expression(filtros))
+    if columnas is not None:
+        tabla = tabla.select(columnas)
+    return tabla
+
+
+def _iterar_lotes_columnares(ruta_archivo: Path, tamaño_bloque: int,
+                             columnas: Optional[List[str]] = None,
+                             filtros: Optional[List[Tuple]] = None) -> Iterator[pd.DataFrame]:
+    """Recorre un archivo columnar lote a lote aplicando proyección y filtros."""
+    pa = _importar_pyarrow()
+
+    formato = 'parquet' if ruta_archivo.suffix.lower() == '.parquet' else 'ipc'
+    dataset = pa.dataset.dataset(ruta_archivo, format=formato)
+    expresion = pa.parquet.filters_to_expression(filtros) if filtros else None
+
+    for lote in dataset.to_batches(columns=columnas, filter=expresion, batch_size=tamaño_bloque):
+        if lote.num_rows:
+            yield lote.to_pandas()
+
+
+def _escribir_tabla_columnar(df: pd.DataFrame, ruta_archivo: Path, formato: str,
+                             compresion: Optional[str] = None, nivel_compresion: Optional[int] = None):
+    """
+    Escribe un DataFrame como Parquet, Feather o Arrow IPC.
+
+    Por defecto 'parquet' usa Snappy y 'feather' LZ4 para ahorrar disco; 'arrow'
+    se escribe sin comprimir para poder mapearlo de vuelta en memoria sin copias
+    (un códec de compresión renuncia a eso).
+    """
+    if compresion == 'gzip' and formato != 'parquet':
+        raise ValueError("Los archivos Feather/Arrow solo soportan compresión 'zstd' o 'lz4'")
+
+    pa = _importar_pyarrow()
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+
+    if formato == 'parquet':
+        pa.parquet.write_table(tabla, ruta_archivo, compression=compresion or 'snappy',
+                               compression_level=nivel_compresion)
+    elif formato == 'feather':
+        pa.feather.write_feather(tabla, ruta_archivo, compression=compresion or 'lz4',
+                                 compression_level=nivel_compresion)
+    else:
+        pa.feather.write_feather(tabla, ruta_archivo, compression=compresion or 'uncompressed',
+                                 compression_level=nivel_compresion)
+
+
+def _compresion_pandas(compresion: Optional[str], nivel_compresion: Optional[int] = None) -> Optional[Dict]:
+    """Construye el argumento compression de los escritores de pandas para un método y nivel."""
+    if compresion is None:
+        return None
+    opciones = {'method': compresion}
+    if nivel_compresion is not None:
+        opciones[ARGUMENTOS_NIVEL_COMPRESION[compresion]] = nivel_compresion
+    return opciones
+
+
+def _abrir_comprimido(ruta_archivo: Path, compresion: Optional[Dict] = None):
+    """Abre un archivo binario para escritura con el códec de un argumento compression de pandas."""
+    if compresion is None:
+        return open(ruta_archivo, 'wb')
+
+    opciones = {k: v for k, v in compresion.items() if k != 'method'}
+    if compresion['method'] == 'gzip':
+        import gzip
+        return gzip.open(ruta_archivo, 'wb', **opciones)
+    if compresion['method'] == 'zstd':
+        import zstandard
+        return zstandard.open(ruta_archivo, 'wb', cctx=zstandard.ZstdCompressor(**opciones))
+    import lz4.frame
+    return lz4.frame.open(ruta_archivo, 'wb', **opciones)
+
+
+def _formato_datos(ruta_archivo: Path) -> Tuple[str, Optional[str]]:
+    """Devuelve el sufijo de formato de un archivo de datos y su método de compresión, ej: ('.csv', 'gzip') para resultados.csv.gz."""
+    sufijos = [sufijo.lower() for sufijo in ruta_archivo.suffixes] or ['']
+    compresion = METODOS_COMPRESION.get(sufijos[-1])
+    if compresion is None or len(sufijos) < 2:
+        return sufijos[-1], None
+    return sufijos[-2], compresion
+
+
+def _abrir_descomprimido(ruta_archivo: Path):
+    """Abre un archivo de datos para lectura binaria, descomprimiéndolo si su último sufijo nombra un códec."""
+    compresion = _formato_datos(ruta_archivo)[1]
+    if compresion == 'gzip':
+        import gzip
+        return gzip.open(ruta_archivo, 'rb')
+    if compresion == 'zstd':
+        import zstandard
+        return zstandard.open(ruta_archivo, 'rb')
+    if compresion == 'lz4':
+        import lz4.frame
+        return lz4.frame.open(ruta_archivo, 'rb')
+    return open(ruta_archivo, 'rb')
+
+
+@contextmanager
+def _fuente_pandas(ruta_archivo: Path):
+    """
+    Entrega lo que un lector de pandas debe abrir para un archivo de datos.
+
+    Los archivos planos, gzip y zstd se pasan como rutas para que pandas
+    deduzca el códec del sufijo (compression='infer'); lz4, que pandas no
+    puede leer, se pasa como un flujo descomprimido.
+    """
+    if _formato_datos(ruta_archivo)[1] != 'lz4':
+        yield ruta_archivo
+        return
+    with _abrir_descomprimido(ruta_archivo) as manejador:
+        yield manejador
+
+
+def _dialecto_alternativo(ruta_archivo: Path, dialecto: Dict, error: UnicodeDecodeError) -> Dict:
+    """Devuelve el dialecto con el siguiente encoding alternativo tras un error de decodificación, o relanza el error si no queda ninguno."""
+    encoding = dialecto['encoding']
+    if encoding.startswith('utf-16') or encoding == ENCODINGS_ALTERNATIVOS_CSV[-1]:
+        raise error
+    alternativo = ENCODINGS_ALTERNATIVOS_CSV[ENCODINGS_ALTERNATIVOS_CSV.index(encoding) + 1] \
+        if encoding in ENCODINGS_ALTERNATIVOS_CSV else ENCODINGS_ALTERNATIVOS_CSV[0]
+    logger.warning("%s no se decodifica como %s fuera de la muestra detectada (%s), se lee como %s",
+                   ruta_archivo.name, encoding, error.reason, alternativo)
+    return {**dialecto, 'encoding': alternativo}
+
+
+def _iterar_bloques_csv(ruta_archivo: Path, tamaño_bloque: int, dialecto: Dict) -> Iterator[pd.DataFrame]:
+    """
+    Lee un CSV por bloques con un dialecto detectado.
+
+    Un error de decodificación fuera de la muestra reinicia la lectura con el
+    siguiente encoding alternativo, omitiendo las filas ya entregadas.
+    """
+    entregadas = 0
+    while True:
+        try:
+            omitir = entregadas
+            for bloque in _leer_bloques(pd.read_csv, ruta_archivo, chunksize=tamaño_bloque,
+                                        **opciones_lectura_csv(dialecto)):
+                if omitir >= len(bloque):
+                    omitir -= len(bloque)
+                    continue
+                bloque = bloque.iloc[omitir:]
+                omitir = 0
+                entregadas += len(bloque)
+                yield bloque
+            return
+        except UnicodeDecodeError as e:
+            dialecto = _dialecto_alternativo(ruta_archivo, dialecto, e)
+
+
+def _iterar_combinados(cargados: Iterator[Tuple[str, pd.DataFrame]], optimizar=None) -> Iterator[pd.DataFrame]:
+    """Entrega los DataFrames cargados indexados por ('archivo_origen', fila), la versión perezosa del DataFrame combinado de cargar_varios."""
+    for nombre, df in cargados:
+        if optimizar is not None:
+            df = optimizar(df, en_lugar=True)
+        yield df.set_axis(pd.MultiIndex.from_product([[nombre], df.index], names=['archivo_origen', None]))
+
+
+def _leer_bloques(leer, ruta_archivo: Path, **opciones) -> Iterator[pd.DataFrame]:
+    """Entrega los bloques de un lector por bloques de pandas, manteniendo abierta la fuente (descomprimida) mientras se itera."""
+    with _fuente_pandas(ruta_archivo) as fuente, leer(fuente, compression='infer', **opciones) as lector:
+        yield from lector
+
+
+@contextmanager
+def _escritura_atomica(ruta_archivo: Path) -> Iterator[Path]:
+    """
+    Entrega una ruta temporal junto a ruta_archivo y la mueve a su lugar una vez escrita.
+
+    Los datos se sincronizan con fsync antes del renombrado y el renombrado
+    después, así que se lee el archivo anterior o el nuevo completo. El
+    archivo temporal se elimina si la escritura falla.
+    """
+    ruta_archivo = Path(ruta_archivo)
+    # Oculto y en el mismo directorio, así el renombrado nunca cruza sistemas de archivos
+    ruta_temporal = ruta_archivo.with_name(f".{ruta_archivo.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        yield ruta_temporal
+        with open(ruta_temporal, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(ruta_temporal, ruta_archivo)
+    except BaseException:
+        ruta_temporal.unlink(missing_ok=True)
+        raise
+
+    # Persistir la entrada del directorio (no soportado en Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        fd_directorio = os.open(ruta_archivo.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd_directorio)
+        finally:
+            os.close(fd_directorio)
+
+
+def escribir_excel_streaming(datos: Union[pd.DataFrame, Iterable[pd.DataFrame]], ruta_archivo: Path,
+                             nombre_hoja: str = "Sheet1", division: str = "sheets",
+                             tamaño_bloque: int = EXCEL_FILAS_BLOQUE_ESCRITURA,
+                             max_filas: int = EXCEL_MAX_FILAS) -> Tuple[List[Path], Tuple[int, int]]:
+    """
+    Escribe un DataFrame o un iterador de bloques a xlsx con memoria acotada.
+
+    El modo de solo escritura de openpyxl envía cada fila al disco, así que
+    solo el bloque que se está convirtiendo queda en memoria, a diferencia de
+    df.to_excel que construye primero todas las celdas del libro. Las filas
+    que superan el límite de la hoja continúan en una hoja nueva ('Sheet1',
+    'Sheet1_2', ...) o en un archivo nuevo ('nombre.xlsx', 'nombre_2.xlsx', ...).
+    Cada archivo se renombra a su lugar solo una vez completo.
+
+    Parameters:
+    -----------
+    datos : pd.DataFrame or Iterable[pd.DataFrame]
+        DataFrame o bloques con las mismas columnas (el índice no se escribe)
+    ruta_archivo : Path
+        Ruta del archivo xlsx (de la primera parte si se divide en varios archivos)
+    nombre_hoja : str
+        Nombre de la primera hoja
+    division : str
+        Dónde van las filas que superan max_filas: 'sheets' (hojas) o 'files' (archivos)
+    tamaño_bloque : int
+        Filas convertidas a la vez cuando datos es un DataFrame
+    max_filas : int
+        Filas por hoja, encabezado incluido (por defecto el límite de Excel)
+
+    Returns:
+    --------
+    Tuple : (rutas de los archivos escritos, (filas, columnas) escritas)
+    """
+    if division not in MODOS_DIVISION_EXCEL:
+        raise ValueError(f"division debe ser uno de: {MODOS_DIVISION_EXCEL}")
+    if max_filas < 2:
+        raise ValueError("max_filas debe dejar lugar para el encabezado y una fila")
+
+    from openpyxl import Workbook
+
+    ruta_archivo = Path(ruta_archivo)
+    bloques = datos
+    if isinstance(datos, pd.DataFrame):
+        # Un DataFrame vacío igual entrega un bloque para que se escriba su encabezado
+        bloques = (datos.iloc[inicio:inicio + tamaño_bloque] for inicio in range(0, max(len(datos), 1), tamaño_bloque))
+
+    rutas = []
+    libro = None
+    hoja = None
+    filas_hoja = 0
+    total_hojas = 0
+    total_filas = 0
+    encabezado = None
+
+    def iniciar_hoja():
+        nonlocal libro, hoja, filas_hoja, total_hojas
+        if libro is None or division == 'files':
+            if libro is not None:
+                _guardar_libro(libro, rutas[-1])
+            libro = Workbook(write_only=True)
+            parte = len(rutas) + 1
+            rutas.append(ruta_archivo if parte == 1
+                         else ruta_archivo.with_name(f"{ruta_archivo.stem}_{parte}{ruta_archivo.suffix}"))
+        total_hojas += 1
+        titulo = nombre_hoja if total_hojas == 1 or division == 'files' else f"{nombre_hoja}_{total_hojas}"
+        hoja = libro.create_sheet(titulo)
+        hoja.append(encabezado)
+        filas_hoja = 1
+
+    try:
+        for bloque in bloques:
+            if encabezado is None:
+                encabezado = [str(col) for col in bloque.columns]
+                iniciar_hoja()
+            elif [str(col) for col in bloque.columns] != encabezado:
+                raise ValueError("Todos los bloques deben tener las mismas columnas")
+
+            for fila in _filas_excel(bloque):
+                if filas_hoja == max_filas:
+                    iniciar_hoja()
+                hoja.append(fila)
+                filas_hoja += 1
+            total_filas += len(bloque)
+    except BaseException:
+        if libro is not None:
+            _descartar_libro(libro)
+        raise
+
+    if libro is None:
+        raise ValueError("No hay bloques para escribir")
+    _guardar_libro(libro, rutas[-1])
+
+    return rutas, (total_filas, len(encabezado))
+
+
+def _guardar_libro(libro, ruta_archivo: Path):
+    """Guarda un libro de solo escritura de forma atómica."""
+    with _escritura_atomica(ruta_archivo) as ruta_temporal:
+        libro.save(ruta_temporal)
+
+
+def _descartar_libro(libro):
+    """Cierra las hojas de un libro de solo escritura sin guardar y elimina sus archivos temporales."""
+    for hoja in libro.worksheets:
+        if hoja._writer is None:
+            continue
+        with suppress(OSError, ValueError):
+            if not hoja.closed:
+                hoja.close()
+            hoja._writer.cleanup()
+
+
+def _filas_excel(bloque: pd.DataFrame) -> Iterator[Tuple]:
+    """Convierte un bloque en filas de valores de Python, con los nulos como celdas vacías."""
+    valores = bloque.astype(object).where(bloque.notna(), None)
+    return valores.itertuples(index=False, name=None)
+
+
+def _escribir_bloques_csv(bloques: Iterable[pd.DataFrame], ruta_archivo: Path,
+                          compresion: Optional[Dict] = None) -> Tuple[int, int]:
+    """Escribe bloques en un flujo CSV (opcionalmente comprimido) con un solo encabezado; retorna las (filas, columnas) escritas."""
+    filas = 0
+    columnas = 0
+    with _abrir_comprimido(ruta_archivo, compresion) as binario, \
+            io.TextIOWrapper(binario, encoding='utf-8', newline='') as manejador:
+        for i, bloque in enumerate(bloques):
+            bloque.to_csv(manejador, header=i == 0, index=False)
+            filas += len(bloque)
+            columnas = bloque.shape[1]
+    return filas, columnas
+
+
+def _es_serializable_json(valor) -> bool:
+    """Verifica si un valor se puede guardar en un archivo JSON."""
+    try:
+        json.dumps(valor)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def opciones_lectura_csv(dialecto: Dict) -> Dict:
+    """
+    Traduce un dialecto detectado a argumentos para pd.read_csv.
+
+    Parameters:
+    -----------
+    dialecto : Dict
+        Dialecto retornado por detectar_dialecto_csv
+
+    Returns:
+    --------
+    Dict : Argumentos para pd.read_csv
+    """
+    return {
+        'sep': dialecto['delimitador'],
+        'encoding': dialecto['encoding'],
+        'quotechar': dialecto['comillas'],
+        'header': 0 if dialecto['tiene_encabezado'] else None
+    }
+
+
+def validar_integridad_archivo(ruta_archivo: Path) -> Dict:
+    """
+    Valida la integridad de un archivo de datos.
+
+    Parameters:
+    -----------
+    ruta_archivo : Path
+        Ruta al archivo a validar
+
+    Returns:
+    --------
+    Dict : Reporte de validación
+    """
+    reporte = _reporte_integridad(ruta_archivo)
+    if reporte['errores']:
         return reporte
 
     # Intentar leer el archivo
     try:
         if reporte['extension'] in ['.xlsx', '.xls']:
-            df = pd.read_excel(ruta_archivo, nrows=5)
+            df = _leer_excel(ruta_archivo, motor=_motor_excel(reporte['extension']), nrows=5)
         elif reporte['extension'] == '.csv':
             df = pd.read_csv(ruta_archivo, nrows=5)
         elif reporte['extension'] == '.json':
-            df = pd.read_json(ruta_archivo, nrows=5)
+            # nrows solo está soportado para JSON lines
+            if _es_json_lines(ruta_archivo):
+                df = pd.read_json(ruta_archivo, lines=True, nrows=5)
+            else:
+                df = pd.read_json(ruta_archivo).head(5)
         else:
             reporte['errores'].append(f"Formato no soportado: {reporte['extension']}")
             return reporte
@@ -501,6 +2994,312 @@ def validar_integridad_archivo(ruta_archivo: Path) -> Dict:
     return reporte
 
 
+def sondear_integridad_archivo(ruta_archivo: Path, filas: int = FILAS_SONDEO_INTEGRIDAD) -> Dict:
+    """
+    Valida un archivo de datos con un sondeo liviano del formato en lugar de un lector de pandas.
+
+    Los formatos binarios se verifican por sus bytes mágicos, los xlsx por
+    el directorio central del zip y un parseo incremental de las primeras
+    filas de la primera hoja, los CSV por sus primeras líneas y los JSON con
+    un parseo incremental de los primeros registros.
+
+    Parameters:
+    -----------
+    ruta_archivo : Path
+        Ruta al archivo a validar
+    filas : int
+        Número de filas de datos parseadas
+
+    Returns:
+    --------
+    Dict : Reporte de validación (mismas claves que validar_integridad_archivo; filas y
+           columnas quedan en 0 para los formatos verificados solo por sus bytes mágicos)
+    """
+    reporte = _reporte_integridad(ruta_archivo)
+    if reporte['errores']:
+        return reporte
+
+    extension = reporte['extension']
+    try:
+        with open(ruta_archivo, 'rb') as f:
+            cabecera = f.read(max(len(magia) for magia in BYTES_MAGICOS_INTEGRIDAD.values()))
+            magia = BYTES_MAGICOS_INTEGRIDAD.get(extension)
+            if magia and not cabecera.startswith(magia):
+                raise ValueError(f"No es un archivo {extension} (bytes mágicos inesperados)")
+            if extension in MAGIA_FINAL_INTEGRIDAD:
+                f.seek(-len(magia), os.SEEK_END)
+                if f.read() != magia:
+                    raise ValueError("Archivo truncado (faltan los bytes mágicos finales)")
+
+        if extension == '.xlsx':
+            reporte['filas'], reporte['columnas'] = _sondear_xlsx(ruta_archivo, filas)
+        elif extension == '.csv':
+            reporte['filas'], reporte['columnas'] = _sondear_csv(ruta_archivo, filas)
+        elif extension in ['.json', '.jsonl', '.ndjson']:
+            reporte['filas'], reporte['columnas'] = _sondear_json(ruta_archivo, filas)
+        elif extension not in BYTES_MAGICOS_INTEGRIDAD:
+            reporte['errores'].append(f"Formato no soportado: {extension}")
+            return reporte
+
+        reporte['legible'] = True
+
+    except Exception as e:
+        reporte['errores'].append(f"Error leyendo archivo: {str(e)}")
+
+    return reporte
+
+
+def escanear_integridad(directorio: Path, ruta_indice: Optional[Path] = None, max_workers: Optional[int] = None,
+                        filas: int = FILAS_SONDEO_INTEGRIDAD) -> Dict:
+    """
+    Valida concurrentemente todos los archivos de un directorio con sondear_integridad_archivo.
+
+    Cada archivo se resume con un checksum (SHA-256) y los checksums se
+    guardan con los reportes en ruta_indice. En un nuevo escaneo, los
+    archivos con tamaño y mtime sin cambios se omiten sin leerlos, y los
+    archivos con el mismo checksum no se vuelven a sondear.
+
+    Parameters:
+    -----------
+    directorio : Path
+        Directorio a escanear (incluye subdirectorios)
+    ruta_indice : Path, opcional
+        Archivo JSON donde se conservan checksums y reportes entre escaneos
+    max_workers : int, opcional
+        Número de hilos (por defecto el del ejecutor)
+    filas : int
+        Número de filas de datos parseadas por archivo
+
+    Returns:
+    --------
+    Dict : Reporte por ruta relativa y un resumen con conteos y rendimiento
+    """
+    directorio = Path(directorio)
+    inicio = time.perf_counter()
+    anteriores = _cargar_indice_integridad(ruta_indice, directorio) if ruta_indice else {}
+
+    entradas = {}
+    resumen = {'archivos': 0, 'validos': 0, 'invalidos': 0, 'omitidos': 0, 'sondeados': 0,
+               'bytes': 0, 'bytes_hasheados': 0}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futuros = {pool.submit(_escanear_integridad_archivo, directorio / relativo, stat,
+                               anteriores.get(relativo), filas): relativo
+                   for relativo, stat in _recorrer_archivos(directorio)}
+        for futuro in as_completed(futuros):
+            relativo = futuros[futuro]
+            entrada, hasheado, sondeado = futuro.result()
+            entradas[relativo] = entrada
+            resumen['archivos'] += 1
+            resumen['bytes'] += entrada['tamaño']
+            if hasheado:
+                resumen['bytes_hasheados'] += entrada['tamaño']
+            if sondeado:
+                resumen['sondeados'] += 1
+            else:
+                resumen['omitidos'] += 1
+            if entrada['reporte']['legible'] and not entrada['reporte']['errores']:
+                resumen['validos'] += 1
+            else:
+                resumen['invalidos'] += 1
+
+    if ruta_indice:
+        try:
+            Path(ruta_indice).parent.mkdir(parents=True, exist_ok=True)
+            with _escritura_atomica(ruta_indice) as ruta_temporal:
+                with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                    json.dump({'version': VERSION_INDICE_INTEGRIDAD, 'directorio': str(directorio),
+                               'archivos': entradas}, f)
+        except OSError as e:
+            logger.warning("No se pudo guardar el índice de integridad: %s", e)
+
+    transcurrido = time.perf_counter() - inicio
+    resumen['segundos'] = round(transcurrido, 3)
+    resumen['archivos_por_segundo'] = round(resumen['archivos'] / transcurrido, 1) if transcurrido else 0.0
+    resumen['mb_por_segundo'] = round(resumen['bytes'] / 1024**2 / transcurrido, 2) if transcurrido else 0.0
+
+    logger.info("Escaneo de integridad de %s: %s/%s válidos, %s sin cambios, %s archivos/s",
+                directorio, resumen['validos'], resumen['archivos'], resumen['omitidos'],
+                resumen['archivos_por_segundo'])
+    return {
+        'directorio': str(directorio),
+        'archivos': {relativo: entradas[relativo]['reporte'] for relativo in sorted(entradas)},
+        'resumen': resumen
+    }
+
+
+def _reporte_integridad(ruta_archivo: Path) -> Dict:
+    """Crea un reporte de validación, con un error si la ruta no es un archivo no vacío."""
+    ruta_archivo = Path(ruta_archivo)
+    try:
+        stat = ruta_archivo.stat()
+    except OSError:
+        stat = None
+
+    reporte = {
+        'archivo': str(ruta_archivo),
+        'existe': stat is not None,
+        'es_archivo': stat is not None and ruta_archivo.is_file(),
+        'tamaño_bytes': stat.st_size if stat else 0,
+        'extension': ruta_archivo.suffix.lower(),
+        'legible': False,
+        'filas': 0,
+        'columnas': 0,
+        'errores': []
+    }
+
+    if not reporte['existe']:
+        reporte['errores'].append("Archivo no existe")
+    elif not reporte['es_archivo']:
+        reporte['errores'].append("La ruta no apunta a un archivo")
+    elif reporte['tamaño_bytes'] == 0:
+        reporte['errores'].append("Archivo vacío")
+    return reporte
+
+
+def _sondear_xlsx(ruta_archivo: Path, filas: int) -> Tuple[int, int]:
+    """Verifica el directorio central del zip de un xlsx y parsea las primeras filas de su primera hoja."""
+    try:
+        with zipfile.ZipFile(ruta_archivo) as archivo:
+            nombres = set(archivo.namelist())
+            faltantes = [nombre for nombre in ['[Content_Types].xml', 'xl/workbook.xml'] if nombre not in nombres]
+            if faltantes:
+                raise ValueError(f"No es un libro xlsx (falta {', '.join(faltantes)})")
+            hojas = sorted(nombre for nombre in nombres
+                           if nombre.startswith('xl/worksheets/') and nombre.endswith('.xml'))
+            if not hojas:
+                raise ValueError("El libro no tiene hojas")
+            hoja = 'xl/worksheets/sheet1.xml' if 'xl/worksheets/sheet1.xml' in nombres else hojas[0]
+
+            # Solo se descomprimen y parsean las primeras filas
+            filas_hoja = 0
+            columnas = 0
+            with archivo.open(hoja) as flujo:
+                for _, elemento in ElementTree.iterparse(flujo):
+                    if elemento.tag.endswith('}row'):
+                        if filas_hoja == 0:
+                            columnas = sum(1 for celda in elemento if celda.tag.endswith('}c'))
+                        filas_hoja += 1
+                        elemento.clear()
+                        if filas_hoja > filas:
+                            break
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Contenedor zip corrupto: {str(e)}")
+    except ElementTree.ParseError as e:
+        raise ValueError(f"XML de la hoja corrupto: {str(e)}")
+    # La primera fila es el encabezado
+    return max(filas_hoja - 1, 0), columnas
+
+
+def _sondear_csv(ruta_archivo: Path, filas: int) -> Tuple[int, int]:
+    """Parsea las primeras líneas de un archivo CSV con su dialecto detectado."""
+    dialecto = detectar_dialecto_csv(ruta_archivo)
+    with open(ruta_archivo, 'r', encoding=dialecto['encoding'], newline='') as f:
+        lector = csv.reader(f, delimiter=dialecto['delimitador'], quotechar=dialecto['comillas'])
+        encabezado = next(lector, [])
+        columnas = len(encabezado)
+        filas_datos = 0 if dialecto['tiene_encabezado'] else 1
+        for fila in lector:
+            if filas_datos >= filas:
+                break
+            if len(fila) > columnas:
+                raise ValueError(f"Se esperaban {columnas} campos en la línea {lector.line_num}, hay {len(fila)}")
+            filas_datos += 1
+    return filas_datos, columnas
+
+
+def _sondear_json(ruta_archivo: Path, filas: int) -> Tuple[int, int]:
+    """
+    Parsea los primeros registros de un arreglo JSON o de un archivo JSON lines sin cargar el archivo completo.
+
+    El primer carácter decide el formato antes de parsear nada, y se decodifican
+    como máximo `filas` registros; solo un objeto de primer nivel (el orient por
+    defecto de pandas) debe parsearse completo.
+    """
+    decodificador = json.JSONDecoder()
+    with open(ruta_archivo, 'r', encoding='utf-8') as f:
+        buffer = f.read(BYTES_MUESTRA_CSV).lstrip()
+        if not buffer.startswith('['):
+            if ruta_archivo.suffix.lower() in ['.jsonl', '.ndjson'] or _es_json_lines(ruta_archivo):
+                registros = []
+                f.seek(0)
+                for linea in f:
+                    if linea.strip():
+                        registros.append(json.loads(linea))
+                        if len(registros) == filas:
+                            break
+                return len(registros), len(registros[0]) if registros and isinstance(registros[0], dict) else 0
+
+            # Un objeto de primer nivel (p. ej. el orient por defecto de pandas) debe parsearse completo
+            documento = json.loads(buffer + f.read())
+            if not isinstance(documento, dict):
+                raise ValueError("El valor JSON de primer nivel no es un arreglo ni un objeto")
+            primero = next(iter(documento.values()), None)
+            return min(len(primero), filas) if isinstance(primero, (dict, list)) else 0, len(documento)
+
+        # Decodificar un elemento del arreglo a la vez, leyendo más texto solo cuando un elemento queda cortado
+        registros = []
+        posicion = 1
+        completo = False
+        while len(registros) < filas:
+            while posicion < len(buffer) and buffer[posicion] in ' \t\r\n,':
+                posicion += 1
+            if posicion < len(buffer) and buffer[posicion] == ']':
+                break
+            try:
+                registro, posicion = decodificador.raw_decode(buffer, posicion)
+                registros.append(registro)
+            except json.JSONDecodeError:
+                if completo:
+                    raise
+                mas = f.read(BYTES_MUESTRA_CSV)
+                completo = not mas
+                buffer = buffer[posicion:] + mas
+                posicion = 0
+    return len(registros), len(registros[0]) if registros and isinstance(registros[0], dict) else 0
+
+
+def _cargar_indice_integridad(ruta_indice: Path, directorio: Path) -> Dict:
+    """Carga las entradas de un índice de integridad, o un dict vacío si falta, está desactualizado o es de otro directorio."""
+    try:
+        with open(ruta_indice, 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if indice.get('version') != VERSION_INDICE_INTEGRIDAD or indice.get('directorio') != str(directorio):
+        return {}
+    return indice.get('archivos', {})
+
+
+def _escanear_integridad_archivo(ruta_archivo: Path, stat: os.stat_result, anterior: Optional[Dict],
+                                 filas: int) -> Tuple[Dict, bool, bool]:
+    """
+    Valida un archivo de un escaneo de integridad.
+
+    Retorna la entrada del índice y si el archivo se hasheó y se sondeó.
+    """
+    entrada = {'tamaño': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if anterior and anterior['tamaño'] == entrada['tamaño'] and anterior['mtime_ns'] == entrada['mtime_ns']:
+        return anterior, False, False
+
+    try:
+        hasher = hashlib.sha256()
+        with open(ruta_archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(BYTES_BLOQUE_BACKUP), b''):
+                hasher.update(bloque)
+        entrada['hash'] = hasher.hexdigest()
+    except OSError as e:
+        entrada['hash'] = None
+        entrada['reporte'] = _reporte_integridad(ruta_archivo)
+        entrada['reporte']['errores'].append(f"Error leyendo archivo: {str(e)}")
+        return entrada, False, True
+
+    if anterior and anterior.get('hash') == entrada['hash']:
+        return {**entrada, 'reporte': anterior['reporte']}, True, False
+
+    entrada['reporte'] = sondear_integridad_archivo(ruta_archivo, filas)
+    return entrada, True, True
+
+
 if __name__ == "__main__":
     # Código de prueba
     print("🧪 Probando módulo FileManager...")
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+instrumentation.py
+==================
+
+Instrumentación de tiempos y perfilado para los módulos de helpers.
+
+Las operaciones decoradas con @instrumentado() (o envueltas en medir())
+registran el tiempo de reloj, el tiempo de CPU, el RSS pico, el pico de
+tracemalloc, las filas y los bytes de cada llamada en un registro en
+proceso, que se puede exportar como JSON o en el formato de texto de
+Prometheus. La instrumentación está apagada hasta llamar a habilitar();
+mientras está apagada una función decorada solo paga la revisión de un flag.
+
+Uso:
+    import instrumentation
+    instrumentation.habilitar(trazar_memoria=True)
+    ...
+    print(instrumentation.REGISTRO.a_prometheus())
+
+Autor: Tu nombre
+Fecha: {fecha_actual}
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Prefijo de las métricas exportadas a Prometheus
+PREFIJO_PROMETHEUS = "proyecto_operacion"
+
+# Estadísticas exportadas: (nombre, tipo de Prometheus, texto de ayuda)
+METRICAS_INSTRUMENTACION = [
+    ('llamadas', 'counter', "Llamadas de la operación"),
+    ('errores', 'counter', "Llamadas que lanzaron una excepción"),
+    ('segundos_reloj', 'counter', "Tiempo de reloj dentro de la operación"),
+    ('segundos_reloj_max', 'gauge', "Llamada más lenta de la operación"),
+    ('segundos_cpu', 'counter', "Tiempo de CPU del proceso durante la operación"),
+    ('filas', 'counter', "Filas procesadas por la operación"),
+    ('bytes', 'counter', "Bytes procesados por la operación"),
+    ('bytes_rss_pico', 'gauge', "Memoria residente pico del proceso después de una llamada"),
+    ('bytes_crecimiento_rss_max', 'gauge', "Mayor crecimiento de la memoria residente pico durante una llamada"),
+    ('bytes_pico_trazado_max', 'gauge', "Mayor pico de tracemalloc sobre la memoria en uso al iniciar una llamada")
+]
+
+# Estado de la instrumentación: si se registran las llamadas y si se usa tracemalloc
+_habilitada = False
+_trazar_memoria = False
+_pilas = threading.local()  # Mediciones abiertas de cada hilo (para los picos de tracemalloc anidados)
+
+
+class Measurement:
+    """
+    Una llamada que se está midiendo. El código medido puede asignar filas
+    y bytes (ej: dentro de un bloque medir()) cuando no se toman de su resultado.
+    """
+
+    __slots__ = ['nombre', 'filas', 'bytes', 'piso_trazado']
+
+    def __init__(self, nombre: str, filas: Optional[int] = None, bytes: Optional[int] = None):
+        self.nombre = nombre
+        self.filas = filas
+        self.bytes = bytes
+        self.piso_trazado = 0  # Pico de tracemalloc de las llamadas anidadas, que reinician el pico
+
+
+# Entregada por medir() cuando la instrumentación está deshabilitada
+_MEDICION_NULA = Measurement("")
+
+
+class InstrumentationRegistry:
+    """
+    Agregado seguro entre hilos de las mediciones de cada operación.
+
+    Los tiempos, filas y bytes se suman por operación; los valores de memoria
+    conservan su máximo. Las llamadas hechas en procesos workers (ej: por
+    FileManager.cargar_varios con un pool de procesos) se registran en el
+    registro de esos procesos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operaciones = {}
+
+    def registrar(self, nombre: str, segundos_reloj: float, segundos_cpu: float, error: bool = False,
+                  filas: Optional[int] = None, bytes: Optional[int] = None, bytes_rss_pico: Optional[int] = None,
+                  bytes_crecimiento_rss: Optional[int] = None, bytes_pico_trazado: Optional[int] = None):
+        """Agrega una llamada a las estadísticas de una operación."""
+        with self._lock:
+            estadisticas = self._operaciones.get(nombre)
+            if estadisticas is None:
+                estadisticas = self._operaciones[nombre] = {metrica: 0 for metrica, _, _ in METRICAS_INSTRUMENTACION}
+            estadisticas['llamadas'] += 1
+            estadisticas['errores'] += int(error)
+            estadisticas['segundos_reloj'] += segundos_reloj
+            estadisticas['segundos_reloj_max'] = max(estadisticas['segundos_reloj_max'], segundos_reloj)
+            estadisticas['segundos_cpu'] += segundos_cpu
+            estadisticas['filas'] += filas or 0
+            estadisticas['bytes'] += bytes or 0
+            estadisticas['bytes_rss_pico'] = max(estadisticas['bytes_rss_pico'], bytes_rss_pico or 0)
+            estadisticas['bytes_crecimiento_rss_max'] = max(estadisticas['bytes_crecimiento_rss_max'],
+                                                            bytes_crecimiento_rss or 0)
+            estadisticas['bytes_pico_trazado_max'] = max(estadisticas['bytes_pico_trazado_max'],
+                                                         bytes_pico_trazado or 0)
+
+    def instantanea(self) -> Dict[str, Dict]:
+        """Retorna una copia de las estadísticas por nombre de operación."""
+        with self._lock:
+            return {nombre: dict(estadisticas) for nombre, estadisticas in sorted(self._operaciones.items())}
+
+    def reiniciar(self):
+        """Descarta todas las llamadas registradas."""
+        with self._lock:
+            self._operaciones.clear()
+
+    def a_json(self, ruta: Optional[Path] = None) -> str:
+        """
+        Exporta las estadísticas como JSON.
+
+        Parameters:
+        -----------
+        ruta : Path, optional
+            Archivo donde también se escribe el documento
+
+        Returns:
+        --------
+        str : Documento JSON con la fecha de generación y las estadísticas por operación
+        """
+        documento = json.dumps({
+            'generado_en': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'trazar_memoria': _trazar_memoria,
+            'operaciones': self.instantanea()
+        }, indent=2, ensure_ascii=False)
+        if ruta is not None:
+            Path(ruta).write_text(documento, encoding='utf-8')
+        return documento
+
+    def a_prometheus(self, ruta: Optional[Path] = None) -> str:
+        """
+        Exporta las estadísticas en el formato de texto de Prometheus, una
+        métrica por estadística etiquetada por operación.
+
+        Parameters:
+        -----------
+        ruta : Path, optional
+            Archivo donde también se escribe el texto (ej: para el textfile collector de node_exporter)
+
+        Returns:
+        --------
+        str : Métricas en formato de texto de Prometheus
+        """
+        operaciones = self.instantanea()
+        lineas = []
+        for metrica, tipo_metrica, texto_ayuda in METRICAS_INSTRUMENTACION:
+            nombre_completo = f"{PREFIJO_PROMETHEUS}_{metrica}" + ("_total" if tipo_metrica == 'counter' else "")
+            lineas.append(f"# HELP {nombre_completo} {texto_ayuda}")
+            lineas.append(f"# TYPE {nombre_completo} {tipo_metrica}")
+            for nombre, estadisticas in operaciones.items():
+                lineas.append(f'{nombre_completo}{{operacion="{_escapar_etiqueta(nombre)}"}} {estadisticas[metrica]}')
+        texto = "\n".join(lineas) + "\n"
+        if ruta is not None:
+            Path(ruta).write_text(texto, encoding='utf-8')
+        return texto
+
+
+# Registro en el que escriben instrumentado() y medir()
+REGISTRO = InstrumentationRegistry()
+
+
+def habilitar(trazar_memoria: bool = False):
+    """
+    Empieza a registrar las llamadas instrumentadas.
+
+    Parameters:
+    -----------
+    trazar_memoria : bool
+        Si también se trazan las asignaciones de Python con tracemalloc, que
+        reporta la memoria pico de cada llamada pero hace más lentas las asignaciones
+    """
+    global _habilitada, _trazar_memoria
+    if trazar_memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _trazar_memoria = trazar_memoria
+    _habilitada = True
+    logger.info("Instrumentación habilitada (tracemalloc: %s)", trazar_memoria)
+
+
+def deshabilitar():
+    """Deja de registrar las llamadas instrumentadas (las estadísticas registradas se conservan)."""
+    global _habilitada, _trazar_memoria
+    if _trazar_memoria and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _habilitada = False
+    _trazar_memoria = False
+
+
+def esta_habilitada() -> bool:
+    """Verifica si se están registrando las llamadas instrumentadas."""
+    return _habilitada
+
+
+@contextmanager
+def medir(nombre: str, filas: Optional[int] = None, bytes: Optional[int] = None) -> Iterator[Measurement]:
+    """
+    Mide un bloque de código como una llamada de una operación.
+
+    El tiempo de CPU es el de todo el proceso, así que incluye el trabajo
+    que hagan otros hilos al mismo tiempo. El pico de tracemalloc solo se
+    mide si la instrumentación se habilitó con trazar_memoria=True.
+
+    Parameters:
+    -----------
+    nombre : str
+        Nombre de la operación
+    filas : int, optional
+        Filas procesadas (también se pueden asignar en la medición entregada)
+    bytes : int, optional
+        Bytes procesados (también se pueden asignar en la medición entregada)
+
+    Returns:
+    --------
+    Iterator[Measurement] : Medición del bloque
+    """
+    if not _habilitada:
+        yield _MEDICION_NULA
+        return
+
+    medicion = Measurement(nombre, filas, bytes)
+    trazar_memoria = _trazar_memoria and tracemalloc.is_tracing()
+    pila = _pila_mediciones()
+    if trazar_memoria:
+        trazado_antes, pico_trazado = tracemalloc.get_traced_memory()
+        if pila:
+            # Reiniciar el pico lo oculta a la llamada que contiene a esta, así que se conserva ahí
+            pila[-1].piso_trazado = max(pila[-1].piso_trazado, pico_trazado)
+        tracemalloc.reset_peak()
+    pila.append(medicion)
+    rss_antes = _bytes_rss_pico()
+    inicio_cpu = time.process_time()
+    inicio = time.perf_counter()
+    error = False
+    try:
+        yield medicion
+    except BaseException:
+        error = True
+        raise
+    finally:
+        segundos_reloj = time.perf_counter() - inicio
+        segundos_cpu = time.process_time() - inicio_cpu
+        pila.pop()
+        bytes_pico_trazado = None
+        if trazar_memoria:
+            pico_trazado = max(tracemalloc.get_traced_memory()[1], medicion.piso_trazado)
+            bytes_pico_trazado = max(pico_trazado - trazado_antes, 0)
+            if pila:
+                pila[-1].piso_trazado = max(pila[-1].piso_trazado, pico_trazado)
+        rss_despues = _bytes_rss_pico()
+        REGISTRO.registrar(nombre, segundos_reloj, segundos_cpu, error, medicion.filas, medicion.bytes,
+                           bytes_rss_pico=rss_despues,
+                           bytes_crecimiento_rss=rss_despues - rss_antes if rss_despues is not None else None,
+                           bytes_pico_trazado=bytes_pico_trazado)
+
+
+def instrumentado(nombre: Optional[str] = None,
+                  contador: Optional[Callable] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorador que mide cada llamada de una función con medir().
+
+    Las filas y los bytes se toman del resultado cuando es un DataFrame
+    (filas y memoria superficial), un dict de DataFrames o la ruta de un
+    archivo (tamaño en disco); si no, del primer argumento DataFrame.
+    Mientras la instrumentación está deshabilitada la función se llama directamente.
+
+    Parameters:
+    -----------
+    nombre : str, optional
+        Nombre de la operación (por defecto el nombre calificado de la función)
+    contador : callable, optional
+        contador(resultado, args, kwargs) -> (filas, bytes), en lugar del conteo por defecto
+
+    Returns:
+    --------
+    Callable : Decorador
+    """
+    def decorador(funcion):
+        operacion = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _habilitada:
+                return funcion(*args, **kwargs)
+            with medir(operacion) as medicion:
+                resultado = funcion(*args, **kwargs)
+                conteo = contador(resultado, args, kwargs) if contador is not None else _contar(resultado, args)
+                medicion.filas, medicion.bytes = conteo
+            return resultado
+
+        return envoltura
+
+    return decorador
+
+
+def _contar(resultado, args: Tuple) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (filas, bytes) por defecto de una llamada: los de su resultado (el primer
+    elemento si es una tupla) cuando es un DataFrame, un dict de DataFrames o
+    la ruta de un archivo, completando lo que falte con su primer argumento DataFrame.
+    """
+    filas = tamaño = None
+    if isinstance(resultado, tuple) and resultado:
+        resultado = resultado[0]
+    if isinstance(resultado, dict) and resultado and all(_es_dataframe(valor) for valor in resultado.values()):
+        conteos = [_contar_dataframe(valor) for valor in resultado.values()]
+        filas, tamaño = sum(filas for filas, _ in conteos), sum(tamaño for _, tamaño in conteos)
+    elif _es_dataframe(resultado):
+        filas, tamaño = _contar_dataframe(resultado)
+    elif isinstance(resultado, (Path, str)):
+        try:
+            tamaño = os.stat(resultado).st_size
+        except (OSError, ValueError):
+            pass
+
+    if filas is None:
+        df = next((valor for valor in args if _es_dataframe(valor)), None)
+        if df is not None:
+            filas, tamaño_df = _contar_dataframe(df)
+            tamaño = tamaño_df if tamaño is None else tamaño
+    return filas, tamaño
+
+
+def _es_dataframe(valor) -> bool:
+    """Verifica si un valor es un DataFrame sin importar pandas."""
+    return hasattr(valor, 'memory_usage') and hasattr(valor, 'columns') and getattr(valor, 'ndim', 0) == 2
+
+
+def _contar_dataframe(df) -> Tuple[int, int]:
+    """
+    Filas y memoria superficial de un DataFrame, sumada desde sus arrays de columnas
+    (df.memory_usage construye una Series por llamada y la memoria profunda mide cada string).
+    """
+    arrays = getattr(getattr(df, '_mgr', None), 'arrays', None)
+    if arrays is None:
+        return len(df), int(df.memory_usage(index=True, deep=False).sum())
+    return len(df), int(df.index.nbytes + sum(getattr(array, 'nbytes', 0) for array in arrays))
+
+
+def _pila_mediciones() -> list:
+    """Mediciones abiertas del hilo actual."""
+    pila = getattr(_pilas, 'pila', None)
+    if pila is None:
+        pila = _pilas.pila = []
+    return pila
+
+
+def _bytes_rss_pico() -> Optional[int]:
+    """
+    Memoria residente pico del proceso en bytes, desde resource en Unix o
+    psutil en Windows (None si ninguno está disponible).
+    """
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta kilobytes, macOS bytes
+        return pico if sys.platform == 'darwin' else pico * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    return None
+
+
+def _escapar_etiqueta(valor: str) -> str:
+    """Escapa el valor de una etiqueta de Prometheus."""
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+if __name__ == "__main__":
+    # Ejemplo de uso
+    logging.basicConfig(level=logging.INFO)
+    habilitar(trazar_memoria=True)
+
+    @instrumentado()
+    def construir_tabla(tamaño):
+        return [list(range(100)) for _ in range(tamaño)]
+
+    for tamaño in [1_000, 10_000]:
+        construir_tabla(tamaño)
+    with medir("pausa") as medicion:
+        time.sleep(0.05)
+        medicion.filas = 1
+
+    print(REGISTRO.a_json())
+    print(REGISTRO.a_prometheus())
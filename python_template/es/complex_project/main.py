@@ -20,8 +20,12 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "helpers"))
 
 # Importaciones estándar
-from datetime import datetime
+from datetime import datetime, timedelta
+import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 
 # Importaciones de terceros (descomenta según necesites)
 # import pandas as pd
@@ -32,26 +36,163 @@ import logging
 # from helpers.data_processor import DataProcessor
 # from helpers.file_manager import FileManager
 
+# Instrumentación de tiempos de los helpers (solo biblioteca estándar)
+import instrumentation
+
+# Archivos de log: tamaño al que se rota el archivo diario y archivos rotados conservados por día
+BYTES_MAX_LOG = 50 * 1024 * 1024
+ARCHIVOS_ROTADOS_LOG = 5
+
+# Hilo en segundo plano que escribe los registros de log encolados (ver configurar_logging)
+_listener_log = None
+
+# Instrumentación de los helpers: variables de entorno que la activan y formatos de reporte
+VARIABLE_INSTRUMENTAR = "PROYECTO_INSTRUMENTAR"  # 'json' o 'prometheus' ('1' significa json)
+VARIABLE_TRAZAR_MEMORIA = "PROYECTO_TRAZAR_MEMORIA"
+FORMATOS_INSTRUMENTACION = ['json', 'prometheus']
+
+class DailyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Escribe en <directorio_log>/proyecto_YYYYMMDD.log, cambiando a un archivo nuevo
+    a medianoche y rotando el actual (.1, .2, ...) cuando alcanza max_bytes.
+    """
+
+    def __init__(self, directorio_log, prefijo="proyecto", max_bytes=BYTES_MAX_LOG,
+                 archivos_rotados=ARCHIVOS_ROTADOS_LOG):
+        self.directorio_log = Path(directorio_log)
+        self.prefijo = prefijo
+        self._iniciar_dia(datetime.now().date())
+        super().__init__(self.baseFilename, maxBytes=max_bytes, backupCount=archivos_rotados,
+                         encoding='utf-8', delay=True)
+
+    def _iniciar_dia(self, dia):
+        """Apunta el manejador al archivo del día indicado."""
+        self.dia = dia
+        self.baseFilename = os.path.abspath(self.directorio_log / f"{self.prefijo}_{dia.strftime('%Y%m%d')}.log")
+        self.siguiente_dia_en = datetime.combine(dia + timedelta(days=1), datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record):
+        if record.created >= self.siguiente_dia_en:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        hoy = datetime.now().date()
+        if hoy == self.dia:
+            super().doRollover()
+            return
+        # Día nuevo: cerrar el archivo del día anterior y empezar el de hoy
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self._iniciar_dia(hoy)
+
 def configurar_logging():
     """
     Configura el sistema de logging para el proyecto.
     Los logs se guardan en la carpeta data/logs/
+
+    Los loggers solo ponen los registros en una cola; un hilo en segundo
+    plano los escribe en el archivo de log diario y en la consola, así las
+    llamadas de logging nunca esperan la E/S de disco o terminal. La cola
+    se vacía al terminar el programa.
     """
+    global _listener_log
+    if _listener_log is not None:
+        return logging.getLogger(__name__)
+
     # Crear directorio de logs si no existe
     log_dir = Path("data/logs")
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    # Configurar logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_dir / f"proyecto_{datetime.now().strftime('%Y%m%d')}.log"),
-            logging.StreamHandler()
-        ]
-    )
+    formato = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    manejador_archivo = DailyRotatingFileHandler(log_dir)
+    manejador_consola = logging.StreamHandler()
+    for manejador in (manejador_archivo, manejador_consola):
+        manejador.setFormatter(formato)
+
+    # Configurar logging (el manejador de la cola conserva el mensaje; los manejadores del listener le dan formato)
+    cola_log = queue.SimpleQueue()
+    manejador_cola = logging.handlers.QueueHandler(cola_log)
+    manejador_cola.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[manejador_cola])
+    _listener_log = logging.handlers.QueueListener(cola_log, manejador_archivo, manejador_consola,
+                                                   respect_handler_level=True)
+    _listener_log.start()
+    atexit.register(detener_logging)
     return logging.getLogger(__name__)
 
+def detener_logging():
+    """
+    Escribe los registros que quedan en la cola y cierra los manejadores de log.
+    Se ejecuta automáticamente al salir.
+    """
+    global _listener_log
+    if _listener_log is None:
+        return
+    _listener_log.stop()
+    for manejador in _listener_log.handlers:
+        manejador.close()
+    _listener_log = None
+
+def configurar_instrumentacion(formato_reporte=None, trazar_memoria=False):
+    """
+    Activa la instrumentación de tiempos de los helpers si se pidió con
+    --instrumentar o con la variable de entorno PROYECTO_INSTRUMENTAR.
+    El reporte se escribe en data/logs/ al terminar el programa.
+
+    Parameters:
+    -----------
+    formato_reporte : str, optional
+        'json' o 'prometheus' (por defecto el de la variable de entorno; None la deja apagada)
+    trazar_memoria : bool
+        Si también se miden los picos de memoria con tracemalloc (o PROYECTO_TRAZAR_MEMORIA=1)
+
+    Returns:
+    --------
+    str : Formato del reporte, o None si la instrumentación queda apagada
+    """
+    if formato_reporte is None:
+        valor = os.environ.get(VARIABLE_INSTRUMENTAR, "").strip().lower()
+        if valor in ['', '0', 'false', 'no', 'off']:
+            return None
+        formato_reporte = valor if valor in FORMATOS_INSTRUMENTACION else 'json'
+    trazar_memoria = trazar_memoria or os.environ.get(VARIABLE_TRAZAR_MEMORIA, "") == "1"
+
+    instrumentation.habilitar(trazar_memoria=trazar_memoria)
+    atexit.register(escribir_reporte_instrumentacion, formato_reporte)
+    return formato_reporte
+
+def escribir_reporte_instrumentacion(formato_reporte="json"):
+    """
+    Escribe las estadísticas de la instrumentación en data/logs/instrumentacion_YYYYMMDD_HHMMSS.json
+    (o .prom para el formato de texto de Prometheus).
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    directorio_log = Path("data/logs")
+    directorio_log.mkdir(parents=True, exist_ok=True)
+    if formato_reporte == 'prometheus':
+        ruta_reporte = directorio_log / f"instrumentacion_{timestamp}.prom"
+        instrumentation.REGISTRO.a_prometheus(ruta_reporte)
+    else:
+        ruta_reporte = directorio_log / f"instrumentacion_{timestamp}.json"
+        instrumentation.REGISTRO.a_json(ruta_reporte)
+    logging.getLogger(__name__).info("Reporte de instrumentación guardado: %s", ruta_reporte)
+    return ruta_reporte
+
+def leer_argumentos(argv=None):
+    """
+    Lee las opciones de línea de comandos del programa.
+    """
+    parser = argparse.ArgumentParser(description="Mi Proyecto Python Completo")
+    parser.add_argument('--instrumentar', nargs='?', const='json', choices=FORMATOS_INSTRUMENTACION,
+                        help="Mide los tiempos de los helpers y escribe un reporte en data/logs/ "
+                             f"(igual que {VARIABLE_INSTRUMENTAR}=json|prometheus)")
+    parser.add_argument('--trazar-memoria', action='store_true',
+                        help="También mide los picos de memoria con tracemalloc, más lento "
+                             f"(igual que {VARIABLE_TRAZAR_MEMORIA}=1)")
+    return parser.parse_args(argv)
+
 def verificar_estructura_proyecto():
     """
     Verifica que todas las carpetas necesarias existan.
@@ -135,10 +276,15 @@ def main():
     Función principal del programa.
     Coordina todas las operaciones del proyecto.
     """
+    args = leer_argumentos()
+
     # Configurar logging
     logger = configurar_logging()
     logger.info("Iniciando aplicación")
 
+    # Instrumentación de tiempos (apagada salvo que se pida)
+    configurar_instrumentacion(args.instrumentar, args.trazar_memoria)
+
     # Mostrar información
     mostrar_info_proyecto()
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_resumen.py
+====================
+
+Benchmark de data_processor.crear_resumen_ejecutivo.
+
+Compara el motor numérico vectorizado con el bucle anterior por columna
+sobre un DataFrame sintético ancho y verifica que ambos produzcan las
+mismas estadísticas.
+
+Uso:
+    python scripts/benchmark_resumen.py --filas 1000000 --columnas 200
+
+Autor: Tu nombre
+Fecha: {fecha_actual}
+"""
+
+import argparse
+import numbers
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio helpers al path para importar módulos personalizados
+sys.path.append(str(Path(__file__).parent.parent / "helpers"))
+
+from data_processor import crear_resumen_ejecutivo, _resumir_columnas_numericas
+
+
+def resumen_ejecutivo_por_columna(df, columnas_numericas):
+    """
+    Implementación de referencia: el resumen anterior, con un juego de
+    reducciones de pandas por columna numérica y los nulos recalculados en cada sección.
+    """
+    return {
+        'calidad_datos': {
+            'valores_nulos_total': df.isnull().sum().sum(),
+            'filas_duplicadas': df.duplicated().sum(),
+            'completitud_porcentaje': ((df.size - df.isnull().sum().sum()) / df.size) * 100
+        },
+        'columnas_numericas': estadisticas_numericas_por_columna(df, columnas_numericas)
+    }
+
+
+def estadisticas_numericas_por_columna(df, columnas_numericas):
+    """
+    Sección numérica de referencia: dropna, media, desviación, mínimo, máximo y tres cuantiles por columna.
+    """
+    estadisticas = {}
+    for col in columnas_numericas:
+        serie = df[col].dropna()
+        estadisticas[col] = {
+            'count': len(serie),
+            'mean': serie.mean(),
+            'std': serie.std(),
+            'min': serie.min(),
+            'max': serie.max(),
+            'q25': serie.quantile(0.25),
+            'q50': serie.quantile(0.50),
+            'q75': serie.quantile(0.75),
+            'valores_nulos': df[col].isnull().sum()
+        }
+    return estadisticas
+
+
+def crear_datos_ejemplo(filas, columnas, semilla=42):
+    """
+    Crea un DataFrame ancho con columnas float (con nulos) y enteras.
+    """
+    rng = np.random.default_rng(semilla)
+    datos = {}
+    for i in range(columnas):
+        if i % 2 == 0:
+            valores = rng.normal(100, 15, filas)
+            valores[rng.random(filas) < 0.05] = np.nan
+            datos[f'float_{i}'] = valores
+        else:
+            datos[f'int_{i}'] = rng.integers(0, 1000, filas)
+    return pd.DataFrame(datos)
+
+
+def mismo_valor(a, b):
+    """
+    Compara dos estadísticas considerando NaN como iguales.
+
+    Las medias y desviaciones de columnas con nulos se suman en un orden
+    distinto que después de dropna(), así que pueden diferir en los últimos bits.
+    Los conteos pueden ser enteros de Python o de NumPy.
+    """
+    if pd.isna(a) and pd.isna(b):
+        return True
+    if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+        return a == b
+    if type(a) != type(b):
+        return False
+    return a == b or bool(np.isclose(a, b, rtol=1e-12, atol=0))
+
+
+def medir_tiempo(funcion, repeticiones):
+    """Retorna el mejor tiempo de varias llamadas."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de crear_resumen_ejecutivo")
+    parser.add_argument('--filas', type=int, default=200_000)
+    parser.add_argument('--columnas', type=int, default=100)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    df = crear_datos_ejemplo(args.filas, args.columnas)
+    columnas_numericas = df.columns.tolist()
+    print(f"Datos: {args.filas:,} filas × {args.columnas} columnas")
+
+    # Verificación contra la referencia por columna
+    esperado = resumen_ejecutivo_por_columna(df, columnas_numericas)
+    obtenido = crear_resumen_ejecutivo(df, columnas_numericas, [])
+    diferencias = [(col, clave) for col in columnas_numericas for clave in esperado['columnas_numericas'][col]
+                   if not mismo_valor(esperado['columnas_numericas'][col][clave],
+                                      obtenido['columnas_numericas'][col][clave])]
+    diferencias += [clave for clave in esperado['calidad_datos']
+                    if not mismo_valor(esperado['calidad_datos'][clave], obtenido['calidad_datos'][clave])]
+    if diferencias:
+        print(f"Estadísticas distintas: {diferencias[:10]}")
+        sys.exit(1)
+    print("El resultado coincide con la implementación por columna")
+
+    nulos_por_columna = df.isnull().sum()
+    tiempos = {
+        'Estadísticas numéricas': (
+            medir_tiempo(lambda: estadisticas_numericas_por_columna(df, columnas_numericas), args.repeticiones),
+            medir_tiempo(lambda: _resumir_columnas_numericas(df, columnas_numericas, nulos_por_columna),
+                         args.repeticiones)
+        ),
+        'Resumen completo': (
+            medir_tiempo(lambda: resumen_ejecutivo_por_columna(df, columnas_numericas), args.repeticiones),
+            medir_tiempo(lambda: crear_resumen_ejecutivo(df, columnas_numericas, []), args.repeticiones)
+        )
+    }
+
+    print(f"{'':24} {'por columna':>12} {'vectorizado':>12} {'mejora':>9}")
+    for nombre, (tiempo_por_columna, tiempo_vectorizado) in tiempos.items():
+        print(f"{nombre:24} {tiempo_por_columna:>11.3f}s {tiempo_vectorizado:>11.3f}s "
+              f"{tiempo_por_columna / tiempo_vectorizado:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
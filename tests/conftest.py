@@ -0,0 +1,11 @@
+"""
+Tests of the complex template helpers.
+
+The helpers modules import each other by bare name, so the English
+helpers directory is put on sys.path like main.py does.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "python_template" / "en" / "complex_project" / "helpers"))
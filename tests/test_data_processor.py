@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_processor
+from data_processor import (DuplicateCounter, StreamingSummary, clean_column_names, count_duplicate_rows,
+                            create_executive_summary, create_streaming_summary, find_column_name_collisions,
+                            measure_memory, optimize_memory, process_dates)
+
+LARGE_IDS = [2**53, 2**53 + 1, 2**60, 2**60 + 1]
+
+
+def test_large_integer_ids_are_not_duplicates():
+    df = pd.DataFrame({'id': LARGE_IDS})
+
+    assert df.duplicated().sum() == 0
+    assert count_duplicate_rows(df) == 0
+    assert DuplicateCounter().update(df).duplicate_rows() == 0
+    assert create_streaming_summary([df])['data_quality']['duplicate_rows'] == 0
+
+
+def test_large_unsigned_and_nullable_ids_are_not_duplicates():
+    unsigned = pd.DataFrame({'id': np.array([2**64 - 1, 2**64 - 2, 2**63 + 1], dtype=np.uint64)})
+    nullable = pd.DataFrame({'id': pd.array([2**62, 2**62 + 1, None], dtype='Int64')})
+
+    assert DuplicateCounter().update(unsigned).duplicate_rows() == 0
+    assert DuplicateCounter().update(nullable).duplicate_rows() == 0
+
+
+def test_integer_and_float_chunks_still_match():
+    counter = DuplicateCounter()
+    counter.update(pd.DataFrame({'id': [1, 2, 2**60]}))
+    counter.update(pd.DataFrame({'id': [1.0, 2.0, float(2**60)]}))
+
+    assert counter.duplicate_rows() == 3
+
+
+def test_text_rows_across_chunks():
+    counter = DuplicateCounter()
+    counter.update(pd.DataFrame({'name': ['a', 'b'], 'id': [1, 2]}))
+    counter.update(pd.DataFrame({'id': [2, 3], 'name': ['b', 'c']}))
+
+    assert counter.duplicate_rows() == 1
+
+
+def test_optimize_memory_keeps_integer_signedness():
+    df = pd.DataFrame({'signed': np.array([0, 5, 200], dtype=np.int64),
+                       'unsigned': np.array([0, 5, 200], dtype=np.uint64)})
+
+    optimized = optimize_memory(df, arrow_strings=False)
+    assert optimized['signed'].dtype == np.int16
+    assert optimized['unsigned'].dtype == np.uint8
+    assert (optimized['signed'] - 10).min() == -10
+
+    assert optimize_memory(df, arrow_strings=False, unsigned_integers=True)['signed'].dtype == np.uint8
+
+
+def test_executive_summary_matches_pandas_with_column_batches(monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"x{i}": rng.normal(size=1001) for i in range(5)})
+    df['n'] = rng.integers(-50, 50, 1001)
+    df.loc[::7, 'x1'] = np.nan
+    df['empty'] = np.nan
+    # Two float64 columns per batch
+    monkeypatch.setattr(data_processor, 'NUMERIC_BATCH_BYTES', 2 * 1001 * 8)
+
+    summary = create_executive_summary(df)['numeric_columns']
+    for col in df.columns:
+        series = df[col].dropna()
+        expected = [series.min(), series.max(), *series.quantile([0.25, 0.5, 0.75])]
+        actual = [summary[col][key] for key in ['min', 'max', 'q25', 'q50', 'q75']]
+        np.testing.assert_array_equal(actual, expected)
+        assert summary[col]['mean'] == pytest.approx(series.mean(), nan_ok=True)
+
+
+def test_outlier_bounds_match_pandas_with_column_batches(monkeypatch):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({f"x{i}": rng.standard_t(3, size=500) for i in range(3)})
+    df.loc[::4, 'x0'] = np.nan
+    monkeypatch.setattr(data_processor, 'NUMERIC_BATCH_BYTES', 500 * 8)
+
+    result = data_processor.detect_outliers_iqr_frame(df, output='indices')
+    for col in df.columns:
+        q1, q3 = df[col].quantile([0.25, 0.75])
+        lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        assert result['summary'].loc[col, 'lower_bound'] == lower
+        expected = np.flatnonzero(((df[col] < lower) | (df[col] > upper)).to_numpy())
+        np.testing.assert_array_equal(result['indices'][col], expected)
+
+
+def summary_frame():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({'x': rng.normal(size=1000), 'n': rng.integers(0, 10, 1000),
+                       'c': rng.choice(list('abc'), 1000)})
+    df.loc[::7, 'x'] = np.nan
+    return df
+
+
+def test_streaming_summary_matches_the_executive_summary():
+    df = summary_frame()
+    expected = create_executive_summary(df)
+    actual = create_streaming_summary(df.iloc[i:i + 128] for i in range(0, len(df), 128))
+
+    assert actual['approximation'] == {'approximate_categories': [], 'approximate_quantiles': []}
+    assert actual['data_quality'] == expected['data_quality']
+    assert actual['categorical_columns'] == expected['categorical_columns']
+    for col, stats in expected['numeric_columns'].items():
+        assert actual['numeric_columns'][col] == pytest.approx(stats)
+
+
+def test_merged_partial_summaries_match_a_single_pass():
+    df = summary_frame()
+    first, second = StreamingSummary(), StreamingSummary()
+    first.update(df.iloc[:600])
+    second.update(df.iloc[600:])
+
+    merged = first.merge(second).summary()
+    single = create_streaming_summary([df])
+    assert merged['data_quality'] == single['data_quality']
+    assert merged['numeric_columns']['x'] == pytest.approx(single['numeric_columns']['x'])
+
+
+def test_small_sketches_report_approximate_quantiles():
+    df = summary_frame()
+    summary = create_streaming_summary([df], sketch_size=64, heavy_hitters=1)
+
+    assert summary['approximation']['approximate_quantiles'] == ['x', 'n']
+    assert summary['approximation']['approximate_categories'] == ['c']
+    assert summary['numeric_columns']['x']['q50'] == pytest.approx(df['x'].median(), abs=0.2)
+    assert summary['numeric_columns']['x']['count'] == df['x'].count()
+
+
+def test_process_dates_components_match_the_datetime_accessor():
+    df = pd.DataFrame({'sale_date': ['2024-03-01', '2024-03-02', None, '2024-03-02', '2023-12-31'],
+                       'amount': [1, 2, 3, 4, 5]})
+    dates = pd.to_datetime(df['sale_date'])
+
+    processed = process_dates(df, 'sale_date')
+    assert 'sale_day_name' not in df
+    pd.testing.assert_series_equal(processed['sale_date'], dates)
+    for component in ['year', 'month', 'day', 'quarter']:
+        np.testing.assert_array_equal(processed[f"sale_{component}"], getattr(dates.dt, component))
+    assert processed['sale_day_name'].astype(object).tolist()[:2] == ['Friday', 'Saturday']
+    assert processed['sale_day_name'].isna().tolist() == dates.isna().tolist()
+    assert processed['sale_is_weekend'].tolist() == (dates.dt.weekday >= 5).tolist()
+
+
+def test_process_dates_new_columns_only_and_inplace():
+    df = pd.DataFrame({'sale_date': ['01/02/2024', '15/02/2024']})
+
+    new_columns = process_dates(df, 'sale_date', '%d/%m/%Y', components=['month', 'is_weekend'],
+                                new_columns_only=True)
+    assert list(new_columns.columns) == ['sale_month', 'sale_is_weekend']
+    assert new_columns['sale_month'].tolist() == [2, 2]
+
+    assert process_dates(df, 'sale_date', '%d/%m/%Y', components=['year'], inplace=True) is df
+    assert df['sale_year'].tolist() == [2024, 2024]
+
+    with pytest.raises(ValueError, match="Unsupported date components"):
+        process_dates(df, 'sale_date', components=['week'])
+
+
+def test_clean_column_names_normalizes_and_handles_collisions():
+    df = pd.DataFrame([[1, 2, 3, 4]], columns=[' Total Sales ', 'TOTAL  SALES', 'Año__2024', 'total_sales_2'])
+
+    assert clean_column_names(df).columns.tolist() == ['total_sales', 'total_sales', 'ao_2024', 'total_sales_2']
+    assert find_column_name_collisions(df.columns) == {'total_sales': [' Total Sales ', 'TOTAL  SALES']}
+    assert clean_column_names(df, on_collision='suffix').columns.tolist() == [
+        'total_sales', 'total_sales_3', 'ao_2024', 'total_sales_2']
+    with pytest.raises(ValueError, match="collide after cleaning"):
+        clean_column_names(df, on_collision='raise')
+
+    view = clean_column_names(df[['Año__2024']], copy_data=False)
+    assert np.shares_memory(view['ao_2024'].to_numpy(), df['Año__2024'].to_numpy())
+    assert clean_column_names(df, inplace=True, on_collision='suffix') is df
+    assert df.columns[1] == 'total_sales_3'
+
+
+def test_measure_memory_is_exact_or_sampled_and_follows_column_changes():
+    rng = np.random.default_rng(3)
+    words = np.array(['a' * n for n in range(1, 40)], dtype=object)
+    df = pd.DataFrame({'text': pd.Series(words[rng.integers(0, len(words), 20000)], dtype=object),
+                       'label': pd.Series(rng.choice(['x', 'yy'], 20000)).astype('str'),
+                       'value': rng.normal(size=20000)},
+                      index=pd.Index([f"row{i}" for i in range(20000)], dtype=object))
+
+    assert measure_memory(df, exact=True) == df.memory_usage(deep=True).sum()
+    assert measure_memory(df) == pytest.approx(df.memory_usage(deep=True).sum(), rel=0.05)
+    assert measure_memory(df, sample_size=len(df)) == df.memory_usage(deep=True).sum()
+
+    df['text'] = df['text'] + 'b' * 100
+    assert measure_memory(df, exact=True) == df.memory_usage(deep=True).sum()
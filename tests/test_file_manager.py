@@ -0,0 +1,385 @@
+import gzip
+import importlib.util
+import json
+import os
+import random
+import time
+from datetime import datetime
+from difflib import SequenceMatcher
+
+import pandas as pd
+import pytest
+
+import file_manager
+from file_manager import (FileManager, LoadCache, SimilarNameIndex, find_similar_files, probe_file_integrity,
+                          sniff_csv_dialect, write_excel_streaming)
+
+CODEC_MODULES = {'gzip': 'gzip', 'zstd': 'zstandard', 'lz4': 'lz4'}
+
+
+@pytest.mark.parametrize('format', ['csv', 'json'])
+@pytest.mark.parametrize('compression', [None, 'gzip', 'zstd', 'lz4'])
+def test_compressed_outputs_load_back(tmp_path, format, compression):
+    if compression is not None and importlib.util.find_spec(CODEC_MODULES[compression]) is None:
+        pytest.skip(f"{CODEC_MODULES[compression]} is not installed")
+
+    manager = FileManager(tmp_path)
+    df = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'ñ'], 'value': [0.5, 1.5, None]})
+    path = manager.save_dataframe(df, 'results', include_timestamp=False, format=format, compression=compression)
+
+    assert path.name == f"results.{format}" + {None: '', 'gzip': '.gz', 'zstd': '.zst', 'lz4': '.lz4'}[compression]
+    pd.testing.assert_frame_equal(manager.load_file_auto(path.name, 'result', use_cache=False), df)
+    chunks = list(manager.iter_file_chunks(path.name, 'result', chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+def test_retention_budgets_are_validated_without_rules(tmp_path):
+    with pytest.raises(ValueError, match="Directory must be one of"):
+        FileManager(tmp_path).apply_retention(rules=[], budgets={'input': 1})
+
+
+def test_ipc_files_are_probed_by_their_arrow_magic_bytes(tmp_path):
+    feather = pytest.importorskip('pyarrow.feather')
+    feather.write_feather(pd.DataFrame({'id': [1, 2, 3]}), tmp_path / 'table.ipc')
+    (tmp_path / 'broken.ipc').write_bytes(b'not an arrow file')
+
+    assert probe_file_integrity(tmp_path / 'table.ipc')['errors'] == []
+    assert 'unexpected magic bytes' in probe_file_integrity(tmp_path / 'broken.ipc')['errors'][0]
+
+
+def test_csv_with_a_non_utf8_byte_past_the_sample_falls_back(tmp_path):
+    manager = FileManager(tmp_path)
+    lines = b''.join(b'%d,abc\n' % i for i in range(20000))
+    (manager.input_directory / 'late.csv').write_bytes(b'id,name\n' + lines + 'x,caf\xe9\n'.encode('latin-1'))
+
+    df = manager.load_file_auto('late.csv', use_cache=False)
+    assert df.shape == (20001, 2)
+    assert df['name'].iloc[-1] == 'café'
+    assert df.attrs['csv_dialect']['encoding'] == 'cp1252'
+
+    chunks = list(manager.iter_file_chunks('late.csv', chunksize=3000))
+    assert sum(len(chunk) for chunk in chunks) == 20001
+    assert chunks[-1]['name'].iloc[-1] == 'café'
+
+
+@pytest.mark.parametrize('text, has_header, columns', [
+    ('2021,2022,2023\n1,2,3\n4,5,6\n', True, ['2021', '2022', '2023']),
+    ('id,name,score\n1,Ann,3.5\n2,Bob,4.0\n', True, ['id', 'name', 'score']),
+    ('1,Ann,3.5\n2,Bob,4.0\n3,Cid,2.5\n', False, [0, 1, 2]),
+])
+def test_csv_header_is_kept_unless_the_first_row_is_typed_like_data(tmp_path, text, has_header, columns):
+    manager = FileManager(tmp_path)
+    (manager.input_directory / 'table.csv').write_text(text)
+
+    assert sniff_csv_dialect(manager.input_directory / 'table.csv')['has_header'] is has_header
+    df = manager.load_file_auto('table.csv', use_cache=False)
+    assert list(df.columns) == columns
+    assert len(df) == (2 if has_header else 3)
+
+
+def test_load_many_lazy_combine_matches_the_combined_frame(tmp_path):
+    manager = FileManager(tmp_path)
+    for i in range(3):
+        pd.DataFrame({'id': range(i + 2), 'name': list('abcd')[:i + 2]}).to_csv(
+            manager.input_directory / f"part_{i}.csv", index=False)
+    (manager.input_directory / 'broken.json').write_text('{not json')
+
+    combined, errors = manager.load_many('*', executor='thread', combine=True)
+    frames, lazy_errors = manager.load_many('*', executor='thread', combine='lazy')
+    assert lazy_errors == {}
+
+    pd.testing.assert_frame_equal(pd.concat(list(frames)), combined)
+    assert list(lazy_errors) == list(errors) == ['broken.json']
+    assert combined.index.get_level_values('source_file').unique().tolist() == ['part_0.csv', 'part_1.csv', 'part_2.csv']
+
+
+@pytest.mark.parametrize('content, encoding, delimiter', [
+    ('id;city\n1;Bogotá\n'.encode('utf-8'), 'utf-8', ';'),
+    ('id|city\n1|Bogotá\n'.encode('utf-8-sig'), 'utf-8-sig', '|'),
+    ('id\tprice\n1\t5€\n'.encode('cp1252'), 'cp1252', '\t'),
+    ('id,name\n1,José\n'.encode('latin-1'), 'latin-1', ','),
+])
+def test_sniffer_detects_encoding_and_delimiter_from_the_sample(tmp_path, content, encoding, delimiter):
+    manager = FileManager(tmp_path)
+    (manager.input_directory / 'data.csv').write_bytes(content)
+
+    dialect = sniff_csv_dialect(manager.input_directory / 'data.csv')
+    assert (dialect['encoding'], dialect['delimiter']) == (encoding, delimiter)
+
+    df = manager.load_file_auto('data.csv', use_cache=False)
+    assert list(df.columns)[0] == 'id'
+    assert df.iloc[0, 1] == content.decode(encoding).splitlines()[1].split(delimiter)[1]
+
+
+def test_load_cache_hits_until_the_source_file_changes(tmp_path):
+    manager = FileManager(tmp_path, use_cache=True)
+    path = manager.input_directory / 'data.csv'
+    pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']}).to_csv(path, index=False)
+
+    first = manager.load_file_auto('data.csv')
+    pd.testing.assert_frame_equal(manager.load_file_auto('data.csv'), first)
+    assert manager.cache.stats()['hits'] == 1
+    assert manager.cache.stats()['entries'] == 1
+
+    pd.DataFrame({'id': [3], 'name': ['c']}).to_csv(path, index=False)
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10 ** 9))
+    assert manager.load_file_auto('data.csv')['id'].tolist() == [3]
+    assert manager.cache.stats()['misses'] == 2
+    assert manager.cache.stats()['entries'] == 1
+
+
+def test_load_cache_evicts_the_least_recently_used_entry(tmp_path):
+    cache = LoadCache(tmp_path / 'cache')
+    paths = []
+    for name in 'abc':
+        paths.append(tmp_path / f"{name}.csv")
+        paths[-1].write_text(f"id\n{ord(name)}\n")
+
+    df = pd.DataFrame({'id': [1]})
+    cache.put(paths[0], df)
+    cache.put(paths[1], df)
+    cache.max_size_bytes = 2 * cache._index[cache._key(cache._signature(paths[0]))]['bytes']
+    assert cache.get(paths[0]) is not None
+
+    cache.put(paths[2], df)
+    assert cache.stats()['evictions'] == 1
+    assert cache.get(paths[1]) is None
+    assert cache.get(paths[0]) is not None and cache.get(paths[2]) is not None
+
+
+def test_load_many_reports_failures_and_fills_the_cache_from_the_workers(tmp_path):
+    manager = FileManager(tmp_path, use_cache=True)
+    pd.DataFrame({'id': [1, 2]}).to_csv(manager.input_directory / 'a.csv', index=False)
+    pd.DataFrame({'id': [3]}).to_parquet(manager.input_directory / 'b.parquet')
+    (manager.input_directory / 'c.json').write_text('{not json')
+
+    frames, errors = manager.load_many('*')
+    assert sorted(frames) == ['a.csv', 'b.parquet']
+    assert list(errors) == ['c.json']
+    assert frames['a.csv']['id'].tolist() == [1, 2]
+    # Columnar files bypass the cache
+    assert manager.cache.stats()['entries'] == 1
+
+    cached, _ = manager.load_many('*.csv', executor='thread')
+    pd.testing.assert_frame_equal(cached['a.csv'], frames['a.csv'])
+    assert manager.cache.stats()['hits'] == 1
+
+    with pytest.raises(ValueError, match="combine must be one of"):
+        manager.load_many('*', combine='eager')
+
+
+@pytest.fixture
+def installed_excel_engines(monkeypatch):
+    """Pretends only the given Excel engines are installed."""
+    installed = set()
+    monkeypatch.setattr(file_manager, '_excel_engine_installed', lambda engine: engine in installed)
+    file_manager._excel_engine.cache_clear()
+    yield installed
+    file_manager._excel_engine.cache_clear()
+
+
+def test_excel_engine_prefers_calamine_and_falls_back(installed_excel_engines):
+    installed_excel_engines.update(['calamine', 'openpyxl'])
+    assert file_manager._excel_engine('.xlsx') == 'calamine'
+    assert file_manager._excel_engine('.xlsx', 'openpyxl') == 'openpyxl'
+
+    file_manager._excel_engine.cache_clear()
+    installed_excel_engines.discard('calamine')
+    assert file_manager._excel_engine('.xlsx') == 'openpyxl'
+    with pytest.raises(ImportError, match="pip install xlrd"):
+        file_manager._excel_engine('.xls')
+    with pytest.raises(ImportError, match="pip install python-calamine"):
+        file_manager._excel_engine('.xlsx', 'calamine')
+
+
+def test_excel_sheets_load_concurrently(tmp_path):
+    pytest.importorskip('openpyxl')
+    manager = FileManager(tmp_path, excel_engine='openpyxl')
+    with pd.ExcelWriter(manager.input_directory / 'book.xlsx', engine='openpyxl') as writer:
+        for i, name in enumerate(['north', 'south', 'east']):
+            pd.DataFrame({'id': [i, i + 1], 'region': name}).to_excel(writer, sheet_name=name, index=False)
+
+    sheets = manager.load_excel_sheets('book.xlsx', sheets=['east', 0], executor='thread')
+    assert list(sheets) == ['east', 'north']
+    assert sheets['east']['id'].tolist() == [2, 3]
+    pd.testing.assert_frame_equal(manager.load_file_auto('book.xlsx', sheet_name='south'),
+                                  pd.DataFrame({'id': [1, 2], 'region': 'south'}))
+
+
+@pytest.mark.parametrize('split, names', [
+    ('sheets', {'book.xlsx': ['data', 'data_2', 'data_3']}),
+    ('files', {'book.xlsx': ['data'], 'book_2.xlsx': ['data'], 'book_3.xlsx': ['data']}),
+])
+def test_streaming_excel_export_splits_rows_beyond_the_sheet_limit(tmp_path, split, names):
+    pytest.importorskip('openpyxl')
+    df = pd.DataFrame({'id': range(7), 'value': [0.5, None, 1.5, 2.0, None, 3.0, 4.5]})
+    chunks = (df.iloc[i:i + 3] for i in range(0, len(df), 3))
+
+    paths, shape = write_excel_streaming(chunks, tmp_path / 'book.xlsx', sheet_name='data', split=split, max_rows=4)
+    assert shape == (7, 2)
+    assert {path.name: pd.ExcelFile(path).sheet_names for path in paths} == names
+
+    parts = [pd.read_excel(path, sheet_name=None) for path in paths]
+    loaded = pd.concat([sheet for part in parts for sheet in part.values()], ignore_index=True)
+    pd.testing.assert_frame_equal(loaded, df)
+
+
+def test_streaming_excel_export_rejects_mismatched_chunks(tmp_path):
+    pytest.importorskip('openpyxl')
+    chunks = [pd.DataFrame({'id': [1]}), pd.DataFrame({'other': [2]})]
+    with pytest.raises(ValueError, match="same columns"):
+        write_excel_streaming(chunks, tmp_path / 'book.xlsx')
+    assert not (tmp_path / 'book.xlsx').exists()
+
+
+def test_incremental_files_report_relists_only_changed_directories(tmp_path, caplog):
+    manager = FileManager(tmp_path)
+    (manager.input_directory / 'a.csv').write_text('x\n1\n')
+    (manager.input_directory / 'sub').mkdir()
+    (manager.input_directory / 'sub' / 'b.txt').write_text('hello')
+
+    full = manager.generate_files_report()
+    with caplog.at_level('INFO', logger='file_manager'):
+        assert manager.generate_files_report(incremental=True)['directories'] == full['directories']
+    assert "(0 directories listed, 4 reused from the index)" in caplog.text
+
+    sub = manager.input_directory / 'sub'
+    (sub / 'c.txt').write_text('world!')
+    os.utime(sub, ns=(sub.stat().st_atime_ns, sub.stat().st_mtime_ns + 10 ** 9))
+    caplog.clear()
+    with caplog.at_level('INFO', logger='file_manager'):
+        incremental = manager.generate_files_report(incremental=True)['directories']
+    assert "(1 directories listed, 3 reused from the index)" in caplog.text
+    assert incremental == manager.generate_files_report()['directories']
+    assert incremental['input']['extensions']['.txt']['count'] == 2
+
+
+def read_tree(root):
+    return {path.relative_to(root).as_posix(): (path.read_bytes(), path.stat().st_mtime_ns)
+            for path in root.rglob('*') if path.is_file()}
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'zstd'])
+def test_backup_restore_round_trip_is_incremental_and_deduplicated(tmp_path, compression):
+    if importlib.util.find_spec(CODEC_MODULES[compression]) is None:
+        pytest.skip(f"{CODEC_MODULES[compression]} is not installed")
+
+    manager = FileManager(tmp_path)
+    results = manager.results_directory
+    (results / 'sub').mkdir()
+    (results / 'a.csv').write_bytes(b'id\n1\n' * 1000)
+    (results / 'copy.csv').write_bytes(b'id\n1\n' * 1000)
+    (results / 'sub' / 'b.txt').write_text('first')
+    first_tree = read_tree(results)
+
+    first = manager.create_backup(compression=compression, max_workers=2)
+    stats = json.loads(first.read_text())['stats']
+    assert (stats['files'], stats['stored'], stats['deduplicated']) == (3, 2, 1)
+
+    (results / 'sub' / 'b.txt').write_text('second version')
+    os.utime(results / 'sub' / 'b.txt', ns=(0, 10 ** 18))
+    second = manager.create_backup(compression=compression)
+    manifest = json.loads(second.read_text())
+    assert manifest['parent'] == first.name
+    assert manifest['stats']['unchanged'] == 2 and manifest['stats']['stored'] == 1
+    assert len([p for p in (tmp_path / 'backups' / 'objects').rglob('*') if p.is_file()]) == 3
+
+    assert read_tree(manager.restore_backup(second)) == read_tree(results)
+    assert read_tree(manager.restore_backup(first, tmp_path / 'old')) == first_tree
+
+
+def test_restore_rejects_corrupted_objects(tmp_path):
+    manager = FileManager(tmp_path)
+    (manager.results_directory / 'a.csv').write_text('id\n1\n')
+    manifest = manager.create_backup(compression='gzip')
+
+    object_path = next(p for p in (tmp_path / 'backups' / 'objects').rglob('*.gz'))
+    object_path.write_bytes(gzip.compress(b'id\n2\n'))
+    with pytest.raises(ValueError, match="Corrupted backup object"):
+        manager.restore_backup(manifest)
+
+
+def test_organize_by_date_dry_run_plans_without_touching_files(tmp_path):
+    manager = FileManager(tmp_path)
+    results = manager.results_directory
+    for name in ['b.csv', 'a.csv', 'taken.csv', '.partial.tmp']:
+        (results / name).write_text(name)
+    month = datetime.fromtimestamp((results / 'a.csv').stat().st_ctime).strftime('%Y-%m')
+    (results / month).mkdir()
+    (results / month / 'taken.csv').write_text('already organized')
+    before = read_tree(results)
+
+    report = manager.organize_files_by_date(dry_run=True)
+    assert read_tree(results) == before
+    assert [(move['name'], move['folder'], move['rename']) for move in report['plan']] == [
+        ('a.csv', month, True), ('b.csv', month, True)]
+    assert report['cost']['files'] == 2 and report['cost']['folders_to_create'] == 0
+    assert report['moved'] == 0
+
+    assert manager.organize_files_by_date()['moved'] == 2
+    assert sorted(p.name for p in (results / month).iterdir()) == ['a.csv', 'b.csv', 'taken.csv']
+    assert sorted(p.name for p in results.iterdir() if p.is_file()) == ['.partial.tmp', 'taken.csv']
+
+
+def baseline_similar_files(directory, base_name, threshold):
+    """find_similar_files before the index: a SequenceMatcher ratio against every stem."""
+    similar_files = []
+    for file in directory.glob('*'):
+        if file.is_file():
+            similarity = SequenceMatcher(None, base_name.lower(), file.stem.lower()).ratio()
+            if similarity >= threshold:
+                similar_files.append((file, similarity))
+    similar_files.sort(key=lambda x: (-x[1], x[0].name))
+    return [file for file, _ in similar_files]
+
+
+def test_similar_name_index_matches_the_difflib_scan(tmp_path):
+    rng = random.Random(0)
+    words = ['sales', 'report', 'Q1', 'q2', 'final', 'v2', 'clients', 'data', '2024', 'x']
+
+    def random_name():
+        name = '_'.join(rng.sample(words, rng.randint(1, 4)))
+        if rng.random() < 0.5:
+            position = rng.randrange(len(name))
+            name = name[:position] + rng.choice('abc_-') + name[position + 1:]
+        return name
+
+    for _ in range(150):
+        (tmp_path / f"{random_name()}{rng.choice(['.csv', '.xlsx', ''])}").touch()
+    index = SimilarNameIndex(tmp_path)
+    queries = [random_name() for _ in range(20)] + ['', 'SALES_REPORT']
+
+    for threshold in [0.0, 0.5, 0.8, 0.95, 1.0]:
+        for query in queries:
+            assert index.find(query, threshold) == baseline_similar_files(tmp_path, query, threshold)
+
+    for path in sorted(tmp_path.iterdir())[::3]:
+        path.unlink()
+    (tmp_path / 'sales_report_final.csv').touch()
+    index.refresh(force=True)
+    for query in queries:
+        assert index.find(query, 0.7) == baseline_similar_files(tmp_path, query, 0.7)
+        assert find_similar_files(tmp_path, query, 0.7) == baseline_similar_files(tmp_path, query, 0.7)
+
+
+def test_retention_deletes_rule_matches_then_evicts_the_oldest_files_over_budget(tmp_path):
+    manager = FileManager(tmp_path)
+    results = manager.results_directory
+    now = time.time()
+    (results / 'sub').mkdir()
+    ages = {'temp_old.csv': 30, 'temp_new.csv': 1, 'a.csv': 5, 'sub/b.csv': 4, 'c.csv': 3, 'd.csv': 2}
+    for relative, days in ages.items():
+        (results / relative).write_bytes(b'x' * 1024)
+        os.utime(results / relative, (now - days * 86400, now - days * 86400))
+
+    plan = manager.apply_retention(budgets={'result': 3 * 1024 / 1024 ** 2}, dry_run=True)
+    candidates = plan['directories']['result']['candidates']
+    assert sorted((c['file'], c['reason']) for c in candidates) == [
+        ('a.csv', 'budget'), ('sub/b.csv', 'budget'), ('temp_old.csv', 'rule 0')]
+    assert plan['directories']['result']['size_after_bytes'] == 3 * 1024
+    assert read_tree(results).keys() == ages.keys()
+
+    report = manager.apply_retention(budgets={'result': 3 * 1024 / 1024 ** 2})
+    assert (report['deleted'], report['freed_bytes']) == (3, 3 * 1024)
+    assert sorted(read_tree(results)) == ['c.csv', 'd.csv', 'temp_new.csv']
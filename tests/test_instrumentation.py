@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import instrumentation
+from file_manager import FileManager
+from instrumentation import REGISTRY, instrumented, measure
+
+
+@pytest.fixture
+def registry():
+    """Records into an empty registry and turns instrumentation off afterwards."""
+    REGISTRY.reset()
+    yield REGISTRY
+    instrumentation.disable()
+    REGISTRY.reset()
+
+
+def test_calls_are_recorded_only_while_enabled(registry):
+    @instrumented(name='square')
+    def square(values):
+        return values ** 2
+
+    square(np.arange(3))
+    assert registry.snapshot() == {}
+
+    instrumentation.enable()
+    assert instrumentation.is_enabled()
+    square(np.arange(3))
+    with pytest.raises(TypeError):
+        square('text')
+    instrumentation.disable()
+    square(np.arange(3))
+
+    stats = registry.snapshot()['square']
+    assert (stats['calls'], stats['errors']) == (2, 1)
+    assert stats['wall_seconds'] >= stats['wall_seconds_max'] > 0
+
+
+def test_rows_and_bytes_come_from_frames_paths_or_the_counter(registry, tmp_path):
+    df = pd.DataFrame({'id': np.arange(1000, dtype=np.int64), 'value': np.ones(1000)})
+
+    @instrumented(name='frame')
+    def passthrough(frame):
+        return frame.head(10), 'summary'
+
+    @instrumented(name='custom', counter=lambda result, args, kwargs: (kwargs['rows'], None))
+    def custom(rows):
+        return None
+
+    instrumentation.enable()
+    passthrough(df)
+    custom(rows=7)
+    path = FileManager(tmp_path).save_dataframe(df, 'table', include_timestamp=False, format='csv')
+    with measure('block', rows=3) as measurement:
+        measurement.bytes = 42
+
+    stats = registry.snapshot()
+    assert (stats['frame']['rows'], stats['frame']['bytes']) == (10, 10 * 16 + df.head(10).index.nbytes)
+    assert (stats['custom']['rows'], stats['custom']['bytes']) == (7, 0)
+    assert (stats['FileManager.save_dataframe']['rows'], stats['FileManager.save_dataframe']['bytes']) == (
+        1000, path.stat().st_size)
+    assert (stats['block']['rows'], stats['block']['bytes']) == (3, 42)
+
+
+def test_nested_tracemalloc_peaks_are_kept_by_the_outer_call(registry):
+    instrumentation.enable(trace_memory=True)
+    with measure('outer'):
+        with measure('inner'):
+            buffer = bytearray(8 * 1024 ** 2)
+            del buffer
+    instrumentation.disable()
+
+    stats = registry.snapshot()
+    assert stats['inner']['traced_peak_bytes_max'] >= 8 * 1024 ** 2
+    assert stats['outer']['traced_peak_bytes_max'] >= stats['inner']['traced_peak_bytes_max']
+
+
+def test_exports_as_json_and_prometheus_text(registry, tmp_path):
+    registry.record('load "input"', wall_seconds=0.5, cpu_seconds=0.25, rows=10)
+    registry.record('load "input"', wall_seconds=1.5, cpu_seconds=0.5, error=True, rows=5)
+
+    document = json.loads(registry.to_json(tmp_path / 'metrics.json'))
+    assert json.loads((tmp_path / 'metrics.json').read_text()) == document
+    stats = document['operations']['load "input"']
+    assert (stats['calls'], stats['errors'], stats['rows']) == (2, 1, 15)
+    assert (stats['wall_seconds'], stats['wall_seconds_max'], stats['cpu_seconds']) == (2.0, 1.5, 0.75)
+
+    text = registry.to_prometheus()
+    assert '# TYPE project_operation_calls_total counter' in text
+    assert 'project_operation_calls_total{operation="load \\"input\\""} 2' in text
+    assert 'project_operation_wall_seconds_max{operation="load \\"input\\""} 1.5' in text
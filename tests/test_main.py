@@ -0,0 +1,69 @@
+import importlib.util
+import logging
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+MAIN_PATH = Path(__file__).parent.parent / "python_template" / "en" / "complex_project" / "main.py"
+
+
+@pytest.fixture
+def main(monkeypatch, tmp_path):
+    """Loads the template main.py with a temporary project directory as working directory."""
+    spec = importlib.util.spec_from_file_location("template_main", MAIN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logging.root, 'level', logging.root.level)
+    yield module
+    module.stop_logging()
+
+
+def test_queued_log_records_reach_the_daily_file(main, tmp_path, monkeypatch):
+    # Without pytest's capture handler, so basicConfig installs the queue handler
+    monkeypatch.setattr(logging.root, 'handlers', [])
+    logger = main.setup_logging()
+    assert main.setup_logging() is logger
+    assert isinstance(logging.root.handlers[0], logging.handlers.QueueHandler)
+
+    for i in range(100):
+        logging.getLogger('file_manager').info("record %s of %s", i, 'batch')
+    main.stop_logging()
+
+    log_files = list((tmp_path / 'data' / 'logs').glob('project_*.log'))
+    assert len(log_files) == 1
+    lines = log_files[0].read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 100
+    assert lines[-1].endswith(" - file_manager - INFO - record 99 of batch")
+
+
+def test_daily_handler_rotates_by_size_and_switches_file_at_midnight(main, tmp_path):
+    handler = main.DailyRotatingFileHandler(tmp_path, max_bytes=200, backup_count=2)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    today = handler.day
+
+    def emit(message, day_offset=0):
+        record = logging.makeLogRecord({'msg': message})
+        record.created += day_offset * 86400
+        handler.handle(record)
+
+    for _ in range(10):
+        emit('x' * 50)
+    handler.close()
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert names == [f"project_{today:%Y%m%d}.log", f"project_{today:%Y%m%d}.log.1", f"project_{today:%Y%m%d}.log.2"]
+
+    # A record after midnight closes the previous day's file and starts a new one
+    (tmp_path / 'days').mkdir()
+    handler = main.DailyRotatingFileHandler(tmp_path / 'days')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    yesterday = today - timedelta(days=1)
+    handler._start_day(yesterday)
+    emit('old day', day_offset=-1)
+    emit('new day')
+    handler.close()
+    assert handler.day == today
+    assert (tmp_path / 'days' / f"project_{yesterday:%Y%m%d}.log").read_text() == 'old day\n'
+    assert (tmp_path / 'days' / f"project_{today:%Y%m%d}.log").read_text() == 'new day\n'